@@ -1,3 +1,4 @@
+from datetime import date
 from fastapi.testclient import TestClient
 from typing import cast
 
@@ -334,6 +335,11 @@ class TestingHarnessAssistantRouter:
         assert self.fake_pinecone_client.insert_session_vectors_invoked
         assert response.status_code == 200
 
+        patient_metrics_delta = self.fake_aws_db_client.last_patient_metrics_delta
+        assert patient_metrics_delta is not None
+        assert patient_metrics_delta.session_count_delta == 1
+        assert patient_metrics_delta.added_session_date == date(2020, 1, 1)
+
     def test_update_session_with_missing_session_token(self):
         response = self.client.put(
             AssistantRouter.SESSIONS_ENDPOINT,
@@ -432,6 +438,12 @@ class TestingHarnessAssistantRouter:
         assert response.status_code == 200
         assert self.fake_pinecone_client.update_session_vectors_invoked
 
+        patient_metrics_delta = self.fake_aws_db_client.last_patient_metrics_delta
+        assert patient_metrics_delta is not None
+        assert patient_metrics_delta.session_count_delta == 0
+        assert patient_metrics_delta.removed_session_date == date(2024, 10, 10)
+        assert patient_metrics_delta.added_session_date == date(2020, 1, 1)
+
     def test_update_session_with_same_text_success(self):
         self.client.cookies.set("session_token", self.session_token)
         self.fake_pinecone_client.vector_store_context_returns_data = True
@@ -494,6 +506,11 @@ class TestingHarnessAssistantRouter:
         assert response.status_code == 200
         assert self.fake_pinecone_client.delete_session_vectors_invoked
 
+        patient_metrics_delta = self.fake_aws_db_client.last_patient_metrics_delta
+        assert patient_metrics_delta is not None
+        assert patient_metrics_delta.session_count_delta == -1
+        assert patient_metrics_delta.removes_written_session
+
     def test_session_query_with_missing_session_token(self):
         response = self.client.post(
             AssistantRouter.QUERIES_ENDPOINT,
@@ -1019,7 +1036,7 @@ class TestingHarnessAssistantRouter:
         assert response.status_code == 400
 
     def test_delete_patient_success(self):
-        assert not self.fake_pinecone_client.delete_preexisting_history_vectors_invoked
+        assert len(self.fake_pinecone_client.deleted_patients_vectors_ids) == 0
         self.client.cookies.set("session_token", self.session_token)
         response = self.client.delete(
             AssistantRouter.PATIENTS_ENDPOINT,
@@ -1031,7 +1048,7 @@ class TestingHarnessAssistantRouter:
             }
         )
         assert response.status_code == 200
-        assert self.fake_pinecone_client.delete_preexisting_history_vectors_invoked
+        assert self.fake_pinecone_client.deleted_patients_vectors_ids == [FAKE_PATIENT_ID]
 
     def test_transform_with_template_with_missing_session_token(self):
         response = self.client.post(
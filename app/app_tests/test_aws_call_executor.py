@@ -0,0 +1,102 @@
+import asyncio, time
+
+from ..dependencies.core.aws_call_executor import AwsCallExecutor
+from ..dependencies.fake.fake_aws_s3_client import FakeAwsS3Client
+from ..dependencies.fake.fake_aws_secret_manager_client import FakeAwsSecretManagerClient
+from ..dependencies.fake.fake_resend_client import FakeResendClient
+
+BLOCKING_CALL_SECONDS = 0.3
+TICK_INTERVAL_SECONDS = 0.01
+
+class SlowFakeBoto3Client:
+    """
+    Mimics a boto3 client, whose calls block the calling thread for a full network round trip.
+    """
+
+    def delete_object(self, Bucket: str, Key: str):
+        time.sleep(BLOCKING_CALL_SECONDS)
+        return {"Bucket": Bucket, "Key": Key}
+
+class TestingHarnessAwsCallExecutor:
+
+    def test_blocking_calls_keep_the_event_loop_responsive(self):
+        client = SlowFakeBoto3Client()
+
+        async def measure():
+            ticks = 0
+            max_tick_gap = 0.0
+
+            async def ticker(done: asyncio.Event):
+                nonlocal ticks, max_tick_gap
+                last_tick = time.perf_counter()
+                while not done.is_set():
+                    await asyncio.sleep(TICK_INTERVAL_SECONDS)
+                    now = time.perf_counter()
+                    max_tick_gap = max(max_tick_gap, now - last_tick)
+                    last_tick = now
+                    ticks += 1
+
+            done = asyncio.Event()
+            ticker_task = asyncio.create_task(ticker(done))
+            started_at = time.perf_counter()
+            responses = await asyncio.gather(*[
+                AwsCallExecutor.run(client.delete_object, Bucket="myBucket", Key=f"file_{i}")
+                for i in range(4)
+            ])
+            elapsed = time.perf_counter() - started_at
+            done.set()
+            await ticker_task
+            return responses, elapsed, ticks, max_tick_gap
+
+        responses, elapsed, ticks, max_tick_gap = asyncio.run(measure())
+        assert [response["Key"] for response in responses] == [f"file_{i}" for i in range(4)]
+
+        # The calls ran concurrently, rather than back to back.
+        assert elapsed < 4 * BLOCKING_CALL_SECONDS
+        # The loop kept ticking while the calls were in flight.
+        assert ticks >= 5
+        assert max_tick_gap < BLOCKING_CALL_SECONDS
+
+    def test_call_timeout(self):
+        client = SlowFakeBoto3Client()
+
+        async def run_with_timeout():
+            await AwsCallExecutor.run(
+                client.delete_object,
+                Bucket="myBucket",
+                Key="myFile",
+                timeout_seconds=0.05,
+            )
+
+        try:
+            asyncio.run(run_with_timeout())
+            assert False, "Expected the call to time out"
+        except TimeoutError as e:
+            assert "delete_object" in str(e)
+
+    def test_call_propagates_errors(self):
+        def failing_call():
+            raise ValueError("myFakeError")
+
+        try:
+            asyncio.run(AwsCallExecutor.run(failing_call))
+            assert False, "Expected the call to fail"
+        except ValueError as e:
+            assert str(e) == "myFakeError"
+
+    def test_fake_clients_run_concurrently(self):
+        s3_client = FakeAwsS3Client()
+        secret_manager = FakeAwsSecretManagerClient()
+        resend_client = FakeResendClient()
+
+        async def run_concurrently():
+            return await asyncio.gather(
+                s3_client.get_audio_file_read_signed_url(bucket_name="myBucket", file_path="myFile"),
+                s3_client.delete_file(source_bucket="myBucket", storage_filepath="myFile"),
+                secret_manager.get_secret_async(secret_id="mySecret", resend_client=resend_client),
+            )
+
+        signed_url, _, secret = asyncio.run(run_concurrently())
+        assert signed_url == {"url": "myFakeUrl"}
+        assert secret == {"secret": "myFakeSecret"}
+        assert s3_client.get_audio_file_read_signed_url_invoked
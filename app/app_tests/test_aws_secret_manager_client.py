@@ -0,0 +1,108 @@
+import threading, time
+
+from ..dependencies.fake.fake_resend_client import FakeResendClient
+from ..dependencies.implementation.aws_secret_manager_client import AwsSecretManagerClient
+
+FAKE_SECRET_ID = "mySecretId"
+REFRESH_TIMEOUT_SECONDS = 5
+
+class FlakySecretManagerClient(AwsSecretManagerClient):
+    """
+    Counts its fetches, which fail while `available` is unset and block while `release` is unset.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.fetches = 0
+        self.version = 1
+        self.available = True
+        self.release = threading.Event()
+        self.release.set()
+
+    def _fetch_secret(self, secret_id: str, resend_client) -> dict:
+        self.fetches += 1
+        self.release.wait(REFRESH_TIMEOUT_SECONDS)
+        if not self.available:
+            raise ConnectionError("Secrets Manager is unavailable")
+        return {"secret": f"mySecret-{self.version}"}
+
+class TestingHarnessAwsSecretManagerClient:
+
+    def setup_method(self):
+        self.client = FlakySecretManagerClient()
+        self.resend_client = FakeResendClient()
+
+    def test_failed_refreshes_back_off(self):
+        self._get_secret()
+        self._expire()
+        self.client.available = False
+
+        assert self._get_secret() == {"secret": "mySecret-1"}
+        assert self._get_secret() == {"secret": "mySecret-1"}
+        assert self.client.fetches == 2
+
+    def test_invalidations_during_an_outage_back_off(self):
+        self._get_secret()
+        self._expire()
+        self.client.available = False
+        self._get_secret()
+
+        self.client.invalidate_secret(FAKE_SECRET_ID)
+
+        assert self._get_secret() == {"secret": "mySecret-1"}
+        assert self.client.fetches == 2
+
+    def test_cached_reads_serve_expired_secrets_while_refreshing_in_the_background(self):
+        self._get_secret()
+        self._expire()
+        self.client.version = 2
+        self.client.release.clear()
+
+        started_at = time.monotonic()
+        for _ in range(10):
+            assert self._get_cached_secret() == {"secret": "mySecret-1"}
+        assert time.monotonic() - started_at < 1
+
+        self.client.release.set()
+        self._wait_for_refresh()
+        assert self._get_cached_secret() == {"secret": "mySecret-2"}
+        assert self.client.fetches == 2
+
+    def test_invalidated_secrets_are_refreshed_in_the_background(self):
+        self._get_secret()
+        self._age(AwsSecretManagerClient.MIN_INVALIDATION_INTERVAL_SECONDS)
+        self.client.version = 2
+
+        self.client.invalidate_secret(FAKE_SECRET_ID)
+        assert self._get_cached_secret() == {"secret": "mySecret-1"}
+
+        self._wait_for_refresh()
+        assert self._get_cached_secret() == {"secret": "mySecret-2"}
+
+    def test_recent_secrets_ignore_invalidations(self):
+        self._get_secret()
+
+        self.client.invalidate_secret(FAKE_SECRET_ID)
+        self._get_cached_secret()
+
+        assert self.client.fetches == 1
+
+    # Private
+
+    def _get_secret(self) -> dict:
+        return self.client.get_secret(secret_id=FAKE_SECRET_ID, resend_client=self.resend_client)
+
+    def _get_cached_secret(self) -> dict:
+        return self.client.get_cached_secret(secret_id=FAKE_SECRET_ID, resend_client=self.resend_client)
+
+    def _age(self, seconds: float):
+        secret, attempted_at, refresh_at = self.client._secrets[FAKE_SECRET_ID]
+        self.client._secrets[FAKE_SECRET_ID] = (secret, attempted_at - seconds, refresh_at - seconds)
+
+    def _expire(self):
+        self._age(AwsSecretManagerClient.SECRET_TTL_SECONDS)
+
+    def _wait_for_refresh(self):
+        deadline = time.monotonic() + REFRESH_TIMEOUT_SECONDS
+        while FAKE_SECRET_ID in self.client._refreshing_secret_ids and time.monotonic() < deadline:
+            time.sleep(0.01)
@@ -0,0 +1,121 @@
+import asyncio, json, threading, time
+
+from botocore.credentials import ReadOnlyCredentials
+from datetime import datetime, timezone
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ..dependencies.fake.fake_resend_client import FakeResendClient
+from ..internal.utilities.aws_utils import AwsRequestSigner
+
+FAKE_CREDENTIALS = ReadOnlyCredentials("AKIAFAKEACCESSKEY", "fakeSecretKey", None)
+SERVER_CLOCK_SKEW_SECONDS = 600
+MAX_ALLOWED_SKEW_SECONDS = 300
+
+class FakeAwsEndpointHandler(BaseHTTPRequestHandler):
+    """
+    Accepts requests whose signing time is within 5 minutes of the server's (skewed) clock, like AWS does.
+    """
+    server_clock_skew_seconds = 0
+    received_requests = 0
+
+    def do_POST(self):
+        cls = type(self)
+        cls.received_requests += 1
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        signing_time = datetime.strptime(
+            self.headers["X-Amz-Date"],
+            "%Y%m%dT%H%M%SZ"
+        ).replace(tzinfo=timezone.utc)
+        server_time = time.time() + cls.server_clock_skew_seconds
+        if abs(signing_time.timestamp() - server_time) > MAX_ALLOWED_SKEW_SECONDS:
+            self._respond(400, {"__type": "InvalidSignatureException", "message": "Signature expired"})
+        elif self.headers["X-Amz-Target"] == "secretsmanager.GetSecretValue":
+            self._respond(200, {"SecretString": json.dumps({"secret": "myFakeSecret"})})
+        else:
+            self._respond(400, {"__type": "AccessDeniedException", "message": "Access denied"})
+
+    def date_time_string(self, timestamp=None):
+        return formatdate(time.time() + type(self).server_clock_skew_seconds, usegmt=True)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, status_code: int, body: dict):
+        encoded_body = json.dumps(body).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/x-amz-json-1.1")
+        self.send_header("Content-Length", str(len(encoded_body)))
+        self.end_headers()
+        self.wfile.write(encoded_body)
+
+class TestingHarnessAwsRequestSigner:
+
+    def setup_method(self):
+        FakeAwsEndpointHandler.server_clock_skew_seconds = 0
+        FakeAwsEndpointHandler.received_requests = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeAwsEndpointHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.endpoint_url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        self.signer = AwsRequestSigner(credentials_provider=lambda _: FAKE_CREDENTIALS)
+        self.resend_client = FakeResendClient()
+
+    def teardown_method(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_send_without_clock_skew(self):
+        response = self._send(target_action="secretsmanager.GetSecretValue")
+        assert json.loads(response["SecretString"]) == {"secret": "myFakeSecret"}
+        assert FakeAwsEndpointHandler.received_requests == 1
+        assert abs(self.signer.clock_skew_offset) < 5
+
+    def test_send_corrects_clock_skew_once_and_reuses_it(self):
+        FakeAwsEndpointHandler.server_clock_skew_seconds = SERVER_CLOCK_SKEW_SECONDS
+        self._send(target_action="secretsmanager.GetSecretValue")
+        assert FakeAwsEndpointHandler.received_requests == 2
+        assert abs(self.signer.clock_skew_offset - SERVER_CLOCK_SKEW_SECONDS) < 5
+
+        # The cached offset is reused, so there are no more rejected round trips.
+        self._send(target_action="secretsmanager.GetSecretValue")
+        assert FakeAwsEndpointHandler.received_requests == 3
+
+    def test_send_async_corrects_clock_skew(self):
+        FakeAwsEndpointHandler.server_clock_skew_seconds = -SERVER_CLOCK_SKEW_SECONDS
+
+        async def send_twice():
+            try:
+                for _ in range(2):
+                    await self.signer.send_async(
+                        service="secretsmanager",
+                        region="us-east-1",
+                        endpoint_url=self.endpoint_url,
+                        payload={"SecretId": "mySecret"},
+                        target_action="secretsmanager.GetSecretValue",
+                        resend_client=self.resend_client,
+                    )
+            finally:
+                await self.signer.aclose()
+
+        asyncio.run(send_twice())
+        assert FakeAwsEndpointHandler.received_requests == 3
+        assert abs(self.signer.clock_skew_offset + SERVER_CLOCK_SKEW_SECONDS) < 5
+
+    def test_send_does_not_retry_other_errors(self):
+        try:
+            self._send(target_action="TrentService.Decrypt")
+            assert False, "Expected the request to fail"
+        except RuntimeError as e:
+            assert "AccessDeniedException" in str(e)
+        assert FakeAwsEndpointHandler.received_requests == 1
+
+    def _send(self, target_action: str) -> dict:
+        return self.signer.send(
+            service="secretsmanager",
+            region="us-east-1",
+            endpoint_url=self.endpoint_url,
+            payload={"SecretId": "mySecret"},
+            target_action=target_action,
+            resend_client=self.resend_client,
+        )
@@ -0,0 +1,155 @@
+import asyncio, hashlib, pytest
+
+from ..vectors import bucket_placement
+from ..vectors.bucket_placement import BucketOverride, BucketPlacement
+
+FAKE_USER_IDS = [f"myFakeTherapist{i}" for i in range(2000)]
+
+class FakeRedis:
+    """
+    An in-memory stand-in for the handful of Redis commands used by bucket placement.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.get_calls = 0
+        self.unavailable = False
+
+    def get(self, key: str):
+        self.get_calls += 1
+        if self.unavailable:
+            raise ConnectionError("myFakeRedisError")
+        return self.values.get(key)
+
+    def set(self, key: str, value: str):
+        self.values[key] = value
+
+    def delete(self, key: str):
+        self.values.pop(key, None)
+
+class TestingHarnessBucketPlacement:
+
+    def test_modulo_strategy_matches_legacy_placement(self):
+        placement = BucketPlacement(strategy=BucketPlacement.MODULO_STRATEGY)
+        for user_id in FAKE_USER_IDS:
+            legacy_bucket = str((int(hashlib.md5(user_id.encode()).hexdigest(), 16) % 20) + 1)
+            assert placement.read_bucket(user_id) == legacy_bucket
+            assert placement.write_buckets(user_id) == [legacy_bucket]
+
+    def test_consistent_hash_strategy_moves_few_users_when_adding_a_bucket(self):
+        buckets = [str(i) for i in range(1, 21)]
+        placement = BucketPlacement(strategy=BucketPlacement.CONSISTENT_HASH_STRATEGY, buckets=buckets)
+        grown_placement = BucketPlacement(strategy=BucketPlacement.CONSISTENT_HASH_STRATEGY, buckets=buckets + ["21"])
+
+        moved_user_ids = [
+            user_id for user_id in FAKE_USER_IDS
+            if placement.hashed_bucket(user_id) != grown_placement.hashed_bucket(user_id)
+        ]
+        # Ideally 1/21 (~5%) of the users move, and only to the new bucket.
+        assert len(moved_user_ids) < 0.1 * len(FAKE_USER_IDS)
+        assert all(grown_placement.hashed_bucket(user_id) == "21" for user_id in moved_user_ids)
+
+        # Modulo placement, by contrast, moves almost everyone.
+        modulo_placement = BucketPlacement(strategy=BucketPlacement.MODULO_STRATEGY, buckets=buckets)
+        grown_modulo_placement = BucketPlacement(strategy=BucketPlacement.MODULO_STRATEGY, buckets=buckets + ["21"])
+        modulo_moved_count = sum(
+            modulo_placement.hashed_bucket(user_id) != grown_modulo_placement.hashed_bucket(user_id)
+            for user_id in FAKE_USER_IDS
+        )
+        assert modulo_moved_count > 0.9 * len(FAKE_USER_IDS)
+
+    def test_overrides_take_precedence(self):
+        placement = BucketPlacement(redis_client=FakeRedis())
+        user_id = FAKE_USER_IDS[0]
+        hashed_bucket = placement.hashed_bucket(user_id)
+        target_bucket = "myFakeBucket"
+
+        placement.set_override(user_id, BucketOverride(read_bucket=hashed_bucket, write_buckets=[hashed_bucket, target_bucket]))
+        assert placement.read_bucket(user_id) == hashed_bucket
+        assert placement.write_buckets(user_id) == [hashed_bucket, target_bucket]
+
+        placement.set_override(user_id, BucketOverride(read_bucket=target_bucket))
+        assert placement.read_bucket(user_id) == target_bucket
+        assert placement.write_buckets(user_id) == [target_bucket]
+
+        placement.clear_override(user_id)
+        assert placement.read_bucket(user_id) == hashed_bucket
+
+        # Other users are unaffected.
+        assert placement.get_override(FAKE_USER_IDS[1]) is None
+
+    def test_overrides_are_cached(self):
+        redis_client = FakeRedis()
+        placement = BucketPlacement(redis_client=redis_client)
+        user_id = FAKE_USER_IDS[0]
+
+        for _ in range(5):
+            placement.read_bucket(user_id)
+        assert redis_client.get_calls == 1
+
+        # Another process sets an override, which this one observes once its cache expires.
+        BucketPlacement(redis_client=redis_client).set_override(user_id, BucketOverride(read_bucket="myFakeBucket"))
+        assert placement.read_bucket(user_id) != "myFakeBucket"
+        placement._overrides_cache.clear()
+        assert placement.read_bucket(user_id) == "myFakeBucket"
+
+    def test_last_known_override_is_served_while_redis_is_unavailable(self):
+        redis_client = FakeRedis()
+        placement = BucketPlacement(redis_client=redis_client)
+        user_id = FAKE_USER_IDS[0]
+
+        placement.set_override(user_id, BucketOverride(read_bucket="myFakeBucket"))
+        assert placement.read_bucket(user_id) == "myFakeBucket"
+
+        redis_client.unavailable = True
+        placement._overrides_cache.clear()
+        assert placement.read_bucket(user_id) == "myFakeBucket"
+
+    def test_redis_is_skipped_for_a_while_after_failing(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(bucket_placement.time, "monotonic", lambda: now[0])
+        redis_client = FakeRedis()
+        placement = BucketPlacement(redis_client=redis_client)
+        user_id = FAKE_USER_IDS[0]
+
+        placement.set_override(user_id, BucketOverride(read_bucket="myFakeBucket"))
+        assert placement.read_bucket(user_id) == "myFakeBucket"
+        redis_client.unavailable = True
+        placement._overrides_cache.clear()
+        redis_client.get_calls = 0
+
+        for other_user_id in FAKE_USER_IDS[:10]:
+            placement.read_bucket(other_user_id)
+        assert redis_client.get_calls == 1
+        assert placement.read_bucket(user_id) == "myFakeBucket"
+
+        # Once the backoff elapses, Redis gets tried again.
+        redis_client.unavailable = False
+        now[0] += BucketPlacement.REDIS_FAILURE_BACKOFF_SECONDS
+        assert placement.read_bucket(user_id) == "myFakeBucket"
+        assert redis_client.get_calls == 2
+
+    def test_async_placement_matches_sync_placement(self):
+        redis_client = FakeRedis()
+        placement = BucketPlacement(redis_client=redis_client)
+        user_id = FAKE_USER_IDS[0]
+        placement.set_override(user_id, BucketOverride(read_bucket="myFakeBucket", write_buckets=["myFakeBucket", "1"]))
+
+        async def resolve():
+            return [await placement.placement_async(user_id) for _ in range(3)]
+
+        placements = asyncio.run(resolve())
+        assert [p.read_bucket for p in placements] == ["myFakeBucket"] * 3
+        assert placements[0].write_buckets == ["myFakeBucket", "1"]
+        assert redis_client.get_calls == 1
+
+        hashed_placement = asyncio.run(BucketPlacement().placement_async(FAKE_USER_IDS[1]))
+        assert hashed_placement.read_bucket == placement.hashed_bucket(FAKE_USER_IDS[1])
+
+    def test_invalid_configurations_are_rejected(self):
+        with pytest.raises(ValueError):
+            BucketPlacement(strategy="myFakeStrategy")
+        with pytest.raises(ValueError):
+            BucketOverride(read_bucket="myFakeBucket", write_buckets=["1"])
+        with pytest.raises(RuntimeError):
+            BucketPlacement().set_override(FAKE_USER_IDS[0], BucketOverride(read_bucket="myFakeBucket"))
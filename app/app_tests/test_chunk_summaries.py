@@ -0,0 +1,151 @@
+import asyncio
+
+from fastapi import Request
+from typing import cast
+
+from ..dependencies.dependency_container import (
+    dependency_container,
+    FakeAsyncOpenAI,
+)
+from ..managers.assistant_manager import AssistantManager
+from ..internal.schemas import ListPackedChunkSummariesSchema, PackedChunkSummarySchema
+from ..vectors import chartwise_assistant
+from ..vectors.chartwise_assistant import ChartWiseAssistant
+from ..vectors.message_templates import PromptScenario
+from ..vectors.tokenizer import Tokenizer
+from .test_tokenizer import BYTE_ENCODING
+
+class TestingHarnessChunkSummaries:
+
+    def setup_method(self):
+        dependency_container._influx_client = None
+        dependency_container._openai_client = None
+        dependency_container._testing_environment = True
+
+        self.fake_openai_client = cast(FakeAsyncOpenAI, dependency_container.inject_openai_client())
+        self.completion_scenarios: list[PromptScenario] = []
+        self.user_prompts: list[str] = []
+        self.packed_output: ListPackedChunkSummariesSchema | Exception | None = None
+
+        fake_completion = self.fake_openai_client.trigger_async_chat_completion
+        async def trigger_async_chat_completion(prompt_scenario: PromptScenario | None = None, **kwargs):
+            self.completion_scenarios.append(prompt_scenario)
+            self.user_prompts.append(kwargs["messages"][-1]["content"])
+            if prompt_scenario == PromptScenario.PACKED_CHUNK_SUMMARIES and self.packed_output is not None:
+                if isinstance(self.packed_output, Exception):
+                    raise self.packed_output
+                return self.packed_output
+            return await fake_completion(prompt_scenario=prompt_scenario, **kwargs)
+        self.fake_openai_client.trigger_async_chat_completion = trigger_async_chat_completion
+
+    def test_chunks_are_packed_up_to_the_token_budget(self, monkeypatch):
+        monkeypatch.setattr(Tokenizer, "_shared_instance", Tokenizer(encoding=BYTE_ENCODING))
+        monkeypatch.setattr(chartwise_assistant, "PACKED_CHUNK_SUMMARIES_TOKEN_BUDGET", 20)
+        chunk_summaries = self._summarize(["a" * 10, "b" * 10, "c" * 10, "d" * 10, "e" * 30])
+
+        assert chunk_summaries == ["my fake summary"] * 5
+        # Two packs of two chunks, and an over-budget chunk that's summarized on its own.
+        assert self.completion_scenarios == [
+            PromptScenario.PACKED_CHUNK_SUMMARIES,
+            PromptScenario.PACKED_CHUNK_SUMMARIES,
+            PromptScenario.CHUNK_SUMMARY,
+        ]
+
+    def test_invalid_summaries_fall_back_per_chunk(self, monkeypatch):
+        monkeypatch.setattr(Tokenizer, "_shared_instance", Tokenizer(encoding=BYTE_ENCODING))
+        self.packed_output = ListPackedChunkSummariesSchema(
+            summaries=[
+                PackedChunkSummarySchema(chunk_id="2", summary="Third chunk"),
+                PackedChunkSummarySchema(chunk_id="0", summary="First chunk"),
+                PackedChunkSummarySchema(chunk_id="1", summary="  "),
+                PackedChunkSummarySchema(chunk_id="7", summary="Unknown chunk"),
+            ]
+        )
+        chunk_summaries = self._summarize(["first", "second", "third", "fourth"])
+
+        assert chunk_summaries == ["First chunk", "my fake summary", "Third chunk", "my fake summary"]
+        assert self.completion_scenarios == [
+            PromptScenario.PACKED_CHUNK_SUMMARIES,
+            PromptScenario.CHUNK_SUMMARY,
+            PromptScenario.CHUNK_SUMMARY,
+        ]
+
+    def test_failed_pack_falls_back_per_chunk(self, monkeypatch):
+        monkeypatch.setattr(Tokenizer, "_shared_instance", Tokenizer(encoding=BYTE_ENCODING))
+        self.packed_output = Exception("Fake exception")
+        chunk_summaries = self._summarize(["first", "second"])
+
+        assert chunk_summaries == ["my fake summary", "my fake summary"]
+        assert self.completion_scenarios == [
+            PromptScenario.PACKED_CHUNK_SUMMARIES,
+            PromptScenario.CHUNK_SUMMARY,
+            PromptScenario.CHUNK_SUMMARY,
+        ]
+
+    def test_mini_summary_is_derived_from_chunk_summaries(self, monkeypatch):
+        monkeypatch.setattr(Tokenizer, "_shared_instance", Tokenizer(encoding=BYTE_ENCODING))
+        asyncio.run(
+            ChartWiseAssistant().create_session_mini_summary(
+                session_notes="The full session notes",
+                language_code="en-US",
+                chunk_summaries=["First section", "Second section"],
+            )
+        )
+
+        assert self.completion_scenarios == [PromptScenario.SESSION_MINI_SUMMARY]
+        assert "- First section\n- Second section" in self.user_prompts[0]
+        assert "The full session notes" not in self.user_prompts[0]
+
+    def test_long_notes_get_a_hierarchical_mini_summary(self, monkeypatch):
+        monkeypatch.setattr(Tokenizer, "_shared_instance", Tokenizer(encoding=BYTE_ENCODING))
+        monkeypatch.setattr(chartwise_assistant, "MINI_SUMMARY_NOTES_TOKEN_BUDGET", 100)
+        asyncio.run(
+            ChartWiseAssistant().create_session_mini_summary(
+                session_notes=" ".join(["The patient talked about work."] * 20),
+                language_code="en-US",
+            )
+        )
+
+        assert self.completion_scenarios[-1] == PromptScenario.SESSION_MINI_SUMMARY
+        assert PromptScenario.PACKED_CHUNK_SUMMARIES in self.completion_scenarios
+        assert "- my fake summary" in self.user_prompts[-1]
+
+    def test_updated_notes_only_summarize_new_chunks_for_the_mini_summary(self, monkeypatch):
+        monkeypatch.setattr(Tokenizer, "_shared_instance", Tokenizer(encoding=BYTE_ENCODING))
+        assistant_manager = AssistantManager()
+        mini_summary_inputs = []
+        async def update_session_notes_with_mini_summary(**kwargs):
+            mini_summary_inputs.append(kwargs["chunk_summaries"])
+        monkeypatch.setattr(assistant_manager, "_update_session_notes_with_mini_summary", update_session_notes_with_mini_summary)
+
+        summarize_chunks = assistant_manager._session_chunks_summarizer(
+            session_notes_id="myFakeSessionNotesId",
+            notes_text="first\n\nsecond, edited",
+            therapist_id="myFakeTherapistId",
+            patient_id="myFakePatientId",
+            session_id=None,
+            language_code="en-US",
+            environment="testing",
+            request=cast(Request, None),
+        )
+        chunk_summaries = asyncio.run(
+            summarize_chunks(
+                chunk_texts=["first", "second, edited"],
+                openai_client=self.fake_openai_client,
+                chunk_summaries=["First section", None],
+            )
+        )
+
+        assert chunk_summaries == ["First section", "my fake summary"]
+        assert self.completion_scenarios == [PromptScenario.CHUNK_SUMMARY]
+        assert mini_summary_inputs == [["First section", "my fake summary"]]
+
+    # Private
+
+    def _summarize(self, chunk_texts: list[str]) -> list[str]:
+        return asyncio.run(
+            ChartWiseAssistant().summarize_chunks(
+                chunk_texts=chunk_texts,
+                openai_client=self.fake_openai_client
+            )
+        )
@@ -0,0 +1,166 @@
+import asyncio
+
+from pydantic import BaseModel
+from types import SimpleNamespace
+
+from ..dependencies.dependency_container import dependency_container, OpenAIClient
+from ..dependencies.implementation import openai_client
+from ..internal.utilities.completion_cache import CompletionCache
+from ..vectors.message_templates import PromptScenario
+from .test_embeddings_cache import FakeAsyncRedis
+
+FAKE_MESSAGES = [
+    {"role": "system", "content": "my fake system prompt"},
+    {"role": "user", "content": "my fake user prompt"},
+]
+
+class FakeSummarySchema(BaseModel):
+    summary: str
+
+class FakeRenamedSummarySchema(BaseModel):
+    renamed_summary: str
+
+class FakeCompletionsApi:
+
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **_):
+        self.calls += 1
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=" my fake completion ", refusal=None))]
+        )
+
+class TestingHarnessCompletionCache:
+
+    def setup_method(self):
+        dependency_container._testing_environment = True
+        self.encryptor = dependency_container.inject_chartwise_encryptor()
+        self.fake_redis = FakeAsyncRedis()
+
+    def test_missing_completion_is_a_miss(self):
+        cache = self._create_cache()
+        assert self._get(cache, self._key(cache)) is None
+
+    def test_completions_are_served_from_memory(self):
+        cache = self._create_cache()
+        asyncio.run(cache.set(key=self._key(cache), completion="my fake completion"))
+        self.fake_redis.unavailable = True
+        assert self._get(cache, self._key(cache)) == "my fake completion"
+
+    def test_structured_completions_are_shared_through_redis(self):
+        asyncio.run(
+            self._create_cache().set(
+                key=self._key(self._create_cache(), FakeSummarySchema),
+                completion=FakeSummarySchema(summary="my fake summary")
+            )
+        )
+        cache = self._create_cache()
+        completion = self._get(cache, self._key(cache, FakeSummarySchema), FakeSummarySchema)
+        assert completion == FakeSummarySchema(summary="my fake summary")
+
+    def test_corrupt_entries_are_evicted_misses(self):
+        cache = self._create_cache()
+        key = self._key(cache)
+        self.fake_redis.values[key] = b"myCorruptCiphertext"
+
+        assert self._get(cache, key) is None
+        assert key not in self.fake_redis.values
+
+    def test_entries_of_a_changed_schema_are_evicted_misses(self):
+        cache = self._create_cache()
+        key = self._key(cache, FakeSummarySchema)
+        asyncio.run(cache.set(key=key, completion=FakeRenamedSummarySchema(renamed_summary="my fake summary")))
+
+        assert self._get(cache, key, FakeSummarySchema) is None
+        assert len(cache._memory_cache) == 0
+        assert key not in self.fake_redis.values
+
+    def test_only_content_transforms_are_cacheable(self):
+        cache = self._create_cache()
+        assert cache.is_cacheable(PromptScenario.CHUNK_SUMMARY)
+        assert cache.is_cacheable(PromptScenario.SOAP_TEMPLATE)
+        assert not cache.is_cacheable(PromptScenario.PRESESSION_BRIEFING)
+        assert not cache.is_cacheable(PromptScenario.QUESTION_SUGGESTIONS)
+        assert not cache.is_cacheable(None)
+
+    def test_client_serves_repeated_transforms_from_cache(self, monkeypatch):
+        completions_api = self._use_fake_openai(monkeypatch)
+        client = OpenAIClient(encryptor=self.encryptor)
+
+        for _ in range(2):
+            assert self._complete(client, PromptScenario.SOAP_TEMPLATE) == "my fake completion"
+        assert completions_api.calls == 1
+
+    def test_client_skips_cache_for_other_scenarios(self, monkeypatch):
+        completions_api = self._use_fake_openai(monkeypatch)
+        client = OpenAIClient(encryptor=self.encryptor)
+
+        for _ in range(2):
+            assert self._complete(client, PromptScenario.PRESESSION_BRIEFING) == "my fake completion"
+        assert completions_api.calls == 2
+
+    def test_client_falls_back_to_api_on_unreadable_entries(self, monkeypatch):
+        completions_api = self._use_fake_openai(monkeypatch)
+        client = OpenAIClient(encryptor=self.encryptor)
+        cache_key = client._completion_cache.cache_key(messages=FAKE_MESSAGES, max_tokens=100)
+        client._completion_cache._memory_cache.set(cache_key, b"myCorruptCiphertext")
+
+        assert self._complete(client, PromptScenario.SOAP_TEMPLATE) == "my fake completion"
+        assert completions_api.calls == 1
+
+    # Private
+
+    def _create_cache(self) -> CompletionCache:
+        return CompletionCache(
+            llm_model="my-fake-model",
+            encryptor=self.encryptor,
+            redis_client=self.fake_redis,
+        )
+
+    def _key(
+        self,
+        cache: CompletionCache,
+        expected_output_model: type[BaseModel] | None = None
+    ) -> str:
+        return cache.cache_key(
+            messages=FAKE_MESSAGES,
+            max_tokens=100,
+            expected_output_model=expected_output_model
+        )
+
+    def _get(
+        self,
+        cache: CompletionCache,
+        key: str,
+        expected_output_model: type[BaseModel] | None = None
+    ):
+        return asyncio.run(
+            cache.get(
+                key=key,
+                prompt_scenario=PromptScenario.CHUNK_SUMMARY,
+                expected_output_model=expected_output_model
+            )
+        )
+
+    def _use_fake_openai(self, monkeypatch) -> FakeCompletionsApi:
+        completions_api = FakeCompletionsApi()
+        monkeypatch.setattr(
+            openai_client,
+            "AsyncOpenAI",
+            lambda **_: SimpleNamespace(chat=SimpleNamespace(completions=completions_api))
+        )
+        return completions_api
+
+    def _complete(
+        self,
+        client: OpenAIClient,
+        prompt_scenario: PromptScenario
+    ):
+        return asyncio.run(
+            client.trigger_async_chat_completion(
+                max_tokens=100,
+                messages=FAKE_MESSAGES,
+                prompt_scenario=prompt_scenario
+            )
+        )
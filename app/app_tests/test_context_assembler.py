@@ -0,0 +1,64 @@
+import tiktoken
+
+from ..vectors.context_assembler import AssembledContext, ContextAssembler
+from ..vectors.tokenizer import Tokenizer
+
+# One token per byte, so that tests don't depend on downloading the models' encoding.
+BYTE_TOKENIZER = Tokenizer(
+    encoding=tiktoken.Encoding(
+        name="test_bytes",
+        pat_str=r"[\s\S]",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={},
+    )
+)
+
+class TestingHarnessContextAssembler:
+
+    def test_unbounded_context(self):
+        assembler = ContextAssembler(tokenizer=BYTE_TOKENIZER)
+        assert assembler.add("first section")
+        assert assembler.add_items(["item_a", "item_b"], prefix="<", suffix=">") == [0, 1]
+
+        context = assembler.build()
+        assert isinstance(context, AssembledContext)
+        assert context == "first section\n<item_a\nitem_b>"
+        assert context.token_count == len(context.encode())
+
+    def test_items_that_dont_fit_are_dropped(self):
+        assembler = ContextAssembler(token_budget=20, tokenizer=BYTE_TOKENIZER)
+        added_positions = assembler.add_items(["12345678", "this item is too long", "abcdefgh"])
+        assert added_positions == [0, 2]
+
+        context = assembler.build()
+        assert context == "12345678\nabcdefgh"
+        assert context.token_count == 17
+
+        # Nothing else fits, so the prefix isn't added on its own.
+        assert assembler.add_items(["xyz"], prefix="Prefix: ") == []
+        assert assembler.build() == context
+
+    def test_sections_get_truncated_on_request(self):
+        assembler = ContextAssembler(token_budget=10, tokenizer=BYTE_TOKENIZER)
+        assert assembler.add("abcd")
+        assert not assembler.add("this section is too long")
+        assert assembler.add("this section is too long", truncate=True)
+
+        context = assembler.build()
+        assert context == "abcd\nthis "
+        assert context.token_count == 10
+
+        # The budget is exhausted.
+        assert not assembler.add("x", truncate=True)
+
+    def test_token_count_matches_encoding(self):
+        assembler = ContextAssembler(token_budget=1000, tokenizer=BYTE_TOKENIZER)
+        assembler.add("Here's an outline of the patient's pre-existing history:")
+        assembler.add_items(
+            ["`session_date` = March 1, 2024\n`chunk_summary` = café\n", "`chunk_summary` = naïve\n"],
+            prefix="Session notes:\n",
+            suffix="End of session notes\n"
+        )
+
+        context = assembler.build()
+        assert context.token_count == BYTE_TOKENIZER.count_tokens(context)
@@ -0,0 +1,53 @@
+import random
+
+from pathlib import Path
+
+from ..data_processing.benchmark_chunker import legacy_clean_up_text
+from ..vectors import data_cleaner
+
+SESSION_NOTES_DIR = Path(__file__).parent / "data" / "session_notes"
+FUZZED_TEXT_PIECES = ["word", "a", ".", " ", "  ", "\t", "\n", "-", "—", "—————", "\\u00e9", "\uf075", "\uf0b7"]
+
+class TestingHarnessDataCleaner:
+
+    def test_unwanted_patterns_are_removed(self):
+        assert data_cleaner.clean_up_text("Sleep  — improved —————") == "Sleep improved "
+        assert data_cleaner.clean_up_text("caf\\u00e9  notes") == "caf notes"
+        # Spaced dashes are removed before the whitespace in front of them gets normalized.
+        assert data_cleaner.clean_up_text("mood\t  — stable") == "mood stable"
+        assert data_cleaner.clean_up_text("mood \n  — stable") == "mood stable"
+        assert data_cleaner.clean_up_text("mood\t   — stable") == "mood stable"
+
+    def test_hyphenated_words_are_fixed(self):
+        assert data_cleaner.clean_up_text("a reduc-\ntion in anxiety") == "a reduction in anxiety"
+        assert data_cleaner.clean_up_text("the self - care plan") == "the self-care plan"
+        assert data_cleaner.clean_up_text("a long-\nterm - goal") == "a longterm-goal"
+        # Hyphens are fixed once unwanted characters are removed.
+        assert data_cleaner.clean_up_text("word \uf0b7 -word") == "word-word"
+        # Only whole words get joined, so a joined word isn't joined onto the next one too.
+        assert data_cleaner.clean_up_text("word-\nword-\nword") == "wordword-word"
+
+    def test_whitespace_is_normalized(self):
+        assert data_cleaner.clean_up_text("  first\t\tsecond \n\n third  ") == " first second third "
+        # Line breaks between words are dropped, rather than turned into spaces.
+        assert data_cleaner.clean_up_text("first line.\nSecond line.") == "first line.Second line."
+
+    def test_line_breaks_are_tracked(self):
+        content = "First paragraph.\n\nSecond line.\nThird line."
+        cleaned_content, line_breaks = data_cleaner.clean_up_text_with_line_breaks(content)
+        assert cleaned_content == data_cleaner.clean_up_text(content)
+        assert cleaned_content == "First paragraph.Second line.Third line."
+        assert line_breaks == {16: 2, 28: 1}
+
+    def test_session_notes_are_cleaned_like_the_legacy_cleanup(self):
+        session_notes_paths = sorted(SESSION_NOTES_DIR.glob("*.txt"))
+        assert len(session_notes_paths) > 0
+        for path in session_notes_paths:
+            content = path.read_text()
+            assert data_cleaner.clean_up_text(content) == legacy_clean_up_text(content), path.name
+
+    def test_fuzzed_text_is_cleaned_like_the_legacy_cleanup(self):
+        rng = random.Random(44)
+        for _ in range(20000):
+            content = "".join(rng.choices(FUZZED_TEXT_PIECES, k=rng.randint(0, 16)))
+            assert data_cleaner.clean_up_text(content) == legacy_clean_up_text(content), repr(content)
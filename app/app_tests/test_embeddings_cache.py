@@ -0,0 +1,90 @@
+import asyncio
+
+from array import array
+
+from ..dependencies.dependency_container import dependency_container
+from ..internal.utilities.embeddings_cache import EmbeddingsCache
+
+FAKE_EMBEDDINGS = [0.5, -0.25, 1.0]
+
+class FakeAsyncRedis:
+    """
+    An in-memory stand-in for the handful of async Redis commands used by the shared cache tiers.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.unavailable = False
+
+    async def get(self, key: str):
+        if self.unavailable:
+            raise ConnectionError("myFakeRedisError")
+        return self.values.get(key)
+
+    async def set(self, key: str, value: bytes, ex: int | None = None):
+        if self.unavailable:
+            raise ConnectionError("myFakeRedisError")
+        self.values[key] = value
+
+    async def delete(self, key: str):
+        if self.unavailable:
+            raise ConnectionError("myFakeRedisError")
+        self.values.pop(key, None)
+
+class TestingHarnessEmbeddingsCache:
+
+    def setup_method(self):
+        dependency_container._testing_environment = True
+        self.encryptor = dependency_container.inject_chartwise_encryptor()
+        self.fake_redis = FakeAsyncRedis()
+
+    def test_missing_text_is_a_miss(self):
+        cache = self._create_cache()
+        assert asyncio.run(cache.get("my fake text")) is None
+
+    def test_embeddings_are_served_from_memory(self):
+        cache = self._create_cache()
+        asyncio.run(cache.set("my fake text", FAKE_EMBEDDINGS))
+        self.fake_redis.unavailable = True
+        assert asyncio.run(cache.get("my fake text")) == FAKE_EMBEDDINGS
+
+    def test_embeddings_are_shared_through_redis_encrypted(self):
+        asyncio.run(self._create_cache().set("my fake text", FAKE_EMBEDDINGS))
+        assert len(self.fake_redis.values) == 1
+        payload = next(iter(self.fake_redis.values.values()))
+        assert payload != array("f", FAKE_EMBEDDINGS).tobytes()
+        assert self.encryptor.decrypt_bytes(payload) == array("f", FAKE_EMBEDDINGS).tobytes()
+
+        # A different process only has the shared tier.
+        assert asyncio.run(self._create_cache().get("my fake text")) == FAKE_EMBEDDINGS
+
+    def test_unreadable_payloads_are_evicted_misses(self):
+        cache = self._create_cache()
+        key = cache._cache_key("my fake text")
+        self.fake_redis.values[key] = b"myCorruptPayload"
+
+        assert asyncio.run(cache.get("my fake text")) is None
+        assert key not in self.fake_redis.values
+
+    def test_payloads_of_the_wrong_size_are_evicted_misses(self):
+        cache = self._create_cache()
+        key = cache._cache_key("my fake text")
+        self.fake_redis.values[key] = self.encryptor.encrypt_bytes(b"abc")
+
+        assert asyncio.run(cache.get("my fake text")) is None
+        assert key not in self.fake_redis.values
+
+    def test_unavailable_redis_is_a_miss(self):
+        self.fake_redis.unavailable = True
+        cache = self._create_cache()
+        asyncio.run(cache.set("my fake text", FAKE_EMBEDDINGS))
+        assert asyncio.run(self._create_cache().get("my fake text")) is None
+
+    # Private
+
+    def _create_cache(self) -> EmbeddingsCache:
+        return EmbeddingsCache(
+            embedding_model="my-fake-model",
+            encryptor=self.encryptor,
+            redis_client=self.fake_redis,
+        )
@@ -0,0 +1,142 @@
+import asyncio
+
+from datetime import date, datetime
+from fastapi import Request
+from typing import cast
+
+from ..dependencies.dependency_container import (
+    dependency_container,
+    FakeAsyncOpenAI,
+    FakeAwsDbClient,
+    FakePineconeClient,
+)
+from ..internal.schemas import (
+    ENCRYPTED_PATIENT_QUESTION_SUGGESTIONS_TABLE_NAME,
+    ENCRYPTED_SESSION_REPORTS_TABLE_NAME,
+)
+from ..managers.assistant_manager import AssistantManager
+from ..vectors import chartwise_assistant
+from ..vectors.chartwise_assistant import ChartWiseAssistant, InsightGenerator
+from ..vectors.message_templates import PromptScenario
+from ..vectors.tokenizer import Tokenizer
+from .test_tokenizer import BYTE_ENCODING
+
+class TestingHarnessInsightFingerprints:
+
+    def setup_method(self):
+        dependency_container._aws_db_client = None
+        dependency_container._chartwise_encryptor = None
+        dependency_container._influx_client = None
+        dependency_container._openai_client = None
+        dependency_container._pinecone_client = None
+        dependency_container._resend_client = None
+        dependency_container._testing_environment = True
+
+        self.fake_openai_client = cast(FakeAsyncOpenAI, dependency_container.inject_openai_client())
+        self.fake_aws_db_client = cast(FakeAwsDbClient, dependency_container.inject_aws_db_client())
+        self.fake_pinecone_client = cast(FakePineconeClient, dependency_container.inject_pinecone_client())
+        self.fake_pinecone_client.vector_store_context_returns_data = True
+        self.sessions = [
+            {"id": "session-2", "session_date": date(2024, 10, 10), "last_updated": datetime(2024, 10, 11, 9, 30)},
+            {"id": "session-1", "session_date": date(2024, 10, 3), "last_updated": datetime(2024, 10, 3, 18, 0)},
+        ]
+        self.stored_fingerprint: str | None = None
+        self.completion_scenarios: list[PromptScenario] = []
+        self.upserted_payloads: list[dict] = []
+
+        fake_select = self.fake_aws_db_client.select
+        async def select(table_name: str, **kwargs):
+            if table_name == ENCRYPTED_SESSION_REPORTS_TABLE_NAME:
+                return self.sessions
+            if kwargs["fields"] == ["input_fingerprint"]:
+                return [] if self.stored_fingerprint is None else [{"input_fingerprint": self.stored_fingerprint}]
+            return await fake_select(table_name=table_name, **kwargs)
+        self.fake_aws_db_client.select = select
+
+        async def upsert(table_name: str, payload: dict, **_):
+            self.upserted_payloads.append(payload)
+        self.fake_aws_db_client.upsert = upsert
+
+        fake_completion = self.fake_openai_client.trigger_async_chat_completion
+        async def trigger_async_chat_completion(prompt_scenario: PromptScenario | None = None, **kwargs):
+            self.completion_scenarios.append(prompt_scenario)
+            return await fake_completion(prompt_scenario=prompt_scenario, **kwargs)
+        self.fake_openai_client.trigger_async_chat_completion = trigger_async_chat_completion
+
+    def test_fingerprint_is_stable_for_the_same_inputs(self):
+        assert self._fingerprint() == self._fingerprint()
+        assert self._fingerprint() != self._fingerprint(generator=InsightGenerator.RECENT_TOPICS)
+
+    def test_fingerprint_changes_when_a_session_is_edited(self):
+        fingerprint = self._fingerprint()
+        self.sessions[1]["last_updated"] = datetime(2024, 10, 12, 8, 0)
+        assert self._fingerprint() != fingerprint
+
+    def test_fingerprint_changes_when_a_session_is_added(self):
+        fingerprint = self._fingerprint()
+        self.sessions.insert(0, {"id": "session-3", "session_date": date(2024, 10, 17), "last_updated": datetime(2024, 10, 17, 12, 0)})
+        assert self._fingerprint() != fingerprint
+
+    def test_fingerprint_changes_with_the_prompt_inputs(self):
+        assert self._fingerprint(language_code="en-US") != self._fingerprint(language_code="es-ES")
+
+    def test_fingerprint_changes_with_the_prompt_version(self, monkeypatch):
+        fingerprint = self._fingerprint()
+        monkeypatch.setitem(chartwise_assistant.INSIGHT_PROMPT_VERSIONS, InsightGenerator.QUESTION_SUGGESTIONS, 2)
+        assert self._fingerprint() != fingerprint
+
+    def test_fresh_outputs_are_not_regenerated(self, monkeypatch):
+        monkeypatch.setattr(Tokenizer, "_shared_instance", Tokenizer(encoding=BYTE_ENCODING))
+        assistant_manager = AssistantManager()
+
+        self._update_question_suggestions(assistant_manager)
+        assert self.completion_scenarios == [PromptScenario.QUESTION_SUGGESTIONS]
+        assert len(self.upserted_payloads) == 1
+
+        # The stored fingerprint now matches the generator's inputs.
+        self.stored_fingerprint = self.upserted_payloads[0]["input_fingerprint"]
+        self._update_question_suggestions(assistant_manager)
+        assert self.completion_scenarios == [PromptScenario.QUESTION_SUGGESTIONS]
+        assert len(self.upserted_payloads) == 1
+
+        counts = assistant_manager.chartwise_assistant.insight_generation_counts
+        assert counts[(InsightGenerator.QUESTION_SUGGESTIONS.value, "regenerated")] == 1
+        assert counts[(InsightGenerator.QUESTION_SUGGESTIONS.value, "skipped")] == 1
+
+    def test_stale_outputs_are_regenerated(self, monkeypatch):
+        monkeypatch.setattr(Tokenizer, "_shared_instance", Tokenizer(encoding=BYTE_ENCODING))
+        self.stored_fingerprint = "myStaleFingerprint"
+        self._update_question_suggestions(AssistantManager())
+
+        assert self.completion_scenarios == [PromptScenario.QUESTION_SUGGESTIONS]
+        assert self.upserted_payloads[0]["input_fingerprint"] != "myStaleFingerprint"
+
+    # Private
+
+    def _fingerprint(
+        self,
+        generator: InsightGenerator = InsightGenerator.QUESTION_SUGGESTIONS,
+        language_code: str = "en-US"
+    ) -> str:
+        return asyncio.run(
+            ChartWiseAssistant().compute_insight_input_fingerprint(
+                generator=generator,
+                therapist_id=FakeAwsDbClient.FAKE_THERAPIST_ID,
+                patient_id=FakeAwsDbClient.FAKE_PATIENT_ID,
+                request=cast(Request, None),
+                language_code=language_code,
+                patient_name="foo bar",
+            )
+        )
+
+    def _update_question_suggestions(self, assistant_manager: AssistantManager):
+        asyncio.run(
+            assistant_manager.update_question_suggestions(
+                language_code="en-US",
+                therapist_id=FakeAwsDbClient.FAKE_THERAPIST_ID,
+                patient_id=FakeAwsDbClient.FAKE_PATIENT_ID,
+                environment="testing",
+                session_id=None,
+                request=cast(Request, None),
+            )
+        )
@@ -0,0 +1,164 @@
+import asyncio
+
+from fastapi import Request
+from typing import cast
+
+from ..dependencies.dependency_container import (
+    dependency_container,
+    FakeAsyncOpenAI,
+    FakeAwsDbClient,
+    FakePineconeClient,
+)
+from ..internal.schemas import (
+    ENCRYPTED_PATIENT_BRIEFINGS_TABLE_NAME,
+    ENCRYPTED_PATIENT_QUESTION_SUGGESTIONS_TABLE_NAME,
+    ENCRYPTED_PATIENT_TOPICS_TABLE_NAME,
+    CombinedInsightsSchema,
+    CombinedRecentTopicSchema,
+)
+from ..managers.assistant_manager import AssistantManager
+from ..vectors.chartwise_assistant import (
+    COMBINED_INSIGHT_SECTIONS,
+    ChartWiseAssistant,
+    InsightGenerationMode,
+)
+from ..vectors.message_templates import PromptCrafter, PromptScenario
+from ..vectors.tokenizer import Tokenizer
+from .test_tokenizer import BYTE_ENCODING
+
+class TestingHarnessInsightGeneration:
+
+    def setup_method(self):
+        dependency_container._aws_db_client = None
+        dependency_container._chartwise_encryptor = None
+        dependency_container._influx_client = None
+        dependency_container._openai_client = None
+        dependency_container._pinecone_client = None
+        dependency_container._resend_client = None
+        dependency_container._testing_environment = True
+
+        self.fake_openai_client = cast(FakeAsyncOpenAI, dependency_container.inject_openai_client())
+        self.fake_aws_db_client = cast(FakeAwsDbClient, dependency_container.inject_aws_db_client())
+        self.fake_pinecone_client = cast(FakePineconeClient, dependency_container.inject_pinecone_client())
+        self.fake_pinecone_client.vector_store_context_returns_data = True
+        self.completion_scenarios: list[PromptScenario] = []
+        self.combined_output: CombinedInsightsSchema | Exception | None = None
+        self.upserted_tables: list[str] = []
+
+        fake_completion = self.fake_openai_client.trigger_async_chat_completion
+        async def trigger_async_chat_completion(prompt_scenario: PromptScenario | None = None, **kwargs):
+            self.completion_scenarios.append(prompt_scenario)
+            if prompt_scenario == PromptScenario.COMBINED_INSIGHTS and self.combined_output is not None:
+                if isinstance(self.combined_output, Exception):
+                    raise self.combined_output
+                return self.combined_output
+            return await fake_completion(prompt_scenario=prompt_scenario, **kwargs)
+        self.fake_openai_client.trigger_async_chat_completion = trigger_async_chat_completion
+
+        async def upsert(table_name: str, **_):
+            self.upserted_tables.append(table_name)
+        self.fake_aws_db_client.upsert = upsert
+
+    def test_valid_sections_take_a_single_call(self, monkeypatch):
+        monkeypatch.setattr(Tokenizer, "_shared_instance", Tokenizer(encoding=BYTE_ENCODING))
+        assistant = ChartWiseAssistant()
+        insights = self._generate(assistant)
+
+        assert self.completion_scenarios == [PromptScenario.COMBINED_INSIGHTS]
+        assert insights.recent_topics.topics[0].topic == "fakeTopic"
+        assert insights.recent_topics_insights == "my fake topics insights"
+        assert insights.presession_briefing == "my fake briefing"
+        assert insights.question_suggestions.questions == ["my fake question"]
+        assert len(assistant.combined_insight_retry_counts) == 0
+
+    def test_only_invalid_sections_are_retried(self, monkeypatch):
+        monkeypatch.setattr(Tokenizer, "_shared_instance", Tokenizer(encoding=BYTE_ENCODING))
+        self.combined_output = CombinedInsightsSchema(
+            recent_topics=[CombinedRecentTopicSchema(topic="A topic label that runs way too long", percentage="100%")],
+            recent_topics_insights="Insights on the invalid topics",
+            presession_briefing="The combined briefing",
+            question_suggestions=None,
+        )
+        assistant = ChartWiseAssistant()
+        insights = self._generate(assistant)
+
+        assert self.completion_scenarios == [
+            PromptScenario.COMBINED_INSIGHTS,
+            PromptScenario.TOPICS,
+            PromptScenario.TOPICS_INSIGHTS,
+            PromptScenario.QUESTION_SUGGESTIONS,
+        ]
+        assert insights.recent_topics.topics[0].topic == "fakeTopic"
+        assert insights.recent_topics_insights == "my fake summary"
+        assert insights.presession_briefing == "The combined briefing"
+        assert set(assistant.combined_insight_retry_counts) == {
+            "recent_topics",
+            "recent_topics_insights",
+            "question_suggestions",
+        }
+
+    def test_failed_call_falls_back_to_standalone_generators(self, monkeypatch):
+        monkeypatch.setattr(Tokenizer, "_shared_instance", Tokenizer(encoding=BYTE_ENCODING))
+        self.combined_output = Exception("Fake exception")
+        insights = self._generate(ChartWiseAssistant())
+
+        assert self.completion_scenarios[1:] == [
+            PromptScenario.TOPICS,
+            PromptScenario.TOPICS_INSIGHTS,
+            PromptScenario.PRESESSION_BRIEFING,
+            PromptScenario.QUESTION_SUGGESTIONS,
+        ]
+        assert insights.presession_briefing == "my fake summary"
+        assert insights.question_suggestions.questions == ["my fake question"]
+
+    def test_combined_prompt_only_includes_requested_sections(self):
+        system_prompt = PromptCrafter().get_system_message_for_scenario(
+            scenario=PromptScenario.COMBINED_INSIGHTS,
+            sections=["question_suggestions"],
+            language_code="es-ES",
+        )
+        assert "### Instructions for `question_suggestions`" in system_prompt
+        assert "### Instructions for `recent_topics`" not in system_prompt
+        assert "### Instructions for `presession_briefing`" not in system_prompt
+
+    def test_manager_stores_stale_insights_from_one_call(self, monkeypatch):
+        monkeypatch.setenv("INSIGHT_GENERATION_MODE", InsightGenerationMode.COMBINED.value)
+        monkeypatch.setattr(Tokenizer, "_shared_instance", Tokenizer(encoding=BYTE_ENCODING))
+        assistant_manager = AssistantManager()
+        assert assistant_manager.chartwise_assistant.insight_generation_mode == InsightGenerationMode.COMBINED
+
+        asyncio.run(
+            assistant_manager.update_patient_insights_in_one_call(
+                language_code="en-US",
+                therapist_id=FakeAwsDbClient.FAKE_THERAPIST_ID,
+                patient_id=FakeAwsDbClient.FAKE_PATIENT_ID,
+                environment="testing",
+                session_id=None,
+                request=cast(Request, None),
+            )
+        )
+        assert self.completion_scenarios == [PromptScenario.COMBINED_INSIGHTS]
+        assert sorted(self.upserted_tables) == sorted([
+            ENCRYPTED_PATIENT_BRIEFINGS_TABLE_NAME,
+            ENCRYPTED_PATIENT_QUESTION_SUGGESTIONS_TABLE_NAME,
+            ENCRYPTED_PATIENT_TOPICS_TABLE_NAME,
+        ])
+
+    # Private
+
+    def _generate(self, assistant: ChartWiseAssistant):
+        return asyncio.run(
+            assistant.generate_combined_insights(
+                generators=set(COMBINED_INSIGHT_SECTIONS),
+                user_id=FakeAwsDbClient.FAKE_THERAPIST_ID,
+                patient_id=FakeAwsDbClient.FAKE_PATIENT_ID,
+                language_code="en-US",
+                patient_first_name="foo",
+                patient_full_name="foo bar",
+                patient_gender="female",
+                therapist_name="baz",
+                therapist_gender="male",
+                session_count=12,
+                request=cast(Request, None),
+            )
+        )
@@ -0,0 +1,136 @@
+import asyncio
+
+from datetime import date
+from fastapi import Request
+from typing import cast
+
+from ..dependencies.dependency_container import dependency_container
+from ..dependencies.fake.fake_aws_db_client import FakeAwsDbClient
+from ..internal.db.job_outbox import JobOutbox, OutboxJob, OutboxJobType
+from ..internal.utilities.job_scheduler import JobPool
+from ..managers.assistant_manager import AssistantManager
+from .test_job_scheduler import SmallPoolJobScheduler
+
+class RecordingAssistantManager(AssistantManager):
+
+    def __init__(self):
+        super().__init__()
+        self.handled_jobs: list[tuple[str, OutboxJobType]] = []
+
+    async def _handle_outbox_job(
+        self,
+        job: OutboxJob,
+        environment: str,
+        request: Request,
+    ) -> list[OutboxJob]:
+        self.handled_jobs.append((job.patient_id, job.job_type))
+        if job.job_type == OutboxJobType.DELETE_SESSION_VECTORS:
+            raise Exception("Pinecone is unavailable")
+        if job.job_type == OutboxJobType.UPDATE_PREEXISTING_HISTORY_VECTORS:
+            await asyncio.sleep(5)
+        if job.job_type == OutboxJobType.INSERT_SESSION_VECTORS:
+            return [
+                OutboxJob(
+                    job_type=OutboxJobType.GENERATE_METRICS_AND_INSIGHTS,
+                    therapist_id=job.therapist_id,
+                    patient_id=job.patient_id,
+                    payload={"language_code": "en-US"},
+                )
+            ]
+        return []
+
+class TestingHarnessJobOutbox:
+
+    def setup_method(self):
+        dependency_container._aws_db_client = None
+        dependency_container._resend_client = None
+        dependency_container._testing_environment = True
+        self.fake_aws_db_client = cast(FakeAwsDbClient, dependency_container.inject_aws_db_client())
+
+    def test_jobs_are_bound_to_the_written_row(self):
+        job = OutboxJob(
+            job_type=OutboxJobType.INSERT_SESSION_VECTORS,
+            therapist_id="therapist",
+            payload={"session_date": date(2024, 10, 10)},
+            written_row_fields={"session_notes_id": "id"},
+        ).bound_to({"id": "report", "patient_id": "patient"})
+        assert job.payload == {"session_date": date(2024, 10, 10), "session_notes_id": "report"}
+        assert (job.therapist_id, job.patient_id) == ("therapist", "patient")
+
+        patient_job = OutboxJob(
+            job_type=OutboxJobType.INSERT_PREEXISTING_HISTORY_VECTORS,
+            therapist_id="therapist",
+            payload={},
+            written_row_fields={"patient_id": "id"},
+        ).bound_to({"id": "patient"})
+        assert patient_job.payload == {}
+        assert patient_job.patient_id == "patient"
+
+    def test_backoff_is_exponential_and_capped(self):
+        assert [JobOutbox.backoff_seconds(attempts) for attempts in range(1, 5)] == [30, 60, 120, 240]
+        assert JobOutbox.backoff_seconds(20) == JobOutbox.MAX_BACKOFF_SECONDS
+
+    def test_jobs_run_in_order_per_patient(self):
+        self.fake_aws_db_client._enqueue_outbox_jobs(
+            [
+                OutboxJob(job_type=OutboxJobType.INSERT_SESSION_VECTORS, therapist_id="t", patient_id="a", payload={}),
+                OutboxJob(job_type=OutboxJobType.DELETE_SESSION_VECTORS, therapist_id="t", patient_id="b", payload={}),
+                OutboxJob(job_type=OutboxJobType.UPDATE_SESSION_VECTORS, therapist_id="t", patient_id="a", payload={}),
+            ],
+            written_row=None
+        )
+
+        assistant_manager = RecordingAssistantManager()
+        asyncio.run(assistant_manager.process_outbox_jobs(request=cast(Request, None)))
+
+        patient_a_jobs = [job_type for patient_id, job_type in assistant_manager.handled_jobs if patient_id == "a"]
+        assert patient_a_jobs == [
+            OutboxJobType.INSERT_SESSION_VECTORS,
+            OutboxJobType.UPDATE_SESSION_VECTORS,
+            OutboxJobType.GENERATE_METRICS_AND_INSIGHTS,
+        ]
+
+        # The failed job doesn't hold back the other patient's jobs, nor is it completed.
+        assert len(self.fake_aws_db_client.pending_outbox_jobs) == 0
+        completed_job_types = [job.job_type for job in self.fake_aws_db_client.completed_outbox_jobs]
+        assert OutboxJobType.DELETE_SESSION_VECTORS not in completed_job_types
+        assert len(completed_job_types) == 3
+
+    def test_drained_jobs_are_requeued_without_using_an_attempt(self):
+        self._enqueue_slow_job()
+
+        async def run():
+            scheduler = SmallPoolJobScheduler()
+            scheduler.submit(JobPool.INGESTION, RecordingAssistantManager().process_outbox_jobs, request=cast(Request, None))
+            await asyncio.sleep(0.01)
+            await scheduler.drain(timeout_seconds=0.05)
+
+        asyncio.run(run())
+        assert len(self.fake_aws_db_client.failed_outbox_jobs) == 0
+        assert [job.attempts for job in self.fake_aws_db_client.pending_outbox_jobs] == [0]
+
+    def test_jobs_past_their_deadline_use_an_attempt(self):
+        self._enqueue_slow_job()
+
+        async def run():
+            scheduler = SmallPoolJobScheduler()
+            await scheduler.submit(
+                JobPool.INGESTION,
+                RecordingAssistantManager().process_outbox_jobs,
+                deadline_seconds=0.05,
+                request=cast(Request, None)
+            )
+
+        asyncio.run(run())
+        assert [job.attempts for job in self.fake_aws_db_client.failed_outbox_jobs] == [1]
+        assert len(self.fake_aws_db_client.pending_outbox_jobs) == 0
+
+    # Private
+
+    def _enqueue_slow_job(self):
+        self.fake_aws_db_client._enqueue_outbox_jobs(
+            [
+                OutboxJob(job_type=OutboxJobType.UPDATE_PREEXISTING_HISTORY_VECTORS, therapist_id="t", patient_id="a", payload={}),
+            ],
+            written_row=None
+        )
@@ -0,0 +1,90 @@
+import asyncio
+
+from ..dependencies.dependency_container import dependency_container
+from ..internal.utilities.job_scheduler import (
+    JobAbandonedError,
+    JobPool,
+    JobPoolLimits,
+    JobScheduler
+)
+
+class SmallPoolJobScheduler(JobScheduler):
+    POOL_LIMITS = {
+        **JobScheduler.POOL_LIMITS,
+        JobPool.INGESTION: JobPoolLimits(concurrency=2, deadline_seconds=1),
+    }
+
+class TestingHarnessJobScheduler:
+
+    def setup_method(self):
+        dependency_container._influx_client = None
+        dependency_container._testing_environment = True
+        self.running_jobs = 0
+        self.max_running_jobs = 0
+        self.errors: list[Exception] = []
+
+    def test_pools_bound_concurrency(self):
+        async def run():
+            scheduler = SmallPoolJobScheduler()
+            tasks = [scheduler.submit(JobPool.INGESTION, self._job, seconds=0.02) for _ in range(5)]
+            await asyncio.sleep(0)
+            assert scheduler.metrics()[JobPool.INGESTION].running == 2
+            assert scheduler.metrics()[JobPool.INGESTION].queued == 3
+
+            await asyncio.gather(*tasks)
+            return scheduler.metrics()[JobPool.INGESTION]
+
+        metrics = asyncio.run(run())
+        assert self.max_running_jobs == 2
+        assert (metrics.completed, metrics.running, metrics.queued) == (5, 0, 0)
+
+    def test_jobs_are_cancelled_past_their_deadline(self):
+        async def run():
+            scheduler = SmallPoolJobScheduler()
+            running_task = scheduler.submit(JobPool.INGESTION, self._job, on_error=self.errors.append, seconds=5, deadline_seconds=0.15)
+            other_running_task = scheduler.submit(JobPool.INGESTION, self._job, seconds=0.2)
+            queued_task = scheduler.submit(JobPool.INGESTION, self._job, on_error=self.errors.append, seconds=0, deadline_seconds=0.1)
+            await asyncio.gather(running_task, other_running_task, queued_task)
+            return scheduler.metrics()[JobPool.INGESTION]
+
+        metrics = asyncio.run(run())
+        assert (metrics.completed, metrics.timed_out, metrics.abandoned) == (1, 1, 1)
+        # The queued job's deadline passes first, while both slots are taken.
+        assert isinstance(self.errors[0], JobAbandonedError)
+        assert isinstance(self.errors[1], TimeoutError)
+
+    def test_drain_finishes_or_cancels_running_jobs(self):
+        async def run():
+            scheduler = SmallPoolJobScheduler()
+            scheduler.submit(JobPool.INGESTION, self._job, seconds=0.01)
+            scheduler.submit(JobPool.INGESTION, self._job, on_error=self.errors.append, seconds=5, deadline_seconds=10)
+            scheduler.submit(JobPool.INGESTION, self._job, on_error=self.errors.append, seconds=0)
+            await asyncio.sleep(0)
+            await scheduler.drain(timeout_seconds=0.1)
+            return scheduler.metrics()[JobPool.INGESTION]
+
+        metrics = asyncio.run(run())
+        assert (metrics.completed, metrics.abandoned, metrics.running) == (1, 2, 0)
+        assert len(self.errors) == 2 and all(isinstance(error, JobAbandonedError) for error in self.errors)
+
+    def test_run_outlives_its_caller(self):
+        async def run():
+            scheduler = SmallPoolJobScheduler()
+            waiting_caller = asyncio.create_task(scheduler.run(JobPool.INGESTION, self._job, seconds=0.05))
+            await asyncio.sleep(0.01)
+            waiting_caller.cancel()
+            await scheduler.drain(timeout_seconds=1)
+            return scheduler.metrics()[JobPool.INGESTION]
+
+        metrics = asyncio.run(run())
+        assert metrics.completed == 1
+
+    # Private
+
+    async def _job(self, seconds: float):
+        self.running_jobs += 1
+        self.max_running_jobs = max(self.max_running_jobs, self.running_jobs)
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            self.running_jobs -= 1
@@ -0,0 +1,138 @@
+import pytest, threading
+
+pytest.importorskip("faiss")
+
+from ..vectors.local_vector_mirror import LocalVectorMirror
+
+FAKE_NAMESPACE = "myFakeTherapist-myFakePatient"
+
+def fake_vector(vector_id: str, values: list[float], session_date_epoch_days: int) -> dict:
+    return {
+        "id": vector_id,
+        "values": values,
+        "metadata": {
+            "session_date_epoch_days": session_date_epoch_days,
+            "chunk_summary": f"summary for {vector_id}",
+        },
+    }
+
+FAKE_VECTORS = [
+    fake_vector("vector_a", [1.0, 0.0, 0.0], 100),
+    fake_vector("vector_b", [0.0, 1.0, 0.0], 200),
+    fake_vector("vector_c", [0.7, 0.7, 0.0], 300),
+]
+
+class TestingHarnessLocalVectorMirror:
+
+    def setup_method(self):
+        self.mirror = LocalVectorMirror()
+        self.mirror.load(FAKE_NAMESPACE, FAKE_VECTORS)
+
+    def test_query_returns_closest_vectors(self):
+        matches = self.mirror.query(
+            namespace=FAKE_NAMESPACE,
+            embeddings=[0.9, 0.1, 0.0],
+            top_k=2
+        )
+        assert [match["id"] for match in matches] == ["vector_a", "vector_c"]
+        assert matches[0]["metadata"]["chunk_summary"] == "summary for vector_a"
+
+    def test_query_with_metadata_filter(self):
+        matches = self.mirror.query(
+            namespace=FAKE_NAMESPACE,
+            embeddings=[0.9, 0.1, 0.0],
+            top_k=2,
+            metadata_filter={"session_date_epoch_days": {"$gte": 200, "$lte": 300}}
+        )
+        assert [match["id"] for match in matches] == ["vector_c", "vector_b"]
+
+        matches = self.mirror.query(
+            namespace=FAKE_NAMESPACE,
+            embeddings=[0.9, 0.1, 0.0],
+            top_k=2,
+            metadata_filter={"session_date_epoch_days": {"$eq": 200}}
+        )
+        assert [match["id"] for match in matches] == ["vector_b"]
+
+    def test_query_cannot_be_served_locally(self):
+        # Unknown namespace
+        assert self.mirror.query(namespace="otherNamespace", embeddings=[1.0, 0.0, 0.0], top_k=1) is None
+
+        # Unsupported filter operator
+        assert self.mirror.query(
+            namespace=FAKE_NAMESPACE,
+            embeddings=[1.0, 0.0, 0.0],
+            top_k=1,
+            metadata_filter={"session_date_epoch_days": {"$exists": True}}
+        ) is None
+
+    def test_writes_are_mirrored(self):
+        self.mirror.upsert(FAKE_NAMESPACE, [fake_vector("vector_d", [0.0, 0.0, 1.0], 400)])
+        self.mirror.remove(FAKE_NAMESPACE, ["vector_a"])
+        assert len(self.mirror) == 3
+
+        matches = self.mirror.query(namespace=FAKE_NAMESPACE, embeddings=[0.1, 0.0, 0.9], top_k=1)
+        assert [match["id"] for match in matches] == ["vector_d"]
+
+        matches = self.mirror.query(namespace=FAKE_NAMESPACE, embeddings=[1.0, 0.0, 0.0], top_k=3)
+        assert "vector_a" not in [match["id"] for match in matches]
+
+        # Writes to namespaces that aren't mirrored are ignored.
+        self.mirror.upsert("otherNamespace", [fake_vector("vector_e", [1.0, 0.0, 0.0], 500)])
+        assert not self.mirror.contains("otherNamespace")
+
+        self.mirror.drop(FAKE_NAMESPACE)
+        assert not self.mirror.contains(FAKE_NAMESPACE)
+        assert len(self.mirror) == 0
+
+    def test_least_recently_used_namespaces_get_evicted(self):
+        mirror = LocalVectorMirror(max_vectors=4)
+        mirror.load("namespace_1", FAKE_VECTORS[:2])
+        mirror.load("namespace_2", FAKE_VECTORS[:2])
+        mirror.query(namespace="namespace_1", embeddings=[1.0, 0.0, 0.0], top_k=1)
+        mirror.load("namespace_3", FAKE_VECTORS[:2])
+
+        assert mirror.contains("namespace_1")
+        assert not mirror.contains("namespace_2")
+        assert mirror.contains("namespace_3")
+        assert len(mirror) == 4
+
+    def test_stale_namespaces_are_only_served_in_degraded_mode(self):
+        mirror = LocalVectorMirror(ttl_seconds=0)
+        mirror.load(FAKE_NAMESPACE, FAKE_VECTORS)
+
+        assert mirror.query(namespace=FAKE_NAMESPACE, embeddings=[1.0, 0.0, 0.0], top_k=1) is None
+        matches = mirror.query(namespace=FAKE_NAMESPACE, embeddings=[1.0, 0.0, 0.0], top_k=1, allow_stale=True)
+        assert [match["id"] for match in matches] == ["vector_a"]
+
+    def test_scheduled_load(self):
+        mirror = LocalVectorMirror()
+        future = mirror.schedule_load(FAKE_NAMESPACE, lambda: FAKE_VECTORS)
+        assert future is not None
+        future.result()
+
+        matches = mirror.query(namespace=FAKE_NAMESPACE, embeddings=[0.0, 1.0, 0.0], top_k=1)
+        assert [match["id"] for match in matches] == ["vector_b"]
+
+    def test_scheduled_load_is_discarded_after_concurrent_writes(self):
+        mirror = LocalVectorMirror()
+        loader_started = threading.Event()
+        release_loader = threading.Event()
+
+        def blocking_loader():
+            loader_started.set()
+            release_loader.wait(timeout=5)
+            return FAKE_VECTORS
+
+        future = mirror.schedule_load(FAKE_NAMESPACE, blocking_loader)
+        assert future is not None
+        loader_started.wait(timeout=5)
+
+        # Only one load per namespace at a time.
+        assert mirror.schedule_load(FAKE_NAMESPACE, blocking_loader) is None
+
+        # The loaded snapshot may not include this write, so it can't be trusted.
+        mirror.remove(FAKE_NAMESPACE, ["vector_a"])
+        release_loader.set()
+        future.result()
+        assert not mirror.contains(FAKE_NAMESPACE)
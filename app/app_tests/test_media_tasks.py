@@ -0,0 +1,122 @@
+import asyncio, json, pytest
+
+from datetime import date
+from fastapi import BackgroundTasks, Request
+from typing import cast
+
+from ..data_processing import celery
+from ..dependencies.api.templates import SessionNotesTemplate
+from ..dependencies.dependency_container import dependency_container
+from ..dependencies.fake.fake_deepgram_client import FakeDeepgramClient
+from ..internal.schemas import SessionProcessingStatus
+from ..internal.utilities.job_scheduler import JobPool
+from ..managers.assistant_manager import AssistantManager
+from ..managers.audio_processing_manager import AudioProcessingManager
+from ..managers.auth_manager import AuthManager
+
+class RecordingAudioProcessingManager(AudioProcessingManager):
+
+    def __init__(self):
+        self.processing_statuses: list[str] = []
+
+    async def _update_session_processing_status(self, session_processing_status: str, **_):
+        self.processing_statuses.append(session_processing_status)
+
+class TestingHarnessMediaTasks:
+
+    def setup_method(self):
+        dependency_container._aws_db_client = None
+        dependency_container._deepgram_client = None
+        dependency_container._testing_environment = True
+        self.fake_deepgram_client = cast(FakeDeepgramClient, dependency_container.inject_deepgram_client())
+        self.enqueued_tasks: list[tuple[celery.MediaTask, dict]] = []
+
+    def test_tasks_are_routed_to_their_media_queue(self):
+        routes = celery.celery_app.conf.task_routes
+        assert routes[celery.MediaTask.TRANSCRIBE_AUDIO.value] == {"queue": celery.MediaQueue.AUDIO.value}
+        assert routes[celery.MediaTask.DIARIZE_AUDIO.value] == {"queue": celery.MediaQueue.AUDIO.value}
+        assert routes[celery.MediaTask.PROCESS_TEXTRACTION.value] == {"queue": celery.MediaQueue.IMAGE.value}
+        assert set(celery.QUEUE_CONCURRENCY) == set(celery.MediaQueue)
+
+    def test_api_only_enqueues_when_a_broker_is_configured(self, monkeypatch):
+        self._use_broker(monkeypatch)
+        background_tasks = BackgroundTasks()
+        session_report_id = self._transcribe(
+            manager=AudioProcessingManager(),
+            background_tasks=background_tasks,
+            diarize=True
+        )
+
+        assert len(background_tasks.tasks) == 0
+        assert not self.fake_deepgram_client.diarize_audio_invoked
+        assert len(self.enqueued_tasks) == 1
+        task, task_arguments = self.enqueued_tasks[0]
+        assert task == celery.MediaTask.DIARIZE_AUDIO
+        assert task_arguments["session_report_id"] == session_report_id
+        assert task_arguments["template"] == SessionNotesTemplate.SOAP.value
+        assert json.loads(json.dumps(task_arguments)) == task_arguments
+
+    def test_eager_mode_runs_the_job_in_process(self, monkeypatch):
+        monkeypatch.setattr(celery, "is_eager", lambda: True)
+        manager = AudioProcessingManager()
+        background_tasks = BackgroundTasks()
+        self._transcribe(
+            manager=manager,
+            background_tasks=background_tasks,
+            diarize=False
+        )
+
+        assert len(self.enqueued_tasks) == 0
+        assert len(background_tasks.tasks) == 1
+        assert background_tasks.tasks[0].args == (JobPool.MEDIA, manager.transcribe_audio_and_save)
+        assert background_tasks.tasks[0].kwargs["storage_filepath"] == "therapist/recording.wav"
+
+    def test_failing_to_enqueue_marks_the_session_as_failed(self, monkeypatch):
+        self._use_broker(monkeypatch)
+
+        def unavailable_broker(**_):
+            raise ConnectionError("Broker is unavailable")
+
+        monkeypatch.setattr(celery, "enqueue_media_task", unavailable_broker)
+        manager = RecordingAudioProcessingManager()
+        with pytest.raises(RuntimeError):
+            self._transcribe(
+                manager=manager,
+                background_tasks=BackgroundTasks(),
+                diarize=False
+            )
+        assert manager.processing_statuses == [SessionProcessingStatus.FAILED.value]
+
+    # Private
+
+    def _use_broker(self, monkeypatch):
+        def enqueue_media_task(task: celery.MediaTask, task_arguments: dict) -> str:
+            self.enqueued_tasks.append((task, task_arguments))
+            return "task-id"
+
+        monkeypatch.setattr(celery, "is_eager", lambda: False)
+        monkeypatch.setattr(celery, "enqueue_media_task", enqueue_media_task)
+
+    def _transcribe(
+        self,
+        manager: AudioProcessingManager,
+        background_tasks: BackgroundTasks,
+        diarize: bool
+    ) -> str:
+        return asyncio.run(
+            manager.transcribe_audio_file(
+                background_tasks=background_tasks,
+                file_path="therapist/recording.wav",
+                auth_manager=AuthManager(),
+                assistant_manager=AssistantManager(),
+                template=SessionNotesTemplate.SOAP,
+                therapist_id="therapist",
+                session_id=None,
+                language_code="en-US",
+                patient_id="patient",
+                session_date=date(2024, 10, 10),
+                environment="testing",
+                diarize=diarize,
+                request=cast(Request, None),
+            )
+        )
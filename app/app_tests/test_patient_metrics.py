@@ -0,0 +1,139 @@
+import asyncio
+
+from datetime import date
+
+from ..internal.db.patient_metrics import PatientMetricsDelta
+
+FAKE_PATIENT_ID = "myFakePatientId"
+
+class FakeMetricsConnection:
+    """
+    Holds a single patient's metrics, and answers the recompute queries with preset values.
+    """
+
+    def __init__(
+        self,
+        total_sessions: int,
+        last_session_date: date | None,
+        unique_active_years: list[str],
+        recomputed_last_session_date: date | None = None,
+        year_still_active: bool = True,
+    ):
+        self.patient = {
+            "total_sessions": total_sessions,
+            "last_session_date": last_session_date,
+            "unique_active_years": unique_active_years,
+        }
+        self.recomputed_last_session_date = recomputed_last_session_date
+        self.year_still_active = year_still_active
+        self.patient_updates = 0
+
+    async def fetchrow(self, query: str, *args):
+        return dict(self.patient)
+
+    async def fetchval(self, query: str, *args):
+        if "max(" in query:
+            return self.recomputed_last_session_date
+        return self.year_still_active
+
+    async def execute(self, query: str, *args):
+        self.patient_updates += 1
+        self.patient = {
+            "total_sessions": args[0],
+            "last_session_date": args[1],
+            "unique_active_years": args[2],
+        }
+
+class TestingHarnessPatientMetrics:
+
+    def test_inserted_session_is_counted(self):
+        conn = FakeMetricsConnection(total_sessions=1, last_session_date=date(2023, 5, 1), unique_active_years=["2023"])
+        self._apply(
+            conn=conn,
+            delta=PatientMetricsDelta.for_inserted_session(date(2024, 10, 10)),
+            session_report=self._session_report(date(2024, 10, 10), is_soft_deleted=False)
+        )
+        assert conn.patient == {
+            "total_sessions": 2,
+            "last_session_date": date(2024, 10, 10),
+            "unique_active_years": ["2023", "2024"],
+        }
+
+    def test_deleted_session_is_only_counted_once(self):
+        conn = FakeMetricsConnection(
+            total_sessions=3,
+            last_session_date=date(2024, 10, 10),
+            unique_active_years=["2023", "2024"],
+            recomputed_last_session_date=date(2024, 3, 2),
+        )
+        deleted_session_report = self._session_report(date(2024, 10, 10), is_soft_deleted=True)
+        self._apply(
+            conn=conn,
+            delta=PatientMetricsDelta.for_deleted_session(),
+            session_report=deleted_session_report,
+            previous_session_report=self._session_report(date(2024, 10, 10), is_soft_deleted=False)
+        )
+        expected_patient = {
+            "total_sessions": 2,
+            "last_session_date": date(2024, 3, 2),
+            "unique_active_years": ["2023", "2024"],
+        }
+        assert conn.patient == expected_patient
+
+        # Deleting the session again doesn't change its state, so the metrics stay untouched.
+        self._apply(
+            conn=conn,
+            delta=PatientMetricsDelta.for_deleted_session(),
+            session_report=deleted_session_report,
+            previous_session_report=deleted_session_report
+        )
+        assert conn.patient == expected_patient
+        assert conn.patient_updates == 1
+
+    def test_deleting_the_last_session_of_a_year_removes_the_year(self):
+        conn = FakeMetricsConnection(
+            total_sessions=2,
+            last_session_date=date(2024, 10, 10),
+            unique_active_years=["2023", "2024"],
+            year_still_active=False,
+        )
+        self._apply(
+            conn=conn,
+            delta=PatientMetricsDelta.for_deleted_session(),
+            session_report=self._session_report(date(2023, 5, 1), is_soft_deleted=True),
+            previous_session_report=self._session_report(date(2023, 5, 1), is_soft_deleted=False)
+        )
+        assert conn.patient == {
+            "total_sessions": 1,
+            "last_session_date": date(2024, 10, 10),
+            "unique_active_years": ["2024"],
+        }
+
+    # Private
+
+    def _session_report(
+        self,
+        session_date: date,
+        is_soft_deleted: bool
+    ) -> dict:
+        return {
+            "id": "myFakeSessionReportId",
+            "patient_id": FAKE_PATIENT_ID,
+            "session_date": session_date,
+            "is_soft_deleted": is_soft_deleted,
+        }
+
+    def _apply(
+        self,
+        conn: FakeMetricsConnection,
+        delta: PatientMetricsDelta,
+        session_report: dict,
+        previous_session_report: dict | None = None
+    ):
+        asyncio.run(
+            delta.apply(
+                conn=conn,
+                session_report=session_report,
+                previous_session_report=previous_session_report
+            )
+        )
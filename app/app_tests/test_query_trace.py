@@ -0,0 +1,121 @@
+import asyncio
+
+from ..dependencies.dependency_container import dependency_container
+from ..dependencies.implementation import aws_db_client
+from ..dependencies.implementation.aws_db_client import AwsDbClient
+from ..internal.db.query_trace import DbQueryTrace
+from ..internal.db.read_routing import DbReadRouting
+from .test_read_routing import FakeDbPool, fake_request
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def perf_counter(self) -> float:
+        return self.now
+
+class FakeInfluxClient:
+
+    def __init__(self):
+        self.query_traces: list[dict] = []
+
+    def log_db_query(self, **kwargs):
+        self.query_traces.append(kwargs)
+
+class TestingHarnessQueryTrace:
+
+    def setup_method(self):
+        dependency_container._testing_environment = True
+        self.clock = FakeClock()
+        self.query_seconds = 0.0
+        self.primary_pool = FakeDbPool("primary")
+        self.fake_influx_client = FakeInfluxClient()
+
+        fake_fetch = self.primary_pool.conn.fetch
+        async def fetch(query: str, *args):
+            self.clock.now += self.query_seconds
+            rows = await fake_fetch(query, *args)
+            return [("Seq Scan on myFakeTable",)] if query.startswith("EXPLAIN") else rows
+        self.primary_pool.conn.fetch = fetch
+
+    def test_queries_are_traced(self, monkeypatch):
+        self._use_fakes(monkeypatch, sample=0.0)
+        self.query_seconds = 0.25
+        self._select()
+
+        trace = self.fake_influx_client.query_traces[0]
+        assert (trace["operation"], trace["table_name"], trace["pool_role"]) == ("select", "myFakeTable", "primary")
+        assert trace["query_time"] == 0.25
+        assert trace["pool_max_size"] == 10
+
+    def test_sampled_slow_selects_are_explained(self, monkeypatch):
+        self._use_fakes(monkeypatch, sample=AwsDbClient.SLOW_QUERY_EXPLAIN_SAMPLE_RATE / 2)
+        self.query_seconds = AwsDbClient.SLOW_QUERY_THRESHOLD_SECONDS + 0.1
+        self._select()
+
+        assert len(self.explained_queries) == 1
+        assert self.explained_queries[0].startswith('EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM "myFakeTable"')
+
+    def test_unsampled_slow_selects_are_not_explained(self, monkeypatch):
+        self._use_fakes(monkeypatch, sample=AwsDbClient.SLOW_QUERY_EXPLAIN_SAMPLE_RATE)
+        self.query_seconds = AwsDbClient.SLOW_QUERY_THRESHOLD_SECONDS + 0.1
+        self._select()
+        assert len(self.explained_queries) == 0
+
+    def test_fast_selects_are_not_explained(self, monkeypatch):
+        self._use_fakes(monkeypatch, sample=0.0)
+        self.query_seconds = AwsDbClient.SLOW_QUERY_THRESHOLD_SECONDS
+        self._select()
+        assert len(self.explained_queries) == 0
+
+    def test_slow_writes_are_never_explained(self, monkeypatch):
+        self._use_fakes(monkeypatch, sample=0.0)
+        self.query_seconds = AwsDbClient.SLOW_QUERY_THRESHOLD_SECONDS + 0.1
+        client = self._client()
+
+        async def update():
+            await client.update(
+                user_id=None,
+                request=fake_request(self.primary_pool, []),
+                payload={"status": "completed"},
+                filters={"id": 1},
+                table_name="myFakeTable",
+            )
+            await asyncio.gather(*client._slow_query_explain_tasks)
+
+        asyncio.run(update())
+        assert len(self.explained_queries) == 0
+        assert self.fake_influx_client.query_traces[0]["operation"] == "update"
+
+    # Private
+
+    def _use_fakes(self, monkeypatch, sample: float):
+        monkeypatch.setattr(DbQueryTrace, "now", staticmethod(self.clock.perf_counter))
+        monkeypatch.setattr(aws_db_client.random, "random", lambda: sample)
+
+    @property
+    def explained_queries(self) -> list[str]:
+        return [query for query in self.primary_pool.conn.queries if query.startswith("EXPLAIN")]
+
+    def _client(self) -> AwsDbClient:
+        return AwsDbClient(
+            encryptor=dependency_container.inject_chartwise_encryptor(),
+            influx_client=self.fake_influx_client,
+        )
+
+    def _select(self):
+        client = self._client()
+
+        async def select():
+            await client.select(
+                user_id=None,
+                request=fake_request(self.primary_pool, []),
+                fields=["*"],
+                table_name="myFakeTable",
+                read_routing=DbReadRouting.PRIMARY,
+            )
+            # The explain runs off the request path.
+            await asyncio.gather(*client._slow_query_explain_tasks)
+
+        asyncio.run(select())
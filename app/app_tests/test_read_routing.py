@@ -0,0 +1,185 @@
+import asyncio
+
+from types import SimpleNamespace
+
+from ..dependencies.dependency_container import dependency_container
+from ..dependencies.implementation.aws_db_client import AwsDbClient
+from ..internal.db import read_routing
+from ..internal.db.connection import read_replica_endpoints
+from ..internal.db.read_routing import (
+    DbReadRouting,
+    pin_request_to_primary,
+    resolve_replica_index,
+)
+
+class FakeDbTransaction:
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        self.conn.in_transaction = True
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.conn.in_transaction = False
+        return False
+
+class FakeDbConnection:
+
+    def __init__(self, name: str):
+        self.name = name
+        self.queries: list[str] = []
+        self.transaction_queries: list[str] = []
+        self.in_transaction = False
+
+    async def fetch(self, query: str, *args):
+        self.queries.append(query)
+        if self.in_transaction:
+            self.transaction_queries.append(query)
+        return []
+
+    def transaction(self):
+        return FakeDbTransaction(self)
+
+class FakeDbPool:
+
+    def __init__(self, name: str):
+        self.conn = FakeDbConnection(name)
+        self.unavailable = False
+        self.acquired = 0
+
+    async def acquire(self):
+        if self.unavailable:
+            raise ConnectionError("myFakePoolError")
+        self.acquired += 1
+        return self.conn
+
+    async def release(self, conn: FakeDbConnection):
+        pass
+
+    def get_size(self) -> int:
+        return 1
+
+    def get_idle_size(self) -> int:
+        return 0
+
+    def get_max_size(self) -> int:
+        return 10
+
+def fake_request(
+    primary_pool: FakeDbPool,
+    replica_pools: list[FakeDbPool]
+) -> SimpleNamespace:
+    return SimpleNamespace(
+        app=SimpleNamespace(state=SimpleNamespace(pool=primary_pool, replica_pools=replica_pools)),
+        state=SimpleNamespace(),
+    )
+
+class TestingHarnessReadRouting:
+
+    def setup_method(self):
+        dependency_container._testing_environment = True
+        self.primary_pool = FakeDbPool("primary")
+        self.replica_pools = [FakeDbPool("replica-0"), FakeDbPool("replica-1")]
+
+    def test_replicas_are_only_used_when_requested(self, monkeypatch):
+        monkeypatch.setattr(read_routing, "_replica_counter", iter(range(100)))
+        request = fake_request(self.primary_pool, self.replica_pools)
+
+        assert resolve_replica_index(request, DbReadRouting.PRIMARY, replica_count=2) is None
+        assert resolve_replica_index(request, DbReadRouting.AUTO, replica_count=0) is None
+        assert [resolve_replica_index(request, DbReadRouting.AUTO, replica_count=2) for _ in range(3)] == [0, 1, 0]
+
+    def test_auto_reads_follow_the_request_writes(self, monkeypatch):
+        monkeypatch.setattr(read_routing, "_replica_counter", iter(range(100)))
+        request = fake_request(self.primary_pool, self.replica_pools)
+        pin_request_to_primary(request)
+
+        assert resolve_replica_index(request, DbReadRouting.AUTO, replica_count=2) is None
+        # Lag-tolerant reads still go to a replica.
+        assert resolve_replica_index(request, DbReadRouting.REPLICA, replica_count=2) == 0
+
+    def test_reads_are_served_by_replicas(self):
+        request = fake_request(self.primary_pool, self.replica_pools)
+        self._select(request, DbReadRouting.AUTO)
+        self._select(request, DbReadRouting.AUTO)
+
+        assert self.primary_pool.acquired == 0
+        assert [pool.acquired for pool in self.replica_pools] == [1, 1]
+
+    def test_writes_pin_the_request_to_the_primary(self):
+        request = fake_request(self.primary_pool, self.replica_pools)
+        asyncio.run(
+            self._client().update(
+                user_id=None,
+                request=request,
+                payload={"status": "completed"},
+                filters={"id": 1},
+                table_name="myFakeTable",
+            )
+        )
+        self._select(request, DbReadRouting.AUTO)
+
+        assert self.primary_pool.acquired == 2
+        assert sum(pool.acquired for pool in self.replica_pools) == 0
+
+    def test_replaced_rows_are_written_in_one_transaction(self):
+        request = fake_request(self.primary_pool, self.replica_pools)
+        asyncio.run(
+            self._client().replace_rows(
+                user_id=None,
+                request=request,
+                table_name="myFakeTable",
+                filters={"session_report_id": "myFakeSessionReportId"},
+                payloads=[{"id": "myFakeId", "session_report_id": "myFakeSessionReportId"}],
+            )
+        )
+
+        queries = self.primary_pool.conn.transaction_queries
+        assert len(queries) == 2
+        assert queries[0].startswith('DELETE FROM "myFakeTable"')
+        assert 'INSERT INTO "myFakeTable"' in queries[1]
+
+    def test_unavailable_replicas_fall_back_to_the_primary(self):
+        for pool in self.replica_pools:
+            pool.unavailable = True
+        request = fake_request(self.primary_pool, self.replica_pools)
+        self._select(request, DbReadRouting.REPLICA)
+
+        assert self.primary_pool.acquired == 1
+        assert len(self.primary_pool.conn.queries) == 1
+
+    def test_reads_without_replicas_use_the_primary(self):
+        request = fake_request(self.primary_pool, [])
+        self._select(request, DbReadRouting.AUTO)
+        assert self.primary_pool.acquired == 1
+
+    def test_replica_endpoints_are_parsed(self, monkeypatch):
+        monkeypatch.setenv("AWS_RDS_READ_REPLICA_ENDPOINTS", " replica-1.rds.amazonaws.com, 127.0.0.1:5434,")
+        assert read_replica_endpoints(default_port=5432) == [
+            ("replica-1.rds.amazonaws.com", 5432),
+            ("127.0.0.1", 5434),
+        ]
+
+        monkeypatch.delenv("AWS_RDS_READ_REPLICA_ENDPOINTS")
+        assert read_replica_endpoints(default_port=5432) == []
+
+    # Private
+
+    def _client(self) -> AwsDbClient:
+        return AwsDbClient(encryptor=dependency_container.inject_chartwise_encryptor())
+
+    def _select(
+        self,
+        request: SimpleNamespace,
+        routing: DbReadRouting
+    ):
+        asyncio.run(
+            self._client().select(
+                user_id=None,
+                request=request,
+                fields=["*"],
+                table_name="myFakeTable",
+                read_routing=routing,
+            )
+        )
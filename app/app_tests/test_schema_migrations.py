@@ -0,0 +1,96 @@
+import asyncio, pytest
+
+from ..internal.db import schema_migrations
+from ..internal.db.schema_migrations import apply_migrations, list_migrations, render_migration_sql
+
+class FakeTransaction:
+
+    def __init__(self, conn: "FakeMigrationsConnection"):
+        self.conn = conn
+
+    async def __aenter__(self):
+        self.conn.statements.append("BEGIN")
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.conn.statements.append("COMMIT" if exc_type is None else "ROLLBACK")
+        return False
+
+class FakeMigrationsConnection:
+
+    def __init__(self, applied_versions: list[str]):
+        self.applied_versions = list(applied_versions)
+        self.statements: list[str] = []
+        self.failing_sql: str | None = None
+
+    async def execute(self, sql: str, *args):
+        if sql == self.failing_sql:
+            raise RuntimeError("myFakeMigrationError")
+        if sql.startswith(f'INSERT INTO "{schema_migrations.SCHEMA_MIGRATIONS_TABLE_NAME}"'):
+            self.applied_versions.append(args[0])
+        self.statements.append(sql.strip())
+
+    async def fetch(self, sql: str, *args):
+        return [{"version": version} for version in self.applied_versions]
+
+    def transaction(self):
+        return FakeTransaction(self)
+
+class TestingHarnessSchemaMigrations:
+
+    def test_shipped_migrations_are_numbered_in_order(self):
+        versions = [migration.version for migration in list_migrations()]
+        assert len(versions) > 0
+        assert versions == sorted(versions)
+        assert all(version.split("_")[0].isdigit() for version in versions)
+
+    def test_job_outbox_is_granted_to_the_app_role(self):
+        migration = next(migration for migration in list_migrations() if migration.version == "0002_create_job_outbox")
+        sql = render_migration_sql(migration=migration, app_role="myFakeAppRole")
+
+        assert 'GRANT SELECT, INSERT, UPDATE ON "job_outbox" TO "myFakeAppRole";' in sql
+        assert 'GRANT USAGE ON SEQUENCE "job_outbox_id_seq" TO "myFakeAppRole";' in sql
+        assert schema_migrations.APP_ROLE_PLACEHOLDER not in sql
+
+    def test_app_role_is_required_by_migrations_that_grant_it_access(self, tmp_path):
+        self._write_migrations(tmp_path)
+        (tmp_path / "0004_grant.sql").write_text('GRANT SELECT ON "myFakeTable" TO {{app_role}};\n')
+        conn = FakeMigrationsConnection(applied_versions=[])
+
+        with pytest.raises(ValueError):
+            asyncio.run(apply_migrations(conn=conn, directory=str(tmp_path)))
+        assert conn.applied_versions == []
+
+        asyncio.run(apply_migrations(conn=conn, directory=str(tmp_path), app_role='my"FakeAppRole'))
+        assert 'GRANT SELECT ON "myFakeTable" TO "my""FakeAppRole";' in conn.statements
+
+    def test_only_pending_migrations_are_applied_in_order(self, tmp_path):
+        self._write_migrations(tmp_path)
+        conn = FakeMigrationsConnection(applied_versions=["0001_first"])
+
+        applied_versions = asyncio.run(apply_migrations(conn=conn, directory=str(tmp_path)))
+        assert applied_versions == ["0002_second", "0003_third"]
+        assert conn.applied_versions == ["0001_first", "0002_second", "0003_third"]
+        assert "SELECT 1;" not in conn.statements
+        assert conn.statements.index("SELECT 2;") < conn.statements.index("SELECT 3;")
+        assert conn.statements[-1].startswith("SELECT pg_advisory_unlock")
+
+        # Re-running is a no-op.
+        assert asyncio.run(apply_migrations(conn=conn, directory=str(tmp_path))) == []
+
+    def test_failed_migration_stops_the_run(self, tmp_path):
+        self._write_migrations(tmp_path)
+        conn = FakeMigrationsConnection(applied_versions=[])
+        conn.failing_sql = "SELECT 2;\n"
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(apply_migrations(conn=conn, directory=str(tmp_path)))
+        assert conn.applied_versions == ["0001_first"]
+        assert "ROLLBACK" in conn.statements
+        assert conn.statements[-1].startswith("SELECT pg_advisory_unlock")
+
+    # Private
+
+    def _write_migrations(self, directory):
+        for version, sql in [("0002_second", "SELECT 2;\n"), ("0001_first", "SELECT 1;\n"), ("0003_third", "SELECT 3;\n")]:
+            (directory / f"{version}.sql").write_text(sql)
+        (directory / "README.md").write_text("Not a migration")
@@ -349,6 +349,7 @@ class TestingHarnessSecurityRouter:
         assert not self.fake_cognito_client.invoked_delete_user
         assert not self.fake_stripe_client.subscription_deletion_invoked
         assert not self.fake_db_client.invoked_delete_patients
+        assert len(self.fake_pinecone_client.deleted_patients_vectors_ids) == 0
         self.client.cookies.set("session_token", self.session_token)
         response = self.client.delete(
             SecurityRouter.THERAPISTS_ENDPOINT,
@@ -359,6 +360,7 @@ class TestingHarnessSecurityRouter:
 
         assert response.status_code == 200
         assert self.fake_db_client.invoked_delete_patients
+        assert self.fake_pinecone_client.deleted_patients_vectors_ids == [FakeAwsDbClient.FAKE_PATIENT_ID]
         assert self.fake_cognito_client.invoked_delete_user
         assert self.fake_stripe_client.subscription_deletion_invoked
 
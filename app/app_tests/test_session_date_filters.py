@@ -0,0 +1,163 @@
+import asyncio
+
+from datetime import date, datetime
+
+from ..dependencies.dependency_container import dependency_container
+from ..data_processing.backfill_session_date_epoch_days import backfill_namespace
+from ..dependencies.implementation.pinecone_client import PineconeClient
+from ..internal.utilities import datetime_handler
+from ..vectors.context_assembler import ContextAssembler
+from ..vectors.tokenizer import Tokenizer
+from .test_session_vectors import (
+    FAKE_NAMESPACE,
+    FAKE_PATIENT_ID,
+    FAKE_USER_ID,
+    FakeEmbeddingsClient,
+    FakeVectorIndex,
+    fake_pinecone_client,
+)
+from .test_tokenizer import BYTE_ENCODING
+
+SESSION_DATES = [date(2024, 10, 1), date(2024, 10, 10), date(2024, 10, 20), date(2024, 11, 1)]
+
+class FakeMappingsDbClient:
+    """
+    Serves no session mappings, so that only vectors holding `session_date_epoch_days` can be found.
+    """
+
+    def __init__(self):
+        self.selects = 0
+
+    async def select(self, **kwargs):
+        self.selects += 1
+        return []
+
+class TestingHarnessSessionDateFilters:
+
+    def setup_method(self):
+        dependency_container._testing_environment = True
+        self.index = FakeVectorIndex()
+        self.embeddings_client = FakeEmbeddingsClient()
+        self.db_client = FakeMappingsDbClient()
+
+    def test_epoch_days_count_from_the_unix_epoch(self):
+        assert datetime_handler.to_epoch_days(date(1970, 1, 1)) == 0
+        assert datetime_handler.to_epoch_days(date(2024, 10, 10)) == 20006
+
+    def test_date_range_filter_is_inclusive(self, monkeypatch):
+        client = self._client(monkeypatch)
+        self._insert_sessions(client)
+
+        context = self._date_range_context(client, start_date="10-10-2024", end_date="10-20-2024")
+
+        assert self.index.query_filters == [
+            {
+                "session_date_epoch_days": {
+                    "$gte": datetime_handler.to_epoch_days(date(2024, 10, 10)),
+                    "$lte": datetime_handler.to_epoch_days(date(2024, 10, 20)),
+                }
+            }
+        ]
+        assert "summary of session 10-10-2024" in context
+        assert "summary of session 10-20-2024" in context
+        assert "summary of session 10-01-2024" not in context
+        assert "summary of session 11-01-2024" not in context
+        assert self.db_client.selects == 0
+
+    def test_backfill_only_updates_vectors_missing_epoch_days(self, monkeypatch):
+        client = self._client(monkeypatch)
+        self._insert_sessions(client)
+        legacy_vector_ids = self._strip_epoch_days(SESSION_DATES[:2])
+
+        assert backfill_namespace(index=self.index, namespace=FAKE_NAMESPACE, dry_run=False) == len(legacy_vector_ids)
+        for vector in self.index.vectors().values():
+            session_date = datetime.strptime(vector['metadata']['session_date'], datetime_handler.DATE_FORMAT).date()
+            assert vector['metadata']['session_date_epoch_days'] == datetime_handler.to_epoch_days(session_date)
+
+    def test_backfill_is_idempotent(self, monkeypatch):
+        client = self._client(monkeypatch)
+        self._insert_sessions(client)
+        self._strip_epoch_days(SESSION_DATES)
+
+        assert backfill_namespace(index=self.index, namespace=FAKE_NAMESPACE, dry_run=False) == len(SESSION_DATES)
+        backfilled_metadata = {vector_id: dict(vector['metadata']) for vector_id, vector in self.index.vectors().items()}
+
+        assert backfill_namespace(index=self.index, namespace=FAKE_NAMESPACE, dry_run=False) == 0
+        assert {vector_id: vector['metadata'] for vector_id, vector in self.index.vectors().items()} == backfilled_metadata
+
+        # Backfilled vectors can be found through the range filter again.
+        context = self._date_range_context(client, start_date="10-10-2024", end_date="10-20-2024")
+        assert "summary of session 10-10-2024" in context
+        assert self.db_client.selects == 0
+
+    def test_backfill_dry_run_leaves_vectors_untouched(self, monkeypatch):
+        client = self._client(monkeypatch)
+        self._insert_sessions(client)
+        self._strip_epoch_days(SESSION_DATES)
+
+        assert backfill_namespace(index=self.index, namespace=FAKE_NAMESPACE, dry_run=True) == len(SESSION_DATES)
+        assert all(
+            'session_date_epoch_days' not in vector['metadata'] for vector in self.index.vectors().values()
+        )
+
+    # Private
+
+    def _client(self, monkeypatch) -> PineconeClient:
+        monkeypatch.setattr(Tokenizer, "_shared_instance", Tokenizer(encoding=BYTE_ENCODING))
+        client = fake_pinecone_client(monkeypatch, self.index)
+        # Reranking only reorders the docs, and needs the cross-encoder model.
+        monkeypatch.setattr(client, "_rerank_docs", lambda query_input, docs, batch_size: docs)
+        return client
+
+    async def _summarize_chunk(self, chunk_text: str, openai_client) -> str:
+        return f"summary of {chunk_text}"
+
+    def _insert_sessions(self, client: PineconeClient):
+        for session_date in SESSION_DATES:
+            asyncio.run(
+                client.insert_session_vectors(
+                    user_id=FAKE_USER_ID,
+                    patient_id=FAKE_PATIENT_ID,
+                    text=f"session {session_date.strftime(datetime_handler.DATE_FORMAT)}",
+                    session_report_id=f"myFakeSessionReportId-{session_date.isoformat()}",
+                    openai_client=self.embeddings_client,
+                    summarize_chunk=self._summarize_chunk,
+                    therapy_session_date=session_date
+                )
+            )
+
+    def _strip_epoch_days(self, session_dates: list[date]) -> list[str]:
+        """
+        Turns the vectors of the incoming session dates into ones written before `session_date_epoch_days` existed.
+        """
+        session_date_prefixes = tuple(session_date.strftime(datetime_handler.DATE_FORMAT) for session_date in session_dates)
+        legacy_vector_ids = [
+            vector_id for vector_id in self.index.vectors() if vector_id.startswith(session_date_prefixes)
+        ]
+        for vector_id in legacy_vector_ids:
+            del self.index.vectors()[vector_id]['metadata']['session_date_epoch_days']
+        return legacy_vector_ids
+
+    def _date_range_context(
+        self,
+        client: PineconeClient,
+        start_date: str,
+        end_date: str
+    ) -> str:
+        context_assembler = ContextAssembler()
+        asyncio.run(
+            client._add_context_from_date_range_vectors(
+                context_assembler=context_assembler,
+                index=self.index,
+                namespace=FAKE_NAMESPACE,
+                query_embeddings=[1.0, 1.0],
+                aws_db_client=self.db_client,
+                therapist_id=FAKE_USER_ID,
+                request=None,
+                query_input="myFakeQuery",
+                start_date=start_date,
+                end_date=end_date,
+                ids_contained_in_current_context=[],
+            )
+        )
+        return context_assembler.build()
@@ -0,0 +1,324 @@
+import asyncio, base64
+
+from datetime import date
+from types import SimpleNamespace
+
+from ..dependencies.dependency_container import dependency_container
+from ..dependencies.implementation.pinecone_client import PineconeClient
+from ..internal.utilities.ttl_lru_cache import TTLLRUCache
+
+FAKE_USER_ID = "myFakeUserId"
+FAKE_PATIENT_ID = "myFakePatientId"
+FAKE_SESSION_REPORT_ID = "myFakeSessionReportId"
+FAKE_NAMESPACE = f"{FAKE_USER_ID}-{FAKE_PATIENT_ID}"
+SESSION_DATE = date(2024, 10, 10)
+
+class FakeVectorIndex:
+    """
+    Keeps the vectors it's given per namespace, and serves them back like a Pinecone index.
+    """
+
+    LIST_PAGE_SIZE = 2
+
+    def __init__(self):
+        self.namespaces: dict[str, dict[str, dict]] = {}
+        self.query_filters: list[dict | None] = []
+        self.fetched_ids: list[str] = []
+
+    def fetch(self, ids: list[str], namespace: str) -> dict:
+        self.fetched_ids.extend(ids)
+        vectors = self.namespaces.get(namespace, {})
+        return {"vectors": {vector_id: vectors[vector_id] for vector_id in ids if vector_id in vectors}}
+
+    def upsert(self, vectors: list[dict], namespace: str):
+        for vector in vectors:
+            self.namespaces.setdefault(namespace, {})[vector['id']] = {
+                "id": vector['id'],
+                "values": list(vector['values']),
+                "metadata": dict(vector['metadata']),
+            }
+
+    def query(self, vector: list[float], top_k: int, namespace: str, include_metadata: bool, filter: dict | None = None):
+        self.query_filters.append(filter)
+        matches = [
+            {"id": vector_id, "metadata": vector_data['metadata']}
+            for vector_id, vector_data in sorted(self.namespaces.get(namespace, {}).items())
+            if type(self)._matches_filter(vector_data['metadata'], filter or {})
+        ]
+        return SimpleNamespace(to_dict=lambda: {"matches": matches[:top_k]})
+
+    def update(self, id: str, set_metadata: dict, namespace: str):
+        self.namespaces[namespace][id]['metadata'].update(set_metadata)
+
+    def delete(self, ids: list[str], namespace: str):
+        for vector_id in ids:
+            self.namespaces.get(namespace, {}).pop(vector_id, None)
+
+    def vectors(self, namespace: str = FAKE_NAMESPACE) -> dict[str, dict]:
+        return self.namespaces.get(namespace, {})
+
+    @staticmethod
+    def _matches_filter(metadata: dict, metadata_filter: dict) -> bool:
+        operators = {
+            "$eq": lambda value, operand: value == operand,
+            "$gte": lambda value, operand: value >= operand,
+            "$lte": lambda value, operand: value <= operand,
+        }
+        return all(
+            field in metadata and operators[operator](metadata[field], operand)
+            for field, conditions in metadata_filter.items()
+            for operator, operand in conditions.items()
+        )
+
+    # Defined last, since it shadows the `list` builtin in the annotations above.
+    def list(self, namespace: str, prefix: str | None = None):
+        vector_ids = sorted(
+            vector_id for vector_id in self.namespaces.get(namespace, {})
+            if prefix is None or vector_id.startswith(prefix)
+        )
+        for i in range(0, len(vector_ids), type(self).LIST_PAGE_SIZE):
+            yield vector_ids[i:i + type(self).LIST_PAGE_SIZE]
+
+class FakeEmbeddingsClient:
+
+    def __init__(self):
+        self.embedded_texts: list[str] = []
+
+    async def create_embeddings(self, text: str) -> list[float]:
+        self.embedded_texts.append(text)
+        return [float(len(text)), 1.0]
+
+def fake_pinecone_client(
+    monkeypatch,
+    index: FakeVectorIndex
+) -> PineconeClient:
+    """
+    Builds a PineconeClient that writes to the incoming fake index, and splits text into chunks by paragraph.
+    """
+    client = PineconeClient.__new__(PineconeClient)
+    client.encryptor = dependency_container.inject_chartwise_encryptor()
+    client._local_vector_mirror = None
+    client._chunk_summary_cache = TTLLRUCache(name="test_chunk_summary", max_entries=100, ttl_seconds=60)
+
+    async def add_documents(indexes, namespace, docs):
+        for write_index in indexes:
+            write_index.upsert(
+                vectors=[{"id": doc.id_, "values": doc.embedding, "metadata": doc.metadata} for doc in docs],
+                namespace=namespace
+            )
+
+    async def get_indexes_for_user(user_id):
+        return (index, [index])
+
+    monkeypatch.setattr(client, "_get_indexes_for_user", get_indexes_for_user)
+    monkeypatch.setattr(client, "_get_write_indexes", lambda user_id: [index])
+    monkeypatch.setattr(client, "_split_text_into_chunks", lambda text: text.split("\n\n"))
+    monkeypatch.setattr(client, "_add_documents", add_documents)
+    return client
+
+class TestingHarnessSessionVectors:
+
+    def setup_method(self):
+        dependency_container._testing_environment = True
+        self.index = FakeVectorIndex()
+        self.embeddings_client = FakeEmbeddingsClient()
+        self.summarized_chunks: list[str] = []
+        self.summarize_chunks_calls: list[tuple[list[str], list[str | None]]] = []
+
+    def test_retried_inserts_replace_the_earlier_attempt(self, monkeypatch):
+        client = fake_pinecone_client(monkeypatch, self.index)
+        other_session_ids = self._insert(client, "other", session_report_id="myOtherFakeSessionReportId")
+        self._insert(client, "first\n\nsecond")
+
+        # The job failed after writing the vectors (i.e. while writing the mappings), and gets retried.
+        retried_ids = self._insert(client, "first\n\nsecond")
+
+        assert set(self.index.vectors()) == set(retried_ids + other_session_ids)
+
+    def test_unchanged_chunks_are_reused(self, monkeypatch):
+        client = fake_pinecone_client(monkeypatch, self.index)
+        original_ids = self._insert(client, "first\n\nsecond\n\nthird")
+
+        updated_ids = self._update(client, "first\n\nsecond\n\nthird")
+
+        assert updated_ids == original_ids
+        assert set(self.index.vectors()) == set(original_ids)
+        assert self.summarized_chunks == ["first", "second", "third"]
+
+    def test_edited_chunks_are_re_embedded(self, monkeypatch):
+        client = fake_pinecone_client(monkeypatch, self.index)
+        original_ids = self._insert(client, "first\n\nsecond\n\nthird")
+        self.summarized_chunks.clear()
+        self.embeddings_client.embedded_texts.clear()
+
+        updated_ids = self._update(client, "first\n\nsecond, edited\n\nthird")
+
+        assert updated_ids[0] == original_ids[0]
+        assert updated_ids[2] == original_ids[2]
+        assert updated_ids[1] not in original_ids
+        assert self.summarized_chunks == ["second, edited"]
+        assert self.embeddings_client.embedded_texts == ["summary of second, edited"]
+        # The edited chunk's previous vector is gone.
+        assert set(self.index.vectors()) == set(updated_ids)
+        assert self._chunk_texts() == ["first", "second, edited", "third"]
+
+    def test_removed_chunks_are_deleted(self, monkeypatch):
+        client = fake_pinecone_client(monkeypatch, self.index)
+        original_ids = self._insert(client, "first\n\nsecond\n\nthird")
+        self.summarized_chunks.clear()
+
+        updated_ids = self._update(client, "first\n\nthird")
+
+        assert updated_ids == [original_ids[0], original_ids[2]]
+        assert set(self.index.vectors()) == set(updated_ids)
+        assert self.summarized_chunks == []
+
+    def test_duplicate_chunks_are_each_reused_once(self, monkeypatch):
+        client = fake_pinecone_client(monkeypatch, self.index)
+        original_ids = self._insert(client, "same\n\nsame")
+        self.summarized_chunks.clear()
+
+        updated_ids = self._update(client, "same\n\nsame\n\nsame")
+
+        assert set(original_ids) < set(updated_ids)
+        assert len(set(updated_ids)) == 3
+        assert self.summarized_chunks == ["same"]
+
+    def test_date_changes_re_key_vectors_without_summarizing(self, monkeypatch):
+        client = fake_pinecone_client(monkeypatch, self.index)
+        original_ids = self._insert(client, "first\n\nsecond")
+        self.summarized_chunks.clear()
+        self.embeddings_client.embedded_texts.clear()
+
+        updated_ids = self._update(client, "first\n\nsecond", new_date=date(2024, 11, 1))
+
+        assert all(vector_id.startswith("11-01-2024-") for vector_id in updated_ids)
+        assert set(self.index.vectors()) == set(updated_ids)
+        assert all(
+            vector['metadata']['session_date'] == "11-01-2024" for vector in self.index.vectors().values()
+        )
+        assert not set(original_ids) & set(updated_ids)
+        assert self.summarized_chunks == []
+        assert self.embeddings_client.embedded_texts == []
+
+    def test_other_sessions_on_the_same_date_are_untouched(self, monkeypatch):
+        client = fake_pinecone_client(monkeypatch, self.index)
+        self._insert(client, "first\n\nsecond")
+        other_session_ids = self._insert(client, "other", session_report_id="myOtherFakeSessionReportId")
+
+        self._update(client, "first, edited")
+
+        assert set(other_session_ids) <= set(self.index.vectors())
+
+    def test_chunks_are_summarized_at_once_along_with_the_reused_summaries(self, monkeypatch):
+        client = fake_pinecone_client(monkeypatch, self.index)
+        original_ids = self._insert(client, "first\n\nsecond\n\nthird")
+        self.summarized_chunks.clear()
+
+        updated_ids = self._update(client, "first\n\nsecond, edited\n\nthird", summarize_chunks=self._summarize_chunks)
+
+        assert self.summarize_chunks_calls == [
+            (
+                ["first", "second, edited", "third"],
+                ["summary of first", None, "summary of third"],
+            )
+        ]
+        assert self.summarized_chunks == ["second, edited"]
+        assert [updated_ids[0], updated_ids[2]] == [original_ids[0], original_ids[2]]
+        assert self._chunk_summaries() == ["summary of first", "summary of second, edited", "summary of third"]
+
+    def test_fetched_chunk_summaries_are_served_from_the_cache(self, monkeypatch):
+        client = fake_pinecone_client(monkeypatch, self.index)
+        vector_ids = self._insert(client, "first\n\nsecond")
+        self.index.fetched_ids.clear()
+
+        first_docs = client._fetch_context_docs(index=self.index, namespace=FAKE_NAMESPACE, vector_ids=vector_ids)
+        second_docs = client._fetch_context_docs(index=self.index, namespace=FAKE_NAMESPACE, vector_ids=vector_ids)
+
+        assert self.index.fetched_ids == vector_ids
+        assert sorted(doc['chunk_summary'] for doc in first_docs) == ["summary of first", "summary of second"]
+        assert sorted(doc['chunk_summary'] for doc in second_docs) == ["summary of first", "summary of second"]
+
+    def test_queried_chunk_summaries_skip_the_cache(self, monkeypatch):
+        client = fake_pinecone_client(monkeypatch, self.index)
+        self._insert(client, "first\n\nsecond")
+
+        docs, vector_ids = client._query_vectors(
+            embeddings=[1.0, 1.0],
+            query_top_k=2,
+            index=self.index,
+            namespace=FAKE_NAMESPACE
+        )
+
+        assert sorted(doc['chunk_summary'] for doc in docs) == ["summary of first", "summary of second"]
+        assert all(client._chunk_summary_cache.get((FAKE_NAMESPACE, vector_id)) is None for vector_id in vector_ids)
+
+    # Private
+
+    async def _summarize_chunk(self, chunk_text: str, openai_client) -> str:
+        self.summarized_chunks.append(chunk_text)
+        return f"summary of {chunk_text}"
+
+    async def _summarize_chunks(
+        self,
+        chunk_texts: list[str],
+        openai_client,
+        chunk_summaries: list[str | None]
+    ) -> list[str]:
+        self.summarize_chunks_calls.append((list(chunk_texts), list(chunk_summaries)))
+        return [
+            chunk_summary if chunk_summary is not None else await self._summarize_chunk(chunk_text, openai_client)
+            for chunk_text, chunk_summary in zip(chunk_texts, chunk_summaries)
+        ]
+
+    def _chunk_texts(self) -> list[str]:
+        return self._decrypted_metadata("chunk_text")
+
+    def _chunk_summaries(self) -> list[str]:
+        return self._decrypted_metadata("chunk_summary")
+
+    def _decrypted_metadata(self, field: str) -> list[str]:
+        vectors = sorted(self.index.vectors().values(), key=lambda vector: vector['id'].split("-")[3])
+        return [
+            dependency_container.inject_chartwise_encryptor().decrypt(base64.b64decode(vector['metadata'][field]))
+            for vector in vectors
+        ]
+
+    def _insert(
+        self,
+        client: PineconeClient,
+        text: str,
+        session_report_id: str = FAKE_SESSION_REPORT_ID
+    ) -> list[str]:
+        return asyncio.run(
+            client.insert_session_vectors(
+                user_id=FAKE_USER_ID,
+                patient_id=FAKE_PATIENT_ID,
+                text=text,
+                session_report_id=session_report_id,
+                openai_client=self.embeddings_client,
+                summarize_chunk=self._summarize_chunk,
+                therapy_session_date=SESSION_DATE
+            )
+        )
+
+    def _update(
+        self,
+        client: PineconeClient,
+        text: str,
+        new_date: date = SESSION_DATE,
+        summarize_chunks=None
+    ) -> list[str]:
+        return asyncio.run(
+            client.update_session_vectors(
+                user_id=FAKE_USER_ID,
+                patient_id=FAKE_PATIENT_ID,
+                text=text,
+                old_date=SESSION_DATE,
+                new_date=new_date,
+                session_report_id=FAKE_SESSION_REPORT_ID,
+                openai_client=self.embeddings_client,
+                summarize_chunk=self._summarize_chunk,
+                summarize_chunks=summarize_chunks
+            )
+        )
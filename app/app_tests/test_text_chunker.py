@@ -0,0 +1,85 @@
+import tiktoken
+
+from ..data_processing.benchmark_chunker import legacy_clean_up_text, legacy_split_text
+from ..vectors import data_cleaner
+from ..vectors.text_chunker import TextChunker
+from ..vectors.tokenizer import Tokenizer
+from .test_data_cleaner import SESSION_NOTES_DIR
+
+# One token per byte, so that tests don't depend on downloading the models' encoding.
+BYTE_TOKENIZER = Tokenizer(
+    encoding=tiktoken.Encoding(
+        name="test_bytes",
+        pat_str=r"[\s\S]",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={},
+    )
+)
+
+class TestingHarnessTextChunker:
+
+    def test_short_text_is_a_single_cleaned_chunk(self):
+        chunker = TextChunker(tokenizer=BYTE_TOKENIZER)
+        assert chunker.split_text("A reduc-\ntion in  anxiety.") == ["A reduction in anxiety."]
+        assert chunker.split_text("") == []
+        assert chunker.split_text(" \n\n ") == []
+
+    def test_chunks_fit_within_the_chunk_size(self):
+        chunker = TextChunker(tokenizer=BYTE_TOKENIZER)
+        text = "\n\n".join(
+            " ".join(f"Sentence {paragraph}.{sentence} about the session." for sentence in range(paragraph % 7 + 1))
+            for paragraph in range(60)
+        )
+        chunks = chunker.split_text(text)
+        assert len(chunks) > 1
+        assert all(0 < BYTE_TOKENIZER.count_tokens(chunk) <= TextChunker.CHUNK_SIZE for chunk in chunks)
+
+        # Every word makes it into some chunk, and chunks never cut through a word.
+        words = set(" ".join(chunks).split())
+        assert words == set(data_cleaner.clean_up_text(text).split())
+
+    def test_paragraphs_are_preferred_over_words(self):
+        chunker = TextChunker(chunk_size=40, chunk_overlap=5, tokenizer=BYTE_TOKENIZER)
+        text = "First short paragraph.\n\nThe second paragraph runs longer than the first one."
+        chunks = chunker.split_text(text)
+        assert chunks[0] == "First short paragraph."
+        assert chunks[1].startswith("The second paragraph")
+
+    def test_consecutive_chunks_overlap(self):
+        chunker = TextChunker(chunk_size=20, chunk_overlap=8, tokenizer=BYTE_TOKENIZER)
+        chunks = chunker.split_text("one two three four five six seven eight nine ten")
+        assert chunks == [
+            "one two three four",
+            "four five six seven",
+            "seven eight nine",
+            "nine ten",
+        ]
+
+    def test_text_without_boundaries_is_still_split(self):
+        chunker = TextChunker(chunk_size=10, chunk_overlap=2, tokenizer=BYTE_TOKENIZER)
+        chunks = chunker.split_text("x" * 26)
+        assert chunks == ["x" * 10, "x" * 10, "x" * 10]
+
+    def test_unsplit_session_notes_match_the_legacy_splitter(self):
+        chunk_size = 4096
+        chunker = TextChunker(chunk_size=chunk_size, tokenizer=BYTE_TOKENIZER)
+        for path in sorted(SESSION_NOTES_DIR.glob("*.txt")):
+            content = path.read_text()
+            assert chunker.split_text(content) == legacy_split_text(content, BYTE_TOKENIZER, chunk_size=chunk_size), path.name
+
+    def test_session_notes_chunks_track_the_legacy_splitter(self):
+        # Both cut at paragraphs first, so notes whose paragraphs fit in a chunk are split the same way.
+        chunker = TextChunker(tokenizer=BYTE_TOKENIZER)
+        soap_note = (SESSION_NOTES_DIR / "soap_note.txt").read_text()
+        assert chunker.split_text(soap_note) == legacy_split_text(soap_note, BYTE_TOKENIZER)
+
+        # Overlaps are cut differently, but chunks span the same text in a similar number of pieces.
+        for path in sorted(SESSION_NOTES_DIR.glob("*.txt")):
+            content = path.read_text()
+            cleaned_content = legacy_clean_up_text(content)
+            chunks = chunker.split_text(content)
+            legacy_chunks = legacy_split_text(content, BYTE_TOKENIZER)
+            assert abs(len(chunks) - len(legacy_chunks)) <= 1, path.name
+            assert all(chunk in cleaned_content for chunk in chunks), path.name
+            assert cleaned_content.strip().startswith(chunks[0]), path.name
+            assert cleaned_content.strip().endswith(chunks[-1]), path.name
@@ -0,0 +1,81 @@
+import tiktoken
+
+from ..vectors.message_templates import PromptCrafter, PromptScenario
+from ..vectors.tokenizer import Tokenizer
+
+# One token per byte, so that tests don't depend on downloading the models' encoding.
+BYTE_ENCODING = tiktoken.Encoding(
+    name="test_bytes",
+    pat_str=r"[\s\S]",
+    mergeable_ranks={bytes([i]): i for i in range(256)},
+    special_tokens={},
+)
+
+class CountingTokenizer(Tokenizer):
+
+    def __init__(self):
+        super().__init__(encoding=BYTE_ENCODING)
+        self.count_tokens_calls = 0
+
+    def count_tokens(self, text: str) -> int:
+        self.count_tokens_calls += 1
+        return super().count_tokens(text)
+
+class TestingHarnessTokenizer:
+
+    def test_shared_instance(self, monkeypatch):
+        monkeypatch.setattr(Tokenizer, "_shared_instance", CountingTokenizer())
+        assert Tokenizer.shared() is Tokenizer.shared()
+
+    def test_count_tokens_batch(self):
+        tokenizer = Tokenizer(encoding=BYTE_ENCODING)
+        texts = ["first", "", "third text", "naïve"]
+        assert tokenizer.count_tokens_batch(texts) == [tokenizer.count_tokens(text) for text in texts]
+        assert tokenizer.count_tokens_batch(texts) == [5, 0, 10, 6]
+
+    def test_special_tokens_are_counted_as_text(self):
+        tokenizer = Tokenizer(encoding=BYTE_ENCODING)
+        assert tokenizer.count_tokens("<|endoftext|>") == len("<|endoftext|>")
+
+    def test_static_prompt_counts_are_memoized(self):
+        tokenizer = CountingTokenizer()
+        prompt_crafter = PromptCrafter()
+        spanish_prompt = prompt_crafter.get_system_message_for_scenario(
+            scenario=PromptScenario.SESSION_MINI_SUMMARY,
+            language_code="es-419"
+        )
+        english_prompt = prompt_crafter.get_system_message_for_scenario(
+            scenario=PromptScenario.SESSION_MINI_SUMMARY,
+            language_code="en-US"
+        )
+
+        for _ in range(3):
+            assert tokenizer.count_prompt_tokens(
+                prompt=spanish_prompt,
+                scenario=PromptScenario.SESSION_MINI_SUMMARY,
+                language_code="es-419"
+            ) == len(spanish_prompt.encode())
+        assert tokenizer.count_tokens_calls == 1
+
+        # Each language gets its own count.
+        assert tokenizer.count_prompt_tokens(
+            prompt=english_prompt,
+            scenario=PromptScenario.SESSION_MINI_SUMMARY,
+            language_code="en-US"
+        ) == len(english_prompt.encode())
+        assert tokenizer.count_tokens_calls == 2
+
+    def test_varying_prompts_are_recounted(self):
+        tokenizer = CountingTokenizer()
+        first_count = tokenizer.count_prompt_tokens(
+            prompt="Talking about Jane",
+            scenario=PromptScenario.PRESESSION_BRIEFING,
+            language_code="en-US"
+        )
+        second_count = tokenizer.count_prompt_tokens(
+            prompt="Talking about Jonathan",
+            scenario=PromptScenario.PRESESSION_BRIEFING,
+            language_code="en-US"
+        )
+        assert (first_count, second_count) == (18, 22)
+        assert tokenizer.count_tokens_calls == 2
@@ -0,0 +1,78 @@
+from ..internal.utilities import ttl_lru_cache
+from ..internal.utilities.ttl_lru_cache import TTLLRUCache
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+class TestingHarnessTTLLRUCache:
+
+    def setup_method(self):
+        self.clock = FakeClock()
+
+    def test_entries_expire_after_their_ttl(self, monkeypatch):
+        monkeypatch.setattr(ttl_lru_cache.time, "monotonic", self.clock.monotonic)
+        cache = TTLLRUCache(name="test", max_entries=10, ttl_seconds=60)
+        cache.set("key", "value")
+
+        self.clock.now += 59
+        assert cache.get("key") == "value"
+
+        self.clock.now += 1
+        assert cache.get("key") is None
+        assert len(cache) == 0
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_entries_without_ttl_never_expire(self, monkeypatch):
+        monkeypatch.setattr(ttl_lru_cache.time, "monotonic", self.clock.monotonic)
+        cache = TTLLRUCache(name="test", max_entries=10)
+        cache.set("key", "value")
+
+        self.clock.now += 10 ** 9
+        assert cache.get("key") == "value"
+
+    def test_setting_a_key_again_resets_its_ttl(self, monkeypatch):
+        monkeypatch.setattr(ttl_lru_cache.time, "monotonic", self.clock.monotonic)
+        cache = TTLLRUCache(name="test", max_entries=10, ttl_seconds=60)
+        cache.set("key", "old value")
+
+        self.clock.now += 50
+        cache.set("key", "new value")
+        self.clock.now += 50
+        assert cache.get("key") == "new value"
+
+    def test_least_recently_used_entries_are_evicted_first(self):
+        cache = TTLLRUCache(name="test", max_entries=3)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+
+        # Reading "a" makes "b" the least recently used entry.
+        assert cache.get("a") == 1
+        cache.set("d", 4)
+        assert cache.get("b") is None
+        assert [cache.get(key) for key in ["a", "c", "d"]] == [1, 3, 4]
+
+        # Overwriting "a" refreshes it too, leaving "c" as the oldest entry.
+        cache.set("a", 5)
+        cache.set("e", 6)
+        assert cache.get("c") is None
+        assert len(cache) == 3
+
+    def test_invalidate_matching_only_removes_matching_keys(self):
+        cache = TTLLRUCache(name="test", max_entries=10)
+        cache.set(("namespace-1", "vector-1"), "first")
+        cache.set(("namespace-1", "vector-2"), "second")
+        cache.set(("namespace-2", "vector-1"), "third")
+
+        cache.invalidate_matching(lambda key: key[0] == "namespace-1")
+        assert cache.get(("namespace-1", "vector-1")) is None
+        assert cache.get(("namespace-1", "vector-2")) is None
+        assert cache.get(("namespace-2", "vector-1")) == "third"
+
+        cache.invalidate(("namespace-2", "vector-1"))
+        assert len(cache) == 0
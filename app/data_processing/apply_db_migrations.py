@@ -0,0 +1,52 @@
+import argparse, asyncio, asyncpg, os
+
+from ..internal.db.schema_migrations import apply_migrations, pending_migrations
+
+"""
+Applies the pending SQL migrations in app/internal/db/migrations, in order. Applied versions are
+recorded in the `schema_migrations` table, so the script can be safely re-run at any time.
+
+The connection must use a role that owns the migrated tables, rather than the app's RLS-bound role
+(e.g. "postgresql://<owner>:<password>@<host>:<port>/<database>?sslmode=require"). Migrations that
+grant the app's role access to new tables need its name, through --app-role or DATABASE_APP_ROLE.
+
+Usage:
+python -m app.data_processing.apply_db_migrations [--dsn <postgres_dsn>] [--app-role <role>] [--dry-run]
+"""
+
+async def run(
+    dsn: str,
+    app_role: str | None,
+    dry_run: bool
+):
+    conn = await asyncpg.connect(dsn=dsn)
+    try:
+        if dry_run:
+            migrations = await pending_migrations(conn)
+            print("\n".join([f"Pending: {migration.version}" for migration in migrations]) or "No pending migrations")
+            return
+
+        applied_versions = await apply_migrations(conn=conn, app_role=app_role)
+        print("\n".join([f"Applied: {version}" for version in applied_versions]) or "No pending migrations")
+    finally:
+        await conn.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply the pending database migrations.")
+    parser.add_argument(
+        "--dsn", default=os.environ.get("DATABASE_MIGRATIONS_DSN"),
+        help="The Postgres DSN of the database to be migrated. Defaults to DATABASE_MIGRATIONS_DSN."
+    )
+    parser.add_argument(
+        "--app-role", default=os.environ.get("DATABASE_APP_ROLE"),
+        help="The name of the app's RLS-bound role, which migrations grant access to. Defaults to DATABASE_APP_ROLE."
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="List the pending migrations, without applying them."
+    )
+
+    args = parser.parse_args()
+    if args.dsn is None:
+        parser.error("A DSN is required, through --dsn or DATABASE_MIGRATIONS_DSN")
+    asyncio.run(run(dsn=args.dsn, app_role=args.app_role, dry_run=args.dry_run))
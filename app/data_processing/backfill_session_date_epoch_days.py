@@ -0,0 +1,118 @@
+import argparse, os
+
+from datetime import datetime
+from pinecone.grpc import PineconeGRPC, GRPCIndex
+
+from ..dependencies.implementation.pinecone_client import PineconeClient
+from ..internal.utilities import datetime_handler
+
+"""
+Backfills the numeric `session_date_epoch_days` metadata field on session vectors written before it
+existed, so that date-filtered vector queries can find them.
+
+The backfill is idempotent, and can be safely re-run (or interrupted) at any time.
+
+Usage:
+python -m app.data_processing.backfill_session_date_epoch_days [--bucket <bucket>] [--dry-run]
+"""
+
+FETCH_BATCH_SIZE = 100
+
+def backfill_namespace(
+    index: GRPCIndex,
+    namespace: str,
+    dry_run: bool
+) -> int:
+    """
+    Backfills the vectors of a single namespace, and returns the number of vectors that were (or would be) updated.
+
+    Arguments:
+    index – the index that holds the namespace.
+    namespace – the namespace to be backfilled.
+    dry_run – whether the vectors should be left untouched.
+    """
+    vector_ids = []
+    for list_ids in index.list(namespace=namespace):
+        vector_ids.extend(list_ids)
+
+    updated_vectors_count = 0
+    for i in range(0, len(vector_ids), FETCH_BATCH_SIZE):
+        fetch_result = index.fetch(
+            ids=vector_ids[i:i + FETCH_BATCH_SIZE],
+            namespace=namespace
+        )
+        vectors = fetch_result['vectors'] or {}
+        for vector_id in vectors:
+            metadata = vectors[vector_id]['metadata']
+            if 'session_date_epoch_days' in metadata or 'session_date' not in metadata:
+                continue
+
+            session_date = datetime.strptime(metadata['session_date'], datetime_handler.DATE_FORMAT).date()
+            if not dry_run:
+                index.update(
+                    id=vector_id,
+                    set_metadata={
+                        "session_date_epoch_days": datetime_handler.to_epoch_days(session_date)
+                    },
+                    namespace=namespace
+                )
+            updated_vectors_count += 1
+    return updated_vectors_count
+
+def backfill_bucket(
+    pc: PineconeGRPC,
+    bucket_index: str,
+    dry_run: bool
+) -> int:
+    """
+    Backfills every session namespace in a bucket, and returns the number of vectors that were (or would be) updated.
+
+    Arguments:
+    pc – the Pinecone client.
+    bucket_index – the name of the bucket's index.
+    dry_run – whether the vectors should be left untouched.
+    """
+    index = pc.Index(bucket_index)
+    namespaces = list((index.describe_index_stats()['namespaces'] or {}).keys())
+    history_suffix = "".join(["-", PineconeClient.PRE_EXISTING_HISTORY_PREFIX])
+
+    updated_vectors_count = 0
+    for namespace_position, namespace in enumerate(namespaces, start=1):
+        if namespace.endswith(history_suffix):
+            # Pre-existing history vectors aren't associated with a session date.
+            continue
+
+        namespace_updates_count = backfill_namespace(
+            index=index,
+            namespace=namespace,
+            dry_run=dry_run
+        )
+        updated_vectors_count += namespace_updates_count
+        print(f"[Bucket {bucket_index}] {namespace_position}/{len(namespaces)} namespaces – {namespace_updates_count} vectors in {namespace}")
+    return updated_vectors_count
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill `session_date_epoch_days` on session vectors.")
+    parser.add_argument(
+        "-b", "--bucket",
+        help="The bucket to be backfilled. Defaults to every bucket in the project."
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Report the vectors that would be updated, without updating them."
+    )
+
+    args = parser.parse_args()
+    pc = PineconeGRPC(api_key=os.environ.get('PINECONE_API_KEY'))
+    bucket_indexes = [args.bucket] if args.bucket is not None else pc.list_indexes().names()
+
+    total_updated_vectors_count = 0
+    for bucket_index in bucket_indexes:
+        total_updated_vectors_count += backfill_bucket(
+            pc=pc,
+            bucket_index=bucket_index,
+            dry_run=args.dry_run
+        )
+
+    action = "Would update" if args.dry_run else "Updated"
+    print(f"\n{action} {total_updated_vectors_count} vectors across {len(bucket_indexes)} buckets")
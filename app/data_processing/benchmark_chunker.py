@@ -0,0 +1,140 @@
+import argparse, random, re, statistics, time
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from ..vectors import data_cleaner
+from ..vectors.text_chunker import TextChunker
+from ..vectors.tokenizer import Tokenizer
+
+"""
+Benchmarks the token-native chunker against the recursive character splitter (and multi-pass cleanup)
+it replaced, over synthetic session notes, and reports the speedup along with how closely their chunks match.
+
+Usage:
+python -m app.data_processing.benchmark_chunker [--sessions <count>] [--words <count>] [--seed <seed>]
+"""
+
+SENTENCES = [
+    "Patient reported improved sleep over the past two weeks.",
+    "They described a reduc-\ntion in anxiety before work meetings.",
+    "We reviewed the breathing exercises  — and discussed when to use them.",
+    "Therapist asked about the patient's relationship with their sister.",
+    "Patient felt that the self - care plan was hard to follow on weekends.",
+    "Homework: keep a thought journal, and bring it to the next session.",
+    "Patient: I don't know, it just feels like everything piles up at once.",
+    "Therapist: What's the first thing you notice when that happens?",
+]
+
+def build_session(
+    word_count: int,
+    rng: random.Random
+) -> str:
+    """
+    Builds a synthetic session with the given (approximate) number of words.
+
+    Arguments:
+    word_count – the approximate number of words in the session.
+    rng – the random number generator.
+    """
+    paragraphs = []
+    current_word_count = 0
+    while current_word_count < word_count:
+        sentences = rng.choices(SENTENCES, k=rng.randint(1, 6))
+        paragraph = "\n".join(sentences) if rng.random() < 0.3 else " ".join(sentences)
+        paragraphs.append(paragraph)
+        current_word_count += len(paragraph.split())
+    return "\n\n".join(paragraphs)
+
+def legacy_clean_up_text(content: str) -> str:
+    """
+    The multi-pass cleanup that `data_cleaner.clean_up_text` replaced, kept as the reference for its output.
+
+    Arguments:
+    content – text input.
+    """
+    # Fix hyphenated words broken by newline
+    content = re.sub(r'(\w+)-\n(\w+)', r'\1\2', content)
+
+    # Remove specific unwanted patterns and characters
+    unwanted_patterns = [
+        "\\n", "  —", "——————————", "—————————", "—————",
+        r'\\u[\dA-Fa-f]{4}', r'\uf075', r'\uf0b7'
+    ]
+    for pattern in unwanted_patterns:
+        content = re.sub(pattern, "", content)
+
+    # Fix improperly spaced hyphenated words and normalize whitespace
+    content = re.sub(r'(\w)\s*-\s*(\w)', r'\1-\2', content)
+    content = re.sub(r'\s+', ' ', content)
+
+    return content
+
+def legacy_split_text(
+    text: str,
+    tokenizer: Tokenizer,
+    chunk_size: int = TextChunker.CHUNK_SIZE
+) -> list[str]:
+    splitter = RecursiveCharacterTextSplitter(
+        separators=["\n\n", "\n", " ", ""],
+        chunk_size=chunk_size,
+        chunk_overlap=TextChunker.CHUNK_OVERLAP,
+        length_function=tokenizer.count_tokens,
+    )
+    return [legacy_clean_up_text(chunk) for chunk in splitter.split_text(text)]
+
+def run_benchmark(
+    sessions: list[str],
+    split_text
+) -> tuple[float, list[list[str]]]:
+    start_time = time.perf_counter()
+    chunks = [split_text(session) for session in sessions]
+    return (time.perf_counter() - start_time, chunks)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the token-native chunker against the legacy splitter.")
+    parser.add_argument(
+        "--sessions", type=int, default=20,
+        help="The number of synthetic sessions to be chunked."
+    )
+    parser.add_argument(
+        "--words", type=int, default=10000,
+        help="The approximate number of words per session."
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="The seed for generating sessions."
+    )
+
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    sessions = [build_session(args.words, rng) for _ in range(args.sessions)]
+
+    tokenizer = Tokenizer.shared()
+    chunker = TextChunker(tokenizer=tokenizer)
+    legacy_seconds, legacy_chunks = run_benchmark(
+        sessions,
+        lambda session: legacy_split_text(session, tokenizer)
+    )
+    chunker_seconds, chunker_chunks = run_benchmark(sessions, chunker.split_text)
+
+    for name, seconds, chunks in [
+        ("Legacy splitter", legacy_seconds, legacy_chunks),
+        ("Token chunker", chunker_seconds, chunker_chunks)
+    ]:
+        chunk_token_counts = tokenizer.count_tokens_batch([chunk for session in chunks for chunk in session])
+        print(
+            f"{name}: {seconds:.3f}s, {len(chunk_token_counts)} chunks, "
+            f"{statistics.mean(chunk_token_counts):.1f} mean tokens, {max(chunk_token_counts)} max tokens"
+        )
+
+    chunk_count_deltas = [
+        abs(len(new_chunks) - len(old_chunks)) / len(old_chunks)
+        for old_chunks, new_chunks in zip(legacy_chunks, chunker_chunks)
+    ]
+    print(f"\nSpeedup: {legacy_seconds / chunker_seconds:.1f}x")
+    print(f"Chunk count delta per session: {statistics.mean(chunk_count_deltas):.1%} mean, {max(chunk_count_deltas):.1%} max")
+
+    # Chunk hashes are computed over the chunk text, so any chunk that differs gets re-embedded on the session's next edit.
+    legacy_chunk_texts = set(chunk for session in legacy_chunks for chunk in session)
+    matching_chunks_count = sum(chunk in legacy_chunk_texts for session in chunker_chunks for chunk in session)
+    print(f"Chunks matching a legacy chunk: {matching_chunks_count / sum(map(len, chunker_chunks)):.1%}")
@@ -0,0 +1,302 @@
+import argparse, asyncio, os, random, statistics, time
+
+from dataclasses import dataclass
+from openai import AsyncOpenAI
+from pydantic import BaseModel
+from typing import Type
+
+from ..dependencies.dependency_container import OpenAIClient
+from ..internal.schemas import (
+    CombinedInsightsSchema,
+    ListQuestionSuggestionsSchema,
+    ListRecentTopicsSchema,
+    RecentTopicSchema,
+)
+from ..vectors.chartwise_assistant import COMBINED_INSIGHT_SECTIONS
+from ..vectors.message_templates import PromptCrafter, PromptScenario
+from ..vectors.tokenizer import Tokenizer
+
+"""
+Benchmarks generating a patient's recent topics, topics insights, presession briefing, and question
+suggestions with separate calls against generating them with a single combined call, over a synthetic
+context of the most recent sessions.
+
+By default only the prompts' input tokens get counted. With --live, both modes run against OpenAI
+(bypassing the completion cache), and their token usage and latency get reported.
+
+Usage:
+python -m app.data_processing.benchmark_insight_generation [--sessions <count>] [--chunks <count>] [--seed <seed>] [--live] [--runs <count>]
+"""
+
+CHUNK_SUMMARIES = [
+    "Patient reported improved sleep after keeping a consistent bedtime, though weekends remain difficult.",
+    "Patient described anxiety ahead of performance reviews at work, and practiced reframing catastrophic thoughts.",
+    "Discussed ongoing conflict with their sister over caring for their mother, and boundaries they'd like to set.",
+    "Patient has been journaling most days, and noticed their low moods cluster around Sunday evenings.",
+    "Reviewed breathing exercises, which the patient used twice before meetings with good results.",
+    "Patient is preparing for graduation, and feels pressure about not having a job lined up yet.",
+]
+PRE_EXISTING_HISTORY = (
+    "Patient was previously treated for generalized anxiety in 2021, with good response to CBT. "
+    "History of insomnia during periods of work stress. No hospitalizations."
+)
+PLACEHOLDER_TOPICS = ListRecentTopicsSchema(
+    topics=[
+        RecentTopicSchema(topic="Work anxiety", percentage="50%"),
+        RecentTopicSchema(topic="Family conflict", percentage="30%"),
+        RecentTopicSchema(topic="Sleep", percentage="20%"),
+    ]
+)
+LANGUAGE_CODE = "en-US"
+PATIENT_FIRST_NAME = "Alex"
+PATIENT_FULL_NAME = "Alex Doe"
+PATIENT_GENDER = "female"
+THERAPIST_NAME = "Sam"
+THERAPIST_GENDER = "male"
+
+@dataclass
+class ModeResult:
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    seconds: float = 0
+
+def build_sessions_context(
+    session_count: int,
+    chunks_per_session: int,
+    rng: random.Random
+) -> str:
+    """
+    Builds a synthetic context of the most recent sessions, in the format the vector store assembles it in.
+
+    Arguments:
+    session_count – the number of sessions in the context.
+    chunks_per_session – the number of chunk summaries per session.
+    rng – the random number generator.
+    """
+    context = ""
+    for session in range(session_count):
+        for chunk_summary in rng.choices(CHUNK_SUMMARIES, k=chunks_per_session):
+            context += f"`session_date` = October {20 - session}, 2024\n`chunk_summary` = {chunk_summary}\n"
+    return context
+
+async def run_separate(
+    context: str,
+    context_without_history: str,
+    openai_client: AsyncOpenAI | None,
+    tokenizer: Tokenizer
+) -> ModeResult:
+    prompt_crafter = PromptCrafter()
+    result = ModeResult()
+
+    recent_topics = await complete(
+        system_prompt=prompt_crafter.get_system_message_for_scenario(
+            scenario=PromptScenario.TOPICS,
+            language_code=LANGUAGE_CODE
+        ),
+        user_prompt=prompt_crafter.get_user_message_for_scenario(
+            scenario=PromptScenario.TOPICS,
+            context=context_without_history,
+            language_code=LANGUAGE_CODE,
+            patient_gender=PATIENT_GENDER,
+            patient_name=PATIENT_FULL_NAME,
+            query_input=f"What are the topics that have come up the most in {PATIENT_FULL_NAME}'s most recent sessions?"
+        ),
+        output_model=ListRecentTopicsSchema,
+        openai_client=openai_client,
+        tokenizer=tokenizer,
+        result=result
+    )
+    await complete(
+        system_prompt=prompt_crafter.get_system_message_for_scenario(
+            scenario=PromptScenario.TOPICS_INSIGHTS,
+            language_code=LANGUAGE_CODE
+        ),
+        user_prompt=prompt_crafter.get_user_message_for_scenario(
+            scenario=PromptScenario.TOPICS_INSIGHTS,
+            context=context_without_history,
+            language_code=LANGUAGE_CODE,
+            patient_gender=PATIENT_GENDER,
+            patient_name=PATIENT_FIRST_NAME,
+            query_input=(
+                "Please help me analyze the following set of topics that have recently come up during "
+                f"my sessions with {PATIENT_FIRST_NAME}, my patient:\n{(recent_topics or PLACEHOLDER_TOPICS).model_dump_json()}"
+            )
+        ),
+        output_model=None,
+        openai_client=openai_client,
+        tokenizer=tokenizer,
+        result=result
+    )
+    await complete(
+        system_prompt=prompt_crafter.get_system_message_for_scenario(
+            scenario=PromptScenario.PRESESSION_BRIEFING,
+            language_code=LANGUAGE_CODE,
+            therapist_name=THERAPIST_NAME,
+            therapist_gender=THERAPIST_GENDER,
+            patient_name=PATIENT_FIRST_NAME,
+            patient_gender=PATIENT_GENDER,
+            session_count=12
+        ),
+        user_prompt=prompt_crafter.get_user_message_for_scenario(
+            scenario=PromptScenario.PRESESSION_BRIEFING,
+            language_code=LANGUAGE_CODE,
+            patient_name=PATIENT_FIRST_NAME,
+            query_input=(
+                f"I'm coming up to speed with {PATIENT_FIRST_NAME}'s session notes. "
+                "What's most valuable for me to remember, and what would be good avenues "
+                "to explore in our upcoming session?"
+            ),
+            context=context
+        ),
+        output_model=None,
+        openai_client=openai_client,
+        tokenizer=tokenizer,
+        result=result
+    )
+    await complete(
+        system_prompt=prompt_crafter.get_system_message_for_scenario(
+            scenario=PromptScenario.QUESTION_SUGGESTIONS,
+            language_code=LANGUAGE_CODE
+        ),
+        user_prompt=prompt_crafter.get_user_message_for_scenario(
+            scenario=PromptScenario.QUESTION_SUGGESTIONS,
+            context=context,
+            language_code=LANGUAGE_CODE,
+            patient_gender=PATIENT_GENDER,
+            patient_name=PATIENT_FULL_NAME,
+            query_input=f"What are 2 questions about different topics that I could ask about {PATIENT_FULL_NAME}'s session history?"
+        ),
+        output_model=ListQuestionSuggestionsSchema,
+        openai_client=openai_client,
+        tokenizer=tokenizer,
+        result=result
+    )
+    return result
+
+async def run_combined(
+    context: str,
+    openai_client: AsyncOpenAI | None,
+    tokenizer: Tokenizer
+) -> ModeResult:
+    prompt_crafter = PromptCrafter()
+    result = ModeResult()
+    sections = [section for generator_sections in COMBINED_INSIGHT_SECTIONS.values() for section in generator_sections]
+    await complete(
+        system_prompt=prompt_crafter.get_system_message_for_scenario(
+            scenario=PromptScenario.COMBINED_INSIGHTS,
+            sections=sections,
+            language_code=LANGUAGE_CODE,
+            therapist_name=THERAPIST_NAME,
+            therapist_gender=THERAPIST_GENDER,
+            patient_name=PATIENT_FIRST_NAME,
+            patient_gender=PATIENT_GENDER,
+            session_count=12
+        ),
+        user_prompt=prompt_crafter.get_user_message_for_scenario(
+            scenario=PromptScenario.COMBINED_INSIGHTS,
+            context=context,
+            language_code=LANGUAGE_CODE,
+            patient_name=PATIENT_FULL_NAME,
+            patient_gender=PATIENT_GENDER,
+            sections=sections
+        ),
+        output_model=CombinedInsightsSchema,
+        openai_client=openai_client,
+        tokenizer=tokenizer,
+        result=result
+    )
+    return result
+
+async def complete(
+    system_prompt: str,
+    user_prompt: str,
+    output_model: Type[BaseModel] | None,
+    openai_client: AsyncOpenAI | None,
+    tokenizer: Tokenizer,
+    result: ModeResult
+):
+    result.calls += 1
+    if openai_client is None:
+        result.prompt_tokens += tokenizer.count_tokens(system_prompt) + tokenizer.count_tokens(user_prompt)
+        return None
+
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+    start_time = time.perf_counter()
+    if output_model is not None:
+        response = await openai_client.beta.chat.completions.parse(
+            model=OpenAIClient.LLM_MODEL,
+            messages=messages,
+            temperature=0,
+            response_format=output_model,
+        )
+    else:
+        response = await openai_client.chat.completions.create(
+            model=OpenAIClient.LLM_MODEL,
+            messages=messages,
+            temperature=0,
+        )
+    result.seconds += time.perf_counter() - start_time
+    result.prompt_tokens += response.usage.prompt_tokens
+    result.completion_tokens += response.usage.completion_tokens
+    return response.choices[0].message.parsed if output_model is not None else None
+
+async def run_benchmark(
+    args: argparse.Namespace
+) -> dict[str, list[ModeResult]]:
+    # The topics generators don't read the pre-existing history.
+    context_without_history = build_sessions_context(args.sessions, args.chunks, random.Random(args.seed))
+    context = f"Here's an outline of the patient's pre-existing history:\n{PRE_EXISTING_HISTORY}\n{context_without_history}"
+    openai_client = AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY")) if args.live else None
+    tokenizer = Tokenizer.shared()
+
+    results: dict[str, list[ModeResult]] = {"Separate calls": [], "Combined call": []}
+    for _ in range(args.runs if args.live else 1):
+        results["Separate calls"].append(await run_separate(context, context_without_history, openai_client, tokenizer))
+        results["Combined call"].append(await run_combined(context, openai_client, tokenizer))
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark combined insight generation against separate calls.")
+    parser.add_argument(
+        "--sessions", type=int, default=4,
+        help="The number of recent sessions in the context."
+    )
+    parser.add_argument(
+        "--chunks", type=int, default=6,
+        help="The number of chunk summaries per session."
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="The seed for generating the context."
+    )
+    parser.add_argument(
+        "--live", action="store_true",
+        help="Run the calls against OpenAI, and report their usage and latency."
+    )
+    parser.add_argument(
+        "--runs", type=int, default=3,
+        help="The number of live runs per mode."
+    )
+
+    args = parser.parse_args()
+    results = asyncio.run(run_benchmark(args))
+
+    for name, mode_results in results.items():
+        prompt_tokens = statistics.mean(result.prompt_tokens for result in mode_results)
+        line = f"{name}: {mode_results[0].calls} calls, {prompt_tokens:.0f} prompt tokens"
+        if args.live:
+            completion_tokens = statistics.mean(result.completion_tokens for result in mode_results)
+            seconds = statistics.mean(result.seconds for result in mode_results)
+            line += f", {completion_tokens:.0f} completion tokens, {seconds:.2f}s"
+        print(line)
+
+    separate, combined = results["Separate calls"], results["Combined call"]
+    prompt_token_ratio = statistics.mean(result.prompt_tokens for result in combined) / statistics.mean(result.prompt_tokens for result in separate)
+    print(f"\nCombined prompt tokens: {prompt_token_ratio:.1%} of separate")
+    if args.live:
+        latency_ratio = statistics.mean(result.seconds for result in combined) / statistics.mean(result.seconds for result in separate)
+        print(f"Combined latency: {latency_ratio:.1%} of separate")
@@ -1,16 +1,81 @@
 import os
 
 from celery import Celery
+from enum import Enum
+from kombu import Queue
+
+"""
+Celery app running the media processing pipelines (transcription, diarization and textraction) off
+the API process. The API records the upload and enqueues a task; workers run the pipeline and write
+the processing status back to the session row.
+
+Each queue gets its own workers, so that long audio jobs can't starve image jobs, and each pool's
+concurrency follows the external service it waits on:
+python -m app.data_processing.media_worker --queue audio
+python -m app.data_processing.media_worker --queue image
+
+Without a broker (or with CELERY_TASK_ALWAYS_EAGER=true, e.g. in tests) tasks run eagerly, in the
+API process, after the response is sent.
+"""
+
+class MediaQueue(Enum):
+    AUDIO = "audio"
+    IMAGE = "image"
+
+class MediaTask(Enum):
+    TRANSCRIBE_AUDIO = "media.transcribe_audio"
+    DIARIZE_AUDIO = "media.diarize_audio"
+    PROCESS_TEXTRACTION = "media.process_textraction"
+
+    @property
+    def queue(self) -> MediaQueue:
+        if self == MediaTask.PROCESS_TEXTRACTION:
+            return MediaQueue.IMAGE
+        return MediaQueue.AUDIO
+
+# Worker processes per queue.
+QUEUE_CONCURRENCY = {
+    MediaQueue.AUDIO: int(os.getenv("CELERY_AUDIO_QUEUE_CONCURRENCY", 4)),
+    MediaQueue.IMAGE: int(os.getenv("CELERY_IMAGE_QUEUE_CONCURRENCY", 8)),
+}
 
 redis_url = os.getenv('CELERY_BROKER_URL')
 
 celery_app = Celery(
     'chartwise',
     broker=redis_url,
-    backend=redis_url
+    backend=redis_url,
+    include=[f"{__package__}.media_tasks"]
+)
+celery_app.conf.update(
+    task_queues=[Queue(queue.value) for queue in MediaQueue],
+    task_routes={task.value: {"queue": task.queue.value} for task in MediaTask},
+    task_always_eager=(redis_url is None or os.getenv("CELERY_TASK_ALWAYS_EAGER", "").lower() == "true"),
+    task_serializer="json",
+    accept_content=["json"],
+    # A job is only acknowledged once it finishes, so that one lost along with its worker gets
+    # redelivered. Workers take one job at a time, since every job is long-running.
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
 )
 
-# example invocation in background add.delay(3, 4)
-@celery_app.task
-def add(x, y):
-    return x + y
+def is_eager() -> bool:
+    """
+    Returns a flag representing whether or not tasks run in-process, instead of going through the broker.
+    """
+    return bool(celery_app.conf.task_always_eager)
+
+def enqueue_media_task(
+    task: MediaTask,
+    task_arguments: dict
+) -> str:
+    """
+    Sends a media task to its queue.
+    Returns the task id.
+
+    Arguments:
+    task – the task to be sent.
+    task_arguments – the (JSON-serializable) keyword arguments of the task.
+    """
+    return celery_app.send_task(task.value, kwargs=task_arguments).id
@@ -0,0 +1,71 @@
+import asyncio
+
+from celery.signals import worker_process_shutdown
+from fastapi import BackgroundTasks, FastAPI
+from typing import Awaitable, Callable
+
+from .celery import MediaTask, celery_app
+from ..dependencies.dependency_container import dependency_container
+from ..internal.db.connection import connect_pool, disconnect_pool
+from ..internal.utilities.general_utilities import worker_request
+from ..managers.audio_processing_manager import AudioProcessingManager
+from ..managers.image_processing_manager import ImageProcessingManager
+
+"""
+Celery tasks running the media processing pipelines on the workers.
+
+Every worker process keeps one event loop, and a database pool on it, across the jobs it runs.
+The jobs themselves are the managers' methods, which write the processing status back to the
+session report when they finish (or fail).
+"""
+
+_worker_app = FastAPI()
+_worker_loop: asyncio.AbstractEventLoop | None = None
+
+@celery_app.task(name=MediaTask.TRANSCRIBE_AUDIO.value)
+def transcribe_audio(**task_arguments):
+    _run_job(AudioProcessingManager().transcribe_audio_and_save, task_arguments)
+
+@celery_app.task(name=MediaTask.DIARIZE_AUDIO.value)
+def diarize_audio(**task_arguments):
+    _run_job(AudioProcessingManager().diarize_audio_and_save, task_arguments)
+
+@celery_app.task(name=MediaTask.PROCESS_TEXTRACTION.value)
+def process_textraction(**task_arguments):
+    _run_job(ImageProcessingManager().process_textraction, task_arguments)
+
+@worker_process_shutdown.connect
+def _disconnect_worker_pool(**_):
+    if _worker_loop is not None and hasattr(_worker_app.state, "pool"):
+        _worker_loop.run_until_complete(disconnect_pool(_worker_app))
+
+def _run_job(
+    job: Callable[..., Awaitable],
+    task_arguments: dict
+):
+    global _worker_loop
+    if _worker_loop is None:
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+    _worker_loop.run_until_complete(_run_job_async(job, task_arguments))
+
+async def _run_job_async(
+    job: Callable[..., Awaitable],
+    task_arguments: dict
+):
+    if not hasattr(_worker_app.state, "pool"):
+        await connect_pool(
+            app=_worker_app,
+            secret_manager=dependency_container.inject_aws_secret_manager_client(),
+            resend_client=dependency_container.inject_resend_client(),
+        )
+
+    background_tasks = BackgroundTasks()
+    await job(
+        background_tasks=background_tasks,
+        request=worker_request(_worker_app),
+        **task_arguments
+    )
+
+    # Follow-up work scheduled by the job (e.g. draining the job outbox) completes before the task does.
+    await background_tasks()
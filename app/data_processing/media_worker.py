@@ -0,0 +1,34 @@
+import argparse
+
+from .celery import MediaQueue, QUEUE_CONCURRENCY, celery_app
+
+"""
+Starts a Celery worker consuming one of the media processing queues, with that queue's concurrency.
+
+Usage:
+python -m app.data_processing.media_worker --queue <audio|image> [--concurrency <processes>]
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Start a media processing worker.")
+    parser.add_argument(
+        "--queue", required=True, choices=[queue.value for queue in MediaQueue],
+        help="The queue to be consumed."
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=None,
+        help="The number of worker processes. Defaults to the queue's configured concurrency."
+    )
+
+    args = parser.parse_args()
+    queue = MediaQueue(args.queue)
+    concurrency = args.concurrency or QUEUE_CONCURRENCY[queue]
+    celery_app.worker_main(
+        argv=[
+            "worker",
+            f"--queues={queue.value}",
+            f"--concurrency={concurrency}",
+            f"--hostname={queue.value}@%h",
+            "--loglevel=INFO",
+        ]
+    )
@@ -0,0 +1,222 @@
+import argparse, json, os, time
+
+from pinecone.grpc import PineconeGRPC, GRPCIndex
+from redis import Redis
+
+from ..dependencies.core.redis_client_factory import RedisClientFactory
+from ..vectors.bucket_placement import BucketOverride, BucketPlacement
+
+"""
+Moves a user's vectors to another bucket while the app keeps serving them.
+
+The migration goes through the following phases, each of which is persisted in Redis so that an
+interrupted run can be resumed by re-running the same command:
+
+1. dual_write – reads stay on the source bucket, while writes go to both buckets.
+2. copy – every namespace of the user gets copied to the target bucket (throttled), and vectors that
+   were deleted from the source while copying are reconciled away.
+3. cutover – reads move to the target bucket, while writes still go to both (so a rollback loses nothing).
+4. completed – reads and writes only go to the target bucket. The source copy is deleted if requested.
+
+Between phases, the tool waits for every process's override cache to expire.
+
+Usage:
+python -m app.data_processing.migrate_pinecone_bucket --user-id <user_id> --target-bucket <bucket> [--max-vectors-per-second <n>] [--cleanup-source]
+"""
+
+MIGRATION_STATE_KEY_PREFIX = "pinecone_bucket_migration:"
+DUAL_WRITE_PHASE = "dual_write"
+CUTOVER_PHASE = "cutover"
+COMPLETED_PHASE = "completed"
+COPY_BATCH_SIZE = 100
+DEFAULT_MAX_VECTORS_PER_SECOND = 500
+PROPAGATION_MARGIN_SECONDS = 5
+
+def copy_namespace(
+    source_index: GRPCIndex,
+    target_index: GRPCIndex,
+    namespace: str,
+    max_vectors_per_second: int
+) -> int:
+    """
+    Copies a namespace across buckets, and returns the number of copied vectors.
+    Re-copying is safe, since upserts are idempotent.
+
+    Arguments:
+    source_index – the index the namespace gets copied from.
+    target_index – the index the namespace gets copied to.
+    namespace – the namespace to be copied.
+    max_vectors_per_second – the copy throughput limit, to leave room for live traffic.
+    """
+    source_ids = _list_vector_ids(source_index, namespace)
+
+    copied_vectors_count = 0
+    for i in range(0, len(source_ids), COPY_BATCH_SIZE):
+        batch_started_at = time.monotonic()
+        vectors = source_index.fetch(ids=source_ids[i:i + COPY_BATCH_SIZE], namespace=namespace)['vectors'] or {}
+        if len(vectors) > 0:
+            # Ids deleted in between listing and fetching are simply missing from the response.
+            target_index.upsert(
+                vectors=[
+                    {
+                        "id": vector_id,
+                        "values": list(vectors[vector_id]['values']),
+                        "metadata": vectors[vector_id]['metadata'],
+                    }
+                    for vector_id in vectors
+                ],
+                namespace=namespace
+            )
+        copied_vectors_count += len(vectors)
+
+        min_batch_seconds = len(vectors) / max_vectors_per_second
+        elapsed_seconds = time.monotonic() - batch_started_at
+        if elapsed_seconds < min_batch_seconds:
+            time.sleep(min_batch_seconds - elapsed_seconds)
+
+    # Writes are mirrored to both buckets by now, but a deletion that landed before dual writes
+    # propagated (and after we listed) would otherwise linger in the target.
+    source_ids = set(_list_vector_ids(source_index, namespace))
+    orphaned_ids = [vector_id for vector_id in _list_vector_ids(target_index, namespace) if vector_id not in source_ids]
+    for i in range(0, len(orphaned_ids), COPY_BATCH_SIZE):
+        target_index.delete(ids=orphaned_ids[i:i + COPY_BATCH_SIZE], namespace=namespace)
+    return copied_vectors_count
+
+def migrate_user(
+    pc: PineconeGRPC,
+    redis_client: Redis,
+    user_id: str,
+    target_bucket: str,
+    max_vectors_per_second: int,
+    cleanup_source: bool
+):
+    """
+    Runs (or resumes) the migration of a user's vectors to the target bucket.
+
+    Arguments:
+    pc – the Pinecone client.
+    redis_client – the client holding bucket overrides and migration state.
+    user_id – the user whose vectors are to be migrated.
+    target_bucket – the bucket the user is migrated to.
+    max_vectors_per_second – the copy throughput limit.
+    cleanup_source – whether the source bucket's copy should be deleted once the migration completes.
+    """
+    placement = BucketPlacement(redis_client=redis_client)
+    state_key = "".join([MIGRATION_STATE_KEY_PREFIX, user_id])
+    stored_state = redis_client.get(state_key)
+    if stored_state is not None:
+        state = json.loads(stored_state)
+        assert state['target_bucket'] == target_bucket, f"A migration to bucket {state['target_bucket']} is already in progress"
+        print(f"[Migration {user_id}] Resuming from phase {state['phase']}")
+    else:
+        source_bucket = placement.read_bucket(user_id)
+        if source_bucket == target_bucket:
+            print(f"[Migration {user_id}] Already placed in bucket {target_bucket}")
+            return
+        state = {
+            "source_bucket": source_bucket,
+            "target_bucket": target_bucket,
+            "phase": None,
+            "copied_namespaces": [],
+        }
+
+    def save_state(phase: str | None = None):
+        if phase is not None:
+            state['phase'] = phase
+        redis_client.set(state_key, json.dumps(state))
+
+    def enter_phase(phase: str, override: BucketOverride):
+        placement.set_override(user_id, override)
+        save_state(phase)
+        wait_seconds = BucketPlacement.OVERRIDE_CACHE_TTL_SECONDS + PROPAGATION_MARGIN_SECONDS
+        print(f"[Migration {user_id}] Entered phase {phase}, waiting {wait_seconds}s for it to propagate")
+        time.sleep(wait_seconds)
+
+    source_bucket = state['source_bucket']
+    source_index = pc.Index(source_bucket)
+    target_index = pc.Index(target_bucket)
+
+    if state['phase'] is None:
+        enter_phase(
+            DUAL_WRITE_PHASE,
+            BucketOverride(read_bucket=source_bucket, write_buckets=[source_bucket, target_bucket])
+        )
+
+    if state['phase'] == DUAL_WRITE_PHASE:
+        namespaces = _list_user_namespaces(source_index, user_id)
+        for namespace_position, namespace in enumerate(namespaces, start=1):
+            if namespace in state['copied_namespaces']:
+                continue
+
+            copied_vectors_count = copy_namespace(
+                source_index=source_index,
+                target_index=target_index,
+                namespace=namespace,
+                max_vectors_per_second=max_vectors_per_second
+            )
+            state['copied_namespaces'].append(namespace)
+            save_state()
+            print(f"[Migration {user_id}] {namespace_position}/{len(namespaces)} namespaces – copied {copied_vectors_count} vectors in {namespace}")
+
+        enter_phase(
+            CUTOVER_PHASE,
+            BucketOverride(read_bucket=target_bucket, write_buckets=[target_bucket, source_bucket])
+        )
+
+    if state['phase'] == CUTOVER_PHASE:
+        enter_phase(
+            COMPLETED_PHASE,
+            BucketOverride(read_bucket=target_bucket)
+        )
+
+    if cleanup_source:
+        for namespace in _list_user_namespaces(source_index, user_id):
+            source_index.delete(delete_all=True, namespace=namespace)
+        print(f"[Migration {user_id}] Deleted the source copy from bucket {source_bucket}")
+
+    # The override stays in place, since the user's hashed bucket is still the source.
+    redis_client.delete(state_key)
+    print(f"[Migration {user_id}] Completed, the user is now placed in bucket {target_bucket}")
+
+def _list_user_namespaces(
+    index: GRPCIndex,
+    user_id: str
+) -> list[str]:
+    namespaces = (index.describe_index_stats()['namespaces'] or {}).keys()
+    user_prefix = "".join([user_id, "-"])
+    return [namespace for namespace in namespaces if namespace.startswith(user_prefix)]
+
+def _list_vector_ids(
+    index: GRPCIndex,
+    namespace: str
+) -> list[str]:
+    vector_ids = []
+    for list_ids in index.list(namespace=namespace):
+        vector_ids.extend(list_ids)
+    return vector_ids
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate a user's vectors to another Pinecone bucket, online.")
+    parser.add_argument("--user-id", required=True, help="The user whose vectors are to be migrated.")
+    parser.add_argument("--target-bucket", required=True, help="The bucket the user is migrated to.")
+    parser.add_argument(
+        "--max-vectors-per-second", type=int, default=DEFAULT_MAX_VECTORS_PER_SECOND,
+        help="The copy throughput limit, to leave room for live traffic."
+    )
+    parser.add_argument(
+        "--cleanup-source", action="store_true",
+        help="Delete the user's vectors from the source bucket once the migration completes."
+    )
+
+    args = parser.parse_args()
+    redis_client = RedisClientFactory.get_client()
+    assert redis_client is not None, "Migrations require Redis (REDIS_HOST)"
+
+    migrate_user(
+        pc=PineconeGRPC(api_key=os.environ.get('PINECONE_API_KEY')),
+        redis_client=redis_client,
+        user_id=args.user_id,
+        target_bucket=args.target_bucket,
+        max_vectors_per_second=args.max_vectors_per_second,
+        cleanup_source=args.cleanup_source
+    )
@@ -5,6 +5,9 @@ from typing import Any, List, Optional
 
 from .aws_secret_manager_base_class import AwsSecretManagerBaseClass
 from .resend_base_class import ResendBaseClass
+from ...internal.db.job_outbox import OutboxJob
+from ...internal.db.patient_metrics import PatientMetricsDelta
+from ...internal.db.read_routing import DbReadRouting
 
 class AwsDbBaseClass(ABC):
 
@@ -14,7 +17,9 @@ class AwsDbBaseClass(ABC):
         user_id: str,
         request: Request,
         payload: dict[str, Any],
-        table_name: str
+        table_name: str,
+        patient_metrics_delta: PatientMetricsDelta | None = None,
+        outbox_jobs: list[OutboxJob] | None = None,
     ) -> Optional[dict]:
         """
         Inserts payload into a table.
@@ -24,6 +29,8 @@ class AwsDbBaseClass(ABC):
         request – the FastAPI request associated with the insert operation.
         payload – the payload to be inserted.
         table_name – the table into which the payload should be inserted.
+        patient_metrics_delta – the optional patient metrics delta to be applied in the same transaction as the insert.
+        outbox_jobs – the optional background jobs to be enqueued in the same transaction as the insert.
         """
         pass
 
@@ -46,6 +53,28 @@ class AwsDbBaseClass(ABC):
         """
         pass
 
+    @abstractmethod
+    async def replace_rows(
+        self,
+        user_id: str,
+        request: Request,
+        table_name: str,
+        filters: dict[str, Any],
+        payloads: list[dict[str, Any]],
+    ) -> list[dict]:
+        """
+        Deletes the rows that match the incoming filters, and inserts the incoming payloads in their
+        place, within a single transaction.
+
+        Arguments:
+        user_id – the current user ID.
+        request – the FastAPI request associated with the operation.
+        table_name – the table name.
+        filters – the set of filters matching the rows to be replaced.
+        payloads – the list of payloads to be inserted.
+        """
+        pass
+
     @abstractmethod
     async def update(
         self,
@@ -53,7 +82,9 @@ class AwsDbBaseClass(ABC):
         request: Request,
         payload: dict[str, Any],
         filters: dict[str, Any],
-        table_name: str
+        table_name: str,
+        patient_metrics_delta: PatientMetricsDelta | None = None,
+        outbox_jobs: list[OutboxJob] | None = None,
     ) -> list | None:
         """
         Updates a table with the incoming payload and filters.
@@ -64,6 +95,8 @@ class AwsDbBaseClass(ABC):
         payload – the payload to be updated.
         filters – the set of filters to be applied to the table.
         table_name – the table that should be updated.
+        patient_metrics_delta – the optional patient metrics delta to be applied to every updated row, in the same transaction as the update.
+        outbox_jobs – the optional background jobs to be enqueued for every updated row, in the same transaction as the update.
         """
         pass
 
@@ -119,7 +152,8 @@ class AwsDbBaseClass(ABC):
         table_name: str,
         filters: dict[str, Any] | None = None,
         limit: Optional[int] | None = None,
-        order_by: Optional[tuple[str, str]] | None = None
+        order_by: Optional[tuple[str, str]] | None = None,
+        read_routing: DbReadRouting = DbReadRouting.PRIMARY,
     ) -> list[dict]:
         """
         Fetches data from a table based on the incoming params.
@@ -132,6 +166,7 @@ class AwsDbBaseClass(ABC):
         table_name – the table to be queried.
         limit – the optional cap for count of results to be returned.
         order_by – the optional specification for column to sort by, and sort style.
+        read_routing – the hint for routing the read to the primary or to a read replica.
         """
         pass
 
@@ -142,7 +177,8 @@ class AwsDbBaseClass(ABC):
         request: Request,
         table_name: str,
         filters: dict[str, Any] | None = None,
-        order_by: Optional[tuple[str, str]] | None = None
+        order_by: Optional[tuple[str, str]] | None = None,
+        read_routing: DbReadRouting = DbReadRouting.PRIMARY,
     ) -> int:
         """
         Fetches the count of results matching the incoming params.
@@ -154,6 +190,7 @@ class AwsDbBaseClass(ABC):
         table_name – the table to be queried.
         limit – the optional cap for count of results to be returned.
         order_by – the optional specification for column to sort by, and sort style.
+        read_routing – the hint for routing the read to the primary or to a read replica.
         """
         pass
 
@@ -167,7 +204,8 @@ class AwsDbBaseClass(ABC):
         secret_manager: AwsSecretManagerBaseClass,
         request: Request,
         limit: Optional[int] | None = None,
-        order_by: Optional[tuple[str, str]] | None = None
+        order_by: Optional[tuple[str, str]] | None = None,
+        read_routing: DbReadRouting = DbReadRouting.PRIMARY,
     ) -> list[dict]:
         """
         Fetches data from a table based on the incoming params, using a stripe_reader connection.
@@ -181,6 +219,7 @@ class AwsDbBaseClass(ABC):
         request – the FastAPI request associated with the select operation.
         limit – the optional cap for count of results to be returned.
         order_by – the optional specification for column to sort by, and sort style.
+        read_routing – the hint for routing the read to the primary or to a read replica.
         """
         pass
 
@@ -203,6 +242,70 @@ class AwsDbBaseClass(ABC):
         """
         pass
 
+    @abstractmethod
+    async def claim_outbox_jobs(
+        self,
+        request: Request,
+        limit: int
+    ) -> list[OutboxJob]:
+        """
+        Claims runnable jobs from the outbox, at most one per patient.
+
+        Arguments:
+        request – the request (or worker context) associated with the claim.
+        limit – the maximum number of jobs to be claimed.
+        """
+        pass
+
+    @abstractmethod
+    async def complete_outbox_job(
+        self,
+        request: Request,
+        job: OutboxJob,
+        follow_up_jobs: list[OutboxJob] | None = None
+    ):
+        """
+        Marks an outbox job as completed, and enqueues its follow-up jobs in the same transaction.
+
+        Arguments:
+        request – the request (or worker context) associated with the job.
+        job – the completed job.
+        follow_up_jobs – the jobs to be run after the completed one, if any.
+        """
+        pass
+
+    @abstractmethod
+    async def fail_outbox_job(
+        self,
+        request: Request,
+        job: OutboxJob,
+        error: str
+    ) -> bool:
+        """
+        Records a failed attempt of an outbox job, and returns whether it will be retried.
+
+        Arguments:
+        request – the request (or worker context) associated with the job.
+        job – the failed job.
+        error – the description of the failure.
+        """
+        pass
+
+    @abstractmethod
+    async def release_outbox_job(
+        self,
+        request: Request,
+        job: OutboxJob
+    ):
+        """
+        Hands an outbox job that was interrupted by a shutdown back to the outbox, without counting the attempt.
+
+        Arguments:
+        request – the request (or worker context) associated with the job.
+        job – the interrupted job.
+        """
+        pass
+
     @abstractmethod
     async def set_session_user_id(
         self,
@@ -3,7 +3,7 @@ from abc import ABC, abstractmethod
 class AwsS3BaseClass(ABC):
 
     @abstractmethod
-    def initiate_multipart_audio_file_upload(
+    async def initiate_multipart_audio_file_upload(
         self,
         file_path: str,
         bucket_name: str | None
@@ -14,7 +14,7 @@ class AwsS3BaseClass(ABC):
         pass
 
     @abstractmethod
-    def retrieve_presigned_url_for_multipart_upload(
+    async def retrieve_presigned_url_for_multipart_upload(
         self,
         part_number: int,
         bucket_name: str | None,
@@ -27,7 +27,7 @@ class AwsS3BaseClass(ABC):
         pass
 
     @abstractmethod
-    def complete_multipart_audio_file_upload(
+    async def complete_multipart_audio_file_upload(
         self,
         file_path: str,
         upload_id: str,
@@ -40,7 +40,7 @@ class AwsS3BaseClass(ABC):
         pass
 
     @abstractmethod
-    def delete_file(
+    async def delete_file(
         self,
         source_bucket: str,
         storage_filepath: str
@@ -55,7 +55,7 @@ class AwsS3BaseClass(ABC):
         pass
 
     @abstractmethod
-    def upload_file(
+    async def upload_file(
         self,
         destination_bucket: str,
         storage_filepath: str,
@@ -72,7 +72,7 @@ class AwsS3BaseClass(ABC):
         pass
 
     @abstractmethod
-    def get_audio_file_read_signed_url(
+    async def get_audio_file_read_signed_url(
         self,
         bucket_name: str | None,
         file_path: str
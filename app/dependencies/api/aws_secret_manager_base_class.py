@@ -5,12 +5,60 @@ from .resend_base_class import ResendBaseClass
 class AwsSecretManagerBaseClass(ABC):
 
     @abstractmethod
-    async def get_secret(
+    def get_secret(
         self,
         secret_id: str,
         resend_client: ResendBaseClass,
     ) -> dict:
         """
-        Retrieves a secret.
+        Retrieves a secret. Secrets are cached for a limited time, so rotations are eventually picked up.
+
+        Arguments:
+        secret_id – the id of the secret.
+        resend_client – the client used for alerting on failures.
+        """
+        pass
+
+    @abstractmethod
+    async def get_secret_async(
+        self,
+        secret_id: str,
+        resend_client: ResendBaseClass,
+    ) -> dict:
+        """
+        Async variant of `get_secret`. Cache misses are fetched off the event loop.
+
+        Arguments:
+        secret_id – the id of the secret.
+        resend_client – the client used for alerting on failures.
+        """
+        pass
+
+    @abstractmethod
+    def get_cached_secret(
+        self,
+        secret_id: str,
+        resend_client: ResendBaseClass,
+    ) -> dict:
+        """
+        Non-blocking variant of `get_secret`, for sync callers on the event loop. Expired values are
+        served while they get refreshed in the background. Only blocks if the secret was never fetched.
+
+        Arguments:
+        secret_id – the id of the secret.
+        resend_client – the client used for alerting on failures.
+        """
+        pass
+
+    @abstractmethod
+    def invalidate_secret(
+        self,
+        secret_id: str,
+    ):
+        """
+        Marks the cached value of a secret as expired, so that the next read refreshes it (i.e. after a rotation).
+
+        Arguments:
+        secret_id – the id of the secret.
         """
         pass
@@ -58,3 +58,72 @@ class InfluxBaseClass(ABC):
         kwargs – the set of optional parameters to be sent into the method.
         """
         pass
+
+    @abstractmethod
+    def log_cache_access(
+        self,
+        cache_name: str,
+        hit: bool,
+        **kwargs
+    ):
+        """
+        Logs data about a cache lookup.
+
+        Arguments:
+        cache_name – the name of the cache.
+        hit – whether the lookup was served from the cache.
+        kwargs – the set of optional parameters to be sent into the method.
+        """
+        pass
+
+    @abstractmethod
+    def log_db_query(
+        self,
+        operation: str,
+        table_name: str,
+        pool_role: str,
+        acquire_wait_time: float,
+        session_setup_time: float,
+        query_time: float,
+        row_count: int,
+        **kwargs
+    ):
+        """
+        Logs data about a database operation, and the state of the pool that served it.
+
+        Arguments:
+        operation – the database operation (i.e. select, insert, update).
+        table_name – the table targeted by the operation.
+        pool_role – the role of the pool that served the operation (i.e. primary, replica).
+        acquire_wait_time – the time spent waiting for a connection.
+        session_setup_time – the time spent setting up the connection's session (i.e. the RLS user).
+        query_time – the time spent running the statement.
+        row_count – the number of rows returned by the statement.
+        kwargs – the set of optional parameters to be sent into the method (i.e. pool_size, pool_idle_size, pool_max_size).
+        """
+        pass
+
+    @abstractmethod
+    def log_scheduled_job(
+        self,
+        pool_name: str,
+        outcome: str,
+        queue_wait_time: float,
+        run_time: float,
+        queued: int,
+        running: int,
+        **kwargs
+    ):
+        """
+        Logs data about a background job, and the state of the scheduler pool that ran it.
+
+        Arguments:
+        pool_name – the name of the pool that ran the job.
+        outcome – the job's outcome (i.e. completed, failed, timed_out, abandoned).
+        queue_wait_time – the time the job spent waiting for a slot in the pool.
+        run_time – the time the job spent running.
+        queued – the number of jobs waiting in the pool.
+        running – the number of jobs running in the pool.
+        kwargs – the set of optional parameters to be sent into the method.
+        """
+        pass
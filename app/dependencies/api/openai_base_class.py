@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
 from langchain.schema import BaseMessage
 from pydantic import BaseModel
-from typing import AsyncIterable, Awaitable, Callable, Type
+from typing import AsyncIterable, Awaitable, Callable, Type, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Imported for typing only, the templates module depends on the dependency container.
+    from ...vectors.message_templates import PromptScenario
 
 class OpenAIBaseClass(ABC):
 
@@ -16,15 +20,18 @@ class OpenAIBaseClass(ABC):
         self,
         max_tokens: int,
         messages: list,
-        expected_output_model: Type[BaseModel] | None = None
+        expected_output_model: Type[BaseModel] | None = None,
+        prompt_scenario: "PromptScenario | None" = None
     ) -> BaseModel | str:
         """
         Invokes a chat completion asynchronously.
+        Completions are deterministic, so identical requests may be served from a cache.
 
         Arguments:
         max_tokens – the max tokens allowed for the response output.
         messages – the set of message prompts.
         expected_output_model – the optional output model expected from the completion.
+        prompt_scenario – the scenario that generated the prompt, used for tagging cache metrics.
         """
         pass
 
@@ -37,7 +44,7 @@ class OpenAIBaseClass(ABC):
         is_first_message_in_conversation: bool,
         patient_name: str,
         patient_gender: str | None,
-        calculate_max_tokens: Callable[[str, str], Awaitable[int]],
+        calculate_max_tokens: Callable[[str, str, str | None], Awaitable[int]],
         last_session_date: str | None = None
     ) -> AsyncIterable[str]:
         """
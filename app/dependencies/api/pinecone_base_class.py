@@ -20,7 +20,8 @@ class PineconeBaseClass(ABC):
         session_report_id: str,
         openai_client: OpenAIBaseClass,
         summarize_chunk: Callable,
-        therapy_session_date: date | None = None
+        therapy_session_date: date | None = None,
+        summarize_chunks: Callable | None = None
     ) -> list[str]:
         """
         Inserts a new record to the store leveraging the incoming data.
@@ -34,6 +35,7 @@ class PineconeBaseClass(ABC):
         openai_client – the openai client to be leveraged internally.
         summarize_chunk – a callable method used to summarize chunks.
         therapy_session_date – the session_date to be used as metadata (only when scenario is NEW_SESSION).
+        summarize_chunks – an optional callable method used to summarize all chunks at once, in place of summarize_chunk.
         """
         pass
 
@@ -92,6 +94,22 @@ class PineconeBaseClass(ABC):
         """
         pass
 
+    @abstractmethod
+    async def delete_patients_vectors(
+        self,
+        user_id: str,
+        patient_ids: list[str],
+    ):
+        """
+        Deletes all vectors (session and pre-existing history) for a set of patients,
+        deleting their namespaces concurrently.
+
+        Arguments:
+        user_id – the user id associated with the operation.
+        patient_ids – the ids of the patients whose vectors should be deleted.
+        """
+        pass
+
     @abstractmethod
     async def update_session_vectors(
         self,
@@ -102,10 +120,12 @@ class PineconeBaseClass(ABC):
         new_date: date,
         session_report_id: str,
         openai_client: OpenAIBaseClass,
-        summarize_chunk: Callable
-    ):
+        summarize_chunk: Callable,
+        summarize_chunks: Callable | None = None
+    ) -> list[str]:
         """
-        Updates a session record leveraging the incoming data.
+        Updates a session record leveraging the incoming data, and returns the session's vector ids.
+        Only chunks whose content changed get summarized and embedded again.
 
         Arguments:
         user_id – the user id associated with the operation.
@@ -115,6 +135,8 @@ class PineconeBaseClass(ABC):
         session_report_id – the session report id.
         openai_client – the openai client to be leveraged internally.
         summarize_chunk – a callable method used to summarize chunks.
+        summarize_chunks – an optional callable method used to summarize all chunks at once, in place of summarize_chunk.
+        It gets the summaries of the reused chunks too, and None for the chunks it has to summarize.
         """
         pass
 
@@ -151,7 +173,8 @@ class PineconeBaseClass(ABC):
         rerank_vectors: bool,
         request: Request,
         include_preexisting_history: bool = True,
-        session_dates_overrides: list[PineconeQuerySessionDateOverride] | None = None
+        session_dates_overrides: list[PineconeQuerySessionDateOverride] | None = None,
+        context_token_budget: int | None = None
     ) -> str:
         """
         Retrieves the vector context associated with the incoming query_input.
@@ -167,6 +190,7 @@ class PineconeBaseClass(ABC):
         request – the FastAPI request associated with the operation.
         include_preexisting_history – flag determinig whether the context will include the patient's preexisting history.
         session_dates_overrides – the optional override for including session-date-specific vectors.
+        context_token_budget – the optional maximum number of tokens in the context, lower priority sections get dropped past it.
         """
         pass
 
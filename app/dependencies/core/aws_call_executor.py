@@ -0,0 +1,74 @@
+import asyncio
+import functools
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+class AwsCallExecutor:
+    """
+    A bounded, process-wide thread pool for blocking AWS SDK calls, so that they never run on the event loop.
+    The pool is sized to match the boto3 clients' connection pools, so that every worker can reuse a connection.
+    """
+    MAX_WORKERS = 16
+    DEFAULT_TIMEOUT_SECONDS = 15
+    _lock = threading.Lock()
+    _executor = None
+
+    @classmethod
+    async def run(
+        cls,
+        func: Callable[..., Any],
+        *args,
+        timeout_seconds: float | None = None,
+        **kwargs
+    ) -> Any:
+        """
+        Runs the incoming blocking function in the pool, and awaits its result.
+
+        Arguments:
+        func – the blocking function to be run.
+        args – the positional arguments for the function.
+        timeout_seconds – the optional timeout for the call. Falls back to `DEFAULT_TIMEOUT_SECONDS`.
+        kwargs – the keyword arguments for the function.
+        """
+        future = asyncio.get_running_loop().run_in_executor(
+            cls._get_executor(),
+            functools.partial(func, *args, **kwargs)
+        )
+        try:
+            return await asyncio.wait_for(
+                future,
+                timeout=cls.DEFAULT_TIMEOUT_SECONDS if timeout_seconds is None else timeout_seconds
+            )
+        except asyncio.TimeoutError as e:
+            # The worker keeps running until the SDK's own socket timeouts kick in, but the caller is released.
+            raise TimeoutError(f"AWS call {getattr(func, '__name__', func)} timed out") from e
+
+    @classmethod
+    def run_in_background(
+        cls,
+        func: Callable[..., Any],
+        *args,
+        **kwargs
+    ) -> Future:
+        """
+        Schedules the incoming blocking function in the pool, without waiting for its result.
+
+        Arguments:
+        func – the blocking function to be run.
+        args – the positional arguments for the function.
+        kwargs – the keyword arguments for the function.
+        """
+        return cls._get_executor().submit(func, *args, **kwargs)
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        if cls._executor is None:
+            with cls._lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=cls.MAX_WORKERS,
+                        thread_name_prefix="aws-call"
+                    )
+        return cls._executor
@@ -2,11 +2,19 @@ import boto3
 import os
 import threading
 
+from botocore.config import Config
 from datetime import datetime, timedelta, timezone
 
+from .aws_call_executor import AwsCallExecutor
 from ...internal.schemas import PROD_ENVIRONMENT, STAGING_ENVIRONMENT
 
 class Boto3ClientFactory:
+    # Socket timeouts bound how long an executor worker can be held by a single call.
+    CLIENT_CONFIG = Config(
+        connect_timeout=5,
+        read_timeout=10,
+        max_pool_connections=AwsCallExecutor.MAX_WORKERS,
+    )
     _lock = threading.Lock()
     _clients = {}
     _expiration = None
@@ -34,7 +42,8 @@ class Boto3ClientFactory:
                     aws_access_key_id=cls._creds['AccessKeyId'],
                     aws_secret_access_key=cls._creds['SecretAccessKey'],
                     aws_session_token=cls._creds['SessionToken'],
-                    region_name=client_region_name
+                    region_name=client_region_name,
+                    config=cls.CLIENT_CONFIG,
                 )
             return cls._clients[service_name]
 
@@ -42,7 +51,8 @@ class Boto3ClientFactory:
         if service_name not in cls._clients:
             cls._clients[service_name] = boto3.client(
                 service_name,
-                region_name=client_region_name
+                region_name=client_region_name,
+                config=cls.CLIENT_CONFIG,
             )
         return cls._clients[service_name]
 
@@ -0,0 +1,60 @@
+import os
+import threading
+
+from redis import Redis as SyncRedis
+from redis.asyncio import Redis
+
+class RedisClientFactory:
+    """
+    Lazily creates the process-wide Redis clients used for shared caches and coordination state.
+    Redis is an optional tier, so callers get None when it isn't configured.
+    """
+    SOCKET_TIMEOUT_SECONDS = 0.5
+    _lock = threading.Lock()
+    _client = None
+    _sync_client = None
+
+    @classmethod
+    def get_async_client(cls) -> Redis | None:
+        host = os.environ.get("REDIS_HOST")
+        if host is None or len(host) == 0:
+            return None
+
+        if cls._client is None:
+            with cls._lock:
+                if cls._client is None:
+                    cls._client = Redis(
+                        host=host,
+                        port=int(os.environ.get("REDIS_PORT", 6379)),
+                        password=os.environ.get("REDIS_AUTH_TOKEN"),
+                        db=0,
+                        ssl=True,
+                        ssl_check_hostname=False,
+                        socket_connect_timeout=cls.SOCKET_TIMEOUT_SECONDS,
+                        socket_timeout=cls.SOCKET_TIMEOUT_SECONDS,
+                    )
+        return cls._client
+
+    @classmethod
+    def get_client(cls) -> SyncRedis | None:
+        """
+        Returns the blocking client, for callers that can't await (i.e. sync code running in the threadpool).
+        """
+        host = os.environ.get("REDIS_HOST")
+        if host is None or len(host) == 0:
+            return None
+
+        if cls._sync_client is None:
+            with cls._lock:
+                if cls._sync_client is None:
+                    cls._sync_client = SyncRedis(
+                        host=host,
+                        port=int(os.environ.get("REDIS_PORT", 6379)),
+                        password=os.environ.get("REDIS_AUTH_TOKEN"),
+                        db=0,
+                        ssl=True,
+                        ssl_check_hostname=False,
+                        socket_connect_timeout=cls.SOCKET_TIMEOUT_SECONDS,
+                        socket_timeout=cls.SOCKET_TIMEOUT_SECONDS,
+                    )
+        return cls._sync_client
@@ -52,12 +52,18 @@ class DependencyContainer:
 
     def inject_openai_client(self) -> OpenAIBaseClass:
         if self._openai_client is None:
-            self._openai_client = FakeAsyncOpenAI() if self._testing_environment else OpenAIClient()
+            self._openai_client = FakeAsyncOpenAI() if self._testing_environment else OpenAIClient(
+                encryptor=self.inject_chartwise_encryptor(),
+                influx_client=self.inject_influx_client(),
+            )
         return self._openai_client
 
     def inject_pinecone_client(self) -> PineconeBaseClass:
         if self._pinecone_client is None:
-            self._pinecone_client = FakePineconeClient() if self._testing_environment else PineconeClient(encryptor=self.inject_chartwise_encryptor())
+            self._pinecone_client = FakePineconeClient() if self._testing_environment else PineconeClient(
+                encryptor=self.inject_chartwise_encryptor(),
+                influx_client=self.inject_influx_client(),
+            )
         return self._pinecone_client
 
     def inject_docupanda_client(self) -> DocupandaBaseClass:
@@ -94,7 +100,10 @@ class DependencyContainer:
     def inject_aws_db_client(self) -> AwsDbBaseClass:
         if self._aws_db_client is None:
             chartwise_encryptor = self.inject_chartwise_encryptor()
-            self._aws_db_client = FakeAwsDbClient() if self._testing_environment else AwsDbClient(encryptor=chartwise_encryptor)
+            self._aws_db_client = FakeAwsDbClient() if self._testing_environment else AwsDbClient(
+                encryptor=chartwise_encryptor,
+                influx_client=self.inject_influx_client(),
+            )
         return self._aws_db_client
 
     def inject_aws_kms_client(self) -> AwsKmsBaseClass:
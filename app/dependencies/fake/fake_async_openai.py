@@ -1,19 +1,26 @@
-import asyncio
+import asyncio, re
 
 from langchain.callbacks import AsyncIteratorCallbackHandler
 from langchain.schema import HumanMessage
 from langchain_core.messages.ai import AIMessage
 from pydantic import BaseModel
-from typing import AsyncIterable, Awaitable, Callable, Type
+from typing import AsyncIterable, Awaitable, Callable, Type, TYPE_CHECKING
 
 from ..api.openai_base_class import OpenAIBaseClass
 from ...internal.schemas import (
+    CombinedInsightsSchema,
+    CombinedRecentTopicSchema,
+    ListPackedChunkSummariesSchema,
+    PackedChunkSummarySchema,
     TimeTokensExtractionSchema,
     ListRecentTopicsSchema,
     ListQuestionSuggestionsSchema,
     RecentTopicSchema,
 )
 
+if TYPE_CHECKING:
+    from ...vectors.message_templates import PromptScenario
+
 FAKE_ASSISTANT_RESPONSE = "This is my fake response"
 
 class FakeResponse(BaseModel):
@@ -67,6 +74,7 @@ class FakeAsyncOpenAI(OpenAIBaseClass):
         max_tokens: int,
         messages: list,
         expected_output_model: Type[BaseModel] | None = None,
+        prompt_scenario: "PromptScenario | None" = None,
     ) -> BaseModel | str:
         if self.throws_exception:
             raise Exception("Fake exception")
@@ -87,6 +95,22 @@ class FakeAsyncOpenAI(OpenAIBaseClass):
                 questions=["my fake question"],
             )
 
+        if expected_output_model is ListPackedChunkSummariesSchema:
+            return ListPackedChunkSummariesSchema(
+                summaries=[
+                    PackedChunkSummarySchema(chunk_id=chunk_id, summary="my fake summary")
+                    for chunk_id in re.findall(r'<chunk id="([^"]+)">', messages[-1]["content"])
+                ],
+            )
+
+        if expected_output_model is CombinedInsightsSchema:
+            return CombinedInsightsSchema(
+                recent_topics=[CombinedRecentTopicSchema(topic="fakeTopic", percentage="100%")],
+                recent_topics_insights="my fake topics insights",
+                presession_briefing="my fake briefing",
+                question_suggestions=["my fake question"],
+            )
+
         return "my fake summary"
 
     async def stream_chat_completion(
@@ -97,7 +121,7 @@ class FakeAsyncOpenAI(OpenAIBaseClass):
         is_first_message_in_conversation: bool,
         patient_name: str,
         patient_gender: str | None,
-        calculate_max_tokens: Callable[[str, str], Awaitable[int]],
+        calculate_max_tokens: Callable[[str, str, str | None], Awaitable[int]],
         last_session_date: str | None = None
     ) -> AsyncIterable[str]:
         async def wrap_done(fn: Awaitable, event: asyncio.Event):
@@ -7,6 +7,9 @@ from typing import Any, List, Optional
 from ..api.aws_db_base_class import AwsDbBaseClass
 from ..api.aws_secret_manager_base_class import AwsSecretManagerBaseClass
 from ..api.resend_base_class import ResendBaseClass
+from ...internal.db.job_outbox import OutboxJob
+from ...internal.db.patient_metrics import PatientMetricsDelta
+from ...internal.db.read_routing import DbReadRouting
 from ...internal.schemas import (
     ENCRYPTED_PATIENT_ATTENDANCE_TABLE_NAME,
     ENCRYPTED_PATIENT_BRIEFINGS_TABLE_NAME,
@@ -28,29 +31,30 @@ class FakeAwsDbClient(AwsDbBaseClass):
     invoked_delete_patients = False
     return_no_subscription_data: bool = False
     return_freemium_usage_above_limit: bool = False
+    last_patient_metrics_delta: PatientMetricsDelta | None = None
+
+    def __init__(self):
+        self.pending_outbox_jobs: list[OutboxJob] = []
+        self.completed_outbox_jobs: list[OutboxJob] = []
+        self.failed_outbox_jobs: list[OutboxJob] = []
+        self._next_outbox_job_id = 1
 
     async def insert(
         self,
         user_id: str,
         request: Request,
         payload: dict[str, Any],
-        table_name: str
+        table_name: str,
+        patient_metrics_delta: PatientMetricsDelta | None = None,
+        outbox_jobs: list[OutboxJob] | None = None,
     ) -> Optional[dict]:
-        if not self.select_returns_data:
-            return {}
+        if patient_metrics_delta is not None:
+            self.last_patient_metrics_delta = patient_metrics_delta
 
-        if table_name == ENCRYPTED_PATIENTS_TABLE_NAME:
-            return {
-                "id": self.FAKE_PATIENT_ID,
-                "first_name": "foo",
-                "last_name": "bar",
-            }
-        if table_name == ENCRYPTED_SESSION_REPORTS_TABLE_NAME:
-            return {
-                "id": self.FAKE_SESSION_NOTES_ID,
-                "patient_id": self.FAKE_PATIENT_ID,
-                "therapist_id": self.FAKE_THERAPIST_ID,
-            }
+        row = self._inserted_row(table_name)
+        if row:
+            self._enqueue_outbox_jobs(outbox_jobs, written_row=row)
+        return row
 
     async def batch_insert(
         self,
@@ -61,48 +65,33 @@ class FakeAwsDbClient(AwsDbBaseClass):
     ) -> list[dict]:
         return [{}]
 
+    async def replace_rows(
+        self,
+        user_id: str,
+        request: Request,
+        table_name: str,
+        filters: dict[str, Any],
+        payloads: list[dict[str, Any]],
+    ) -> list[dict]:
+        return payloads
+
     async def update(
         self,
         user_id: str,
         request: Request,
         payload: dict[str, Any],
         filters: dict[str, Any],
-        table_name: str
+        table_name: str,
+        patient_metrics_delta: PatientMetricsDelta | None = None,
+        outbox_jobs: list[OutboxJob] | None = None,
     ) -> list | None:
-        if table_name == THERAPISTS_TABLE_NAME:
-            return [
-                {
-                    "id": self.FAKE_THERAPIST_ID,
-                    "email": "myFakeEmail",
-                    "first_name": "foo",
-                    "last_name": "bar",
-                    "language_preference": "en-US",
-                    "gender": "male",
-                }
-            ]
-        if table_name == ENCRYPTED_SESSION_REPORTS_TABLE_NAME:
-            return [
-                {
-                    "id": self.FAKE_SESSION_NOTES_ID,
-                    "patient_id": self.FAKE_PATIENT_ID,
-                    "therapist_id": self.FAKE_THERAPIST_ID,
-                    "session_date": date(2024, 10, 10),
-                    "notes_text": "These are my notes",
-                    "template": "soap"
-                }
-            ]
-        if table_name == ENCRYPTED_PATIENTS_TABLE_NAME:
-            if "is_soft_deleted" in payload and payload.get("is_soft_deleted"):
-                self.invoked_delete_patients = True
-            return [
-                {
-                    "id": self.FAKE_PATIENT_ID,
-                    "first_name": "foo",
-                    "last_name": "bar",
-                    "therapist_id": self.FAKE_THERAPIST_ID,
-                }
-            ]
-        return []
+        if patient_metrics_delta is not None:
+            self.last_patient_metrics_delta = patient_metrics_delta
+
+        rows = self._updated_rows(payload, table_name)
+        for row in rows:
+            self._enqueue_outbox_jobs(outbox_jobs, written_row=row)
+        return rows
 
     async def upsert(
         self,
@@ -133,7 +122,8 @@ class FakeAwsDbClient(AwsDbBaseClass):
         table_name: str,
         filters: dict[str, Any] | None = None,
         limit: Optional[int] = None,
-        order_by: Optional[tuple[str, str]] = None
+        order_by: Optional[tuple[str, str]] = None,
+        read_routing: DbReadRouting = DbReadRouting.PRIMARY,
     ) -> list[dict]:
         if not self.select_returns_data:
             return []
@@ -278,7 +268,8 @@ class FakeAwsDbClient(AwsDbBaseClass):
         request: Request,
         table_name: str,
         filters: dict[str, Any] | None = None,
-        order_by: Optional[tuple[str, str]] = None
+        order_by: Optional[tuple[str, str]] = None,
+        read_routing: DbReadRouting = DbReadRouting.PRIMARY,
     ) -> int:
         return 100 if self.return_freemium_usage_above_limit else 1
 
@@ -291,7 +282,8 @@ class FakeAwsDbClient(AwsDbBaseClass):
         secret_manager: AwsSecretManagerBaseClass,
         request: Request,
         limit: Optional[int] = None,
-        order_by: Optional[tuple[str, str]] = None
+        order_by: Optional[tuple[str, str]] = None,
+        read_routing: DbReadRouting = DbReadRouting.PRIMARY,
     ) -> list[dict]:
         if not self.select_returns_data:
             return []
@@ -325,3 +317,125 @@ class FakeAwsDbClient(AwsDbBaseClass):
         user_id: str
     ):
         pass
+
+    async def claim_outbox_jobs(
+        self,
+        request: Request,
+        limit: int
+    ) -> list[OutboxJob]:
+        claimed_jobs = []
+        claimed_patient_ids = set()
+        for job in self.pending_outbox_jobs:
+            if len(claimed_jobs) == limit:
+                break
+            if job.patient_id in claimed_patient_ids:
+                continue
+            claimed_patient_ids.add(job.patient_id)
+            claimed_jobs.append(job)
+
+        for job in claimed_jobs:
+            self.pending_outbox_jobs.remove(job)
+            job.attempts += 1
+        return claimed_jobs
+
+    async def complete_outbox_job(
+        self,
+        request: Request,
+        job: OutboxJob,
+        follow_up_jobs: list[OutboxJob] | None = None
+    ):
+        self.completed_outbox_jobs.append(job)
+        self._enqueue_outbox_jobs(follow_up_jobs, written_row=None)
+
+    async def fail_outbox_job(
+        self,
+        request: Request,
+        job: OutboxJob,
+        error: str
+    ) -> bool:
+        self.failed_outbox_jobs.append(job)
+        return False
+
+    async def release_outbox_job(
+        self,
+        request: Request,
+        job: OutboxJob
+    ):
+        job.attempts -= 1
+        self.pending_outbox_jobs.insert(0, job)
+
+    # Private
+
+    def _enqueue_outbox_jobs(
+        self,
+        outbox_jobs: list[OutboxJob] | None,
+        written_row: dict | None
+    ):
+        for outbox_job in outbox_jobs or []:
+            job = outbox_job.bound_to(written_row)
+            # Payloads go through JSON in the outbox table.
+            job.payload = json.loads(json.dumps(job.payload, default=str))
+            job.id = self._next_outbox_job_id
+            self._next_outbox_job_id += 1
+            self.pending_outbox_jobs.append(job)
+
+    def _inserted_row(
+        self,
+        table_name: str
+    ) -> dict | None:
+        if not self.select_returns_data:
+            return {}
+
+        if table_name == ENCRYPTED_PATIENTS_TABLE_NAME:
+            return {
+                "id": self.FAKE_PATIENT_ID,
+                "first_name": "foo",
+                "last_name": "bar",
+            }
+        if table_name == ENCRYPTED_SESSION_REPORTS_TABLE_NAME:
+            return {
+                "id": self.FAKE_SESSION_NOTES_ID,
+                "patient_id": self.FAKE_PATIENT_ID,
+                "therapist_id": self.FAKE_THERAPIST_ID,
+            }
+        return None
+
+    def _updated_rows(
+        self,
+        payload: dict[str, Any],
+        table_name: str
+    ) -> list[dict]:
+        if table_name == THERAPISTS_TABLE_NAME:
+            return [
+                {
+                    "id": self.FAKE_THERAPIST_ID,
+                    "email": "myFakeEmail",
+                    "first_name": "foo",
+                    "last_name": "bar",
+                    "language_preference": "en-US",
+                    "gender": "male",
+                }
+            ]
+        if table_name == ENCRYPTED_SESSION_REPORTS_TABLE_NAME:
+            return [
+                {
+                    "id": self.FAKE_SESSION_NOTES_ID,
+                    "patient_id": self.FAKE_PATIENT_ID,
+                    "therapist_id": self.FAKE_THERAPIST_ID,
+                    "session_date": date(2024, 10, 10),
+                    "notes_text": "These are my notes",
+                    "template": "soap"
+                }
+            ]
+        if table_name == ENCRYPTED_PATIENTS_TABLE_NAME:
+            if "is_soft_deleted" in payload and payload.get("is_soft_deleted"):
+                self.invoked_delete_patients = True
+            return [
+                {
+                    "id": self.FAKE_PATIENT_ID,
+                    "first_name": "foo",
+                    "last_name": "bar",
+                    "therapist_id": self.FAKE_THERAPIST_ID,
+                }
+            ]
+        return []
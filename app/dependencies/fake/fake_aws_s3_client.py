@@ -4,14 +4,14 @@ class FakeAwsS3Client(AwsS3BaseClass):
 
     get_audio_file_read_signed_url_invoked = False
 
-    def initiate_multipart_audio_file_upload(
+    async def initiate_multipart_audio_file_upload(
         self,
         file_path: str,
         bucket_name: str | None
     ) -> dict:
         return {"url": "myFakeUrl"}
 
-    def retrieve_presigned_url_for_multipart_upload(
+    async def retrieve_presigned_url_for_multipart_upload(
         self,
         part_number: int,
         bucket_name: str | None,
@@ -20,7 +20,7 @@ class FakeAwsS3Client(AwsS3BaseClass):
     ) -> str:
         return "myFakeURL"
 
-    def complete_multipart_audio_file_upload(
+    async def complete_multipart_audio_file_upload(
         self,
         file_path: str,
         upload_id: str,
@@ -29,14 +29,14 @@ class FakeAwsS3Client(AwsS3BaseClass):
     ):
         pass
 
-    def delete_file(
+    async def delete_file(
         self,
         source_bucket: str,
         storage_filepath: str
     ):
         pass
 
-    def upload_file(
+    async def upload_file(
         self,
         destination_bucket: str,
         storage_filepath: str,
@@ -44,7 +44,7 @@ class FakeAwsS3Client(AwsS3BaseClass):
     ):
         pass
 
-    def get_audio_file_read_signed_url(
+    async def get_audio_file_read_signed_url(
         self,
         bucket_name: str | None,
         file_path: str
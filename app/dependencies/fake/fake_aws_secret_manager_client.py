@@ -10,3 +10,29 @@ class FakeAwsSecretManagerClient(AwsSecretManagerBaseClass):
         resend_client: ResendBaseClass,
     ) -> dict:
         return {"secret": "myFakeSecret"}
+
+    async def get_secret_async(
+        self,
+        secret_id: str,
+        resend_client: ResendBaseClass,
+    ) -> dict:
+        return self.get_secret(
+            secret_id=secret_id,
+            resend_client=resend_client,
+        )
+
+    def get_cached_secret(
+        self,
+        secret_id: str,
+        resend_client: ResendBaseClass,
+    ) -> dict:
+        return self.get_secret(
+            secret_id=secret_id,
+            resend_client=resend_client,
+        )
+
+    def invalidate_secret(
+        self,
+        secret_id: str,
+    ):
+        pass
@@ -28,3 +28,36 @@ class FakeInfluxClient(InfluxBaseClass):
         **kwargs
     ):
         pass
+
+    def log_cache_access(
+        self,
+        cache_name: str,
+        hit: bool,
+        **kwargs
+    ):
+        pass
+
+    def log_db_query(
+        self,
+        operation: str,
+        table_name: str,
+        pool_role: str,
+        acquire_wait_time: float,
+        session_setup_time: float,
+        query_time: float,
+        row_count: int,
+        **kwargs
+    ):
+        pass
+
+    def log_scheduled_job(
+        self,
+        pool_name: str,
+        outcome: str,
+        queue_wait_time: float,
+        run_time: float,
+        queued: int,
+        running: int,
+        **kwargs
+    ):
+        pass
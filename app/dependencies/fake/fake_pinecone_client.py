@@ -22,6 +22,7 @@ class FakePineconeClient(PineconeBaseClass):
         self.update_preexisting_history_vectors_invoked = False
         self.delete_session_vectors_invoked = False
         self.delete_preexisting_history_vectors_invoked = False
+        self.deleted_patients_vectors_ids: list[str] = []
         self.get_vector_store_context_invoked = False
         self.fetch_historical_context_invoked = False
 
@@ -33,10 +34,13 @@ class FakePineconeClient(PineconeBaseClass):
         session_report_id: str,
         openai_client: OpenAIBaseClass,
         summarize_chunk: Callable,
-        therapy_session_date: date | None = None
+        therapy_session_date: date | None = None,
+        summarize_chunks: Callable | None = None
     ) -> list[str]:
         self.fake_vectors_insertion = text
         self.insert_session_vectors_invoked = True
+        if summarize_chunks is not None and len(text) > 0:
+            await summarize_chunks(chunk_texts=[text], openai_client=openai_client)
         return ["vector1", "vector2"]
 
     async def insert_preexisting_history_vectors(
@@ -65,6 +69,13 @@ class FakePineconeClient(PineconeBaseClass):
     ):
         self.delete_preexisting_history_vectors_invoked = True
 
+    async def delete_patients_vectors(
+        self,
+        user_id: str,
+        patient_ids: list[str]
+    ):
+        self.deleted_patients_vectors_ids.extend(patient_ids)
+
     async def update_session_vectors(
         self,
         user_id: str,
@@ -74,9 +85,13 @@ class FakePineconeClient(PineconeBaseClass):
         new_date: date,
         session_report_id: str,
         openai_client: OpenAIBaseClass,
-        summarize_chunk: Callable
-    ):
+        summarize_chunk: Callable,
+        summarize_chunks: Callable | None = None
+    ) -> list[str]:
         self.update_session_vectors_invoked = True
+        if summarize_chunks is not None and len(text) > 0:
+            await summarize_chunks(chunk_texts=[text], openai_client=openai_client, chunk_summaries=[None])
+        return ["vector1", "vector2"]
 
     async def update_preexisting_history_vectors(
         self,
@@ -100,7 +115,8 @@ class FakePineconeClient(PineconeBaseClass):
         rerank_vectors: bool,
         request: Request,
         include_preexisting_history: bool = True,
-        session_dates_overrides: list[PineconeQuerySessionDateOverride] | None = None
+        session_dates_overrides: list[PineconeQuerySessionDateOverride] | None = None,
+        context_token_budget: int | None = None
     ) -> str:
         self.get_vector_store_context_invoked = True
         if not self.vector_store_context_returns_data:
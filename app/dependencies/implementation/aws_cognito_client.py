@@ -7,6 +7,7 @@ from fastapi import Header, HTTPException, status
 from typing import Dict
 
 from ..api.aws_cognito_base_class import AwsCognitoBaseClass
+from ..core.aws_call_executor import AwsCallExecutor
 from ..core.boto3_client_factory import Boto3ClientFactory
 
 class AwsCognitoClient(AwsCognitoBaseClass):
@@ -80,7 +81,8 @@ class AwsCognitoClient(AwsCognitoBaseClass):
         user_id: str
     ):
         try:
-            self.client.admin_delete_user(
+            await AwsCallExecutor.run(
+                self.client.admin_delete_user,
                 UserPoolId=self.user_pool_id,
                 Username=user_id
             )
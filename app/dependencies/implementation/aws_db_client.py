@@ -1,20 +1,35 @@
+import asyncio
 import asyncpg
 import json
 import os
+import random
 import uuid
 
+from contextlib import asynccontextmanager
 from fastapi import Request
 from typing import (
     Any,
-    Awaitable,
+    AsyncContextManager,
+    AsyncIterator,
     Callable,
     List,
-    Optional
+    Optional,
+    Tuple
 )
 
 from ..api.aws_db_base_class import AwsDbBaseClass
+from ..api.influx_base_class import InfluxBaseClass
 from ..api.aws_secret_manager_base_class import AwsSecretManagerBaseClass
 from ..api.resend_base_class import ResendBaseClass
+from ...internal.db.connection import read_replica_endpoints
+from ...internal.db.job_outbox import JobOutbox, OutboxJob
+from ...internal.db.patient_metrics import PatientMetricsDelta
+from ...internal.db.query_trace import DbQueryTrace
+from ...internal.db.read_routing import (
+    DbReadRouting,
+    pin_request_to_primary,
+    resolve_replica_index,
+)
 from ...internal.schemas import (
     ENCRYPTED_PATIENT_ATTENDANCE_TABLE_NAME,
     ENCRYPTED_PATIENT_BRIEFINGS_TABLE_NAME,
@@ -24,6 +39,7 @@ from ...internal.schemas import (
     ENCRYPTED_SESSION_REPORTS_TABLE_NAME,
     ENCRYPTED_TABLES,
     IS_JSON_KEY,
+    JOB_OUTBOX_TABLE_NAME,
     PATIENT_ATTENDANCE_ENCRYPTED_COLUMNS,
     PATIENT_BRIEFINGS_ENCRYPTED_COLUMNS,
     PATIENT_QUESTION_SUGGESTIONS_ENCRYPTED_COLUMNS,
@@ -37,18 +53,26 @@ from ...internal.security.chartwise_encryptor import ChartWiseEncryptor
 
 class AwsDbClient(AwsDbBaseClass):
 
+    SLOW_QUERY_THRESHOLD_SECONDS = 0.5
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE = 0.1
+
     def __init__(
         self,
-        encryptor: ChartWiseEncryptor
+        encryptor: ChartWiseEncryptor,
+        influx_client: InfluxBaseClass | None = None,
     ):
         self.encryptor = encryptor
+        self.influx_client = influx_client
+        self._slow_query_explain_tasks: set[asyncio.Task] = set()
 
     async def insert(
         self,
         user_id: str,
         request: Request,
         payload: dict[str, Any],
-        table_name: str
+        table_name: str,
+        patient_metrics_delta: PatientMetricsDelta | None = None,
+        outbox_jobs: list[OutboxJob] | None = None,
     ) -> Optional[dict]:
         try:
             payload = self._encrypt_payload(payload, table_name)
@@ -65,16 +89,27 @@ class AwsDbClient(AwsDbBaseClass):
                 """
             )
 
-            async with request.app.state.pool.acquire() as conn:
-                # Set the current user ID for satisfying RLS.
-                await self.set_session_user_id(
-                    conn=conn,
-                    user_id=user_id
-                )
-                row = await conn.fetchrow(
-                    insert_statement,
-                    *values
-                )
+            trace = DbQueryTrace(operation="insert", table_name=table_name)
+            async with self._pooled_connection(request=request, user_id=user_id, trace=trace) as conn:
+                async with conn.transaction():
+                    rows = await self._fetch(
+                        conn,
+                        trace,
+                        insert_statement,
+                        *values
+                    )
+                    row = rows[0] if rows else None
+                    if row and patient_metrics_delta is not None:
+                        await patient_metrics_delta.apply(
+                            conn=conn,
+                            session_report=dict(row)
+                        )
+                    if row:
+                        for outbox_job in outbox_jobs or []:
+                            await outbox_job.enqueue(
+                                conn=conn,
+                                written_row=dict(row)
+                            )
                 return dict(row) if row else None
         except Exception as e:
             raise RuntimeError(f"Insert failed: {e}") from e
@@ -90,41 +125,50 @@ class AwsDbClient(AwsDbBaseClass):
             return []
 
         try:
-            # Validate all payloads have the same keys
-            columns = list(payloads[0].keys())
-            for p in payloads:
-                if set(p.keys()) != set(columns):
-                    raise ValueError("All payloads must have the same keys")
-
-            # Encrypt all payloads
-            encrypted_payloads = [self._encrypt_payload(p, table_name) for p in payloads]
-
-            # Prepare dynamic SQL
-            column_names = ', '.join(f'"{col}"' for col in columns)
-            placeholders = []
-            values = []
-
-            for payload in encrypted_payloads:
-                value_placeholders = [
-                    f"${len(values) + j + 1}" for j in range(len(columns))
-                ]
-                placeholders.append(f"({', '.join(value_placeholders)})")
-                values.extend(payload[col] for col in columns)
-
-            insert_statement = f"""
-                INSERT INTO "{table_name}" ({column_names})
-                VALUES {', '.join(placeholders)}
-                RETURNING *
-            """
+            insert_statement, values = self._batch_insert_statement(
+                payloads=payloads,
+                table_name=table_name
+            )
 
-            async with request.app.state.pool.acquire() as conn:
-                await self.set_session_user_id(conn=conn, user_id=user_id)
-                rows = await conn.fetch(insert_statement, *values)
+            trace = DbQueryTrace(operation="batch_insert", table_name=table_name)
+            async with self._pooled_connection(request=request, user_id=user_id, trace=trace) as conn:
+                rows = await self._fetch(conn, trace, insert_statement, *values)
                 return [dict(row) for row in rows]
 
         except Exception as e:
             raise RuntimeError(f"Batch insert failed: {e}") from e
 
+    async def replace_rows(
+        self,
+        user_id: str,
+        request: Request,
+        table_name: str,
+        filters: dict[str, Any],
+        payloads: list[dict[str, Any]],
+    ) -> list[dict]:
+        try:
+            where_clause, where_values = type(self)._build_where_clause(filters)
+            if len(where_clause) == 0:
+                raise ValueError("Replacing rows requires at least one filter")
+            delete_query = " ".join(f'DELETE FROM "{table_name}" {where_clause}'.split())
+
+            trace = DbQueryTrace(operation="replace", table_name=table_name)
+            async with self._pooled_connection(request=request, user_id=user_id, trace=trace) as conn:
+                # A failure in between would otherwise leave no rows behind.
+                async with conn.transaction():
+                    await self._fetch(conn, trace, delete_query, *where_values)
+                    if not payloads:
+                        return []
+
+                    insert_statement, values = self._batch_insert_statement(
+                        payloads=payloads,
+                        table_name=table_name
+                    )
+                    rows = await self._fetch(conn, trace, insert_statement, *values)
+                    return [dict(row) for row in rows]
+        except Exception as e:
+            raise RuntimeError(f"Replace failed: {e}") from e
+
     async def upsert(
         self,
         user_id: str,
@@ -133,17 +177,15 @@ class AwsDbClient(AwsDbBaseClass):
         payload: dict[str, Any],
         table_name: str
     ) -> Optional[dict]:
-        async def connection_provider():
-            conn = await request.app.state.pool.acquire()
-            await self.set_session_user_id(conn=conn, user_id=user_id)
-            return (conn, False) # False indicates "don't close after use"
-
         return await self._upsert_common(
-            request=request,
             conflict_columns=conflict_columns,
             payload=payload,
             table_name=table_name,
-            connection_provider=connection_provider,
+            connection_provider=lambda trace: self._pooled_connection(
+                request=request,
+                user_id=user_id,
+                trace=trace,
+            ),
         )
 
     async def upsert_with_stripe_connection(
@@ -155,19 +197,17 @@ class AwsDbClient(AwsDbBaseClass):
         resend_client: ResendBaseClass,
         secret_manager: AwsSecretManagerBaseClass,
     ) -> Optional[dict]:
-        async def connection_provider():
-            conn = await self._get_stripe_writer_connection(
-                secret_manager=secret_manager,
-                resend_client=resend_client,
-            )
-            return (conn, True) # True indicates "close after use"
-
+        pin_request_to_primary(request)
         return await self._upsert_common(
-            request=request,
             conflict_columns=conflict_columns,
             payload=payload,
             table_name=table_name,
-            connection_provider=connection_provider,
+            connection_provider=lambda trace: self._stripe_connection(
+                stripe_role_env_var="AWS_SECRET_MANAGER_STRIPE_WRITER_ROLE",
+                secret_manager=secret_manager,
+                resend_client=resend_client,
+                trace=trace,
+            ),
         )
 
     async def update(
@@ -176,7 +216,9 @@ class AwsDbClient(AwsDbBaseClass):
         request: Request,
         payload: dict[str, Any],
         filters: dict[str, Any],
-        table_name: str
+        table_name: str,
+        patient_metrics_delta: PatientMetricsDelta | None = None,
+        outbox_jobs: list[OutboxJob] | None = None,
     ) -> list | None:
         try:
             payload = self._encrypt_payload(payload, table_name)
@@ -206,16 +248,46 @@ class AwsDbClient(AwsDbBaseClass):
 
             all_values = set_values + where_values
 
-            async with request.app.state.pool.acquire() as conn:
-                # Set the current user ID for satisfying RLS.
-                await self.set_session_user_id(
-                    conn=conn,
-                    user_id=user_id
-                )
-                rows = await conn.fetch(
-                    update_query,
-                    *all_values
-                )
+            trace = DbQueryTrace(operation="update", table_name=table_name)
+            async with self._pooled_connection(request=request, user_id=user_id, trace=trace) as conn:
+                async with conn.transaction():
+                    previous_rows = {}
+                    if patient_metrics_delta is not None:
+                        # Lock the rows before updating them, so that the delta only accounts
+                        # for state that actually changes (i.e. a session that gets deleted twice).
+                        lock_where_expr = ' AND '.join([
+                            f'"{col}" = ${i+1}' for i, col in enumerate(where_columns)
+                        ])
+                        locked_rows = await conn.fetch(
+                            f"""
+                            SELECT *
+                            FROM "{table_name}"
+                            WHERE {lock_where_expr}
+                            FOR UPDATE
+                            """,
+                            *where_values
+                        )
+                        previous_rows = {row['id']: dict(row) for row in locked_rows}
+
+                    rows = await self._fetch(
+                        conn,
+                        trace,
+                        update_query,
+                        *all_values
+                    )
+                    if patient_metrics_delta is not None:
+                        for row in rows:
+                            await patient_metrics_delta.apply(
+                                conn=conn,
+                                session_report=dict(row),
+                                previous_session_report=previous_rows.get(row['id'])
+                            )
+                    for row in rows:
+                        for outbox_job in outbox_jobs or []:
+                            await outbox_job.enqueue(
+                                conn=conn,
+                                written_row=dict(row)
+                            )
                 return [dict(row) for row in rows]
         except Exception as e:
             raise RuntimeError(e) from e
@@ -228,21 +300,21 @@ class AwsDbClient(AwsDbBaseClass):
         table_name: str,
         filters: dict[str, Any] | None = None,
         limit: Optional[int] = None,
-        order_by: Optional[tuple[str, str]] = None
+        order_by: Optional[tuple[str, str]] = None,
+        read_routing: DbReadRouting = DbReadRouting.PRIMARY,
     ) -> list[dict]:
-        async def connection_provider():
-            conn = await request.app.state.pool.acquire()
-            await self.set_session_user_id(conn=conn, user_id=user_id)
-            return (conn, False) # False indicates "don't close after use"
-
         return await self._select_common(
             fields=fields,
             table_name=table_name,
             filters=filters,
             limit=limit,
             order_by=order_by,
-            connection_provider=connection_provider,
-            request=request,
+            connection_provider=lambda trace: self._pooled_connection(
+                request=request,
+                user_id=user_id,
+                trace=trace,
+                read_routing=read_routing,
+            ),
         )
 
     async def select_count(
@@ -251,20 +323,20 @@ class AwsDbClient(AwsDbBaseClass):
         request: Request,
         table_name: str,
         filters: dict[str, Any] | None = None,
-        order_by: Optional[tuple[str, str]] = None
+        order_by: Optional[tuple[str, str]] = None,
+        read_routing: DbReadRouting = DbReadRouting.PRIMARY,
     ) -> int:
-        async def connection_provider():
-            conn = await request.app.state.pool.acquire()
-            await self.set_session_user_id(conn=conn, user_id=user_id)
-            return (conn, False) # False indicates "don't close after use"
-
         count_response = await self._select_common(
             fields=["COUNT(*) AS count"],
             table_name=table_name,
             filters=filters,
             order_by=order_by,
-            connection_provider=connection_provider,
-            request=request,
+            connection_provider=lambda trace: self._pooled_connection(
+                request=request,
+                user_id=user_id,
+                trace=trace,
+                read_routing=read_routing,
+            ),
         )
         return count_response[0]["count"]
 
@@ -277,23 +349,23 @@ class AwsDbClient(AwsDbBaseClass):
         secret_manager: AwsSecretManagerBaseClass,
         request: Request,
         limit: Optional[int] = None,
-        order_by: Optional[tuple[str, str]] = None
+        order_by: Optional[tuple[str, str]] = None,
+        read_routing: DbReadRouting = DbReadRouting.PRIMARY,
     ) -> list[dict]:
-        async def connection_provider():
-            conn = await self._get_stripe_reader_connection(
-                secret_manager=secret_manager,
-                resend_client=resend_client,
-            )
-            return (conn, True) # True indicates "close after use"
-
         return await self._select_common(
             fields=fields,
             table_name=table_name,
             filters=filters,
             limit=limit,
             order_by=order_by,
-            connection_provider=connection_provider,
-            request=request,
+            connection_provider=lambda trace: self._stripe_connection(
+                stripe_role_env_var="AWS_SECRET_MANAGER_STRIPE_READER_ROLE",
+                secret_manager=secret_manager,
+                resend_client=resend_client,
+                trace=trace,
+                request=request,
+                read_routing=read_routing,
+            ),
         )
 
     async def delete(
@@ -314,13 +386,11 @@ class AwsDbClient(AwsDbBaseClass):
             )
             delete_query = " ".join(delete_query.split())
 
-            async with request.app.state.pool.acquire() as conn:
-                # Set the current user ID for satisfying RLS.
-                await self.set_session_user_id(
-                    conn=conn,
-                    user_id=user_id
-                )
-                rows = await conn.fetch(
+            trace = DbQueryTrace(operation="delete", table_name=table_name)
+            async with self._pooled_connection(request=request, user_id=user_id, trace=trace) as conn:
+                rows = await self._fetch(
+                    conn,
+                    trace,
                     delete_query,
                     *where_values
                 )
@@ -328,6 +398,67 @@ class AwsDbClient(AwsDbBaseClass):
         except Exception as e:
             raise RuntimeError(f"Delete failed: {e}") from e
 
+    async def claim_outbox_jobs(
+        self,
+        request: Request,
+        limit: int
+    ) -> list[OutboxJob]:
+        try:
+            trace = DbQueryTrace(operation="claim", table_name=JOB_OUTBOX_TABLE_NAME)
+            async with self._pooled_connection(request=request, user_id=None, trace=trace) as conn:
+                return await JobOutbox.claim(conn=conn, limit=limit)
+        except Exception as e:
+            raise RuntimeError(e) from e
+
+    async def complete_outbox_job(
+        self,
+        request: Request,
+        job: OutboxJob,
+        follow_up_jobs: list[OutboxJob] | None = None
+    ):
+        try:
+            trace = DbQueryTrace(operation="complete", table_name=JOB_OUTBOX_TABLE_NAME)
+            async with self._pooled_connection(request=request, user_id=None, trace=trace) as conn:
+                await JobOutbox.complete(
+                    conn=conn,
+                    job=job,
+                    follow_up_jobs=follow_up_jobs
+                )
+        except Exception as e:
+            raise RuntimeError(e) from e
+
+    async def fail_outbox_job(
+        self,
+        request: Request,
+        job: OutboxJob,
+        error: str
+    ) -> bool:
+        try:
+            trace = DbQueryTrace(operation="fail", table_name=JOB_OUTBOX_TABLE_NAME)
+            async with self._pooled_connection(request=request, user_id=None, trace=trace) as conn:
+                return await JobOutbox.fail(
+                    conn=conn,
+                    job=job,
+                    error=error
+                )
+        except Exception as e:
+            raise RuntimeError(e) from e
+
+    async def release_outbox_job(
+        self,
+        request: Request,
+        job: OutboxJob
+    ):
+        try:
+            trace = DbQueryTrace(operation="release", table_name=JOB_OUTBOX_TABLE_NAME)
+            async with self._pooled_connection(request=request, user_id=None, trace=trace) as conn:
+                await JobOutbox.release(
+                    conn=conn,
+                    job=job
+                )
+        except Exception as e:
+            raise RuntimeError(e) from e
+
     async def set_session_user_id(
         self,
         user_id: str,
@@ -509,40 +640,203 @@ class AwsDbClient(AwsDbBaseClass):
         where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
         return where_clause, values
 
-    async def _get_stripe_reader_connection(
+    @asynccontextmanager
+    async def _pooled_connection(
         self,
+        request: Request,
+        user_id: str | None,
+        trace: DbQueryTrace,
+        read_routing: DbReadRouting | None = None,
+    ) -> AsyncIterator[asyncpg.Connection]:
+        # Connections without a read routing hint are used for writing, so they always come
+        # from the primary and pin the rest of the request to it (read-your-writes).
+        primary_pool = request.app.state.pool
+        pool = primary_pool
+        if read_routing is None:
+            pin_request_to_primary(request)
+        else:
+            replica_pools = getattr(request.app.state, "replica_pools", [])
+            replica_index = resolve_replica_index(
+                request=request,
+                read_routing=read_routing,
+                replica_count=len(replica_pools)
+            )
+            if replica_index is not None:
+                pool = replica_pools[replica_index]
+                trace.pool_role = "replica"
+
+        acquire_start = trace.now()
+        try:
+            conn = await pool.acquire()
+        except Exception as e:
+            if pool is primary_pool:
+                raise
+            # Replicas are an optimization, fall back to the primary if one is unavailable.
+            print(f"[AwsDbClient] Failed to acquire a replica connection, falling back to the primary: {e}")
+            pool = primary_pool
+            trace.pool_role = "primary"
+            conn = await pool.acquire()
+        trace.acquire_wait_time = trace.now() - acquire_start
+        trace.record_pool_state(pool)
+
+        try:
+            # Set the current user ID for satisfying RLS. Service-owned tables (i.e. the job outbox)
+            # aren't covered by RLS, so they're accessed without a user.
+            if user_id is not None:
+                session_setup_start = trace.now()
+                await self.set_session_user_id(
+                    conn=conn,
+                    user_id=user_id
+                )
+                trace.session_setup_time = trace.now() - session_setup_start
+            yield conn
+        finally:
+            await pool.release(conn)
+            self._log_query_trace(trace)
+
+    @asynccontextmanager
+    async def _stripe_connection(
+        self,
+        stripe_role_env_var: str,
         secret_manager: AwsSecretManagerBaseClass,
         resend_client: ResendBaseClass,
-    ):
-        stripe_role_secret = os.environ.get("AWS_SECRET_MANAGER_STRIPE_READER_ROLE")
+        trace: DbQueryTrace,
+        request: Request | None = None,
+        read_routing: DbReadRouting | None = None,
+    ) -> AsyncIterator[asyncpg.Connection]:
+        stripe_role_secret = os.environ.get(stripe_role_env_var)
         assert stripe_role_secret is not None, "Null role secret"
-        return await self._get_db_connection_for_stripe(
+
+        replica_endpoint = None
+        if request is not None and read_routing is not None:
+            replica_endpoints = read_replica_endpoints(default_port=int(os.getenv("AWS_RDS_DB_PORT", 5432)))
+            replica_index = resolve_replica_index(
+                request=request,
+                read_routing=read_routing,
+                replica_count=len(replica_endpoints)
+            )
+            if replica_index is not None:
+                replica_endpoint = replica_endpoints[replica_index]
+                trace.pool_role = "replica"
+
+        # Stripe roles use dedicated connections, so the acquire wait is the time spent connecting.
+        acquire_start = trace.now()
+        conn = await self._get_db_connection_for_stripe(
             stripe_role=stripe_role_secret,
             secret_manager=secret_manager,
-            resend_client=resend_client
+            resend_client=resend_client,
+            replica_endpoint=replica_endpoint,
         )
+        trace.acquire_wait_time = trace.now() - acquire_start
+        try:
+            yield conn
+        finally:
+            await conn.close()
+            self._log_query_trace(trace)
 
-    async def _get_stripe_writer_connection(
+    def _batch_insert_statement(
         self,
-        secret_manager: AwsSecretManagerBaseClass,
-        resend_client: ResendBaseClass,
+        payloads: list[dict[str, Any]],
+        table_name: str
+    ) -> Tuple[str, list]:
+        # Validate all payloads have the same keys
+        columns = list(payloads[0].keys())
+        for p in payloads:
+            if set(p.keys()) != set(columns):
+                raise ValueError("All payloads must have the same keys")
+
+        # Encrypt all payloads
+        encrypted_payloads = [self._encrypt_payload(p, table_name) for p in payloads]
+
+        # Prepare dynamic SQL
+        column_names = ', '.join(f'"{col}"' for col in columns)
+        placeholders = []
+        values = []
+
+        for payload in encrypted_payloads:
+            value_placeholders = [
+                f"${len(values) + j + 1}" for j in range(len(columns))
+            ]
+            placeholders.append(f"({', '.join(value_placeholders)})")
+            values.extend(payload[col] for col in columns)
+
+        insert_statement = f"""
+            INSERT INTO "{table_name}" ({column_names})
+            VALUES {', '.join(placeholders)}
+            RETURNING *
+        """
+        return insert_statement, values
+
+    async def _fetch(
+        self,
+        conn: asyncpg.Connection,
+        trace: DbQueryTrace,
+        query: str,
+        *args
+    ) -> list[asyncpg.Record]:
+        query_start = trace.now()
+        rows = await conn.fetch(query, *args)
+        trace.query_time += trace.now() - query_start
+        trace.row_count += len(rows)
+        return rows
+
+    def _log_query_trace(
+        self,
+        trace: DbQueryTrace
     ):
-        stripe_role_secret = os.environ.get("AWS_SECRET_MANAGER_STRIPE_WRITER_ROLE")
-        assert stripe_role_secret is not None, "Null role secret"
-        return await self._get_db_connection_for_stripe(
-            stripe_role=stripe_role_secret,
-            secret_manager=secret_manager,
-            resend_client=resend_client
-        )
+        if self.influx_client is None:
+            return
+
+        try:
+            self.influx_client.log_db_query(
+                operation=trace.operation,
+                table_name=trace.table_name,
+                pool_role=trace.pool_role,
+                acquire_wait_time=trace.acquire_wait_time,
+                session_setup_time=trace.session_setup_time,
+                query_time=trace.query_time,
+                row_count=trace.row_count,
+                pool_size=trace.pool_size,
+                pool_idle_size=trace.pool_idle_size,
+                pool_max_size=trace.pool_max_size,
+            )
+        except Exception as e:
+            # Metrics should never break the caller.
+            print(f"[AwsDbClient] Failed to log query metrics: {e}")
+
+    async def _explain_slow_select(
+        self,
+        connection_provider: Callable[[DbQueryTrace], AsyncContextManager[asyncpg.Connection]],
+        table_name: str,
+        query_time: float,
+        query: str,
+        *args
+    ):
+        # EXPLAIN ANALYZE executes the statement, so this is only safe for reads. Plans don't carry
+        # the bound values, so they're safe to log.
+        try:
+            trace = DbQueryTrace(operation="explain", table_name=table_name)
+            async with connection_provider(trace) as conn:
+                plan_rows = await self._fetch(
+                    conn,
+                    trace,
+                    f"EXPLAIN (ANALYZE, BUFFERS) {query}",
+                    *args
+                )
+            plan = "\n".join([row[0] for row in plan_rows])
+            print(f"[AwsDbClient] Slow select on {table_name} ({query_time * 1000:.0f}ms): {query}\n{plan}")
+        except Exception as e:
+            print(f"[AwsDbClient] Failed to explain slow select on {table_name}: {e}")
 
     async def _get_db_connection_for_stripe(
         self,
         stripe_role: str,
         secret_manager: AwsSecretManagerBaseClass,
         resend_client: ResendBaseClass,
+        replica_endpoint: tuple[str, int] | None = None,
     ):
         try:
-            secret = secret_manager.get_secret(
+            secret = await secret_manager.get_secret_async(
                 secret_id=stripe_role,
                 resend_client=resend_client,
             )
@@ -557,16 +851,30 @@ class AwsDbClient(AwsDbBaseClass):
                 endpoint = os.getenv("AWS_RDS_DATABASE_ENDPOINT")
                 port = secret.get("port") or os.getenv("AWS_RDS_DB_PORT")
 
-            conn = await asyncpg.connect(
-                user=secret.get("username", None),
-                password=secret.get("password", None),
-                database=db,
-                host=endpoint,
-                port=port,
-                ssl='require',
-                timeout=10
-            )
-            return conn
+            if replica_endpoint is not None:
+                endpoint, port = replica_endpoint
+
+            for attempt in range(2):
+                try:
+                    return await asyncpg.connect(
+                        user=secret.get("username", None),
+                        password=secret.get("password", None),
+                        database=db,
+                        host=endpoint,
+                        port=port,
+                        ssl='require',
+                        timeout=10
+                    )
+                except asyncpg.InvalidPasswordError:
+                    if attempt > 0:
+                        raise
+
+                    # The role's password may have been rotated since we cached it, retry once with a fresh copy.
+                    secret_manager.invalidate_secret(stripe_role)
+                    secret = await secret_manager.get_secret_async(
+                        secret_id=stripe_role,
+                        resend_client=resend_client,
+                    )
         except Exception as e:
             raise RuntimeError(e) from e
 
@@ -576,8 +884,7 @@ class AwsDbClient(AwsDbBaseClass):
         table_name: str,
         filters: dict[str, Any] | None,
         order_by: Optional[tuple[str, str]],
-        connection_provider: Callable[[], Awaitable[tuple[Any, bool]]],
-        request: Request,
+        connection_provider: Callable[[DbQueryTrace], AsyncContextManager[asyncpg.Connection]],
         limit: Optional[int] = None,
     ) -> list[dict]:
         try:
@@ -604,28 +911,39 @@ class AwsDbClient(AwsDbBaseClass):
             """
             query = " ".join(query.split())
 
-            conn, should_close = await connection_provider()
-            try:
-                rows = await conn.fetch(query, *where_values)
-                result = [dict(row) for row in rows]
-                if table_name in ENCRYPTED_TABLES and rows:
-                    result = [self._decrypt_payload(row, table_name) for row in result]
-                return result
-            finally:
-                if should_close:
-                    await conn.close()
-                else:
-                    await request.app.state.pool.release(conn)
+            cls = type(self)
+            trace = DbQueryTrace(operation="select", table_name=table_name)
+            async with connection_provider(trace) as conn:
+                rows = await self._fetch(conn, trace, query, *where_values)
+
+            if (trace.query_time > cls.SLOW_QUERY_THRESHOLD_SECONDS
+                and random.random() < cls.SLOW_QUERY_EXPLAIN_SAMPLE_RATE):
+                # Explain off the request path, on a separate connection.
+                task = asyncio.create_task(
+                    self._explain_slow_select(
+                        connection_provider,
+                        table_name,
+                        trace.query_time,
+                        query,
+                        *where_values
+                    )
+                )
+                self._slow_query_explain_tasks.add(task)
+                task.add_done_callback(self._slow_query_explain_tasks.discard)
+
+            result = [dict(row) for row in rows]
+            if table_name in ENCRYPTED_TABLES and rows:
+                result = [self._decrypt_payload(row, table_name) for row in result]
+            return result
         except Exception as e:
             raise RuntimeError(f"Select failed: {e}") from e
 
     async def _upsert_common(
         self,
-        request: Request,
         conflict_columns: List[str],
         payload: dict[str, Any],
         table_name: str,
-        connection_provider: Callable[[], Awaitable[tuple[Any, bool]]],
+        connection_provider: Callable[[DbQueryTrace], AsyncContextManager[asyncpg.Connection]],
     ) -> Optional[dict]:
         try:
             payload = self._encrypt_payload(payload, table_name)
@@ -650,17 +968,14 @@ class AwsDbClient(AwsDbBaseClass):
                 """
             )
 
-            conn, should_close = await connection_provider()
-            try:
-                row = await conn.fetchrow(
+            trace = DbQueryTrace(operation="upsert", table_name=table_name)
+            async with connection_provider(trace) as conn:
+                rows = await self._fetch(
+                    conn,
+                    trace,
                     upsert_query,
                     *values
                 )
-                return dict(row) if row else None
-            finally:
-                if should_close:
-                    await conn.close()
-                else:
-                    await request.app.state.pool.release(conn)
+                return dict(rows[0]) if rows else None
         except Exception as e:
             raise RuntimeError(f"Upsert failed: {e}") from e
@@ -1,17 +1,19 @@
 from ..api.aws_s3_base_class import AwsS3BaseClass
+from ..core.aws_call_executor import AwsCallExecutor
 from ..core.boto3_client_factory import Boto3ClientFactory
 
 class AwsS3Client(AwsS3BaseClass):
 
     TEN_MIN_IN_SECONDS = 600
     FIFTEEN_MIN_IN_SECONDS = 900
+    UPLOAD_TIMEOUT_SECONDS = 60
 
     def __init__(self):
         self.client = Boto3ClientFactory.get_client(
             service_name="s3",
         )
 
-    def initiate_multipart_audio_file_upload(
+    async def initiate_multipart_audio_file_upload(
         self,
         file_path: str,
         bucket_name: str | None,
@@ -19,7 +21,8 @@ class AwsS3Client(AwsS3BaseClass):
         try:
             assert bucket_name is not None, "Received a nullable bucket name"
 
-            response = self.client.create_multipart_upload(
+            response = await AwsCallExecutor.run(
+                self.client.create_multipart_upload,
                 Bucket=bucket_name,
                 Key=file_path
             )
@@ -30,7 +33,7 @@ class AwsS3Client(AwsS3BaseClass):
         except Exception as e:
             raise RuntimeError(f"Failed to initiate file upload: {e}") from e
 
-    def retrieve_presigned_url_for_multipart_upload(
+    async def retrieve_presigned_url_for_multipart_upload(
         self,
         part_number: int,
         bucket_name: str | None,
@@ -41,7 +44,8 @@ class AwsS3Client(AwsS3BaseClass):
             assert bucket_name is not None, "Received nullable bucket name"
             assert upload_id is not None, "Received nullable upload id"
             assert file_path is not None, "Received nullable file path"
-            url = self.client.generate_presigned_url(
+            url = await AwsCallExecutor.run(
+                self.client.generate_presigned_url,
                 "upload_part",
                 Params={
                     "Bucket": bucket_name,
@@ -55,7 +59,7 @@ class AwsS3Client(AwsS3BaseClass):
         except Exception as e:
             raise RuntimeError(f"Failed to retrieve presigned URL for multipart upload: {e}") from e
 
-    def complete_multipart_audio_file_upload(
+    async def complete_multipart_audio_file_upload(
         self,
         file_path: str,
         upload_id: str,
@@ -64,7 +68,8 @@ class AwsS3Client(AwsS3BaseClass):
     ):
         try:
             assert bucket_name is not None, "Received nullable bucket name"
-            self.client.complete_multipart_upload(
+            await AwsCallExecutor.run(
+                self.client.complete_multipart_upload,
                 Bucket=bucket_name,
                 Key=file_path,
                 UploadId=upload_id,
@@ -73,20 +78,21 @@ class AwsS3Client(AwsS3BaseClass):
         except Exception as e:
             raise RuntimeError(f"Failed to complete file upload: {e}") from e
 
-    def delete_file(
+    async def delete_file(
         self,
         source_bucket: str,
         storage_filepath: str
     ):
         try:
-            self.client.delete_object(
+            await AwsCallExecutor.run(
+                self.client.delete_object,
                 Bucket=source_bucket,
                 Key=storage_filepath
             )
         except Exception as e:
             raise RuntimeError(f"Could not delete file: {e}") from e
 
-    def upload_file(
+    async def upload_file(
         self,
         destination_bucket: str,
         storage_filepath: str,
@@ -96,22 +102,25 @@ class AwsS3Client(AwsS3BaseClass):
             if isinstance(content, str):
                 content = content.encode('utf-8')
 
-            self.client.put_object(
+            await AwsCallExecutor.run(
+                self.client.put_object,
                 Bucket=destination_bucket,
                 Key=storage_filepath,
-                Body=content
+                Body=content,
+                timeout_seconds=type(self).UPLOAD_TIMEOUT_SECONDS,
             )
         except Exception as e:
             raise RuntimeError(f"Could not upload file: {e}") from e
 
-    def get_audio_file_read_signed_url(
+    async def get_audio_file_read_signed_url(
         self,
         bucket_name: str | None,
         file_path: str
     ) -> dict:
         try:
             assert bucket_name is not None, "Received nullable bucket name"
-            response = self.client.generate_presigned_url(
+            response = await AwsCallExecutor.run(
+                self.client.generate_presigned_url,
                 'get_object',
                 Params={
                     'Bucket': bucket_name,
@@ -1,33 +1,170 @@
 import json
 import os
+import threading
+import time
 
 from ..api.aws_secret_manager_base_class import AwsSecretManagerBaseClass
+from ..core.aws_call_executor import AwsCallExecutor
 from ...dependencies.api.resend_base_class import ResendBaseClass
 from ...internal.utilities.aws_utils import sign_and_send_aws_request
 
 class AwsSecretManagerClient(AwsSecretManagerBaseClass):
 
+    SECRET_TTL_SECONDS = 900 # 15 minutes
+    MIN_INVALIDATION_INTERVAL_SECONDS = 60
+    FAILED_REFRESH_RETRY_SECONDS = 30
+
+    def __init__(self):
+        # Secret values, along with the monotonic times at which they were last fetched (or a fetch was
+        # attempted), and at which they are due a refresh.
+        self._secrets: dict[str, tuple[dict, float, float]] = {}
+        self._secret_locks: dict[str, threading.Lock] = {}
+        self._secret_locks_guard = threading.Lock()
+        self._refreshing_secret_ids: set[str] = set()
+
     def get_secret(
         self,
         secret_id: str,
         resend_client: ResendBaseClass,
     ) -> dict:
+        cached_secret = self._secrets.get(secret_id)
+        if cached_secret is not None and self._is_fresh(cached_secret):
+            return cached_secret[0]
+
+        # Single-flight: concurrent callers for the same secret wait on a single fetch.
+        with self._lock_for_secret(secret_id):
+            cached_secret = self._secrets.get(secret_id)
+            if cached_secret is not None and self._is_fresh(cached_secret):
+                return cached_secret[0]
+
+            try:
+                secret = self._fetch_secret(
+                    secret_id=secret_id,
+                    resend_client=resend_client,
+                )
+            except Exception as e:
+                if cached_secret is None:
+                    raise RuntimeError(f"Error getting secret: {e}") from e
+
+                # Serve the stale value rather than failing while Secrets Manager is unavailable,
+                # and hold off on the next attempt so that callers don't all retry on every read.
+                print(f"[AwsSecretManagerClient] Failed to refresh secret, serving stale value: {e}")
+                attempted_at = time.monotonic()
+                self._secrets[secret_id] = (
+                    cached_secret[0],
+                    attempted_at,
+                    attempted_at + type(self).FAILED_REFRESH_RETRY_SECONDS,
+                )
+                return cached_secret[0]
+
+            fetched_at = time.monotonic()
+            self._secrets[secret_id] = (secret, fetched_at, fetched_at + type(self).SECRET_TTL_SECONDS)
+            return secret
+
+    async def get_secret_async(
+        self,
+        secret_id: str,
+        resend_client: ResendBaseClass,
+    ) -> dict:
+        cached_secret = self._secrets.get(secret_id)
+        if cached_secret is not None and self._is_fresh(cached_secret):
+            return cached_secret[0]
+
+        return await AwsCallExecutor.run(
+            self.get_secret,
+            secret_id=secret_id,
+            resend_client=resend_client,
+        )
+
+    def get_cached_secret(
+        self,
+        secret_id: str,
+        resend_client: ResendBaseClass,
+    ) -> dict:
+        cached_secret = self._secrets.get(secret_id)
+        if cached_secret is None:
+            return self.get_secret(
+                secret_id=secret_id,
+                resend_client=resend_client,
+            )
+
+        if not self._is_fresh(cached_secret):
+            with self._secret_locks_guard:
+                refresh_pending = secret_id in self._refreshing_secret_ids
+                self._refreshing_secret_ids.add(secret_id)
+            if not refresh_pending:
+                AwsCallExecutor.run_in_background(
+                    self._refresh_secret,
+                    secret_id=secret_id,
+                    resend_client=resend_client,
+                )
+        return cached_secret[0]
+
+    def invalidate_secret(
+        self,
+        secret_id: str,
+    ):
+        cached_secret = self._secrets.get(secret_id)
+        if cached_secret is None:
+            return
+
+        # Callers invalidate on auth failures, which anyone can trigger (i.e. with a forged token),
+        # so we don't let them force more than one refresh per interval.
+        if time.monotonic() - cached_secret[1] < type(self).MIN_INVALIDATION_INTERVAL_SECONDS:
+            return
+
+        # Keep the value around, so that `get_cached_secret` can serve it while the refresh is in flight.
+        self._secrets[secret_id] = (cached_secret[0], cached_secret[1], 0)
+
+    # Private
+
+    def _is_fresh(
+        self,
+        cached_secret: tuple[dict, float, float]
+    ) -> bool:
+        return time.monotonic() < cached_secret[2]
+
+    def _refresh_secret(
+        self,
+        secret_id: str,
+        resend_client: ResendBaseClass,
+    ):
         try:
-            region = os.environ.get("AWS_SERVICES_REGION")
-            assert region is not None, "Missing region"
-
-            payload = {
-                "SecretId": secret_id
-            }
-
-            result = sign_and_send_aws_request(
-                service="secretsmanager",
-                region=region,
-                endpoint_url=f"https://secretsmanager.{region}.amazonaws.com/",
-                payload=payload,
-                target_action="secretsmanager.GetSecretValue",
+            self.get_secret(
+                secret_id=secret_id,
                 resend_client=resend_client,
             )
-            return json.loads(result["SecretString"])
-        except Exception as e:
-            raise RuntimeError(f"Error getting secret: {e}") from e
+        finally:
+            with self._secret_locks_guard:
+                self._refreshing_secret_ids.discard(secret_id)
+
+    def _lock_for_secret(
+        self,
+        secret_id: str
+    ) -> threading.Lock:
+        with self._secret_locks_guard:
+            if secret_id not in self._secret_locks:
+                self._secret_locks[secret_id] = threading.Lock()
+            return self._secret_locks[secret_id]
+
+    def _fetch_secret(
+        self,
+        secret_id: str,
+        resend_client: ResendBaseClass,
+    ) -> dict:
+        region = os.environ.get("AWS_SERVICES_REGION")
+        assert region is not None, "Missing region"
+
+        payload = {
+            "SecretId": secret_id
+        }
+
+        result = sign_and_send_aws_request(
+            service="secretsmanager",
+            region=region,
+            endpoint_url=f"https://secretsmanager.{region}.amazonaws.com/",
+            payload=payload,
+            target_action="secretsmanager.GetSecretValue",
+            resend_client=resend_client,
+        )
+        return json.loads(result["SecretString"])
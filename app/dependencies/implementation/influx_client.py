@@ -11,12 +11,20 @@ class InfluxClient(InfluxBaseClass):
     API_REQUESTS_BUCKET = "api_requests"
     API_RESPONSES_BUCKET = "api_responses"
     API_ERRORS_BUCKET = "errors"
+    CACHE_ACCESS_BUCKET = "cache_access"
+    DB_QUERIES_BUCKET = "db_queries"
+    SCHEDULED_JOBS_BUCKET = "scheduled_jobs"
+    _db_pool_fields = ["pool_size",
+                       "pool_idle_size",
+                       "pool_max_size"]
     _optional_tags = ["patient_id",
                       "session_id",
                       "session_report_id",
                       "status_code",
                       "therapist_id",
-                      "notes_template"]
+                      "insight_generator",
+                      "notes_template",
+                      "prompt_scenario"]
 
     def __init__(
         self,
@@ -112,3 +120,94 @@ class InfluxClient(InfluxBaseClass):
                 point.tag(tag, str(value))
 
         self.client.write(record=point, database=cls.API_ERRORS_BUCKET)
+
+    def log_cache_access(
+        self,
+        cache_name: str,
+        hit: bool,
+        **kwargs
+    ):
+        if not self.is_prod_environment:
+            return
+
+        cls = type(self)
+        point = (
+            Point(cls.CACHE_ACCESS_BUCKET)
+            .tag("cache_name", cache_name)
+            .tag("environment", self.environment)
+            .field("hit", 1 if hit else 0)
+            .field("miss", 0 if hit else 1)
+        )
+
+        for tag in cls._optional_tags:
+            value = kwargs.get(tag)
+            if value is not None:
+                point.tag(tag, str(value))
+
+        self.client.write(record=point, database=cls.CACHE_ACCESS_BUCKET)
+
+    def log_db_query(
+        self,
+        operation: str,
+        table_name: str,
+        pool_role: str,
+        acquire_wait_time: float,
+        session_setup_time: float,
+        query_time: float,
+        row_count: int,
+        **kwargs
+    ):
+        if not self.is_prod_environment:
+            return
+
+        cls = type(self)
+        point = (
+            Point(cls.DB_QUERIES_BUCKET)
+            .tag("operation", operation)
+            .tag("table_name", table_name)
+            .tag("pool_role", pool_role)
+            .tag("environment", self.environment)
+            .field("acquire_wait_time", acquire_wait_time)
+            .field("session_setup_time", session_setup_time)
+            .field("query_time", query_time)
+            .field("row_count", row_count)
+        )
+
+        # Pool sizes are fields rather than tags so they can be aggregated when sizing the pool.
+        for field in cls._db_pool_fields:
+            value = kwargs.get(field)
+            if value is not None:
+                point.field(field, value)
+
+        for tag in cls._optional_tags:
+            value = kwargs.get(tag)
+            if value is not None:
+                point.tag(tag, str(value))
+
+        self.client.write(record=point, database=cls.DB_QUERIES_BUCKET)
+
+    def log_scheduled_job(
+        self,
+        pool_name: str,
+        outcome: str,
+        queue_wait_time: float,
+        run_time: float,
+        queued: int,
+        running: int,
+        **kwargs
+    ):
+        if not self.is_prod_environment:
+            return
+
+        cls = type(self)
+        point = (
+            Point(cls.SCHEDULED_JOBS_BUCKET)
+            .tag("pool_name", pool_name)
+            .tag("outcome", outcome)
+            .tag("environment", self.environment)
+            .field("queue_wait_time", queue_wait_time)
+            .field("run_time", run_time)
+            .field("queued", queued)
+            .field("running", running)
+        )
+        self.client.write(record=point, database=cls.SCHEDULED_JOBS_BUCKET)
@@ -11,18 +11,60 @@ from openai import AsyncOpenAI
 from openai.types import Completion
 from pydantic import BaseModel
 
+from ...dependencies.api.influx_base_class import InfluxBaseClass
 from ...dependencies.api.openai_base_class import OpenAIBaseClass
+from ...dependencies.core.redis_client_factory import RedisClientFactory
+from ...internal.security.chartwise_encryptor import ChartWiseEncryptor
+from ...internal.utilities.completion_cache import CompletionCache
+from ...internal.utilities.embeddings_cache import EmbeddingsCache
 from ...vectors.message_templates import PromptCrafter, PromptScenario
 
 class OpenAIClient(OpenAIBaseClass):
 
+    def __init__(
+        self,
+        encryptor: ChartWiseEncryptor,
+        influx_client: InfluxBaseClass | None = None
+    ):
+        redis_client = RedisClientFactory.get_async_client()
+        self._embeddings_cache = EmbeddingsCache(
+            embedding_model=type(self).EMBEDDING_MODEL,
+            encryptor=encryptor,
+            redis_client=redis_client,
+            influx_client=influx_client,
+        )
+        self._completion_cache = CompletionCache(
+            llm_model=type(self).LLM_MODEL,
+            encryptor=encryptor,
+            redis_client=redis_client,
+            influx_client=influx_client,
+        )
+
     async def trigger_async_chat_completion(
         self,
         max_tokens: int,
         messages: list,
         expected_output_model: Type[BaseModel] | None = None,
+        prompt_scenario: PromptScenario | None = None,
     ) -> BaseModel | str:
         try:
+            # Every completion runs at temperature 0, so identical requests for content
+            # transforms can be served from cache.
+            use_cache = self._completion_cache.is_cacheable(prompt_scenario)
+            if use_cache:
+                cache_key = self._completion_cache.cache_key(
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    expected_output_model=expected_output_model,
+                )
+                cached_completion = await self._completion_cache.get(
+                    key=cache_key,
+                    prompt_scenario=prompt_scenario,
+                    expected_output_model=expected_output_model,
+                )
+                if cached_completion is not None:
+                    return cached_completion
+
             openai_client = AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
 
             if expected_output_model is not None:
@@ -50,6 +92,11 @@ class OpenAIClient(OpenAIBaseClass):
                 response_message = response_message.content.strip()
 
             assert response_message is not None, "Null value was attempted to send in response"
+            if use_cache:
+                await self._completion_cache.set(
+                    key=cache_key,
+                    completion=response_message
+                )
             return response_message
         except Exception as e:
             raise RuntimeError(e) from e
@@ -62,7 +109,7 @@ class OpenAIClient(OpenAIBaseClass):
         is_first_message_in_conversation: bool,
         patient_name: str,
         patient_gender: str | None,
-        calculate_max_tokens: Callable[[str, str], Awaitable[int]],
+        calculate_max_tokens: Callable[[str, str, str | None], Awaitable[int]],
         last_session_date: str | None = None
     ) -> AsyncIterable[str]:
         try:
@@ -90,6 +137,7 @@ class OpenAIClient(OpenAIBaseClass):
             max_tokens = await calculate_max_tokens(
                 system_prompt,
                 user_prompt_with_chat_history,
+                vector_context,
             )
 
             callback = AsyncIteratorCallbackHandler()
@@ -160,6 +208,12 @@ class OpenAIClient(OpenAIBaseClass):
         self,
         text: str
     ):
+        # Query inputs repeat a lot (suggested questions, briefing templates), and identical
+        # text always yields identical embeddings for a given model.
+        cached_embeddings = await self._embeddings_cache.get(text)
+        if cached_embeddings is not None:
+            return cached_embeddings
+
         openai_client = AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
         response = await openai_client.embeddings.create(
             input=[text],
@@ -168,4 +222,9 @@ class OpenAIClient(OpenAIBaseClass):
         embeddings = []
         for item in response.model_dump()['data']:
             embeddings.extend(item['embedding'])
+
+        await self._embeddings_cache.set(
+            text=text,
+            embeddings=embeddings
+        )
         return embeddings
@@ -1,10 +1,9 @@
-import base64
-import hashlib, os, uuid
-import tiktoken, torch
+import asyncio, base64
+import grpc, os, uuid
+import torch
 
 from datetime import date, datetime
 from fastapi import HTTPException, Request, status
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from llama_index.core import Document
 from llama_index.vector_stores.pinecone import PineconeVectorStore
 from pinecone import PineconeApiException
@@ -16,26 +15,45 @@ from typing import Callable, Tuple
 
 from ...data_processing.electra_model_data import ELECTRA_MODEL_CACHE_DIR, ELECTRA_MODEL_NAME
 from ...dependencies.api.aws_db_base_class import AwsDbBaseClass
+from ...dependencies.api.influx_base_class import InfluxBaseClass
 from ...dependencies.api.openai_base_class import OpenAIBaseClass
 from ...dependencies.api.pinecone_session_date_override import (
     PineconeQuerySessionDateOverride,
     PineconeQuerySessionDateOverrideType,
 )
 from ...dependencies.api.pinecone_base_class import PineconeBaseClass
+from ...dependencies.core.redis_client_factory import RedisClientFactory
 from ...internal.schemas import VECTORS_SESSION_MAPPINGS_TABLE_NAME
 from ...internal.security.chartwise_encryptor import ChartWiseEncryptor
 from ...internal.utilities import datetime_handler
-from ...vectors import data_cleaner
+from ...internal.utilities.ttl_lru_cache import TTLLRUCache
+from ...vectors.bucket_placement import BucketPlacement
+from ...vectors.context_assembler import ContextAssembler
+from ...vectors.local_vector_mirror import LocalVectorMirror
+from ...vectors.text_chunker import TextChunker
 
 class PineconeClient(PineconeBaseClass):
 
     RERANK_TOP_N = 4
     PRE_EXISTING_HISTORY_PREFIX = "pre-existing-history"
     MAX_CHUNK_SIZE = 512
+    HISTORICAL_CONTEXT_CACHE_MAX_ENTRIES = 1000
+    HISTORICAL_CONTEXT_CACHE_TTL_SECONDS = 300 # 5 minutes
+    CHUNK_SUMMARY_CACHE_MAX_ENTRIES = 20000
+    CHUNK_SUMMARY_CACHE_TTL_SECONDS = 3600 # 1 hour
+    DELETE_BATCH_SIZE = 1000 # Pinecone's limit of ids per delete request
+    MAX_CONCURRENT_NAMESPACE_DELETIONS = 8
+    NAMESPACE_DELETION_PROGRESS_INTERVAL = 50
+    SINGLE_DATE_QUERY_TOP_K = 100
+    DATE_RANGE_QUERY_TOP_K = 30
+    CONTEXT_TOKEN_BUDGET = 64000 # Half of the models' context window
+    FETCH_BATCH_SIZE = 200
+    MIRRORED_METADATA_FIELDS = ["session_date", "session_date_epoch_days", "chunk_summary", "session_report_id"]
 
     def __init__(
         self,
-        encryptor: ChartWiseEncryptor
+        encryptor: ChartWiseEncryptor,
+        influx_client: InfluxBaseClass | None = None
     ):
         self._pc = PineconeGRPC(api_key=os.environ.get('PINECONE_API_KEY'))
         self._tokenizer = AutoTokenizer.from_pretrained(
@@ -49,6 +67,36 @@ class PineconeClient(PineconeBaseClass):
         self._device = torch.device("cpu")
         self._model.to(self._device)
         self.encryptor = encryptor
+        self._bucket_placement = BucketPlacement(redis_client=RedisClientFactory.get_client())
+
+        # Pre-existing history rarely changes, but it gets fetched and decrypted on every
+        # context build. Entries are kept encrypted, and the short TTL bounds staleness
+        # across processes that didn't observe the write.
+        cls = type(self)
+        self._historical_context_cache = TTLLRUCache(
+            name="pinecone_historical_context",
+            max_entries=cls.HISTORICAL_CONTEXT_CACHE_MAX_ENTRIES,
+            ttl_seconds=cls.HISTORICAL_CONTEXT_CACHE_TTL_SECONDS,
+            influx_client=influx_client,
+        )
+
+        # Session vectors are immutable once written (updates re-insert them under new ids),
+        # so their summaries save us a fetch until the vectors get deleted. Like the historical
+        # context, summaries are kept encrypted and get decrypted on read, and the TTL bounds
+        # how long patient data stays in memory.
+        self._chunk_summary_cache = TTLLRUCache(
+            name="pinecone_chunk_summary",
+            max_entries=cls.CHUNK_SUMMARY_CACHE_MAX_ENTRIES,
+            ttl_seconds=cls.CHUNK_SUMMARY_CACHE_TTL_SECONDS,
+            influx_client=influx_client,
+        )
+
+        # Optional in-process mirror of the queried namespaces, for low-latency queries that keep
+        # working while Pinecone is unavailable.
+        self._local_vector_mirror = (
+            LocalVectorMirror() if os.environ.get("LOCAL_VECTOR_MIRROR_ENABLED") == "true" and LocalVectorMirror.is_available()
+            else None
+        )
 
     async def insert_session_vectors(
         self,
@@ -58,61 +106,58 @@ class PineconeClient(PineconeBaseClass):
         session_report_id: str,
         openai_client: OpenAIBaseClass,
         summarize_chunk: Callable,
-        therapy_session_date: date | None = None
+        therapy_session_date: date | None = None,
+        summarize_chunks: Callable | None = None
     ) -> list[str]:
         try:
-            bucket_index = self._get_bucket_for_user(user_id)
-            index = self._pc.Index(bucket_index)
-            vector_store = PineconeVectorStore(pinecone_index=index)
             namespace = self._get_namespace(
                 user_id=user_id,
                 patient_id=patient_id
             )
 
-            enc = tiktoken.get_encoding("o200k_base")
-            splitter = RecursiveCharacterTextSplitter(
-                separators=["\n\n", "\n", " ", ""],
-                chunk_size=256,
-                chunk_overlap=25,
-                length_function=lambda text: len(enc.encode(text)),
+            assert therapy_session_date is not None, "Cannot manipulate a null date"
+            chunk_texts = self._split_text_into_chunks(text)
+            chunk_summaries = (
+                await summarize_chunks(chunk_texts=chunk_texts, openai_client=openai_client) if summarize_chunks is not None
+                else [None] * len(chunk_texts)
             )
-            chunks = splitter.split_text(text)
-
             vector_ids = []
             vectors = []
-            for chunk_index, chunk in enumerate(chunks):
-                doc = Document()
-
-                chunk_text = data_cleaner.clean_up_text(chunk)
-                encrypted_chunk_text = self.encryptor.encrypt(chunk_text)
-                encoded_chunk_ciphertext = base64.b64encode(encrypted_chunk_text).decode("utf-8")
-                doc.set_content(encoded_chunk_ciphertext)
-
-                chunk_summary = await summarize_chunk(
+            for chunk_index, (chunk_text, chunk_summary) in enumerate(zip(chunk_texts, chunk_summaries)):
+                doc = await self._create_session_chunk_document(
                     chunk_text=chunk_text,
-                    openai_client=openai_client
+                    chunk_index=chunk_index,
+                    therapy_session_date=therapy_session_date,
+                    session_report_id=session_report_id,
+                    openai_client=openai_client,
+                    summarize_chunk=summarize_chunk,
+                    chunk_summary=chunk_summary
                 )
-                encrypted_chunk_summary = self.encryptor.encrypt(chunk_summary)
-                encoded_chunk_summary_ciphertext = base64.b64encode(encrypted_chunk_summary).decode("utf-8")
-
-                vector_store.namespace = namespace
-
-                assert therapy_session_date is not None, "Cannot manipulate a null date"
-                therapy_session_date_formatted = therapy_session_date.strftime(datetime_handler.DATE_FORMAT)
-                doc_id = f"{therapy_session_date_formatted}-{chunk_index}-{uuid.uuid1()}"
-                vector_ids.append(doc_id)
-                doc.id_ = doc_id
-                doc.metadata.update({
-                    "session_date": therapy_session_date_formatted,
-                    "chunk_summary": encoded_chunk_summary_ciphertext,
-                    "chunk_text": encoded_chunk_ciphertext,
-                    "session_report_id": str(session_report_id)
-                })
-
-                doc.embedding = await openai_client.create_embeddings(text=chunk_summary)
+                vector_ids.append(doc.id_)
                 vectors.append(doc)
 
-            await run_in_threadpool(vector_store.add, vectors)
+            # Vector ids are unique per attempt, so a retried insert first drops whatever an earlier attempt wrote.
+            _, write_indexes = await self._get_indexes_for_user(user_id)
+            for write_index in write_indexes:
+                await run_in_threadpool(
+                    self._delete_session_report_vectors,
+                    index=write_index,
+                    namespace=namespace,
+                    session_date=therapy_session_date,
+                    session_report_id=session_report_id
+                )
+            await self._add_documents(
+                indexes=write_indexes,
+                namespace=namespace,
+                docs=vectors
+            )
+            self._mirror_upsert(
+                namespace=namespace,
+                vectors=[
+                    {"id": doc.id_, "values": doc.embedding, "metadata": doc.metadata}
+                    for doc in vectors
+                ]
+            )
             return vector_ids
         except PineconeApiException as e:
             raise HTTPException(
@@ -131,24 +176,18 @@ class PineconeClient(PineconeBaseClass):
         summarize_chunk: Callable
     ):
         try:
-            bucket_index = self._get_bucket_for_user(user_id)
-            index = self._pc.Index(bucket_index)
-            vector_store = PineconeVectorStore(pinecone_index=index)
-
-            enc = tiktoken.get_encoding("o200k_base")
-            splitter = RecursiveCharacterTextSplitter(
-                separators=["\n\n", "\n", " ", ""],
-                chunk_size=256,
-                chunk_overlap=25,
-                length_function=lambda text: len(enc.encode(text)),
+            cls = type(self)
+            namespace = self._get_preexisting_history_namespace(
+                self._get_namespace(
+                    user_id=user_id,
+                    patient_id=patient_id
+                )
             )
-            chunks = splitter.split_text(text)
 
             vectors = []
-            for chunk in chunks:
+            for chunk_text in self._split_text_into_chunks(text):
                 doc = Document()
 
-                chunk_text = data_cleaner.clean_up_text(chunk)
                 encrypted_chunk_text = self.encryptor.encrypt(chunk_text)
                 encoded_chunk_ciphertext = base64.b64encode(encrypted_chunk_text).decode("utf-8")
                 doc.set_content(encoded_chunk_ciphertext)
@@ -160,14 +199,6 @@ class PineconeClient(PineconeBaseClass):
                 encrypted_chunk_summary = self.encryptor.encrypt(chunk_summary)
                 encoded_chunk_summary_ciphertext = base64.b64encode(encrypted_chunk_summary).decode("utf-8")
 
-                namespace = self._get_namespace(
-                    user_id=user_id,
-                    patient_id=patient_id
-                )
-                cls = type(self)
-                vector_store.namespace = "".join([namespace,
-                                                    "-",
-                                                    cls.PRE_EXISTING_HISTORY_PREFIX])
                 doc.id_ = f"{cls.PRE_EXISTING_HISTORY_PREFIX}-{uuid.uuid1()}"
                 doc.embedding = await openai_client.create_embeddings(text=chunk_summary)
                 doc.metadata.update({
@@ -176,7 +207,16 @@ class PineconeClient(PineconeBaseClass):
                 })
                 vectors.append(doc)
 
-            await run_in_threadpool(vector_store.add, vectors)
+            _, write_indexes = await self._get_indexes_for_user(user_id)
+            await self._add_documents(
+                indexes=write_indexes,
+                namespace=namespace,
+                docs=vectors
+            )
+            self._invalidate_historical_context_cache(
+                user_id=user_id,
+                patient_id=patient_id
+            )
 
         except PineconeApiException as e:
             raise HTTPException(status_code=status.HTTP_417_EXPECTATION_FAILED, detail=str(e))
@@ -190,26 +230,40 @@ class PineconeClient(PineconeBaseClass):
         date: date | None = None
     ):
         try:
-            bucket_index = self._get_bucket_for_user(user_id)
-            index = self._pc.Index(bucket_index)
-
+            indexes = self._get_write_indexes(user_id)
             namespace = self._get_namespace(
                 user_id=user_id,
                 patient_id=patient_id
             )
-            ids_to_delete = []
             if date is None:
                 # Delete all vectors inside namespace
-                for list_ids in index.list(namespace=namespace):
-                    ids_to_delete = list_ids
+                for index in indexes:
+                    self._delete_namespace(
+                        index=index,
+                        namespace=namespace
+                    )
+                self._chunk_summary_cache.invalidate_matching(
+                    lambda key: key[0] == namespace
+                )
             else:
                 # Delete the subset of data that matches the date prefix.
                 date_formatted = date.strftime(datetime_handler.DATE_FORMAT)
-                for list_ids in index.list(prefix=date_formatted, namespace=namespace):
-                    ids_to_delete = list_ids
-
-            if len(ids_to_delete or '') > 0:
-                index.delete(ids=ids_to_delete, namespace=namespace)
+                for index in indexes:
+                    vector_ids = self._list_vector_ids(
+                        index=index,
+                        namespace=namespace,
+                        prefix=date_formatted
+                    )
+                    self._delete_vector_ids(
+                        index=index,
+                        namespace=namespace,
+                        vector_ids=vector_ids
+                    )
+                    if self._local_vector_mirror is not None:
+                        self._local_vector_mirror.remove(namespace, vector_ids)
+                self._chunk_summary_cache.invalidate_matching(
+                    lambda key: key[0] == namespace and key[1].startswith(date_formatted)
+                )
         except NotFoundException as e:
             raise NotFoundException(e)
         except Exception as e:
@@ -221,28 +275,83 @@ class PineconeClient(PineconeBaseClass):
         patient_id: str
     ):
         try:
-            bucket_index = self._get_bucket_for_user(user_id)
-            index = self._pc.Index(bucket_index)
-
             namespace = self._get_namespace(
                 user_id=user_id,
                 patient_id=patient_id
             )
-            namespace_with_suffix = "".join([namespace,
-                                             "-",
-                                             type(self).PRE_EXISTING_HISTORY_PREFIX])
-
-            ids_to_delete = []
-            for list_ids in index.list(namespace=namespace_with_suffix):
-                ids_to_delete = list_ids
+            for index in self._get_write_indexes(user_id):
+                self._delete_namespace(
+                    index=index,
+                    namespace=self._get_preexisting_history_namespace(namespace)
+                )
 
-            if len(ids_to_delete or '') > 0:
-                index.delete(ids=ids_to_delete, namespace=namespace_with_suffix)
+            self._invalidate_historical_context_cache(
+                user_id=user_id,
+                patient_id=patient_id
+            )
         except NotFoundException as e:
             raise NotFoundException(e)
         except Exception as e:
             raise RuntimeError(e) from e
 
+    async def delete_patients_vectors(
+        self,
+        user_id: str,
+        patient_ids: list[str]
+    ):
+        try:
+            cls = type(self)
+            _, indexes = await self._get_indexes_for_user(user_id)
+
+            namespaces = []
+            for patient_id in patient_ids:
+                namespace = self._get_namespace(
+                    user_id=user_id,
+                    patient_id=patient_id
+                )
+                namespaces.extend([namespace, self._get_preexisting_history_namespace(namespace)])
+
+            semaphore = asyncio.Semaphore(cls.MAX_CONCURRENT_NAMESPACE_DELETIONS)
+            deleted_namespaces_count = 0
+
+            async def delete_namespace(namespace: str):
+                nonlocal deleted_namespaces_count
+                async with semaphore:
+                    for index in indexes:
+                        await run_in_threadpool(
+                            self._delete_namespace,
+                            index=index,
+                            namespace=namespace
+                        )
+                deleted_namespaces_count += 1
+                if (deleted_namespaces_count % cls.NAMESPACE_DELETION_PROGRESS_INTERVAL == 0
+                    or deleted_namespaces_count == len(namespaces)):
+                    print(f"[PineconeClient] Deleted {deleted_namespaces_count}/{len(namespaces)} namespaces for user {user_id}")
+
+            results = await asyncio.gather(
+                *[delete_namespace(namespace) for namespace in namespaces],
+                return_exceptions=True
+            )
+
+            for patient_id in patient_ids:
+                namespace = self._get_namespace(
+                    user_id=user_id,
+                    patient_id=patient_id
+                )
+                self._chunk_summary_cache.invalidate_matching(
+                    lambda key: key[0] == namespace
+                )
+                self._invalidate_historical_context_cache(
+                    user_id=user_id,
+                    patient_id=patient_id
+                )
+
+            failures = [result for result in results if isinstance(result, Exception)]
+            if len(failures) > 0:
+                raise Exception(f"Failed to delete {len(failures)}/{len(namespaces)} namespaces: {failures[0]}")
+        except Exception as e:
+            raise RuntimeError(e) from e
+
     async def update_session_vectors(
         self,
         user_id: str,
@@ -252,26 +361,131 @@ class PineconeClient(PineconeBaseClass):
         new_date: date,
         session_report_id: str,
         openai_client: OpenAIBaseClass,
-        summarize_chunk: Callable
-    ):
+        summarize_chunk: Callable,
+        summarize_chunks: Callable | None = None
+    ) -> list[str]:
         try:
-            # Delete the outdated data
-            self.delete_session_vectors(
+            # Resolved once, so that the diff is computed against the bucket we're writing to.
+            index, write_indexes = await self._get_indexes_for_user(user_id)
+            namespace = self._get_namespace(
                 user_id=user_id,
-                patient_id=patient_id,
-                date=old_date
+                patient_id=patient_id
             )
 
-            # Insert the fresh data
-            await self.insert_session_vectors(
-                user_id=user_id,
-                patient_id=patient_id,
-                text=text,
-                session_report_id=session_report_id,
-                openai_client=openai_client,
-                therapy_session_date=new_date,
-                summarize_chunk=summarize_chunk
+            # Index the session's current vectors by chunk hash, so that unchanged chunks can be reused.
+            reusable_vectors: dict[str, list[dict]] = {}
+            session_report_vectors = await run_in_threadpool(
+                self._fetch_session_report_vectors,
+                index=index,
+                namespace=namespace,
+                session_date=old_date,
+                session_report_id=session_report_id
             )
+            for vector_data in session_report_vectors:
+                chunk_hash = vector_data['metadata'].get('chunk_hash')
+                if chunk_hash is None:
+                    # Vectors written before chunk hashes were introduced.
+                    chunk_hash = self.encryptor.digest(
+                        self.encryptor.decrypt(base64.b64decode(vector_data['metadata']['chunk_text']))
+                    )
+                reusable_vectors.setdefault(chunk_hash, []).append(vector_data)
+
+            chunk_texts = self._split_text_into_chunks(text)
+            reused_vectors: list[dict | None] = []
+            for chunk_text in chunk_texts:
+                matching_vectors = reusable_vectors.get(self.encryptor.digest(chunk_text))
+                reused_vectors.append(matching_vectors.pop() if matching_vectors else None)
+
+            # Reused chunks keep their summary, and the callable summarizes the rest (all at once).
+            chunk_summaries = [None] * len(chunk_texts)
+            if summarize_chunks is not None:
+                chunk_summaries = await summarize_chunks(
+                    chunk_texts=chunk_texts,
+                    openai_client=openai_client,
+                    chunk_summaries=[
+                        None if reused_vector is None
+                        else self.encryptor.decrypt(base64.b64decode(reused_vector['metadata']['chunk_summary']))
+                        for reused_vector in reused_vectors
+                    ]
+                )
+
+            date_changed = old_date != new_date
+            new_date_formatted = new_date.strftime(datetime_handler.DATE_FORMAT)
+            vector_ids = []
+            moved_vectors = []
+            moved_from_vector_ids = []
+            new_vectors = []
+            for chunk_index, (chunk_text, reused_vector) in enumerate(zip(chunk_texts, reused_vectors)):
+                if reused_vector is None:
+                    # New or edited chunk, it has to be summarized and embedded.
+                    doc = await self._create_session_chunk_document(
+                        chunk_text=chunk_text,
+                        chunk_index=chunk_index,
+                        therapy_session_date=new_date,
+                        session_report_id=session_report_id,
+                        openai_client=openai_client,
+                        summarize_chunk=summarize_chunk,
+                        chunk_summary=chunk_summaries[chunk_index]
+                    )
+                    vector_ids.append(doc.id_)
+                    new_vectors.append(doc)
+                    continue
+
+                if not date_changed:
+                    vector_ids.append(reused_vector['id'])
+                    continue
+
+                # Vector ids are prefixed with the session date, so a date change re-keys the vector.
+                # Its embedding and summary are carried over as-is.
+                moved_vector_id = f"{new_date_formatted}-{chunk_index}-{uuid.uuid1()}"
+                vector_ids.append(moved_vector_id)
+                moved_vectors.append({
+                    "id": moved_vector_id,
+                    "values": list(reused_vector['values']),
+                    "metadata": {
+                        **reused_vector['metadata'],
+                        "session_date": new_date_formatted,
+                        "session_date_epoch_days": datetime_handler.to_epoch_days(new_date),
+                    },
+                })
+                moved_from_vector_ids.append(reused_vector['id'])
+
+            if len(moved_vectors) > 0:
+                for write_index in write_indexes:
+                    await run_in_threadpool(write_index.upsert, vectors=moved_vectors, namespace=namespace)
+                self._mirror_upsert(
+                    namespace=namespace,
+                    vectors=moved_vectors
+                )
+
+            if len(new_vectors) > 0:
+                await self._add_documents(
+                    indexes=write_indexes,
+                    namespace=namespace,
+                    docs=new_vectors
+                )
+                self._mirror_upsert(
+                    namespace=namespace,
+                    vectors=[
+                        {"id": doc.id_, "values": doc.embedding, "metadata": doc.metadata}
+                        for doc in new_vectors
+                    ]
+                )
+
+            # Drop the vectors of removed or edited chunks, along with the ones that were re-keyed.
+            stale_vector_ids = moved_from_vector_ids + [
+                vector_data['id']
+                for vectors in reusable_vectors.values()
+                for vector_data in vectors
+            ]
+            if len(stale_vector_ids) > 0:
+                for write_index in write_indexes:
+                    await run_in_threadpool(write_index.delete, ids=stale_vector_ids, namespace=namespace)
+                if self._local_vector_mirror is not None:
+                    self._local_vector_mirror.remove(namespace, stale_vector_ids)
+                for vector_id in stale_vector_ids:
+                    self._chunk_summary_cache.invalidate((namespace, vector_id))
+            return vector_ids
         except PineconeApiException as e:
             raise HTTPException(
                 status_code=status.HTTP_417_EXPECTATION_FAILED,
@@ -322,7 +536,8 @@ class PineconeClient(PineconeBaseClass):
         rerank_vectors: bool,
         request: Request,
         include_preexisting_history: bool = True,
-        session_dates_overrides: list[PineconeQuerySessionDateOverride] | None = None
+        session_dates_overrides: list[PineconeQuerySessionDateOverride] | None = None,
+        context_token_budget: int | None = None
     ) -> str:
         try:
             missing_session_data_error = (
@@ -330,55 +545,48 @@ class PineconeClient(PineconeBaseClass):
                 "They may have not gone through their first session since the practitioner added them to the platform. "
             )
 
-            bucket_index = self._get_bucket_for_user(user_id)
-            index = self._pc.Index(bucket_index)
+            index, _ = await self._get_indexes_for_user(user_id)
             namespace = self._get_namespace(
                 user_id=user_id,
                 patient_id=patient_id
             )
 
+            # Both the similarity search and the session date overrides are served by vector queries.
+            query_embeddings = None
+            if query_top_k > 0 or len(session_dates_overrides or []) > 0:
+                query_embeddings = await openai_client.create_embeddings(text=query_input)
+
             ids_contained = []
             retrieved_docs = []
-            context = ""
             if query_top_k > 0:
-                retrieved_docs, ids_contained = await self._query_vectors(
-                    query_input=query_input,
+                assert query_embeddings is not None, "Missing query embeddings"
+                retrieved_docs, _ = self._query_vectors(
+                    embeddings=query_embeddings,
                     query_top_k=query_top_k,
                     index=index,
                     namespace=namespace,
-                    openai_client=openai_client,
                 )
 
                 if len(retrieved_docs or '') == 0:
                     return missing_session_data_error
 
+            # Sections are added by priority, so the most relevant context survives the budget.
+            context_assembler = ContextAssembler(
+                token_budget=context_token_budget or type(self).CONTEXT_TOKEN_BUDGET
+            )
             if rerank_vectors:
                 assert query_top_k > 0, "query_top_k must be greater than 0 when reranking is enabled."
-                context, ids_contained = self.get_reranked_context(
+                retrieved_docs = self._rerank_docs(
                     query_input=query_input,
-                    retrieved_docs=retrieved_docs,
+                    docs=retrieved_docs,
                     batch_size=query_top_k,
+                )[:type(self).RERANK_TOP_N]
+
+            if len(retrieved_docs or '') > 0:
+                added_positions = context_assembler.add_items(
+                    [self._format_context_doc(doc) for doc in retrieved_docs]
                 )
-            elif len(retrieved_docs or '') > 0:
-                # If reranking is not enabled, we will use the retrieved documents as they are.
-                for doc in retrieved_docs:
-                    formatted_date = datetime_handler.convert_to_date_format_spell_out_month(
-                        session_date=doc['session_date'],
-                        incoming_date_format=datetime_handler.DATE_FORMAT
-                    )
-                    doc_session_date = "".join(["`session_date` = ", f"{formatted_date}\n"])
-                    doc_chunk_summary = "".join(["`chunk_summary` = ", f"{doc['chunk_summary']}"])
-                    doc_full_context = "".join(
-                        [doc_session_date,
-                        doc_chunk_summary,
-                        "\n"]
-                    )
-                    context = "\n".join(
-                        [
-                            context,
-                            doc_full_context
-                        ]
-                    )
+                ids_contained.extend([retrieved_docs[position]['id'] for position in added_positions])
 
             if include_preexisting_history:
                 found_historical_context, historical_context = await self.fetch_historical_context(
@@ -399,31 +607,29 @@ class PineconeClient(PineconeBaseClass):
                         f"{historical_context}\nBeyond this pre-existing context, there's no data from actual patient sessions. "
                         "They may have not gone through their first session since the practitioner added them to the platform. "
                     )
-                    context = "\n".join(
-                        [
-                            context,
-                            historical_context
-                        ]
-                    )
+                    context_assembler.add(historical_context, truncate=True)
 
             # Check if caller wants us to fetch a specific set of vectors, other than
             # the ones that may have already been fetched.
             if session_dates_overrides is not None:
+                assert query_embeddings is not None, "Missing query embeddings"
                 for session_date_override in session_dates_overrides:
                     if session_date_override.override_type == PineconeQuerySessionDateOverrideType.SINGLE_DATE:
-                        context = self._append_context_from_single_date_vectors(
+                        self._add_context_from_single_date_vectors(
                             session_date_override=session_date_override,
                             index=index,
                             namespace=namespace,
-                            current_context=context,
+                            query_embeddings=query_embeddings,
+                            context_assembler=context_assembler,
                             ids_contained_in_current_context=ids_contained,
                         )
                     elif session_date_override.override_type == PineconeQuerySessionDateOverrideType.DATE_RANGE:
                         assert session_date_override.session_date_end is not None, "Missing session date end"
-                        context = await self._append_context_from_date_range_vectors(
-                            current_context=context,
+                        await self._add_context_from_date_range_vectors(
+                            context_assembler=context_assembler,
                             index=index,
                             namespace=namespace,
+                            query_embeddings=query_embeddings,
                             aws_db_client=aws_db_client,
                             therapist_id=user_id,
                             request=request,
@@ -432,7 +638,9 @@ class PineconeClient(PineconeBaseClass):
                             end_date=session_date_override.session_date_end,
                             ids_contained_in_current_context=ids_contained,
                         )
-            return missing_session_data_error if len(context or '') == 0 else context
+
+            context = context_assembler.build()
+            return missing_session_data_error if len(context) == 0 else context
         except Exception as e:
             raise RuntimeError(e) from e
 
@@ -448,115 +656,187 @@ class PineconeClient(PineconeBaseClass):
                 ]
             )
         )
-        context_vector_ids = []
-        for list_ids in index.list(namespace=historial_context_namespace):
-            context_vector_ids = list_ids
 
-        if len(context_vector_ids or '') == 0:
-            return (False, None)
+        cached_context = self._historical_context_cache.get(historial_context_namespace)
+        if cached_context is not None:
+            # An empty cached value means we already know there's no historical context.
+            if len(cached_context) == 0:
+                return (False, None)
+            return (True, self.encryptor.decrypt(cached_context))
 
-        fetch_result = index.fetch(
-            ids=context_vector_ids,
-            namespace=historial_context_namespace
+        found_context, context = self._fetch_historical_context_from_index(
+            index=index,
+            historial_context_namespace=historial_context_namespace
+        )
+        self._historical_context_cache.set(
+            historial_context_namespace,
+            self.encryptor.encrypt(context) if found_context else b""
         )
+        return (found_context, context)
 
-        context_docs = []
-        vectors = fetch_result['vectors']
-        for vector_id in vectors:
-            vector_data = vectors[vector_id]
-            metadata = vector_data['metadata']
-            ciphertext = base64.b64decode(metadata['pre_existing_history_summary'])
-            plaintext = self.encryptor.decrypt(ciphertext)
-            decrypted_chunk_summary = "".join(["`pre_existing_history_summary` = ",
-                                               f"{plaintext}"])
-            decrypted_chunk_full_context = "".join([decrypted_chunk_summary, "\n"])
-            context_docs.append({
-                "id": vector_data['id'],
-                "text": decrypted_chunk_full_context
-            })
+    # Private
 
-        if len(context_docs) > 0:
-            return (True, "\n".join([doc['text'] for doc in context_docs]))
-        return (False, None)
+    def _split_text_into_chunks(
+        self,
+        text: str
+    ) -> list[str]:
+        return TextChunker().split_text(text)
 
-    def get_reranked_context(
+    async def _create_session_chunk_document(
         self,
-        query_input: str,
-        retrieved_docs: list,
-        batch_size: int,
-        include_all_docs: bool = False,
-    ) -> Tuple[str, list]:
+        chunk_text: str,
+        chunk_index: int,
+        therapy_session_date: date,
+        session_report_id: str,
+        openai_client: OpenAIBaseClass,
+        summarize_chunk: Callable,
+        chunk_summary: str | None = None
+    ) -> Document:
         """
-        Reranks the retrieved documents based on their chunk summaries using a pre-trained model.
-        Args:
-            query_input (str): The input query to be used for reranking.
-            retrieved_docs (list): A list of documents retrieved from the vector store.
-            batch_size (int): The size of the batches to process the documents in.
-        Returns:
-            Tuple[str, list]:
-            - str: The reranked context.
-            - list: A list of vector ids contained in the reranked context.
+        Summarizes (unless a summary is provided) and embeds a session chunk, returning the document
+        to be inserted in the vector store.
         """
-        # Create pairs using only the chunk_summary for ranking
-        pairs = [[query_input, doc['chunk_summary']] for doc in retrieved_docs]
-        scores = []
-        ids_contained = []
-
-        # Process in batches
-        for i in range(0, len(pairs), batch_size):
-            batch = pairs[i:i + batch_size]
-            inputs = self._tokenizer(
-                batch,
-                padding=True,
-                truncation=True,
-                return_tensors='pt',
-                max_length=type(self).MAX_CHUNK_SIZE
-            ).to(self._device)
-
-            with torch.no_grad():
-                batch_scores = self._model(**inputs).logits.squeeze(-1)
-                scores.extend(batch_scores.cpu().numpy())
-
-        # Sort the original objects based on scores
-        doc_score_pairs = list(zip(retrieved_docs, scores))
-        reranked_documents = [doc for doc, _ in sorted(doc_score_pairs, key=lambda x: x[1], reverse=True)]
-
-        reranked_context = ""
-        reranked_docs_count = type(self).RERANK_TOP_N if not include_all_docs else len(retrieved_docs)
-        for doc in reranked_documents[:reranked_docs_count]:
-            ids_contained.append(doc['id'])
-            formatted_date = datetime_handler.convert_to_date_format_spell_out_month(
-                session_date=doc['session_date'],
-                incoming_date_format=datetime_handler.DATE_FORMAT
+        doc = Document()
+        encrypted_chunk_text = self.encryptor.encrypt(chunk_text)
+        encoded_chunk_ciphertext = base64.b64encode(encrypted_chunk_text).decode("utf-8")
+        doc.set_content(encoded_chunk_ciphertext)
+
+        if chunk_summary is None:
+            chunk_summary = await summarize_chunk(
+                chunk_text=chunk_text,
+                openai_client=openai_client
             )
-            doc_session_date = "".join(["`session_date` = ", f"{formatted_date}\n"])
-            doc_chunk_summary = "".join(["`chunk_summary` = ", f"{doc['chunk_summary']}"])
-            doc_full_context = "".join(
-                [doc_session_date,
-                doc_chunk_summary,
-                "\n"]
+        encrypted_chunk_summary = self.encryptor.encrypt(chunk_summary)
+        encoded_chunk_summary_ciphertext = base64.b64encode(encrypted_chunk_summary).decode("utf-8")
+
+        therapy_session_date_formatted = therapy_session_date.strftime(datetime_handler.DATE_FORMAT)
+        doc.id_ = f"{therapy_session_date_formatted}-{chunk_index}-{uuid.uuid1()}"
+        doc.metadata.update({
+            "session_date": therapy_session_date_formatted,
+            "session_date_epoch_days": datetime_handler.to_epoch_days(therapy_session_date),
+            "chunk_summary": encoded_chunk_summary_ciphertext,
+            "chunk_text": encoded_chunk_ciphertext,
+            "chunk_hash": self.encryptor.digest(chunk_text),
+            "session_report_id": str(session_report_id)
+        })
+        doc.embedding = await openai_client.create_embeddings(text=chunk_summary)
+        return doc
+
+    def _fetch_session_report_vectors(
+        self,
+        index: GRPCIndex,
+        namespace: str,
+        session_date: date,
+        session_report_id: str
+    ) -> list[dict]:
+        """
+        Fetches the vectors (values included) of a session report. Vectors are listed by their session
+        date prefix, which other sessions from the same day share, so they're filtered by report id.
+        """
+        vector_ids = self._list_vector_ids(
+            index=index,
+            namespace=namespace,
+            prefix=session_date.strftime(datetime_handler.DATE_FORMAT)
+        )
+        if len(vector_ids) == 0:
+            return []
+
+        vectors = index.fetch(ids=vector_ids, namespace=namespace)['vectors'] or {}
+        return [
+            {
+                "id": vectors[vector_id]['id'],
+                "values": vectors[vector_id]['values'],
+                "metadata": vectors[vector_id]['metadata'],
+            }
+            for vector_id in vectors
+            if vectors[vector_id]['metadata'].get('session_report_id') == str(session_report_id)
+        ]
+
+    def _delete_session_report_vectors(
+        self,
+        index: GRPCIndex,
+        namespace: str,
+        session_date: date,
+        session_report_id: str
+    ):
+        stale_vector_ids = [
+            vector_data['id'] for vector_data in self._fetch_session_report_vectors(
+                index=index,
+                namespace=namespace,
+                session_date=session_date,
+                session_report_id=session_report_id
             )
-            reranked_context = "\n".join([reranked_context, doc_full_context])
-        return reranked_context, ids_contained
+        ]
+        if len(stale_vector_ids) == 0:
+            return
 
-    # Private
+        self._delete_vector_ids(
+            index=index,
+            namespace=namespace,
+            vector_ids=stale_vector_ids
+        )
+        if self._local_vector_mirror is not None:
+            self._local_vector_mirror.remove(namespace, stale_vector_ids)
+        for vector_id in stale_vector_ids:
+            self._chunk_summary_cache.invalidate((namespace, vector_id))
 
-    async def _query_vectors(
+    def _list_vector_ids(
         self,
-        query_input: str,
+        index: GRPCIndex,
+        namespace: str,
+        prefix: str | None = None
+    ) -> list[str]:
+        # `list` paginates, so we collect every page.
+        vector_ids = []
+        list_kwargs = {"namespace": namespace} if prefix is None else {"namespace": namespace, "prefix": prefix}
+        for list_ids in index.list(**list_kwargs):
+            vector_ids.extend(list_ids)
+        return vector_ids
+
+    def _query_vectors(
+        self,
+        embeddings: list[float],
         query_top_k: int,
         index: GRPCIndex,
         namespace: str,
-        openai_client: OpenAIBaseClass,
+        metadata_filter: dict | None = None,
     ) -> Tuple[list, list]:
-        embeddings = await openai_client.create_embeddings(text=query_input)
-        query_result = index.query(
-            vector=embeddings,
-            top_k=query_top_k,
+        mirror = self._local_vector_mirror
+        query_matches = None if mirror is None else mirror.query(
             namespace=namespace,
-            include_metadata=True
+            embeddings=embeddings,
+            top_k=query_top_k,
+            metadata_filter=metadata_filter
         )
-        query_matches = query_result.to_dict()['matches']
+
+        if query_matches is None:
+            try:
+                query_result = index.query(
+                    vector=embeddings,
+                    top_k=query_top_k,
+                    namespace=namespace,
+                    include_metadata=True,
+                    filter=metadata_filter
+                )
+                query_matches = query_result.to_dict()['matches']
+            except Exception as e:
+                # Degraded mode: serve an outdated copy of the namespace rather than failing.
+                query_matches = None if mirror is None else mirror.query(
+                    namespace=namespace,
+                    embeddings=embeddings,
+                    top_k=query_top_k,
+                    metadata_filter=metadata_filter,
+                    allow_stale=True
+                )
+                if query_matches is None:
+                    raise
+                print(f"[PineconeClient] Vector query failed, serving from the local mirror: {e}")
+            else:
+                if mirror is not None:
+                    mirror.schedule_load(
+                        namespace,
+                        lambda: self._load_namespace_vectors(index=index, namespace=namespace)
+                    )
 
         if len(query_matches or []) == 0:
             return [], []
@@ -564,146 +844,173 @@ class PineconeClient(PineconeBaseClass):
         ids_contained = []
         retrieved_docs = []
         for match in query_matches:
-            metadata = match['metadata']
-            session_date = metadata['session_date']
             vector_id = match['id']
             ids_contained.append(vector_id)
-            ciphertext = base64.b64decode(metadata['chunk_summary'])
-            plaintext = self.encryptor.decrypt(ciphertext)
+            # The query already returned the metadata, so there's no fetch for the cache to save here.
             retrieved_docs.append(
                 {
-                    "session_date": session_date,
-                    "chunk_summary": plaintext,
+                    **self._decrypt_chunk_metadata(match['metadata']),
                     "id": vector_id,
                 }
             )
         return retrieved_docs, ids_contained
 
-    def _create_context_from_vectors(
+    def _fetch_context_docs(
         self,
         index: GRPCIndex,
         namespace: str,
-        vector_ids: list[str],
-        query_input: str | None = None,
-        rerank_vectors: bool = False
-    ) -> str:
-        fetch_result = index.fetch(
-            ids=vector_ids,
-            namespace=namespace
-        )
-        vectors = fetch_result['vectors']
-        if len(vectors or []) == 0:
-            return ""
-
+        vector_ids: list[str]
+    ) -> list[dict]:
         fetched_docs = []
-        for vector_id in vectors:
-            vector_data = vectors[vector_id]
-
-            metadata = vector_data['metadata']
-            ciphertext = base64.b64decode(metadata['chunk_summary'])
-            plaintext = self.encryptor.decrypt(ciphertext)
+        missing_vector_ids = []
+        for vector_id in vector_ids:
+            cached_chunk_data = self._get_cached_chunk_data(namespace=namespace, vector_id=vector_id)
+            if cached_chunk_data is None:
+                missing_vector_ids.append(vector_id)
+                continue
             fetched_docs.append({
-                "session_date": metadata['session_date'],
-                "chunk_summary": plaintext,
-                "id": vector_data['id'],
+                **cached_chunk_data,
+                "id": vector_id,
             })
 
-        if rerank_vectors:
-            assert query_input is not None, "query_input must be provided when reranking is enabled."
-            context, _ = self.get_reranked_context(
-                query_input=query_input,
-                batch_size=len(fetched_docs),
-                retrieved_docs=fetched_docs,
-                include_all_docs=True,
+        # Only hit the index for the vectors we haven't decrypted before.
+        if len(missing_vector_ids) > 0:
+            fetch_result = index.fetch(
+                ids=missing_vector_ids,
+                namespace=namespace
             )
-        else:
-            # Build context in-order from the fetched documents.
-            context = ""
-            for doc in fetched_docs:
-                formatted_date = datetime_handler.convert_to_date_format_spell_out_month(
-                    session_date=doc['session_date'],
-                    incoming_date_format=datetime_handler.DATE_FORMAT
+            vectors = fetch_result['vectors']
+            for vector_id in (vectors or []):
+                vector_data = vectors[vector_id]
+                metadata = vector_data['metadata']
+                self._chunk_summary_cache.set(
+                    (namespace, vector_data['id']),
+                    {
+                        "session_date": metadata['session_date'],
+                        "chunk_summary": base64.b64decode(metadata['chunk_summary']),
+                    }
                 )
-                doc_context = "".join([
-                    "`session_date` = ",
-                    formatted_date,
-                    "\n",
-                    "`chunk_summary` = ",
-                    doc['chunk_summary'],
-                    "\n"
-                ])
-                context = "".join([context, doc_context, "\n"])
-        return context
-
-    def _append_context_from_single_date_vectors(
+                fetched_docs.append({
+                    **self._decrypt_chunk_metadata(metadata),
+                    "id": vector_data['id'],
+                })
+        return fetched_docs
+
+    def _rerank_docs(
         self,
-        session_date_override: PineconeQuerySessionDateOverride,
-        index: GRPCIndex,
-        namespace: str,
-        current_context: str,
-        ids_contained_in_current_context: list[str]
-    ) -> str:
+        query_input: str,
+        docs: list[dict],
+        batch_size: int
+    ) -> list[dict]:
         """
-        Updates the context for a single session date override.
+        Sorts the documents by relevance to the query, scoring their chunk summaries with the reranking model.
         """
-        session_date_vector_ids = []
-        for list_ids in index.list(
-            namespace=namespace,
-            prefix=session_date_override.session_date_start,
-        ):
-            session_date_vector_ids = list_ids
+        if len(docs) == 0:
+            return []
 
-        if len(session_date_vector_ids) == 0:
-            # If there are no db hits for the session date override, we will not modify the current context.
-            return current_context
+        # Create pairs using only the chunk_summary for ranking
+        pairs = [[query_input, doc['chunk_summary']] for doc in docs]
+        scores = []
 
-        filtered_vector_ids = [
-            vector_id for vector_id in session_date_vector_ids if vector_id not in ids_contained_in_current_context
-        ]
+        # Process in batches
+        for i in range(0, len(pairs), batch_size):
+            batch = pairs[i:i + batch_size]
+            inputs = self._tokenizer(
+                batch,
+                padding=True,
+                truncation=True,
+                return_tensors='pt',
+                max_length=type(self).MAX_CHUNK_SIZE
+            ).to(self._device)
 
-        if len(filtered_vector_ids) == 0:
-            # If there are no new vectors to append, we will not modify the current context.
-            return current_context
+            with torch.no_grad():
+                batch_scores = self._model(**inputs).logits.squeeze(-1)
+                scores.extend(batch_scores.cpu().numpy())
+
+        doc_score_pairs = list(zip(docs, scores))
+        return [doc for doc, _ in sorted(doc_score_pairs, key=lambda x: x[1], reverse=True)]
 
-        session_date_override_context = self._create_context_from_vectors(
+    def _format_context_doc(
+        self,
+        doc: dict
+    ) -> str:
+        formatted_date = datetime_handler.convert_to_date_format_spell_out_month(
+            session_date=doc['session_date'],
+            incoming_date_format=datetime_handler.DATE_FORMAT
+        )
+        return "".join([
+            "`session_date` = ",
+            formatted_date,
+            "\n",
+            "`chunk_summary` = ",
+            doc['chunk_summary'],
+            "\n"
+        ])
+
+    def _add_context_from_single_date_vectors(
+        self,
+        session_date_override: PineconeQuerySessionDateOverride,
+        index: GRPCIndex,
+        namespace: str,
+        query_embeddings: list[float],
+        context_assembler: ContextAssembler,
+        ids_contained_in_current_context: list[str]
+    ):
+        """
+        Adds the context for a single session date override.
+        """
+        session_date = datetime.strptime(
+            session_date_override.session_date_start,
+            datetime_handler.DATE_FORMAT
+        ).date()
+        session_date_docs, _ = self._query_vectors(
+            embeddings=query_embeddings,
+            query_top_k=type(self).SINGLE_DATE_QUERY_TOP_K,
             index=index,
             namespace=namespace,
-            vector_ids=filtered_vector_ids,
+            metadata_filter={
+                "session_date_epoch_days": {"$eq": datetime_handler.to_epoch_days(session_date)}
+            },
         )
 
-        if session_date_override_context is not None:
-            # If the session_date_override has an output prefix or suffix for formatting purposes,
-            # apply it, and append the final result to the `context` value.
-            if session_date_override.output_prefix_override is not None:
-                session_date_override_context = "".join(
-                    [
-                        session_date_override.output_prefix_override,
-                        session_date_override_context
-                    ]
-                )
-            if session_date_override.output_suffix_override is not None:
-                session_date_override_context = "".join(
-                    [
-                        session_date_override_context,
-                        session_date_override.output_suffix_override,
-                        "\n"
-                    ]
-                )
-            return "\n".join(
-                [
-                    current_context,
-                    session_date_override_context
-                ]
+        if len(session_date_docs) > 0:
+            session_date_override_docs = [
+                doc for doc in session_date_docs if doc['id'] not in ids_contained_in_current_context
+            ]
+        else:
+            # Vectors written before `session_date_epoch_days` existed (and not backfilled yet)
+            # can only be found through their date prefix.
+            session_date_vector_ids = self._list_vector_ids(
+                index=index,
+                namespace=namespace,
+                prefix=session_date_override.session_date_start,
             )
+            filtered_vector_ids = [
+                vector_id for vector_id in session_date_vector_ids if vector_id not in ids_contained_in_current_context
+            ]
+            session_date_override_docs = self._fetch_context_docs(
+                index=index,
+                namespace=namespace,
+                vector_ids=filtered_vector_ids,
+            ) if len(filtered_vector_ids) > 0 else []
+
+        # If the session_date_override has an output prefix or suffix for formatting purposes,
+        # they wrap the override's section.
+        suffix = session_date_override.output_suffix_override
+        self._add_context_docs(
+            context_assembler=context_assembler,
+            docs=session_date_override_docs,
+            ids_contained_in_current_context=ids_contained_in_current_context,
+            prefix=session_date_override.output_prefix_override or "",
+            suffix="" if suffix is None else "".join([suffix, "\n"]),
+        )
 
-        # If no context was found for the session date override, we will not modify the current context.
-        return current_context
-
-    async def _append_context_from_date_range_vectors(
+    async def _add_context_from_date_range_vectors(
             self,
-            current_context: str,
+            context_assembler: ContextAssembler,
             index: GRPCIndex,
             namespace: str,
+            query_embeddings: list[float],
             aws_db_client: AwsDbBaseClass,
             therapist_id: str,
             request: Request,
@@ -712,6 +1019,61 @@ class PineconeClient(PineconeBaseClass):
             end_date: str,
             ids_contained_in_current_context: list[str],
         ):
+        start_date_value = datetime.strptime(start_date, datetime_handler.DATE_FORMAT).date()
+        end_date_value = datetime.strptime(end_date, datetime_handler.DATE_FORMAT).date()
+        date_range_docs, _ = self._query_vectors(
+            embeddings=query_embeddings,
+            query_top_k=type(self).DATE_RANGE_QUERY_TOP_K,
+            index=index,
+            namespace=namespace,
+            metadata_filter={
+                "session_date_epoch_days": {
+                    "$gte": datetime_handler.to_epoch_days(start_date_value),
+                    "$lte": datetime_handler.to_epoch_days(end_date_value),
+                }
+            },
+        )
+
+        if len(date_range_docs) > 0:
+            date_range_docs = [
+                doc for doc in date_range_docs if doc['id'] not in ids_contained_in_current_context
+            ]
+        else:
+            # Vectors written before `session_date_epoch_days` existed (and not backfilled yet)
+            # can only be found through the session mappings table.
+            date_range_docs = await self._fetch_mapped_date_range_docs(
+                index=index,
+                namespace=namespace,
+                aws_db_client=aws_db_client,
+                therapist_id=therapist_id,
+                request=request,
+                start_date=start_date_value,
+                end_date=end_date_value,
+                ids_contained_in_current_context=ids_contained_in_current_context,
+            )
+
+        # Ranges can hold more chunks than the budget allows, so the most relevant ones go first.
+        self._add_context_docs(
+            context_assembler=context_assembler,
+            docs=self._rerank_docs(
+                query_input=query_input,
+                docs=date_range_docs,
+                batch_size=max(len(date_range_docs), 1),
+            ),
+            ids_contained_in_current_context=ids_contained_in_current_context,
+        )
+
+    async def _fetch_mapped_date_range_docs(
+        self,
+        index: GRPCIndex,
+        namespace: str,
+        aws_db_client: AwsDbBaseClass,
+        therapist_id: str,
+        request: Request,
+        start_date: date,
+        end_date: date,
+        ids_contained_in_current_context: list[str],
+    ) -> list[dict]:
         vector_ids_response = await aws_db_client.select(
             user_id=therapist_id,
             request=request,
@@ -719,36 +1081,225 @@ class PineconeClient(PineconeBaseClass):
             fields=["id"],
             filters={
                 "therapist_id": therapist_id,
-                "session_date__gte": datetime.strptime(start_date, datetime_handler.DATE_FORMAT).date(),
-                "session_date__lte": datetime.strptime(end_date, datetime_handler.DATE_FORMAT).date(),
+                "session_date__gte": start_date,
+                "session_date__lte": end_date,
             },
         )
 
-        if len(vector_ids_response) == 0:
-            return current_context
-
         vector_ids = [
             item['id'] for item in vector_ids_response if item['id'] not in ids_contained_in_current_context
         ]
-
         if len(vector_ids) == 0:
-            # If there are no new vectors to append, we will not modify the current context.
-            return current_context
+            return []
 
-        date_range_context = self._create_context_from_vectors(
+        return self._fetch_context_docs(
             index=index,
             namespace=namespace,
             vector_ids=vector_ids,
-            query_input=query_input,
-            rerank_vectors=True,
         )
-        return "\n".join(
+
+    def _add_context_docs(
+        self,
+        context_assembler: ContextAssembler,
+        docs: list[dict],
+        ids_contained_in_current_context: list[str],
+        prefix: str = "",
+        suffix: str = ""
+    ):
+        added_positions = context_assembler.add_items(
+            [self._format_context_doc(doc) for doc in docs],
+            prefix=prefix,
+            suffix=suffix,
+        )
+        ids_contained_in_current_context.extend([docs[position]['id'] for position in added_positions])
+
+    def _fetch_historical_context_from_index(
+        self,
+        index: GRPCIndex,
+        historial_context_namespace: str
+    ) -> Tuple[bool, str | None]:
+        context_vector_ids = self._list_vector_ids(
+            index=index,
+            namespace=historial_context_namespace
+        )
+
+        if len(context_vector_ids or '') == 0:
+            return (False, None)
+
+        fetch_result = index.fetch(
+            ids=context_vector_ids,
+            namespace=historial_context_namespace
+        )
+
+        context_docs = []
+        vectors = fetch_result['vectors']
+        for vector_id in vectors:
+            vector_data = vectors[vector_id]
+            metadata = vector_data['metadata']
+            ciphertext = base64.b64decode(metadata['pre_existing_history_summary'])
+            plaintext = self.encryptor.decrypt(ciphertext)
+            decrypted_chunk_summary = "".join(["`pre_existing_history_summary` = ",
+                                               f"{plaintext}"])
+            decrypted_chunk_full_context = "".join([decrypted_chunk_summary, "\n"])
+            context_docs.append({
+                "id": vector_data['id'],
+                "text": decrypted_chunk_full_context
+            })
+
+        if len(context_docs) > 0:
+            return (True, "\n".join([doc['text'] for doc in context_docs]))
+        return (False, None)
+
+    def _decrypt_chunk_metadata(
+        self,
+        metadata: dict
+    ) -> dict:
+        """
+        Returns the `session_date` and decrypted `chunk_summary` of a session vector.
+        """
+        return {
+            "session_date": metadata['session_date'],
+            "chunk_summary": self.encryptor.decrypt(base64.b64decode(metadata['chunk_summary'])),
+        }
+
+    def _get_cached_chunk_data(
+        self,
+        namespace: str,
+        vector_id: str
+    ) -> dict | None:
+        """
+        Returns the cached `session_date` and decrypted `chunk_summary` of a session vector, if any.
+        """
+        cached_chunk_data = self._chunk_summary_cache.get((namespace, vector_id))
+        if cached_chunk_data is None:
+            return None
+        return {
+            "session_date": cached_chunk_data['session_date'],
+            "chunk_summary": self.encryptor.decrypt(cached_chunk_data['chunk_summary']),
+        }
+
+    def _load_namespace_vectors(
+        self,
+        index: GRPCIndex,
+        namespace: str
+    ) -> list[dict]:
+        vector_ids = self._list_vector_ids(
+            index=index,
+            namespace=namespace
+        )
+
+        namespace_vectors = []
+        batch_size = type(self).FETCH_BATCH_SIZE
+        for i in range(0, len(vector_ids), batch_size):
+            vectors = index.fetch(ids=vector_ids[i:i + batch_size], namespace=namespace)['vectors'] or {}
+            namespace_vectors.extend([
+                {
+                    "id": vectors[vector_id]['id'],
+                    "values": list(vectors[vector_id]['values']),
+                    "metadata": self._mirrored_metadata(vectors[vector_id]['metadata']),
+                }
+                for vector_id in vectors
+            ])
+        return namespace_vectors
+
+    async def _add_documents(
+        self,
+        indexes: list[GRPCIndex],
+        namespace: str,
+        docs: list[Document]
+    ):
+        # Users being migrated across buckets get their writes applied to every bucket they're placed in.
+        for index in indexes:
+            vector_store = PineconeVectorStore(pinecone_index=index)
+            vector_store.namespace = namespace
+            await run_in_threadpool(vector_store.add, docs)
+
+    def _mirror_upsert(
+        self,
+        namespace: str,
+        vectors: list[dict]
+    ):
+        if self._local_vector_mirror is None:
+            return
+
+        self._local_vector_mirror.upsert(
+            namespace,
             [
-                current_context,
-                date_range_context,
+                {**vector, "metadata": self._mirrored_metadata(vector['metadata'])}
+                for vector in vectors
             ]
         )
 
+    def _mirrored_metadata(
+        self,
+        metadata: dict
+    ) -> dict:
+        # The mirror only keeps what queries need, leaving out the (large) encrypted chunk text.
+        return {
+            field: metadata[field]
+            for field in type(self).MIRRORED_METADATA_FIELDS
+            if field in metadata
+        }
+
+    def _delete_vector_ids(
+        self,
+        index: GRPCIndex,
+        namespace: str,
+        vector_ids: list[str]
+    ):
+        batch_size = type(self).DELETE_BATCH_SIZE
+        for i in range(0, len(vector_ids), batch_size):
+            index.delete(
+                ids=vector_ids[i:i + batch_size],
+                namespace=namespace
+            )
+
+    def _delete_namespace(
+        self,
+        index: GRPCIndex,
+        namespace: str
+    ):
+        try:
+            index.delete(
+                delete_all=True,
+                namespace=namespace
+            )
+        except Exception as e:
+            # Namespaces only exist once they hold vectors, so there's nothing to delete.
+            if not self._is_not_found_error(e):
+                raise
+
+        if self._local_vector_mirror is not None:
+            self._local_vector_mirror.drop(namespace)
+
+    def _is_not_found_error(
+        self,
+        e: Exception
+    ) -> bool:
+        if isinstance(e, NotFoundException):
+            return True
+        grpc_error = e.__cause__
+        return isinstance(grpc_error, grpc.Call) and grpc_error.code() == grpc.StatusCode.NOT_FOUND
+
+    def _invalidate_historical_context_cache(
+        self,
+        user_id: str,
+        patient_id: str
+    ):
+        namespace = self._get_namespace(
+            user_id=user_id,
+            patient_id=patient_id
+        )
+        self._historical_context_cache.invalidate(
+            self._get_preexisting_history_namespace(namespace)
+        )
+
+    def _get_preexisting_history_namespace(
+        self,
+        namespace: str
+    ) -> str:
+        return "".join([namespace, "-", type(self).PRE_EXISTING_HISTORY_PREFIX])
+
     def _get_namespace(
         self,
         user_id: str,
@@ -756,11 +1307,13 @@ class PineconeClient(PineconeBaseClass):
     ) -> str:
         return f"{user_id}-{patient_id}"
 
-    def _get_bucket_for_user(self, user_id: str) -> str:
-        user_int = int(hashlib.md5(user_id.encode()).hexdigest(), 16)
-
-        bucket_count = 20
-        offset = 1
+    def _get_write_indexes(self, user_id: str) -> list[GRPCIndex]:
+        # Only for sync callers, async ones resolve the placement without blocking the event loop.
+        return [self._pc.Index(bucket) for bucket in self._bucket_placement.write_buckets(user_id)]
 
-        index_number = (user_int % bucket_count) + offset
-        return str(index_number)
+    async def _get_indexes_for_user(self, user_id: str) -> Tuple[GRPCIndex, list[GRPCIndex]]:
+        placement = await self._bucket_placement.placement_async(user_id)
+        return (
+            self._pc.Index(placement.read_bucket),
+            [self._pc.Index(bucket) for bucket in placement.write_buckets],
+        )
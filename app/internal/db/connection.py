@@ -15,7 +15,8 @@ async def connect_pool(
     try:
         chartwise_user_secret_id = os.environ.get("AWS_SECRET_MANAGER_CHARTWISE_USER_ROLE")
         assert chartwise_user_secret_id is not None, "Nullable value for role secret"
-        secret = secret_manager.get_secret(
+        # Fetch off the event loop, so that other startup work can proceed concurrently.
+        secret = await secret_manager.get_secret_async(
             secret_id=chartwise_user_secret_id,
             resend_client=resend_client,
         )
@@ -41,10 +42,49 @@ async def connect_pool(
             timeout=30,
             command_timeout=30,
         )
+
+        # Read replicas share the primary's credentials, and physical replication carries over
+        # the RLS policies, so the same role can serve reads from them.
+        app.state.replica_pools = []
+        for replica_endpoint, replica_port in read_replica_endpoints(default_port=int(port)):
+            app.state.replica_pools.append(
+                await asyncpg.create_pool(
+                    user=username,
+                    password=password,
+                    host=replica_endpoint,
+                    port=replica_port,
+                    database=database_name,
+                    ssl='require',
+                    timeout=30,
+                    command_timeout=30,
+                )
+            )
     except Exception as e:
         raise RuntimeError(f"Invalid database URL: {e}") from e
 
 async def disconnect_pool(
     app: FastAPI
 ):
+    for replica_pool in getattr(app.state, "replica_pools", []):
+        await replica_pool.close()
     await app.state.pool.close()
+
+def read_replica_endpoints(
+    default_port: int
+) -> list[tuple[str, int]]:
+    """
+    Returns the (host, port) pairs of the configured read replicas, parsed from the comma-separated
+    `AWS_RDS_READ_REPLICA_ENDPOINTS` value (e.g. "replica-1.rds.amazonaws.com,127.0.0.1:5434").
+
+    Arguments:
+    default_port – the port to be used for endpoints that don't specify one.
+    """
+    endpoints = []
+    for entry in os.environ.get("AWS_RDS_READ_REPLICA_ENDPOINTS", "").split(","):
+        entry = entry.strip()
+        if len(entry) == 0:
+            continue
+
+        host, _, port = entry.partition(":")
+        endpoints.append((host, int(port) if len(port) > 0 else default_port))
+    return endpoints
@@ -0,0 +1,281 @@
+import asyncpg
+import json
+
+from enum import Enum
+from typing import Any
+
+from ..schemas import JOB_OUTBOX_TABLE_NAME
+
+# The table is created by migrations/0002_create_job_outbox.sql. The outbox is only read and written
+# by the service's own workers, so it isn't covered by RLS.
+
+class OutboxJobType(Enum):
+    INSERT_SESSION_VECTORS = "insert_session_vectors"
+    UPDATE_SESSION_VECTORS = "update_session_vectors"
+    DELETE_SESSION_VECTORS = "delete_session_vectors"
+    INSERT_PREEXISTING_HISTORY_VECTORS = "insert_preexisting_history_vectors"
+    UPDATE_PREEXISTING_HISTORY_VECTORS = "update_preexisting_history_vectors"
+    GENERATE_METRICS_AND_INSIGHTS = "generate_metrics_and_insights"
+
+class OutboxJobStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class OutboxJob:
+    """
+    A unit of background work (i.e. vector ingestion or insights generation), written to the outbox
+    inside the same transaction as the write that produced it, so that it survives deploys and crashes.
+
+    Payloads only carry identifiers and settings, never patient data: handlers read the current
+    data when they run, which also keeps retries idempotent.
+
+    Arguments:
+    job_type – the type of work to be done.
+    payload – the JSON-serializable arguments of the job.
+    therapist_id – the therapist the job runs for. Read from the written row when None.
+    patient_id – the patient the job runs for. Read from the written row when None.
+    written_row_fields – the payload keys (or `therapist_id` and `patient_id`) that should be read
+    from the written row, mapped to the row's columns (i.e. the ID of a session report that's being inserted).
+    """
+
+    def __init__(
+        self,
+        job_type: OutboxJobType,
+        payload: dict[str, Any],
+        therapist_id: str | None = None,
+        patient_id: str | None = None,
+        written_row_fields: dict[str, str] | None = None,
+    ):
+        self.job_type = job_type
+        self.payload = payload
+        self.therapist_id = therapist_id
+        self.patient_id = patient_id
+        self.written_row_fields = written_row_fields or {}
+        self.id: int | None = None
+        self.attempts = 0
+
+    @classmethod
+    def from_row(
+        cls,
+        row: dict
+    ) -> "OutboxJob":
+        payload = row['payload']
+        job = cls(
+            job_type=OutboxJobType(row['job_type']),
+            payload=json.loads(payload) if isinstance(payload, str) else payload,
+            therapist_id=str(row['therapist_id']),
+            patient_id=str(row['patient_id']),
+        )
+        job.id = row['id']
+        job.attempts = row['attempts']
+        return job
+
+    def bound_to(
+        self,
+        written_row: dict | None
+    ) -> "OutboxJob":
+        """
+        Returns a copy of the job, with the fields read from the written row filled in.
+
+        Arguments:
+        written_row – the row written along with the job, if any.
+        """
+        written_row = written_row or {}
+        payload = dict(self.payload)
+        for key, column in self.written_row_fields.items():
+            payload[key] = written_row[column]
+
+        therapist_id = self.therapist_id or payload.pop('therapist_id', None) or written_row.get('therapist_id')
+        patient_id = self.patient_id or payload.pop('patient_id', None) or written_row.get('patient_id')
+        assert therapist_id is not None and patient_id is not None, "Missing the job's therapist or patient"
+        return type(self)(
+            job_type=self.job_type,
+            payload=payload,
+            therapist_id=str(therapist_id),
+            patient_id=str(patient_id),
+        )
+
+    async def enqueue(
+        self,
+        conn: asyncpg.Connection,
+        written_row: dict | None = None
+    ) -> int:
+        """
+        Writes the job to the outbox, and returns its ID.
+        Must be invoked within the transaction of the write that produced the job, if any.
+
+        Arguments:
+        conn – the connection holding the transaction.
+        written_row – the row written by the transaction, if any.
+        """
+        job = self.bound_to(written_row)
+        return await conn.fetchval(
+            f"""
+            INSERT INTO "{JOB_OUTBOX_TABLE_NAME}" ("job_type", "therapist_id", "patient_id", "payload")
+            VALUES ($1, $2, $3, $4::jsonb)
+            RETURNING "id"
+            """,
+            job.job_type.value,
+            job.therapist_id,
+            job.patient_id,
+            # Dates and UUIDs are stored in their ISO/string form.
+            json.dumps(job.payload, default=str),
+        )
+
+class JobOutbox:
+    """
+    Claims, completes and retries outbox jobs.
+
+    Jobs for the same patient run in the order they were enqueued: only a patient's oldest
+    unfinished job can be claimed, so a job waiting on its backoff holds back the ones after it.
+    Claims skip rows locked by other workers, and expire after a lease, so that jobs held by a
+    crashed process get picked up again.
+    """
+    MAX_ATTEMPTS = 5
+    BASE_BACKOFF_SECONDS = 30
+    MAX_BACKOFF_SECONDS = 3600
+    LEASE_SECONDS = 900
+
+    @classmethod
+    async def claim(
+        cls,
+        conn: asyncpg.Connection,
+        limit: int
+    ) -> list[OutboxJob]:
+        """
+        Claims up to `limit` runnable jobs, at most one per patient.
+
+        Arguments:
+        conn – the connection to be used.
+        limit – the maximum number of jobs to be claimed.
+        """
+        rows = await conn.fetch(
+            f"""
+            UPDATE "{JOB_OUTBOX_TABLE_NAME}" AS job
+            SET "status" = $1,
+                "attempts" = job."attempts" + 1,
+                "locked_until" = now() + make_interval(secs => $2)
+            WHERE job."id" IN (
+                SELECT candidate."id"
+                FROM "{JOB_OUTBOX_TABLE_NAME}" AS candidate
+                WHERE candidate."run_after" <= now()
+                AND (
+                    candidate."status" = $3
+                    OR (candidate."status" = $1 AND candidate."locked_until" < now())
+                )
+                AND NOT EXISTS (
+                    SELECT 1
+                    FROM "{JOB_OUTBOX_TABLE_NAME}" AS earlier
+                    WHERE earlier."patient_id" = candidate."patient_id"
+                    AND earlier."id" < candidate."id"
+                    AND earlier."status" IN ($1, $3)
+                )
+                ORDER BY candidate."id"
+                LIMIT $4
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING job.*
+            """,
+            OutboxJobStatus.RUNNING.value,
+            float(cls.LEASE_SECONDS),
+            OutboxJobStatus.PENDING.value,
+            limit,
+        )
+        return sorted([OutboxJob.from_row(dict(row)) for row in rows], key=lambda job: job.id)
+
+    @classmethod
+    async def complete(
+        cls,
+        conn: asyncpg.Connection,
+        job: OutboxJob,
+        follow_up_jobs: list[OutboxJob] | None = None
+    ):
+        """
+        Marks a job as completed, and enqueues its follow-up jobs in the same transaction.
+
+        Arguments:
+        conn – the connection to be used.
+        job – the completed job.
+        follow_up_jobs – the jobs to be run after the completed one, if any.
+        """
+        async with conn.transaction():
+            await conn.execute(
+                f"""
+                UPDATE "{JOB_OUTBOX_TABLE_NAME}"
+                SET "status" = $1, "completed_at" = now(), "locked_until" = NULL
+                WHERE "id" = $2
+                """,
+                OutboxJobStatus.COMPLETED.value,
+                job.id,
+            )
+            for follow_up_job in follow_up_jobs or []:
+                await follow_up_job.enqueue(conn)
+
+    @classmethod
+    async def fail(
+        cls,
+        conn: asyncpg.Connection,
+        job: OutboxJob,
+        error: str
+    ) -> bool:
+        """
+        Records a failed attempt, scheduling a retry with exponential backoff until the job
+        runs out of attempts. Returns whether the job will be retried.
+
+        Arguments:
+        conn – the connection to be used.
+        job – the failed job.
+        error – the description of the failure.
+        """
+        will_retry = job.attempts < cls.MAX_ATTEMPTS
+        await conn.execute(
+            f"""
+            UPDATE "{JOB_OUTBOX_TABLE_NAME}"
+            SET "status" = $1,
+                "run_after" = now() + make_interval(secs => $2),
+                "locked_until" = NULL,
+                "last_error" = $3
+            WHERE "id" = $4
+            """,
+            OutboxJobStatus.PENDING.value if will_retry else OutboxJobStatus.FAILED.value,
+            float(cls.backoff_seconds(job.attempts)),
+            error,
+            job.id,
+        )
+        return will_retry
+
+    @classmethod
+    async def release(
+        cls,
+        conn: asyncpg.Connection,
+        job: OutboxJob
+    ):
+        """
+        Hands a job that was interrupted by a shutdown back to the outbox, to be claimed again right away.
+        The interrupted run doesn't count as an attempt.
+
+        Arguments:
+        conn – the connection to be used.
+        job – the interrupted job.
+        """
+        await conn.execute(
+            f"""
+            UPDATE "{JOB_OUTBOX_TABLE_NAME}"
+            SET "status" = $1,
+                "attempts" = GREATEST("attempts" - 1, 0),
+                "locked_until" = NULL
+            WHERE "id" = $2 AND "status" = $3
+            """,
+            OutboxJobStatus.PENDING.value,
+            job.id,
+            OutboxJobStatus.RUNNING.value,
+        )
+
+    @classmethod
+    def backoff_seconds(
+        cls,
+        attempts: int
+    ) -> int:
+        return min(cls.BASE_BACKOFF_SECONDS * (2 ** max(attempts - 1, 0)), cls.MAX_BACKOFF_SECONDS)
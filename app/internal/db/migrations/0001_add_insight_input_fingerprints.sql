@@ -0,0 +1,6 @@
+-- Stores the fingerprint of the inputs each insight was generated from, so that insights
+-- whose inputs haven't changed can skip regeneration.
+ALTER TABLE "encrypted_patient_topics" ADD COLUMN IF NOT EXISTS "input_fingerprint" TEXT;
+ALTER TABLE "encrypted_patient_briefings" ADD COLUMN IF NOT EXISTS "input_fingerprint" TEXT;
+ALTER TABLE "encrypted_patient_question_suggestions" ADD COLUMN IF NOT EXISTS "input_fingerprint" TEXT;
+ALTER TABLE "encrypted_patient_attendance" ADD COLUMN IF NOT EXISTS "input_fingerprint" TEXT;
@@ -0,0 +1,24 @@
+-- Background jobs (i.e. vector ingestion or insights generation), written in the same transaction as the
+-- write that produced them. The outbox is only read and written by the service's own workers, so it isn't
+-- covered by RLS.
+CREATE TABLE IF NOT EXISTS "job_outbox" (
+    "id" BIGSERIAL PRIMARY KEY,
+    "job_type" TEXT NOT NULL,
+    "therapist_id" UUID NOT NULL,
+    "patient_id" UUID NOT NULL,
+    "payload" JSONB NOT NULL DEFAULT '{}',
+    "status" TEXT NOT NULL DEFAULT 'pending',
+    "attempts" INTEGER NOT NULL DEFAULT 0,
+    "run_after" TIMESTAMPTZ NOT NULL DEFAULT now(),
+    "locked_until" TIMESTAMPTZ,
+    "last_error" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT now(),
+    "completed_at" TIMESTAMPTZ
+);
+CREATE INDEX IF NOT EXISTS "job_outbox_unfinished_idx" ON "job_outbox" ("patient_id", "id")
+WHERE "status" IN ('pending', 'running');
+
+-- Migrations run as the tables' owner, but the service connects as its RLS-bound role, which enqueues
+-- jobs alongside its writes and claims, completes, fails or releases them from the workers.
+GRANT SELECT, INSERT, UPDATE ON "job_outbox" TO {{app_role}};
+GRANT USAGE ON SEQUENCE "job_outbox_id_seq" TO {{app_role}};
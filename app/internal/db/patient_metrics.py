@@ -0,0 +1,166 @@
+import asyncpg
+
+from datetime import date
+
+from ..schemas import ENCRYPTED_PATIENTS_TABLE_NAME, ENCRYPTED_SESSION_REPORTS_TABLE_NAME
+
+class PatientMetricsDelta:
+    """
+    An incremental change to a patient's session metrics (`total_sessions`, `last_session_date` and
+    `unique_active_years`), applied inside the same transaction as the session report write.
+
+    Deltas are applied against the (locked) patient row without touching the patient's session reports.
+    Only ambiguous removals fall back to a recompute, and only over the `session_date` column:
+    removing the session that held the current `last_session_date`, or removing the last session
+    seen in a given year.
+
+    Arguments:
+    session_count_delta – the change in the patient's session count.
+    added_session_date – the session date being added, if any.
+    removed_session_date – the session date being removed, if any.
+    removes_written_session – whether the removed date should be read from the written session report
+    (i.e. when deleting a session whose date the caller doesn't know ahead of time).
+    """
+
+    def __init__(
+        self,
+        session_count_delta: int,
+        added_session_date: date | None = None,
+        removed_session_date: date | None = None,
+        removes_written_session: bool = False,
+    ):
+        self.session_count_delta = session_count_delta
+        self.added_session_date = added_session_date
+        self.removed_session_date = removed_session_date
+        self.removes_written_session = removes_written_session
+
+    @classmethod
+    def for_inserted_session(
+        cls,
+        session_date: date
+    ) -> "PatientMetricsDelta":
+        return cls(
+            session_count_delta=1,
+            added_session_date=session_date
+        )
+
+    @classmethod
+    def for_rescheduled_session(
+        cls,
+        old_session_date: date,
+        new_session_date: date
+    ) -> "PatientMetricsDelta":
+        return cls(
+            session_count_delta=0,
+            added_session_date=new_session_date,
+            removed_session_date=old_session_date
+        )
+
+    @classmethod
+    def for_deleted_session(cls) -> "PatientMetricsDelta":
+        return cls(
+            session_count_delta=-1,
+            removes_written_session=True
+        )
+
+    async def apply(
+        self,
+        conn: asyncpg.Connection,
+        session_report: dict,
+        previous_session_report: dict | None = None
+    ):
+        """
+        Applies the delta to the patient associated with the written session report.
+        Must be invoked within the transaction that wrote the session report.
+
+        Removals are only counted when the session report actually transitions into the soft-deleted
+        state, so that deleting a session twice (i.e. a retried request) doesn't decrement its patient's
+        metrics twice.
+
+        Arguments:
+        conn – the connection holding the session report transaction.
+        session_report – the session report row that was written.
+        previous_session_report – the (locked) session report row as it was before the write, if any.
+        """
+        if (
+            self.removes_written_session
+            and previous_session_report is not None
+            and previous_session_report.get('is_soft_deleted')
+        ):
+            return
+
+        patient_id = session_report['patient_id']
+        removed_session_date = (
+            session_report.get('session_date') if self.removes_written_session
+            else self.removed_session_date
+        )
+
+        # Lock the patient row so that concurrent session writes apply their deltas serially.
+        patient = await conn.fetchrow(
+            f"""
+            SELECT "total_sessions", "last_session_date", "unique_active_years"
+            FROM "{ENCRYPTED_PATIENTS_TABLE_NAME}"
+            WHERE "id" = $1
+            FOR UPDATE
+            """,
+            patient_id
+        )
+        assert patient is not None, "Did not find the patient associated with the session report"
+
+        total_sessions = max((patient['total_sessions'] or 0) + self.session_count_delta, 0)
+        last_session_date: date | None = patient['last_session_date']
+        unique_active_years = set(patient['unique_active_years'] or [])
+
+        if self.added_session_date is not None:
+            last_session_date = (
+                self.added_session_date if last_session_date is None
+                else max(last_session_date, self.added_session_date)
+            )
+            unique_active_years.add(str(self.added_session_date.year))
+
+        if removed_session_date is not None and removed_session_date != self.added_session_date:
+            if removed_session_date == patient['last_session_date'] and (
+                self.added_session_date is None or self.added_session_date < removed_session_date
+            ):
+                # The removed session held the patient's last session date, so we can't derive the new one.
+                last_session_date = await conn.fetchval(
+                    f"""
+                    SELECT max("session_date")
+                    FROM "{ENCRYPTED_SESSION_REPORTS_TABLE_NAME}"
+                    WHERE "patient_id" = $1 AND "is_soft_deleted" = false
+                    """,
+                    patient_id
+                )
+
+            removed_year = removed_session_date.year
+            added_year = None if self.added_session_date is None else self.added_session_date.year
+            if removed_year != added_year:
+                year_still_active = await conn.fetchval(
+                    f"""
+                    SELECT EXISTS (
+                        SELECT 1
+                        FROM "{ENCRYPTED_SESSION_REPORTS_TABLE_NAME}"
+                        WHERE "patient_id" = $1
+                        AND "is_soft_deleted" = false
+                        AND "session_date" >= $2
+                        AND "session_date" < $3
+                    )
+                    """,
+                    patient_id,
+                    date(removed_year, 1, 1),
+                    date(removed_year + 1, 1, 1),
+                )
+                if not year_still_active:
+                    unique_active_years.discard(str(removed_year))
+
+        await conn.execute(
+            f"""
+            UPDATE "{ENCRYPTED_PATIENTS_TABLE_NAME}"
+            SET "total_sessions" = $1, "last_session_date" = $2, "unique_active_years" = $3
+            WHERE "id" = $4
+            """,
+            total_sessions,
+            last_session_date,
+            sorted(unique_active_years),
+            patient_id
+        )
@@ -0,0 +1,49 @@
+import time
+
+class DbQueryTrace:
+    """
+    Collects the timings of a single database operation, split between waiting for a connection,
+    setting up its session (i.e. the RLS user), and running the statement itself.
+
+    Arguments:
+    operation – the database operation (i.e. select, insert, update).
+    table_name – the table targeted by the operation.
+    """
+
+    def __init__(
+        self,
+        operation: str,
+        table_name: str
+    ):
+        self.operation = operation
+        self.table_name = table_name
+        self.pool_role = "primary"
+        self.acquire_wait_time = 0.0
+        self.session_setup_time = 0.0
+        self.query_time = 0.0
+        self.row_count = 0
+        self.pool_size: int | None = None
+        self.pool_idle_size: int | None = None
+        self.pool_max_size: int | None = None
+
+    @staticmethod
+    def now() -> float:
+        return time.perf_counter()
+
+    def record_pool_state(
+        self,
+        pool
+    ):
+        """
+        Records the in-use and idle connection counts of the pool serving the operation.
+
+        Arguments:
+        pool – the asyncpg pool serving the operation.
+        """
+        try:
+            self.pool_size = pool.get_size()
+            self.pool_idle_size = pool.get_idle_size()
+            self.pool_max_size = pool.get_max_size()
+        except Exception:
+            # Pool stats are best-effort.
+            pass
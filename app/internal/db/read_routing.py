@@ -0,0 +1,51 @@
+import itertools
+
+from enum import Enum
+from fastapi import Request
+
+class DbReadRouting(Enum):
+    """
+    Routing hints for read queries.
+
+    PRIMARY – always read from the primary.
+    AUTO – read from a replica, unless the request already wrote to the primary (read-your-writes).
+    REPLICA – read from a replica even after the request wrote, for reads that tolerate replication lag.
+    """
+    PRIMARY = "primary"
+    AUTO = "auto"
+    REPLICA = "replica"
+
+_replica_counter = itertools.count()
+
+def pin_request_to_primary(request: Request):
+    """
+    Flags the request as having written to the primary, so that subsequent AUTO reads
+    (including the ones in its background tasks) observe its own writes.
+
+    Arguments:
+    request – the request that wrote to the primary.
+    """
+    request.state.db_pinned_to_primary = True
+
+def is_request_pinned_to_primary(request: Request) -> bool:
+    return getattr(request.state, "db_pinned_to_primary", False)
+
+def resolve_replica_index(
+    request: Request,
+    read_routing: DbReadRouting,
+    replica_count: int
+) -> int | None:
+    """
+    Returns the index of the replica that should serve the read, or None if it should be served by the primary.
+    Replicas are picked in a round-robin fashion.
+
+    Arguments:
+    request – the request associated with the read.
+    read_routing – the routing hint for the read.
+    replica_count – the number of available replicas.
+    """
+    if replica_count == 0 or read_routing == DbReadRouting.PRIMARY:
+        return None
+    if read_routing == DbReadRouting.AUTO and is_request_pinned_to_primary(request):
+        return None
+    return next(_replica_counter) % replica_count
@@ -0,0 +1,120 @@
+import asyncpg, os
+
+from dataclasses import dataclass
+
+MIGRATIONS_DIRECTORY = os.path.join(os.path.dirname(__file__), "migrations")
+SCHEMA_MIGRATIONS_TABLE_NAME = "schema_migrations"
+
+# Serializes concurrent runs (i.e. two deploys racing), so that every migration is applied once.
+MIGRATIONS_ADVISORY_LOCK_ID = 7318002451
+
+# Migrations refer to the app's RLS-bound role (i.e. in grants) through this placeholder, since
+# its name differs between environments.
+APP_ROLE_PLACEHOLDER = "{{app_role}}"
+
+@dataclass(frozen=True)
+class SchemaMigration:
+    version: str
+    sql: str
+
+def list_migrations(
+    directory: str = MIGRATIONS_DIRECTORY
+) -> list[SchemaMigration]:
+    """
+    Returns the migrations in the incoming directory, in the order they must be applied.
+    Migrations are `.sql` files named `<number>_<description>.sql`, and their version is the file name.
+
+    Arguments:
+    directory – the directory holding the migration files.
+    """
+    migrations = []
+    for file_name in sorted(os.listdir(directory)):
+        if not file_name.endswith(".sql"):
+            continue
+
+        with open(os.path.join(directory, file_name), encoding="utf-8") as migration_file:
+            migrations.append(
+                SchemaMigration(
+                    version=file_name.removesuffix(".sql"),
+                    sql=migration_file.read()
+                )
+            )
+    return migrations
+
+async def pending_migrations(
+    conn: asyncpg.Connection,
+    directory: str = MIGRATIONS_DIRECTORY
+) -> list[SchemaMigration]:
+    """
+    Returns the migrations that haven't been applied to the database yet.
+
+    Arguments:
+    conn – the connection to be used.
+    directory – the directory holding the migration files.
+    """
+    await conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{SCHEMA_MIGRATIONS_TABLE_NAME}" (
+            "version" TEXT PRIMARY KEY,
+            "applied_at" TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+        """
+    )
+    applied_versions = {
+        row['version'] for row in await conn.fetch(f'SELECT "version" FROM "{SCHEMA_MIGRATIONS_TABLE_NAME}"')
+    }
+    return [migration for migration in list_migrations(directory) if migration.version not in applied_versions]
+
+def render_migration_sql(
+    migration: SchemaMigration,
+    app_role: str | None
+) -> str:
+    """
+    Returns the SQL of the incoming migration, with the app role placeholder replaced by the quoted role name.
+
+    Arguments:
+    migration – the migration to be rendered.
+    app_role – the name of the app's RLS-bound role. Only required by migrations that refer to it.
+    """
+    if APP_ROLE_PLACEHOLDER not in migration.sql:
+        return migration.sql
+
+    if not app_role:
+        raise ValueError(f"Migration {migration.version} requires the app role")
+    quoted_app_role = '"' + app_role.replace('"', '""') + '"'
+    return migration.sql.replace(APP_ROLE_PLACEHOLDER, quoted_app_role)
+
+async def apply_migrations(
+    conn: asyncpg.Connection,
+    directory: str = MIGRATIONS_DIRECTORY,
+    app_role: str | None = None
+) -> list[str]:
+    """
+    Applies the pending migrations in order, each one in its own transaction along with its
+    bookkeeping row, and returns the versions that were applied.
+
+    Arguments:
+    conn – the connection to be used. Its role must own the migrated tables.
+    directory – the directory holding the migration files.
+    app_role – the name of the app's RLS-bound role, for migrations that grant it access.
+    """
+    await conn.execute("SELECT pg_advisory_lock($1)", MIGRATIONS_ADVISORY_LOCK_ID)
+    try:
+        # Rendered up front, so that a missing app role fails the run before anything gets applied.
+        rendered_migrations = [
+            (migration.version, render_migration_sql(migration=migration, app_role=app_role))
+            for migration in await pending_migrations(conn=conn, directory=directory)
+        ]
+
+        applied_versions = []
+        for version, sql in rendered_migrations:
+            async with conn.transaction():
+                await conn.execute(sql)
+                await conn.execute(
+                    f'INSERT INTO "{SCHEMA_MIGRATIONS_TABLE_NAME}" ("version") VALUES ($1)',
+                    version,
+                )
+            applied_versions.append(version)
+        return applied_versions
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATIONS_ADVISORY_LOCK_ID)
@@ -9,8 +9,8 @@ from starlette.requests import Request
 from ..alerting.internal_alert import EngineeringAlert
 from ..schemas import PROD_ENVIRONMENT
 from ...dependencies.dependency_container import (dependency_container, AwsDbBaseClass)
-from ...internal.utilities.fire_and_forget_caller import fire_and_forget
 from ...internal.utilities.general_utilities import retrieve_ip_address
+from ...internal.utilities.job_scheduler import JobPool, JobScheduler
 from ...routers.assistant_router import AssistantRouter
 from ...routers.audio_processing_router import AudioProcessingRouter
 from ...routers.image_processing_router import ImageProcessingRouter
@@ -159,14 +159,14 @@ class TimingMiddleware(BaseHTTPMiddleware):
                     )
                 assert therapist_id is not None, "Nullable type for user ID"
                 aws_db_client: AwsDbBaseClass = dependency_container.inject_aws_db_client()
-                fire_and_forget(
-                    aws_db_client.insert(
-                        user_id=therapist_id,
-                        request=request,
-                        payload=payload,
-                        table_name="audit_logs"
-                    ),
-                    on_error=on_log_audit_error
+                JobScheduler.shared().submit(
+                    JobPool.AUDIT_LOGS,
+                    aws_db_client.insert,
+                    on_error=on_log_audit_error,
+                    user_id=therapist_id,
+                    request=request,
+                    payload=payload,
+                    table_name="audit_logs"
                 )
             except Exception as e:
                 # Fail silently but send an internal alert.
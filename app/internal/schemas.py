@@ -16,6 +16,7 @@ ENCRYPTED_TABLES = [ENCRYPTED_PATIENT_ATTENDANCE_TABLE_NAME,
                     ENCRYPTED_SESSION_REPORTS_TABLE_NAME]
 
 # Unencrypted tables names
+JOB_OUTBOX_TABLE_NAME = "job_outbox"
 SUBSCRIPTION_STATUS_TABLE_NAME = "subscription_status"
 THERAPISTS_TABLE_NAME = "therapists"
 VECTORS_SESSION_MAPPINGS_TABLE_NAME = "vectors_session_mappings"
@@ -103,6 +104,25 @@ class RecentTopicSchema(BaseModel):
 class ListRecentTopicsSchema(BaseModel):
     topics: list[RecentTopicSchema]
 
+class PackedChunkSummarySchema(BaseModel):
+    chunk_id: str
+    summary: str
+
+class ListPackedChunkSummariesSchema(BaseModel):
+    summaries: list[PackedChunkSummarySchema]
+
+class CombinedRecentTopicSchema(BaseModel):
+    topic: str
+    percentage: str
+
+class CombinedInsightsSchema(BaseModel):
+    # Sections are loosely typed, and validated one by one against their own schemas afterwards,
+    # so that a malformed section doesn't throw away the rest of the output.
+    recent_topics: list[CombinedRecentTopicSchema] | None
+    recent_topics_insights: str | None
+    presession_briefing: str | None
+    question_suggestions: list[str] | None
+
 class TimeTokensExtractionSchema(BaseModel):
     start_date: str
     end_date: str
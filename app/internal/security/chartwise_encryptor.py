@@ -1,3 +1,5 @@
+from nacl.encoding import HexEncoder, RawEncoder
+from nacl.hash import blake2b
 from nacl.secret import Aead
 
 from ...dependencies.api.aws_kms_base_class import AwsKmsBaseClass
@@ -21,6 +23,13 @@ class ChartWiseEncryptor:
 
         self.aead = Aead(encryption_key)
 
+        # Derive a separate key for digests so that the encryption key is never reused as a MAC key.
+        self._digest_key = blake2b(
+            b"chartwise-digest-key",
+            key=encryption_key,
+            encoder=RawEncoder
+        )
+
     """
     Encrypts the incoming plaintext string.
 
@@ -56,3 +65,51 @@ class ChartWiseEncryptor:
             return plaintext_bytes.decode("utf-8")
         except Exception as e:
             raise ValueError("Decryption failed") from e
+
+    """
+    Encrypts the incoming raw bytes.
+
+    Params:
+    -------
+    plaintext: The bytes to be encrypted.
+    """
+    def encrypt_bytes(
+        self,
+        plaintext: bytes
+    ) -> bytes:
+        return self.aead.encrypt(plaintext)
+
+    """
+    Decrypts the incoming bytes without decoding them.
+
+    Params:
+    -------
+    ciphertext: The bytes to be decrypted.
+    """
+    def decrypt_bytes(
+        self,
+        ciphertext: bytes
+    ) -> bytes:
+        try:
+            return self.aead.decrypt(ciphertext)
+        except Exception as e:
+            raise ValueError("Decryption failed") from e
+
+    """
+    Returns a keyed, deterministic hex digest of the incoming value.
+    Digests can't be reversed or brute-forced without the encryption key, so they are safe
+    to use as cache keys or fingerprints for sensitive data.
+
+    Params:
+    -------
+    value: The value to be digested.
+    """
+    def digest(
+        self,
+        value: str
+    ) -> str:
+        return blake2b(
+            value.encode("utf-8"),
+            key=self._digest_key,
+            encoder=HexEncoder
+        ).decode("utf-8")
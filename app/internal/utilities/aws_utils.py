@@ -1,15 +1,260 @@
+import httpx
 import json
-import requests
+import threading
+import time
 
-from botocore.awsrequest import AWSRequest
+from botocore.awsrequest import AWSPreparedRequest, AWSRequest
 from botocore.auth import SigV4Auth
+from botocore.credentials import ReadOnlyCredentials
+from botocore.exceptions import NoCredentialsError
 from botocore.httpsession import URLLib3Session
 from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Mapping
 
-from .datetime_handler import DATE_TIME_TIMEZONE_FORMAT, WEEKDAY_DATE_TIME_TIMEZONE_FORMAT
+from .datetime_handler import DATE_TIME_TIMEZONE_FORMAT
 from ...dependencies.api.resend_base_class import ResendBaseClass
 from ...dependencies.core.boto3_session_factory import Boto3SessionFactory
 
+class AwsRequestSigner:
+    """
+    Signs and sends SigV4 AWS JSON API requests over a pooled HTTP session.
+
+    The offset between the local clock and AWS's clock is cached. It's refreshed passively from the
+    `Date` header of responses, at most once per refresh interval, and immediately whenever AWS rejects
+    a request for clock skew, in which case the request is re-signed and retried once.
+
+    Arguments:
+    credentials_provider – the optional function returning the credentials used for signing.
+    Defaults to the credentials of the shared boto3 session.
+    """
+    CLOCK_SKEW_REFRESH_SECONDS = 900 # 15 minutes
+    CLOCK_SKEW_ERROR_CODES = [
+        "InvalidSignatureException",
+        "RequestExpired",
+        "RequestTimeTooSkewed",
+        "SignatureDoesNotMatch",
+    ]
+    TIMEOUT_SECONDS = 10
+
+    def __init__(
+        self,
+        credentials_provider: Callable[[ResendBaseClass], ReadOnlyCredentials] | None = None,
+    ):
+        self._credentials_provider = credentials_provider or _boto3_session_credentials
+        self._clock_skew_offset = 0.0
+        self._clock_skew_refreshed_at: float | None = None
+        self._http_session = URLLib3Session(timeout=type(self).TIMEOUT_SECONDS)
+        self._async_http_client: httpx.AsyncClient | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def clock_skew_offset(self) -> float:
+        return self._clock_skew_offset
+
+    def send(
+        self,
+        service: str,
+        region: str,
+        endpoint_url: str,
+        payload: dict,
+        target_action: str,
+        resend_client: ResendBaseClass,
+    ) -> dict:
+        """
+        Signs and sends the request, returning the parsed JSON response.
+
+        Arguments:
+        service – the AWS service name (e.g., 'kms', 'secretsmanager').
+        region – the AWS region (e.g., 'us-east-1').
+        endpoint_url – the full endpoint URL.
+        payload – the request body.
+        target_action – the target action (e.g., 'TrentService.Decrypt' or 'secretsmanager.GetSecretValue').
+        resend_client – the client used for alerting on credential failures.
+        """
+        try:
+            for attempt in range(2):
+                request = self._signed_request(
+                    service=service,
+                    region=region,
+                    endpoint_url=endpoint_url,
+                    payload=payload,
+                    target_action=target_action,
+                    resend_client=resend_client,
+                )
+                response = self._http_session.send(request)
+                response_text = response.content.decode("utf-8")
+                if self._should_retry_after_skew_correction(
+                    attempt=attempt,
+                    status_code=response.status_code,
+                    headers=response.headers,
+                    response_text=response_text,
+                ):
+                    continue
+                return json.loads(response_text)
+        except Exception as e:
+            raise RuntimeError(e) from e
+
+    async def send_async(
+        self,
+        service: str,
+        region: str,
+        endpoint_url: str,
+        payload: dict,
+        target_action: str,
+        resend_client: ResendBaseClass,
+    ) -> dict:
+        """
+        Async variant of `send`, backed by a pooled httpx client.
+
+        Arguments:
+        service – the AWS service name (e.g., 'kms', 'secretsmanager').
+        region – the AWS region (e.g., 'us-east-1').
+        endpoint_url – the full endpoint URL.
+        payload – the request body.
+        target_action – the target action (e.g., 'TrentService.Decrypt' or 'secretsmanager.GetSecretValue').
+        resend_client – the client used for alerting on credential failures.
+        """
+        try:
+            if self._async_http_client is None:
+                self._async_http_client = httpx.AsyncClient(timeout=type(self).TIMEOUT_SECONDS)
+
+            for attempt in range(2):
+                request = self._signed_request(
+                    service=service,
+                    region=region,
+                    endpoint_url=endpoint_url,
+                    payload=payload,
+                    target_action=target_action,
+                    resend_client=resend_client,
+                )
+                response = await self._async_http_client.post(
+                    request.url,
+                    content=request.body,
+                    headers=dict(request.headers.items()),
+                )
+                if self._should_retry_after_skew_correction(
+                    attempt=attempt,
+                    status_code=response.status_code,
+                    headers=response.headers,
+                    response_text=response.text,
+                ):
+                    continue
+                return response.json()
+        except Exception as e:
+            raise RuntimeError(e) from e
+
+    async def aclose(self):
+        if self._async_http_client is not None:
+            await self._async_http_client.aclose()
+            self._async_http_client = None
+
+    # Private
+
+    def _signed_request(
+        self,
+        service: str,
+        region: str,
+        endpoint_url: str,
+        payload: dict,
+        target_action: str,
+        resend_client: ResendBaseClass,
+    ) -> AWSPreparedRequest:
+        request = AWSRequest(
+            method="POST",
+            url=endpoint_url,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={
+                "Content-Type": "application/x-amz-json-1.1",
+                "X-Amz-Target": target_action
+            },
+        )
+        _SkewAdjustedSigV4Auth(
+            credentials=self._credentials_provider(resend_client),
+            service_name=service,
+            region_name=region,
+            clock_skew_offset=self._clock_skew_offset,
+        ).add_auth(request)
+        return request.prepare()
+
+    def _should_retry_after_skew_correction(
+        self,
+        attempt: int,
+        status_code: int,
+        headers: Mapping[str, str],
+        response_text: str,
+    ) -> bool:
+        if status_code == 200:
+            self._refresh_clock_skew_offset(headers=headers, force=False)
+            return False
+
+        is_clock_skew_error = any(code in response_text for code in type(self).CLOCK_SKEW_ERROR_CODES)
+        if attempt == 0 and is_clock_skew_error and self._refresh_clock_skew_offset(headers=headers, force=True):
+            return True
+
+        raise Exception(f"[AWS Request] {status_code} {response_text}")
+
+    def _refresh_clock_skew_offset(
+        self,
+        headers: Mapping[str, str],
+        force: bool,
+    ) -> bool:
+        now = time.monotonic()
+        if (not force
+            and self._clock_skew_refreshed_at is not None
+            and now - self._clock_skew_refreshed_at < type(self).CLOCK_SKEW_REFRESH_SECONDS):
+            return False
+
+        aws_date = headers.get("Date") or headers.get("date")
+        if aws_date is None:
+            return False
+
+        try:
+            aws_time = parsedate_to_datetime(aws_date).astimezone(timezone.utc)
+        except Exception as e:
+            print(f"[AwsRequestSigner] Failed to parse AWS date header: {e}")
+            return False
+
+        with self._lock:
+            self._clock_skew_offset = (aws_time - datetime.now(timezone.utc)).total_seconds()
+            self._clock_skew_refreshed_at = now
+        return True
+
+class _SkewAdjustedSigV4Auth(SigV4Auth):
+    """
+    SigV4Auth always signs with the local clock, so we override the timestamp with the skew-adjusted time.
+    """
+
+    def __init__(
+        self,
+        credentials: ReadOnlyCredentials,
+        service_name: str,
+        region_name: str,
+        clock_skew_offset: float,
+    ):
+        super().__init__(credentials, service_name, region_name)
+        self._clock_skew_offset = clock_skew_offset
+
+    def add_auth(self, request):
+        if self.credentials is None:
+            raise NoCredentialsError()
+
+        adjusted_time = datetime.now(timezone.utc) + timedelta(seconds=self._clock_skew_offset)
+        request.context["timestamp"] = adjusted_time.strftime(DATE_TIME_TIMEZONE_FORMAT)
+        self._modify_request_before_signing(request)
+        canonical_request = self.canonical_request(request)
+        string_to_sign = self.string_to_sign(request, canonical_request)
+        signature = self.signature(string_to_sign, request)
+        self._inject_signature_to_request(request, signature)
+
+def _boto3_session_credentials(
+    resend_client: ResendBaseClass
+) -> ReadOnlyCredentials:
+    session = Boto3SessionFactory.get_session(resend_client=resend_client)
+    return session.get_credentials().get_frozen_credentials()
+
+_default_signer = AwsRequestSigner()
+
 def sign_and_send_aws_request(
     service: str,
     region: str,
@@ -19,7 +264,8 @@ def sign_and_send_aws_request(
     resend_client: ResendBaseClass,
 ) -> dict:
     """
-    Constructs and sends a SigV4-signed AWS API request, adjusting for clock skew.
+    Constructs and sends a SigV4-signed AWS API request through the process-wide signer,
+    adjusting for clock skew.
 
     Args:
         service: The AWS service name (e.g., 'kms', 'secretsmanager').
@@ -27,57 +273,36 @@ def sign_and_send_aws_request(
         endpoint_url: Full HTTPS endpoint URL.
         payload: The request body (as a dict).
         target_action: e.g., 'TrentService.Decrypt' or 'secretsmanager.GetSecretValue'
-        timeout: Timeout in seconds for the request.
         resend_client: Resend client for sending internal alerts.
 
     Returns:
         dict response parsed from JSON.
     """
-    try:
-        session = Boto3SessionFactory.get_session(resend_client=resend_client)
-        creds = session.get_credentials().get_frozen_credentials()
-
-        clock_skew_offset = get_aws_clock_skew_offset()
-        adjusted_time = datetime.now(timezone.utc) + timedelta(seconds=clock_skew_offset)
-
-        body = json.dumps(payload).encode("utf-8")
-        headers = {
-            "Content-Type": "application/x-amz-json-1.1",
-            "X-Amz-Target": target_action
-        }
-
-        request = AWSRequest(
-            method="POST",
-            url=endpoint_url,
-            data=body,
-            headers=headers,
-        )
-        request.context["timestamp"] = adjusted_time.strftime(DATE_TIME_TIMEZONE_FORMAT)
-        SigV4Auth(creds, service, region).add_auth(request)
-
-        http_session = URLLib3Session()
-        response = http_session.send(request.prepare())
+    return _default_signer.send(
+        service=service,
+        region=region,
+        endpoint_url=endpoint_url,
+        payload=payload,
+        target_action=target_action,
+        resend_client=resend_client,
+    )
 
-        if response.status_code != 200:
-            raise Exception(f"[AWS Request] {response.status_code} {response.text}")
-
-        return json.loads(response.content.decode("utf-8"))
-    except Exception as e:
-        raise RuntimeError(e) from e
-
-def get_aws_clock_skew_offset() -> int:
+async def async_sign_and_send_aws_request(
+    service: str,
+    region: str,
+    endpoint_url: str,
+    payload: dict,
+    target_action: str,
+    resend_client: ResendBaseClass,
+) -> dict:
     """
-    Returns the number of seconds by which local system clock is off from AWS server time.
-    Positive = local clock is behind.
-    Negative = local clock is ahead.
+    Async variant of `sign_and_send_aws_request`.
     """
-    try:
-        response = requests.head("https://sts.amazonaws.com", timeout=5)
-        aws_time_str = response.headers["Date"]
-        aws_time = datetime.strptime(aws_time_str, WEEKDAY_DATE_TIME_TIMEZONE_FORMAT).astimezone(timezone.utc)
-        local_time = datetime.now(timezone.utc)
-        offset = int((aws_time - local_time).total_seconds())
-        return offset
-    except Exception as e:
-        print(f"[ClockSkew] Failed to calculate clock skew: {e}")
-        return 0
+    return await _default_signer.send_async(
+        service=service,
+        region=region,
+        endpoint_url=endpoint_url,
+        payload=payload,
+        target_action=target_action,
+        resend_client=resend_client,
+    )
@@ -0,0 +1,212 @@
+import json
+
+from pydantic import BaseModel
+from redis.asyncio import Redis
+from typing import Type
+
+from ...dependencies.api.influx_base_class import InfluxBaseClass
+from ...internal.security.chartwise_encryptor import ChartWiseEncryptor
+from ...vectors.message_templates import PromptScenario
+from .ttl_lru_cache import TTLLRUCache
+
+class CompletionCache:
+    """
+    A cache for deterministic (temperature 0) chat completions. Keys are keyed digests of the model,
+    the prompt messages, the token limit and the expected output schema, so any change in the inputs
+    produces a new entry. Completions are encrypted before being stored in any tier.
+
+    Only the scenarios that transform content (which often gets resubmitted unchanged on retries,
+    re-uploads and template conversions) are cached. Scenarios that answer a therapist's questions,
+    or whose output depends on data outside the prompt, always reach the API.
+
+    Arguments:
+    llm_model – the model used for generating the completions.
+    encryptor – the encryptor used for hashing keys and encrypting the cached completions.
+    redis_client – the optional Redis client backing the shared tier.
+    influx_client – the optional client used for reporting hit ratios per prompt scenario.
+    """
+    CACHE_NAME = "openai_completions"
+    MEMORY_MAX_ENTRIES = 500
+    MEMORY_TTL_SECONDS = 3600 # 1 hour
+    REDIS_TTL_SECONDS = 86400 # 24 hours
+    REDIS_KEY_PREFIX = "completions"
+    MAX_VALUE_BYTES = 65536
+    CACHEABLE_PROMPT_SCENARIOS = frozenset([
+        PromptScenario.CHUNK_SUMMARY,
+        PromptScenario.DIARIZATION_CHUNKS_GRAND_SUMMARY,
+        PromptScenario.DIARIZATION_SUMMARY,
+        PromptScenario.PACKED_CHUNK_SUMMARIES,
+        PromptScenario.SESSION_MINI_SUMMARY,
+        PromptScenario.SOAP_TEMPLATE,
+    ])
+
+    def __init__(
+        self,
+        llm_model: str,
+        encryptor: ChartWiseEncryptor,
+        redis_client: Redis | None = None,
+        influx_client: InfluxBaseClass | None = None,
+    ):
+        cls = type(self)
+        self.llm_model = llm_model
+        self._encryptor = encryptor
+        self._redis_client = redis_client
+        self._influx_client = influx_client
+        self._memory_cache = TTLLRUCache(
+            name=cls.CACHE_NAME,
+            max_entries=cls.MEMORY_MAX_ENTRIES,
+            ttl_seconds=cls.MEMORY_TTL_SECONDS,
+        )
+
+    def is_cacheable(
+        self,
+        prompt_scenario: PromptScenario | None
+    ) -> bool:
+        """
+        Returns whether completions for the incoming prompt scenario should be cached.
+
+        Arguments:
+        prompt_scenario – the scenario that generated the prompt.
+        """
+        return prompt_scenario in type(self).CACHEABLE_PROMPT_SCENARIOS
+
+    def cache_key(
+        self,
+        messages: list,
+        max_tokens: int,
+        expected_output_model: Type[BaseModel] | None = None,
+    ) -> str:
+        """
+        Returns the cache key for a completion request.
+
+        Arguments:
+        messages – the set of message prompts.
+        max_tokens – the max tokens allowed for the response output.
+        expected_output_model – the optional output model expected from the completion.
+        """
+        schema = None if expected_output_model is None else expected_output_model.model_json_schema()
+        serialized_request = json.dumps(
+            {
+                "model": self.llm_model,
+                "messages": messages,
+                "max_tokens": max_tokens,
+                "schema": schema,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return ":".join([
+            type(self).REDIS_KEY_PREFIX,
+            self.llm_model,
+            self._encryptor.digest(serialized_request)
+        ])
+
+    async def get(
+        self,
+        key: str,
+        prompt_scenario: PromptScenario | None,
+        expected_output_model: Type[BaseModel] | None = None,
+    ) -> BaseModel | str | None:
+        """
+        Returns the cached completion for the incoming key, or None if it isn't cached.
+        Entries that can't be decrypted or parsed (i.e. after a key rotation or a schema change)
+        are evicted, and treated as misses.
+
+        Arguments:
+        key – the cache key, as returned by `cache_key`.
+        prompt_scenario – the scenario that generated the prompt, used for tagging hit ratios.
+        expected_output_model – the optional output model expected from the completion.
+        """
+        ciphertext = self._memory_cache.get(key)
+        read_from_redis = False
+        if ciphertext is None and self._redis_client is not None:
+            try:
+                ciphertext = await self._redis_client.get(key)
+                read_from_redis = True
+            except Exception as e:
+                # The shared tier is best-effort, we can always fall back to the API.
+                print(f"[CompletionCache] Failed to read from Redis: {e}")
+
+        completion = None
+        if ciphertext is not None:
+            try:
+                plaintext = self._encryptor.decrypt(ciphertext)
+                completion = (
+                    plaintext if expected_output_model is None
+                    else expected_output_model.model_validate_json(plaintext)
+                )
+            except Exception as e:
+                print(f"[CompletionCache] Failed to decode a cached completion: {e}")
+                await self._evict(key)
+            else:
+                if read_from_redis:
+                    self._memory_cache.set(key, ciphertext)
+
+        self._log_access(
+            hit=completion is not None,
+            prompt_scenario=prompt_scenario
+        )
+        return completion
+
+    async def set(
+        self,
+        key: str,
+        completion: BaseModel | str,
+    ):
+        """
+        Stores the incoming completion. Oversized completions are not cached.
+
+        Arguments:
+        key – the cache key, as returned by `cache_key`.
+        completion – the completion to be cached.
+        """
+        cls = type(self)
+        plaintext = completion.model_dump_json() if isinstance(completion, BaseModel) else completion
+        ciphertext = self._encryptor.encrypt(plaintext)
+        if len(ciphertext) > cls.MAX_VALUE_BYTES:
+            return
+
+        self._memory_cache.set(key, ciphertext)
+        if self._redis_client is None:
+            return
+
+        try:
+            await self._redis_client.set(
+                key,
+                ciphertext,
+                ex=cls.REDIS_TTL_SECONDS
+            )
+        except Exception as e:
+            print(f"[CompletionCache] Failed to write to Redis: {e}")
+
+    # Private
+
+    async def _evict(
+        self,
+        key: str
+    ):
+        self._memory_cache.invalidate(key)
+        if self._redis_client is None:
+            return
+
+        try:
+            await self._redis_client.delete(key)
+        except Exception as e:
+            print(f"[CompletionCache] Failed to delete from Redis: {e}")
+
+    def _log_access(
+        self,
+        hit: bool,
+        prompt_scenario: PromptScenario | None
+    ):
+        if self._influx_client is None:
+            return
+
+        try:
+            self._influx_client.log_cache_access(
+                cache_name=type(self).CACHE_NAME,
+                hit=hit,
+                prompt_scenario=(PromptScenario.UNDEFINED if prompt_scenario is None else prompt_scenario).value
+            )
+        except Exception as e:
+            print(f"[CompletionCache] Failed to log cache access: {e}")
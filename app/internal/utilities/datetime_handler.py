@@ -17,6 +17,8 @@ UTC_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
 WEEKDAY_DATE_TIME_TIMEZONE_FORMAT = "%a, %d %b %Y %H:%M:%S %Z"
 YEAR_FORMAT = "%Y"
 
+EPOCH_DATE = date(1970, 1, 1)
+
 def is_valid_date(
     date_input: str,
     incoming_date_format: str,
@@ -41,6 +43,15 @@ def is_valid_date(
     except:
         return False
 
+def to_epoch_days(
+    value: date
+) -> int:
+    """
+    Returns the number of days elapsed between the Unix epoch and the incoming date.
+    Used wherever dates need to be compared numerically (i.e. vector metadata filters).
+    """
+    return (value - EPOCH_DATE).days
+
 def convert_to_date_format_spell_out_month(
     session_date: str,
     incoming_date_format: str
@@ -0,0 +1,129 @@
+from array import array
+from redis.asyncio import Redis
+
+from ...dependencies.api.influx_base_class import InfluxBaseClass
+from ...internal.security.chartwise_encryptor import ChartWiseEncryptor
+from .ttl_lru_cache import TTLLRUCache
+
+class EmbeddingsCache:
+    """
+    A two-tier cache for text embeddings. The first tier is an in-process LRU, and the optional
+    second tier is a shared Redis instance. Keys are keyed digests of the text, namespaced by the
+    embedding model, so that switching models never serves stale vectors. Embeddings are stored as
+    compact float32 arrays, and they are encrypted before leaving the process.
+
+    Arguments:
+    embedding_model – the model used for generating the embeddings.
+    encryptor – the encryptor used for hashing keys and encrypting the Redis payloads.
+    redis_client – the optional Redis client backing the shared tier.
+    influx_client – the optional client used for reporting hit/miss metrics.
+    """
+    MEMORY_MAX_ENTRIES = 2000
+    REDIS_TTL_SECONDS = 604800 # 7 days
+    REDIS_KEY_PREFIX = "embeddings"
+
+    def __init__(
+        self,
+        embedding_model: str,
+        encryptor: ChartWiseEncryptor,
+        redis_client: Redis | None = None,
+        influx_client: InfluxBaseClass | None = None,
+    ):
+        self.embedding_model = embedding_model
+        self._encryptor = encryptor
+        self._redis_client = redis_client
+        self._memory_cache = TTLLRUCache(
+            name="openai_embeddings",
+            max_entries=type(self).MEMORY_MAX_ENTRIES,
+            influx_client=influx_client,
+        )
+
+    async def get(
+        self,
+        text: str
+    ) -> list[float] | None:
+        """
+        Returns the cached embeddings for the incoming text, or None if they're not cached.
+
+        Arguments:
+        text – the embedded text.
+        """
+        key = self._cache_key(text)
+        embeddings = self._memory_cache.get(key)
+        if embeddings is not None:
+            return embeddings.tolist()
+
+        if self._redis_client is None:
+            return None
+
+        try:
+            payload = await self._redis_client.get(key)
+        except Exception as e:
+            # The shared tier is best-effort, we can always fall back to the API.
+            print(f"[EmbeddingsCache] Failed to read from Redis: {e}")
+            return None
+
+        if payload is None:
+            return None
+
+        try:
+            embeddings = array("f")
+            embeddings.frombytes(self._encryptor.decrypt_bytes(payload))
+        except Exception as e:
+            # Corrupt payloads (or ones encrypted with a rotated key) are treated as misses,
+            # and evicted so that they get overwritten with fresh embeddings.
+            print(f"[EmbeddingsCache] Failed to decode a Redis payload: {e}")
+            await self._evict(key)
+            return None
+
+        self._memory_cache.set(key, embeddings)
+        return embeddings.tolist()
+
+    async def set(
+        self,
+        text: str,
+        embeddings: list[float]
+    ):
+        """
+        Stores the embeddings generated for the incoming text.
+
+        Arguments:
+        text – the embedded text.
+        embeddings – the generated embeddings.
+        """
+        key = self._cache_key(text)
+        compact_embeddings = array("f", embeddings)
+        self._memory_cache.set(key, compact_embeddings)
+
+        if self._redis_client is None:
+            return
+
+        try:
+            await self._redis_client.set(
+                key,
+                self._encryptor.encrypt_bytes(compact_embeddings.tobytes()),
+                ex=type(self).REDIS_TTL_SECONDS
+            )
+        except Exception as e:
+            print(f"[EmbeddingsCache] Failed to write to Redis: {e}")
+
+    # Private
+
+    async def _evict(
+        self,
+        key: str
+    ):
+        try:
+            await self._redis_client.delete(key)
+        except Exception as e:
+            print(f"[EmbeddingsCache] Failed to delete from Redis: {e}")
+
+    def _cache_key(
+        self,
+        text: str
+    ) -> str:
+        return ":".join([
+            type(self).REDIS_KEY_PREFIX,
+            self.embedding_model,
+            self._encryptor.digest(text)
+        ])
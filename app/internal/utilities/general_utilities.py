@@ -1,6 +1,7 @@
 import httpx, os, re, uuid
 
 from fastapi import (
+    FastAPI,
     HTTPException,
     status,
     Request
@@ -122,6 +123,23 @@ def retrieve_ip_address(request: Request) -> str:
         ip_address = request.client.host
     return ip_address
 
+def worker_request(app: FastAPI) -> Request:
+    """
+    Returns a request for work running outside of a route (e.g. pollers, or queue workers).
+    Jobs reach the database pool through a request, like the routes that enqueue them.
+
+    Arguments:
+    app – the app whose state holds the database pool.
+    """
+    return Request(
+        scope={
+            "type": "http",
+            "app": app,
+            "headers": [],
+            "state": {},
+        }
+    )
+
 async def get_country_iso_code_from_ip(ip: str) -> str:
     try:
         async with httpx.AsyncClient() as client:
@@ -0,0 +1,309 @@
+import asyncio, threading
+
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable
+
+from ...dependencies.dependency_container import dependency_container
+
+class JobPool(Enum):
+    # Outbox drains (vector ingestion and insights), bound by OpenAI and Pinecone limits.
+    INGESTION = "ingestion"
+    # Media pipelines, when they run in-process (i.e. without a Celery broker).
+    MEDIA = "media"
+    AUDIT_LOGS = "audit_logs"
+    MAINTENANCE = "maintenance"
+
+@dataclass(frozen=True)
+class JobPoolLimits:
+    concurrency: int
+    deadline_seconds: float
+
+@dataclass
+class JobPoolMetrics:
+    queued: int = 0
+    running: int = 0
+    completed: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    abandoned: int = 0
+
+class JobAbandonedError(Exception):
+    """
+    Reported for jobs that were dropped before finishing, because their deadline passed while they were
+    queued, or because the scheduler was draining.
+    """
+    pass
+
+@dataclass
+class _JobPoolState:
+    limits: JobPoolLimits
+    metrics: JobPoolMetrics = field(default_factory=JobPoolMetrics)
+    waiters: deque = field(default_factory=deque)
+
+class JobScheduler:
+    """
+    Runs background jobs in named pools, each with a concurrency limit, so that bursts of work
+    queue up instead of all running at once.
+
+    Every job has a deadline (covering its time in the queue), past which it gets cancelled.
+    On shutdown, `drain` lets running jobs finish within a timeout and cancels the rest. Jobs that
+    must survive being cancelled persist themselves (i.e. outbox jobs get handed back to the outbox),
+    and can tell a drain apart from their deadline through `is_drain_cancellation`.
+    """
+    POOL_LIMITS = {
+        JobPool.INGESTION: JobPoolLimits(concurrency=4, deadline_seconds=600),
+        JobPool.MEDIA: JobPoolLimits(concurrency=2, deadline_seconds=1800),
+        JobPool.AUDIT_LOGS: JobPoolLimits(concurrency=16, deadline_seconds=30),
+        JobPool.MAINTENANCE: JobPoolLimits(concurrency=4, deadline_seconds=60),
+    }
+    DRAIN_TIMEOUT_SECONDS = 25
+    DRAIN_CANCEL_MESSAGE = "The scheduler is draining"
+    _lock = threading.Lock()
+    _shared_instance = None
+
+    def __init__(self):
+        cls = type(self)
+        self._pools = {pool: _JobPoolState(limits=limits) for pool, limits in cls.POOL_LIMITS.items()}
+        self._tasks: set[asyncio.Task] = set()
+        self._draining = False
+
+    @classmethod
+    def shared(cls) -> "JobScheduler":
+        if cls._shared_instance is None:
+            with cls._lock:
+                if cls._shared_instance is None:
+                    cls._shared_instance = cls()
+        return cls._shared_instance
+
+    def submit(
+        self,
+        pool: JobPool,
+        job: Callable[..., Awaitable],
+        on_error: Callable[[Exception], Any] | None = None,
+        deadline_seconds: float | None = None,
+        **job_arguments
+    ) -> asyncio.Task:
+        """
+        Queues a job in the incoming pool, and returns the task running it.
+        The task doesn't raise, failures get reported to `on_error` instead (or logged).
+
+        Arguments:
+        pool – the pool to run the job in.
+        job – the coroutine function to be run.
+        on_error – the (optionally async) callback for the job's failure, timeout or abandonment.
+        deadline_seconds – the time the job has to finish in. Defaults to the pool's deadline.
+        job_arguments – the keyword arguments of the job.
+        """
+        pool_state = self._pools[pool]
+        deadline = asyncio.get_running_loop().time() + (deadline_seconds or pool_state.limits.deadline_seconds)
+        task = asyncio.create_task(
+            self._run_job(
+                pool=pool,
+                job=job,
+                job_arguments=job_arguments,
+                deadline=deadline,
+                on_error=on_error
+            )
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def run(
+        self,
+        pool: JobPool,
+        job: Callable[..., Awaitable],
+        **job_arguments
+    ):
+        """
+        Queues a job in the incoming pool, and waits for it to finish.
+        Cancelling the wait leaves the job running, so that it gets drained with the rest.
+
+        Arguments:
+        pool – the pool to run the job in.
+        job – the coroutine function to be run.
+        job_arguments – the keyword arguments of the job.
+        """
+        await asyncio.shield(self.submit(pool, job, **job_arguments))
+
+    @classmethod
+    def is_drain_cancellation(
+        cls,
+        error: asyncio.CancelledError
+    ) -> bool:
+        """
+        Returns whether the incoming cancellation came from a drain, rather than the job's deadline.
+
+        Arguments:
+        error – the cancellation raised within the job.
+        """
+        return cls.DRAIN_CANCEL_MESSAGE in error.args
+
+    def metrics(self) -> dict[JobPool, JobPoolMetrics]:
+        """
+        Returns a snapshot of every pool's queue depth, running jobs and outcomes.
+        """
+        return {
+            pool: JobPoolMetrics(**vars(pool_state.metrics))
+            for pool, pool_state in self._pools.items()
+        }
+
+    async def drain(
+        self,
+        timeout_seconds: float | None = None
+    ):
+        """
+        Stops starting jobs, waits for the running ones to finish, and cancels those still running
+        once the timeout is reached. Queued jobs, and jobs submitted while draining, get abandoned.
+
+        Arguments:
+        timeout_seconds – the time running jobs have to finish in. Defaults to DRAIN_TIMEOUT_SECONDS.
+        """
+        cls = type(self)
+        self._draining = True
+        for pool_state in self._pools.values():
+            while pool_state.waiters:
+                waiter = pool_state.waiters.popleft()
+                if not waiter.done():
+                    waiter.set_exception(JobAbandonedError("The scheduler is draining"))
+
+        try:
+            tasks = set(self._tasks)
+            if len(tasks) == 0:
+                return
+
+            print(f"[JobScheduler] Draining {len(tasks)} jobs")
+            _, pending = await asyncio.wait(tasks, timeout=timeout_seconds or cls.DRAIN_TIMEOUT_SECONDS)
+            if len(pending) > 0:
+                print(f"[JobScheduler] Cancelling {len(pending)} jobs still running after the drain timeout")
+                for task in pending:
+                    task.cancel(msg=cls.DRAIN_CANCEL_MESSAGE)
+                await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            self._draining = False
+
+    # Private
+
+    async def _run_job(
+        self,
+        pool: JobPool,
+        job: Callable[..., Awaitable],
+        job_arguments: dict,
+        deadline: float,
+        on_error: Callable[[Exception], Any] | None
+    ):
+        loop = asyncio.get_running_loop()
+        pool_state = self._pools[pool]
+        enqueued_at = loop.time()
+        try:
+            await self._acquire_slot(pool_state, deadline)
+        except (JobAbandonedError, TimeoutError) as e:
+            pool_state.metrics.abandoned += 1
+            error = e if isinstance(e, JobAbandonedError) else JobAbandonedError("The job's deadline passed while it was queued")
+            await self._report_error(pool, job, error, on_error)
+            self._log_job(pool, "abandoned", queue_wait_time=loop.time() - enqueued_at, run_time=0)
+            return
+
+        started_at = loop.time()
+        outcome = "completed"
+        try:
+            async with asyncio.timeout_at(deadline):
+                await job(**job_arguments)
+            pool_state.metrics.completed += 1
+        except TimeoutError as e:
+            outcome = "timed_out"
+            pool_state.metrics.timed_out += 1
+            await self._report_error(pool, job, e, on_error)
+        except asyncio.CancelledError:
+            outcome = "abandoned"
+            pool_state.metrics.abandoned += 1
+            await self._report_error(pool, job, JobAbandonedError("The job was cancelled while running"), on_error)
+            raise
+        except Exception as e:
+            outcome = "failed"
+            pool_state.metrics.failed += 1
+            await self._report_error(pool, job, e, on_error)
+        finally:
+            self._release_slot(pool_state)
+            self._log_job(pool, outcome, queue_wait_time=started_at - enqueued_at, run_time=loop.time() - started_at)
+
+    async def _acquire_slot(
+        self,
+        pool_state: _JobPoolState,
+        deadline: float
+    ):
+        if self._draining:
+            raise JobAbandonedError("The scheduler is draining")
+
+        if pool_state.metrics.running < pool_state.limits.concurrency and len(pool_state.waiters) == 0:
+            pool_state.metrics.running += 1
+            return
+
+        # Released slots get handed over to the oldest waiter, without going through the count.
+        waiter = asyncio.get_running_loop().create_future()
+        pool_state.waiters.append(waiter)
+        pool_state.metrics.queued += 1
+        try:
+            async with asyncio.timeout_at(deadline):
+                await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                # The slot was handed over just as the wait ended.
+                self._release_slot(pool_state)
+            raise
+        finally:
+            pool_state.metrics.queued -= 1
+            if waiter in pool_state.waiters:
+                pool_state.waiters.remove(waiter)
+
+    def _release_slot(
+        self,
+        pool_state: _JobPoolState
+    ):
+        while pool_state.waiters:
+            waiter = pool_state.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        pool_state.metrics.running -= 1
+
+    async def _report_error(
+        self,
+        pool: JobPool,
+        job: Callable[..., Awaitable],
+        error: Exception,
+        on_error: Callable[[Exception], Any] | None
+    ):
+        job_name = getattr(job, "__qualname__", repr(job))
+        if on_error is None:
+            print(f"[JobScheduler] Job {job_name} in pool {pool.value} didn't finish: {error!r}")
+            return
+
+        try:
+            result = on_error(error)
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as callback_error:
+            print(f"[JobScheduler] on_error callback of job {job_name} failed: {callback_error}")
+
+    def _log_job(
+        self,
+        pool: JobPool,
+        outcome: str,
+        queue_wait_time: float,
+        run_time: float
+    ):
+        try:
+            metrics = self._pools[pool].metrics
+            dependency_container.inject_influx_client().log_scheduled_job(
+                pool_name=pool.value,
+                outcome=outcome,
+                queue_wait_time=queue_wait_time,
+                run_time=run_time,
+                queued=metrics.queued,
+                running=metrics.running
+            )
+        except Exception as e:
+            print(f"[JobScheduler] Failed to log job metrics: {e}")
@@ -0,0 +1,134 @@
+import threading, time
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from ...dependencies.api.influx_base_class import InfluxBaseClass
+
+class TTLLRUCache:
+    """
+    A thread-safe, size-bounded LRU cache with an optional per-entry time-to-live.
+
+    Arguments:
+    name – the cache name, used to tag hit/miss metrics.
+    max_entries – the maximum number of entries kept before evicting the least recently used one.
+    ttl_seconds – the optional time-to-live for every entry. Entries never expire when None.
+    influx_client – the optional client used for reporting hit/miss metrics.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl_seconds: float | None = None,
+        influx_client: InfluxBaseClass | None = None,
+    ):
+        assert max_entries > 0, "max_entries must be greater than 0"
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._influx_client = influx_client
+        self._entries: OrderedDict[Hashable, tuple[Any, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        key: Hashable,
+        **metric_tags
+    ) -> Any | None:
+        """
+        Returns the value stored for the incoming key, or None if it's missing or expired.
+
+        Arguments:
+        key – the cache key.
+        metric_tags – the set of optional tags to be attached to the hit/miss metric.
+        """
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is not None and entry[1] is not None and time.monotonic() >= entry[1]:
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+
+        self._log_access(hit=entry is not None, **metric_tags)
+        return None if entry is None else entry[0]
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any
+    ):
+        """
+        Stores the incoming value, evicting the least recently used entries if needed.
+
+        Arguments:
+        key – the cache key.
+        value – the value to be stored.
+        """
+        expiration = None if self.ttl_seconds is None else time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (value, expiration)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(
+        self,
+        key: Hashable
+    ):
+        """
+        Removes the entry associated with the incoming key, if any.
+
+        Arguments:
+        key – the cache key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_matching(
+        self,
+        predicate: Callable[[Hashable], bool]
+    ):
+        """
+        Removes every entry whose key satisfies the incoming predicate.
+
+        Arguments:
+        predicate – the function used for deciding whether a key should be removed.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # Private
+
+    def _log_access(
+        self,
+        hit: bool,
+        **metric_tags
+    ):
+        if self._influx_client is None:
+            return
+
+        try:
+            self._influx_client.log_cache_access(
+                cache_name=self.name,
+                hit=hit,
+                **metric_tags
+            )
+        except Exception as e:
+            # Metrics should never break the caller.
+            print(f"[TTLLRUCache] Failed to log cache access for {self.name}: {e}")
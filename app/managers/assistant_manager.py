@@ -5,15 +5,19 @@ from datetime import date, datetime, timedelta
 from enum import Enum
 from fastapi import BackgroundTasks, Request
 from pydantic import BaseModel
-from typing import Any, AsyncIterable, Set
+from starlette.concurrency import run_in_threadpool
+from typing import Any, AsyncIterable, Callable
 
-from ..dependencies.dependency_container import AwsDbBaseClass, dependency_container
+from ..dependencies.dependency_container import AwsDbBaseClass, OpenAIBaseClass, dependency_container
 from ..dependencies.api.pinecone_session_date_override import (
     PineconeQuerySessionDateOverride,
     PineconeQuerySessionDateOverrideType,
 )
 from ..managers.auth_manager import AuthManager
 from ..internal.alerting.internal_alert import EngineeringAlert
+from ..internal.db.job_outbox import OutboxJob, OutboxJobType
+from ..internal.db.patient_metrics import PatientMetricsDelta
+from ..internal.db.read_routing import DbReadRouting
 from ..internal.schemas import (
     DATE_COLUMNS,
     ENCRYPTED_PATIENT_ATTENDANCE_TABLE_NAME,
@@ -28,8 +32,12 @@ from ..internal.schemas import (
     TimeRange
 )
 from ..internal.utilities import datetime_handler, general_utilities
+from ..internal.utilities.job_scheduler import JobPool, JobScheduler
 from ..vectors.chartwise_assistant import (
+    COMBINED_INSIGHT_SECTIONS,
     ChartWiseAssistant,
+    InsightGenerationMode,
+    InsightGenerator,
     ListRecentTopicsSchema,
     ListQuestionSuggestionsSchema,
 )
@@ -38,11 +46,6 @@ class AssistantQuery(BaseModel):
     patient_id: str
     text: str
 
-class SessionCrudOperation(Enum):
-    INSERT_COMPLETED = "insert_completed"
-    UPDATE_COMPLETED = "update_completed"
-    DELETE_COMPLETED = "delete_completed"
-
 class PatientConsentmentChannel(Enum):
     UNDEFINED = "undefined"
     NO_CONSENT = "no_consent"
@@ -107,6 +110,8 @@ class CachedPatientQueryData:
 
 class AssistantManager:
 
+    OUTBOX_CLAIM_BATCH_SIZE = 4
+    OUTBOX_DRAIN_MAX_JOBS = 50
     cached_patient_query_data: CachedPatientQueryData | None = None
 
     def __init__(self):
@@ -202,31 +207,33 @@ class AssistantManager:
             if len(diarization or '') > 0:
                 insert_payload['diarization'] = diarization
 
+            # Upload vector embeddings and generate insights, through a job that's enqueued
+            # along with the session report.
             aws_db_client: AwsDbBaseClass = dependency_container.inject_aws_db_client()
             insert_result = await aws_db_client.insert(
                 user_id=therapist_id,
                 request=request,
                 table_name=ENCRYPTED_SESSION_REPORTS_TABLE_NAME,
-                payload=insert_payload
+                payload=insert_payload,
+                patient_metrics_delta=PatientMetricsDelta.for_inserted_session(session_date),
+                outbox_jobs=[
+                    OutboxJob(
+                        job_type=OutboxJobType.INSERT_SESSION_VECTORS,
+                        therapist_id=therapist_id,
+                        patient_id=patient_id,
+                        payload={
+                            "session_date": session_date,
+                            "language_code": language_code,
+                            "session_id": session_id,
+                        },
+                        written_row_fields={"session_notes_id": "id"},
+                    )
+                ]
             )
             assert type(insert_result) == dict, "Unexpected type after inserting"
             session_notes_id = insert_result['id']
 
-            # Upload vector embeddings and generate insights
-            background_tasks.add_task(
-                self._insert_vectors_and_generate_insights,
-                session_notes_id=session_notes_id,
-                therapist_id=therapist_id,
-                patient_id=patient_id,
-                notes_text=notes_text,
-                session_date=session_date,
-                session_id=session_id,
-                language_code=language_code,
-                environment=environment,
-                background_tasks=background_tasks,
-                auth_manager=auth_manager,
-                request=request,
-            )
+            self._schedule_outbox_drain(background_tasks=background_tasks, request=request)
             return session_notes_id
         except Exception as e:
             raise RuntimeError(e) from e
@@ -273,17 +280,6 @@ class AssistantManager:
                     ).date()
                 session_update_payload[key] = value
 
-            session_update_response = await aws_db_client.update(
-                user_id=therapist_id,
-                request=request,
-                table_name=ENCRYPTED_SESSION_REPORTS_TABLE_NAME,
-                payload=session_update_payload,
-                filters={
-                    'id': session_notes_id
-                }
-            )
-            assert (0 != len(session_update_response or '')), "Update operation could not be completed"
-
             current_session_text = report_query[0]['notes_text']
             current_session_date: date = report_query[0]['session_date']
             session_text_changed = 'notes_text' in session_update_payload and session_update_payload['notes_text'] != current_session_text
@@ -293,30 +289,45 @@ class AssistantManager:
 
             # Update the session vectors if needed
             patient_id = str(report_query[0]['patient_id'])
+            outbox_jobs = []
             if session_date_changed or session_text_changed:
-                new_session_date = filtered_body.get('session_date', None)
-                background_tasks.add_task(
-                    self._update_vectors_and_generate_insights,
-                    session_notes_id=session_notes_id,
-                    therapist_id=therapist_id,
-                    patient_id=patient_id,
-                    notes_text=filtered_body.get('notes_text', current_session_text),
-                    old_session_date=current_session_date,
-                    new_session_date=(
-                        datetime.strptime(
-                            new_session_date,
-                            datetime_handler.DATE_FORMAT
-                        ).date() if new_session_date is not None
-                        else current_session_date
-                    ),
-                    session_id=session_id,
-                    language_code=language_code,
-                    environment=environment,
-                    background_tasks=background_tasks,
-                    auth_manager=auth_manager,
-                    request=request,
+                outbox_jobs.append(
+                    OutboxJob(
+                        job_type=OutboxJobType.UPDATE_SESSION_VECTORS,
+                        therapist_id=therapist_id,
+                        patient_id=patient_id,
+                        payload={
+                            "session_notes_id": session_notes_id,
+                            "session_text_changed": session_text_changed,
+                            "old_session_date": current_session_date,
+                            "new_session_date": session_update_payload.get('session_date', current_session_date),
+                            "language_code": language_code,
+                            "session_id": session_id,
+                        },
+                    )
                 )
 
+            session_update_response = await aws_db_client.update(
+                user_id=therapist_id,
+                request=request,
+                table_name=ENCRYPTED_SESSION_REPORTS_TABLE_NAME,
+                payload=session_update_payload,
+                filters={
+                    'id': session_notes_id
+                },
+                patient_metrics_delta=(
+                    PatientMetricsDelta.for_rescheduled_session(
+                        old_session_date=current_session_date,
+                        new_session_date=session_update_payload['session_date']
+                    ) if session_date_changed else None
+                ),
+                outbox_jobs=outbox_jobs
+            )
+            assert (0 != len(session_update_response or '')), "Update operation could not be completed"
+
+            if len(outbox_jobs) > 0:
+                self._schedule_outbox_drain(background_tasks=background_tasks, request=request)
+
             return {
                 "patient_id": patient_id,
                 "session_report_id": session_notes_id
@@ -347,26 +358,24 @@ class AssistantManager:
                 filters={
                     'id': session_report_id
                 },
+                patient_metrics_delta=PatientMetricsDelta.for_deleted_session(),
+                # Delete the session's vector data, since it's not necessary to keep around
+                # when we already have our soft-deleted records in Postgres.
+                outbox_jobs=[
+                    OutboxJob(
+                        job_type=OutboxJobType.DELETE_SESSION_VECTORS,
+                        payload={
+                            "language_code": language_code,
+                            "session_id": session_id,
+                        },
+                        written_row_fields={"session_date": "session_date"},
+                    )
+                ]
             )
             assert type(soft_deletion_result_data) is list and len(soft_deletion_result_data) > 0, "No session found with the incoming session_report_id"
 
-            therapist_id = str(soft_deletion_result_data[0]['therapist_id'])
             patient_id = str(soft_deletion_result_data[0]['patient_id'])
-            session_date = soft_deletion_result_data[0]['session_date']
-
-            # Delete all vector data for the patient, since it's not necessary to keep around
-            # when we already have our soft-deleted records in Postgres.
-            background_tasks.add_task(
-                self._delete_vectors_and_generate_insights,
-                therapist_id=therapist_id,
-                patient_id=patient_id,
-                session_date=session_date,
-                session_id=session_id,
-                language_code=language_code,
-                environment=environment,
-                background_tasks=background_tasks,
-                request=request,
-            )
+            self._schedule_outbox_drain(background_tasks=background_tasks, request=request)
 
             return {
                 "patient_id": patient_id,
@@ -413,7 +422,8 @@ class AssistantManager:
                 filters={
                     "therapist_id": therapist_id,
                     "is_soft_deleted": False,
-                }
+                },
+                read_routing=DbReadRouting.AUTO,
             )
             return [] if len(response) == 0 else response
         except Exception as e:
@@ -436,33 +446,31 @@ class AssistantManager:
                     value = value.value
                 payload[key] = value
 
+            is_first_time_patient = filtered_body['onboarding_first_time_patient']
+            outbox_jobs = []
+            if is_first_time_patient and len(filtered_body.get('pre_existing_history') or '') > 0:
+                outbox_jobs.append(
+                    OutboxJob(
+                        job_type=OutboxJobType.INSERT_PREEXISTING_HISTORY_VECTORS,
+                        therapist_id=therapist_id,
+                        payload={},
+                        written_row_fields={"patient_id": "id"},
+                    )
+                )
+
             aws_db_client: AwsDbBaseClass = dependency_container.inject_aws_db_client()
             response = await aws_db_client.insert(
                 user_id=therapist_id,
                 request=request,
                 table_name=ENCRYPTED_PATIENTS_TABLE_NAME,
-                payload=payload
+                payload=payload,
+                outbox_jobs=outbox_jobs
             )
             assert type(response) == dict, "Unexpected data type after insert"
             patient_id = response['id']
 
-            is_first_time_patient = filtered_body['onboarding_first_time_patient']
-            if is_first_time_patient:
-                try:
-                    pre_existing_history = filtered_body['pre_existing_history']
-                    assert len(pre_existing_history or '') > 0
-
-                    background_tasks.add_task(
-                        dependency_container.inject_pinecone_client().insert_preexisting_history_vectors,
-                        user_id=therapist_id,
-                        patient_id=patient_id,
-                        text=pre_existing_history,
-                        openai_client=dependency_container.inject_openai_client(),
-                        summarize_chunk=self.chartwise_assistant.summarize_chunk
-                    )
-                except Exception:
-                    # If pre_existing_history is not in `filtered_body` or if it's empty, we won't do anything
-                    pass
+            if len(outbox_jobs) > 0:
+                self._schedule_outbox_drain(background_tasks=background_tasks, request=request)
 
             # Load default question suggestions
             await self._load_default_question_suggestions_for_new_patient(
@@ -519,6 +527,21 @@ class AssistantManager:
                 value = value.value
             update_db_payload[key] = value
 
+        pre_existing_history_changed = (
+            'pre_existing_history' in filtered_body
+            and filtered_body['pre_existing_history'] != current_pre_existing_history
+        )
+        outbox_jobs = []
+        if pre_existing_history_changed:
+            outbox_jobs.append(
+                OutboxJob(
+                    job_type=OutboxJobType.UPDATE_PREEXISTING_HISTORY_VECTORS,
+                    therapist_id=therapist_id,
+                    patient_id=filtered_body['id'],
+                    payload={},
+                )
+            )
+
         update_response = await aws_db_client.update(
             user_id=therapist_id,
             request=request,
@@ -526,26 +549,18 @@ class AssistantManager:
             payload=update_db_payload,
             filters={
                 'id': filtered_body['id']
-            }
+            },
+            outbox_jobs=outbox_jobs
         )
         assert (0 != len(update_response or '')), "Update operation could not be completed"
 
-        if ('pre_existing_history' not in filtered_body
-            or filtered_body['pre_existing_history'] == current_pre_existing_history):
+        if not pre_existing_history_changed:
             return
 
-        openai_client = dependency_container.inject_openai_client()
-        background_tasks.add_task(
-            dependency_container.inject_pinecone_client().update_preexisting_history_vectors,
-            user_id=therapist_id,
-            patient_id=filtered_body['id'],
-            text=filtered_body['pre_existing_history'],
-            openai_client=openai_client,
-            summarize_chunk=self.chartwise_assistant.summarize_chunk
-        )
+        self._schedule_outbox_drain(background_tasks=background_tasks, request=request)
 
         # New pre-existing history content means we should clear any existing conversation.
-        await openai_client.clear_chat_history()
+        await dependency_container.inject_openai_client().clear_chat_history()
 
     async def adapt_session_notes_to_soap(
         self,
@@ -559,38 +574,31 @@ class AssistantManager:
         except Exception as e:
             raise RuntimeError(e) from e
 
-    def delete_all_vector_data_for_single_patient(
+    async def delete_all_vector_data_for_single_patient(
         self,
         therapist_id: str,
         patient_id: str
     ):
         try:
-            pinecone_client = dependency_container.inject_pinecone_client()
-            pinecone_client.delete_session_vectors(
+            await dependency_container.inject_pinecone_client().delete_patients_vectors(
                 user_id=therapist_id,
-                patient_id=patient_id
-            )
-            pinecone_client.delete_preexisting_history_vectors(
-                user_id=therapist_id,
-                patient_id=patient_id
+                patient_ids=[patient_id]
             )
         except Exception as e:
             # Index doesn't exist, failing silently. Patient may have been queued for deletion prior to having any
             # data in our vector db
             pass
 
-    def delete_all_vector_data_for_patients(
+    async def delete_all_vector_data_for_patients(
         self,
         user_id: str,
         patient_ids: list[str]
     ):
         try:
-            pinecone_client = dependency_container.inject_pinecone_client()
-            for patient_id in patient_ids:
-                pinecone_client.delete_session_vectors(
-                    user_id=user_id,
-                    patient_id=patient_id
-                )
+            await dependency_container.inject_pinecone_client().delete_patients_vectors(
+                user_id=user_id,
+                patient_ids=patient_ids
+            )
         except Exception as e:
             raise RuntimeError(e) from e
 
@@ -706,6 +714,27 @@ class AssistantManager:
                 )
                 return
 
+            input_fingerprint = await self.chartwise_assistant.compute_insight_input_fingerprint(
+                generator=InsightGenerator.QUESTION_SUGGESTIONS,
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                request=request,
+                **self._insight_prompt_inputs(
+                    generator=InsightGenerator.QUESTION_SUGGESTIONS,
+                    language_code=language_code,
+                    patient_data=patient_query[0],
+                ),
+            )
+            if await self._insight_output_is_fresh(
+                generator=InsightGenerator.QUESTION_SUGGESTIONS,
+                table_name=ENCRYPTED_PATIENT_QUESTION_SUGGESTIONS_TABLE_NAME,
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                input_fingerprint=input_fingerprint,
+                request=request,
+            ):
+                return
+
             questions_json_schema: ListQuestionSuggestionsSchema = await self.chartwise_assistant.create_question_suggestions(
                 language_code=language_code,
                 user_id=therapist_id,
@@ -715,21 +744,12 @@ class AssistantManager:
                 request=request,
             )
 
-            questions_json = questions_json_schema.model_dump_json()
-            now_timestamp = datetime.now()
-
-            # Upsert result to DB
-            await aws_db_client.upsert(
-                user_id=therapist_id,
+            await self._store_question_suggestions(
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                question_suggestions=questions_json_schema,
+                input_fingerprint=input_fingerprint,
                 request=request,
-                payload={
-                    "patient_id": patient_id,
-                    "last_updated": now_timestamp,
-                    "therapist_id": therapist_id,
-                    "questions": eval(questions_json)
-                },
-                table_name=ENCRYPTED_PATIENT_QUESTION_SUGGESTIONS_TABLE_NAME,
-                conflict_columns=["patient_id"],
             )
         except Exception as e:
             eng_alert = EngineeringAlert(
@@ -799,6 +819,28 @@ class AssistantManager:
             language_code = therapist_query[0]['language_preference']
             therapist_gender = therapist_query[0]['gender']
 
+            input_fingerprint = await self.chartwise_assistant.compute_insight_input_fingerprint(
+                generator=InsightGenerator.PRESESSION_BRIEFING,
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                request=request,
+                **self._insight_prompt_inputs(
+                    generator=InsightGenerator.PRESESSION_BRIEFING,
+                    language_code=language_code,
+                    patient_data=patient_query[0],
+                    therapist_data=therapist_query[0],
+                ),
+            )
+            if await self._insight_output_is_fresh(
+                generator=InsightGenerator.PRESESSION_BRIEFING,
+                table_name=ENCRYPTED_PATIENT_BRIEFINGS_TABLE_NAME,
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                input_fingerprint=input_fingerprint,
+                request=request,
+            ):
+                return
+
             briefing = await self.chartwise_assistant.create_briefing(
                 user_id=therapist_id,
                 patient_id=patient_id,
@@ -811,19 +853,12 @@ class AssistantManager:
                 request=request,
             )
 
-            # Upsert result to DB
-            now_timestamp = datetime.now()
-            await aws_db_client.upsert(
-                user_id=therapist_id,
+            await self._store_presession_briefing(
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                briefing=briefing,
+                input_fingerprint=input_fingerprint,
                 request=request,
-                payload={
-                    "last_updated": now_timestamp,
-                    "patient_id": patient_id,
-                    "therapist_id": therapist_id,
-                    "briefing": briefing
-                },
-                conflict_columns=["patient_id"],
-                table_name=ENCRYPTED_PATIENT_BRIEFINGS_TABLE_NAME
             )
         except Exception as e:
             eng_alert = EngineeringAlert(
@@ -877,7 +912,29 @@ class AssistantManager:
                 )
                 return
 
-            # There are sessions associated with the patient. Regenerate recent topics.
+            input_fingerprint = await self.chartwise_assistant.compute_insight_input_fingerprint(
+                generator=InsightGenerator.RECENT_TOPICS,
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                request=request,
+                **self._insight_prompt_inputs(
+                    generator=InsightGenerator.RECENT_TOPICS,
+                    language_code=language_code,
+                    patient_data=patient_query[0],
+                ),
+            )
+            if await self._insight_output_is_fresh(
+                generator=InsightGenerator.RECENT_TOPICS,
+                table_name=ENCRYPTED_PATIENT_TOPICS_TABLE_NAME,
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                input_fingerprint=input_fingerprint,
+                request=request,
+            ):
+                return
+
+            # There are sessions associated with the patient, and they changed since the last generation.
+            # Regenerate recent topics.
             recent_topics_schema: ListRecentTopicsSchema = await self.chartwise_assistant.fetch_recent_topics(
                 language_code=language_code,
                 user_id=therapist_id,
@@ -897,26 +954,149 @@ class AssistantManager:
                 request=request,
             )
 
-            recent_topics_json = recent_topics_schema.model_dump_json()
-            now_timestamp = datetime.now()
+            await self._store_recent_topics(
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                recent_topics=recent_topics_schema,
+                topics_insights=topics_insights,
+                input_fingerprint=input_fingerprint,
+                request=request,
+            )
+        except Exception as e:
+            eng_alert = EngineeringAlert(
+                description="Updating the recent topics failed",
+                session_id=session_id,
+                exception=e,
+                environment=environment,
+                therapist_id=therapist_id,
+                patient_id=patient_id
+            )
+            dependency_container.inject_resend_client().send_internal_alert(alert=eng_alert)
+            raise RuntimeError(e) from e
 
-            # Upsert result to DB
-            await aws_db_client.upsert(
+    async def update_patient_insights_in_one_call(
+        self,
+        language_code: str,
+        therapist_id: str,
+        patient_id: str,
+        environment: str,
+        session_id: str | None,
+        request: Request,
+    ):
+        """
+        Updates the patient's recent topics, presession briefing, and question suggestions, generating
+        the stale ones with a single combined call. Fresh outputs are skipped, same as when updating them one by one.
+        """
+        try:
+            aws_db_client: AwsDbBaseClass = dependency_container.inject_aws_db_client()
+            patient_query = await aws_db_client.select(
                 user_id=therapist_id,
                 request=request,
-                payload={
-                    "last_updated": now_timestamp,
-                    "insights": topics_insights,
-                    "patient_id": patient_id,
-                    "therapist_id": therapist_id,
-                    "topics": eval(recent_topics_json)
+                fields=["*"],
+                filters={
+                    'therapist_id': therapist_id,
+                    'id': patient_id
                 },
-                conflict_columns=["patient_id"],
-                table_name=ENCRYPTED_PATIENT_TOPICS_TABLE_NAME
+                table_name=ENCRYPTED_PATIENTS_TABLE_NAME
+            )
+            assert (0 != len(patient_query)), "There isn't a patient-therapist match with the incoming ids."
+            patient_data = patient_query[0]
+
+            therapist_query = await aws_db_client.select(
+                user_id=therapist_id,
+                request=request,
+                fields=["*"],
+                filters={
+                    "id": therapist_id
+                },
+                table_name="therapists"
             )
+            assert (0 != len(therapist_query)), "Error caught when trying to find data associated to therapist ID"
+            therapist_data = therapist_query[0]
+
+            # Zero-state outputs don't involve the LLM, and the briefing follows the therapist's
+            # language preference, so in both cases the insights get updated one by one.
+            separate_generators = set()
+            if 0 == len(patient_data['unique_active_years']):
+                separate_generators = set(COMBINED_INSIGHT_SECTIONS)
+            elif therapist_data['language_preference'] != language_code:
+                separate_generators = {InsightGenerator.PRESESSION_BRIEFING}
+
+            insight_tables = {
+                InsightGenerator.RECENT_TOPICS: ENCRYPTED_PATIENT_TOPICS_TABLE_NAME,
+                InsightGenerator.PRESESSION_BRIEFING: ENCRYPTED_PATIENT_BRIEFINGS_TABLE_NAME,
+                InsightGenerator.QUESTION_SUGGESTIONS: ENCRYPTED_PATIENT_QUESTION_SUGGESTIONS_TABLE_NAME,
+            }
+            stale_fingerprints: dict[InsightGenerator, str] = {}
+            for generator, table_name in insight_tables.items():
+                if generator in separate_generators:
+                    continue
+
+                input_fingerprint = await self.chartwise_assistant.compute_insight_input_fingerprint(
+                    generator=generator,
+                    therapist_id=therapist_id,
+                    patient_id=patient_id,
+                    request=request,
+                    **self._insight_prompt_inputs(
+                        generator=generator,
+                        language_code=language_code,
+                        patient_data=patient_data,
+                        therapist_data=therapist_data,
+                    ),
+                )
+                if not await self._insight_output_is_fresh(
+                    generator=generator,
+                    table_name=table_name,
+                    therapist_id=therapist_id,
+                    patient_id=patient_id,
+                    input_fingerprint=input_fingerprint,
+                    request=request,
+                ):
+                    stale_fingerprints[generator] = input_fingerprint
+
+            if len(stale_fingerprints) > 0:
+                insights = await self.chartwise_assistant.generate_combined_insights(
+                    generators=set(stale_fingerprints),
+                    user_id=therapist_id,
+                    patient_id=patient_id,
+                    language_code=language_code,
+                    patient_first_name=patient_data['first_name'],
+                    patient_full_name=(" ".join([patient_data['first_name'], patient_data['last_name']])),
+                    patient_gender=patient_data['gender'],
+                    therapist_name=therapist_data['first_name'],
+                    therapist_gender=therapist_data['gender'],
+                    session_count=patient_data['total_sessions'],
+                    request=request,
+                )
+
+                if InsightGenerator.RECENT_TOPICS in stale_fingerprints:
+                    await self._store_recent_topics(
+                        therapist_id=therapist_id,
+                        patient_id=patient_id,
+                        recent_topics=insights.recent_topics,
+                        topics_insights=insights.recent_topics_insights,
+                        input_fingerprint=stale_fingerprints[InsightGenerator.RECENT_TOPICS],
+                        request=request,
+                    )
+                if InsightGenerator.PRESESSION_BRIEFING in stale_fingerprints:
+                    await self._store_presession_briefing(
+                        therapist_id=therapist_id,
+                        patient_id=patient_id,
+                        briefing=insights.presession_briefing,
+                        input_fingerprint=stale_fingerprints[InsightGenerator.PRESESSION_BRIEFING],
+                        request=request,
+                    )
+                if InsightGenerator.QUESTION_SUGGESTIONS in stale_fingerprints:
+                    await self._store_question_suggestions(
+                        therapist_id=therapist_id,
+                        patient_id=patient_id,
+                        question_suggestions=insights.question_suggestions,
+                        input_fingerprint=stale_fingerprints[InsightGenerator.QUESTION_SUGGESTIONS],
+                        request=request,
+                    )
         except Exception as e:
             eng_alert = EngineeringAlert(
-                description="Updating the recent topics failed",
+                description="Updating the combined patient insights failed",
                 session_id=session_id,
                 exception=e,
                 environment=environment,
@@ -926,6 +1106,34 @@ class AssistantManager:
             dependency_container.inject_resend_client().send_internal_alert(alert=eng_alert)
             raise RuntimeError(e) from e
 
+        if InsightGenerator.RECENT_TOPICS in separate_generators:
+            await self.update_patient_recent_topics(
+                language_code=language_code,
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                environment=environment,
+                session_id=session_id,
+                request=request,
+            )
+        if InsightGenerator.PRESESSION_BRIEFING in separate_generators:
+            await self.update_presession_tray(
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                environment=environment,
+                session_id=session_id,
+                language_code=language_code,
+                request=request,
+            )
+        if InsightGenerator.QUESTION_SUGGESTIONS in separate_generators:
+            await self.update_question_suggestions(
+                language_code=language_code,
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                environment=environment,
+                session_id=session_id,
+                request=request,
+            )
+
     async def generate_attendance_insights(
         self,
         language_code: str,
@@ -964,15 +1172,34 @@ class AssistantManager:
                 )
                 return
 
-            attendance_insights = await self.chartwise_assistant.generate_attendance_insights(
+            input_fingerprint = await self.chartwise_assistant.compute_insight_input_fingerprint(
+                generator=InsightGenerator.ATTENDANCE_INSIGHTS,
                 therapist_id=therapist_id,
                 patient_id=patient_id,
-                patient_gender=patient_gender,
-                patient_name=patient_first_name,
-                language_code=language_code,
                 request=request,
+                language_code=language_code,
+                patient_name=patient_first_name,
+                patient_gender=patient_gender,
             )
-
+            if await self._insight_output_is_fresh(
+                generator=InsightGenerator.ATTENDANCE_INSIGHTS,
+                table_name=ENCRYPTED_PATIENT_ATTENDANCE_TABLE_NAME,
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                input_fingerprint=input_fingerprint,
+                request=request,
+            ):
+                return
+
+            attendance_insights = await self.chartwise_assistant.generate_attendance_insights(
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                patient_gender=patient_gender,
+                patient_name=patient_first_name,
+                language_code=language_code,
+                request=request,
+            )
+
             # Upsert result to DB
             now_timestamp = datetime.now()
             await aws_db_client.upsert(
@@ -982,7 +1209,8 @@ class AssistantManager:
                     "last_updated": now_timestamp,
                     "insights": attendance_insights,
                     "patient_id": patient_id,
-                    "therapist_id": therapist_id
+                    "therapist_id": therapist_id,
+                    "input_fingerprint": input_fingerprint,
                 },
                 conflict_columns=["patient_id"],
                 table_name=ENCRYPTED_PATIENT_ATTENDANCE_TABLE_NAME
@@ -1000,117 +1228,6 @@ class AssistantManager:
             dependency_container.inject_resend_client().send_internal_alert(alert=eng_alert)
             raise RuntimeError(e) from e
 
-    async def update_patient_metrics_after_session_report_operation(
-        self,
-        patient_id: str,
-        environment: str,
-        therapist_id: str,
-        session_id: str | None,
-        operation: SessionCrudOperation,
-        request: Request,
-        session_date: date | None = None
-    ):
-        try:
-            # Fetch patient last session date and total session count
-            aws_db_client: AwsDbBaseClass = dependency_container.inject_aws_db_client()
-            patient_session_notes_data = await aws_db_client.select(
-                user_id=therapist_id,
-                request=request,
-                fields=["*"],
-                table_name=ENCRYPTED_SESSION_REPORTS_TABLE_NAME,
-                filters={
-                    "patient_id": patient_id,
-                    "is_soft_deleted": False,
-                },
-                order_by=("session_date", "desc")
-            )
-            total_session_count = len(patient_session_notes_data)
-            patient_last_session_date: date | None = (
-                None if total_session_count == 0
-                else patient_session_notes_data[0]['session_date']
-            )
-
-            unique_active_years: list[str] = await self.get_patient_active_session_years(
-                therapist_id=therapist_id,
-                patient_id=patient_id,
-                request=request,
-            )
-
-            # New value for last_session_date will be the most recent session we already found
-            if operation == SessionCrudOperation.DELETE_COMPLETED:
-                await aws_db_client.update(
-                    user_id=therapist_id,
-                    request=request,
-                    table_name=ENCRYPTED_PATIENTS_TABLE_NAME,
-                    payload={
-                        "last_session_date": patient_last_session_date,
-                        "total_sessions": total_session_count,
-                        "unique_active_years": unique_active_years
-                    },
-                    filters={
-                        'id': patient_id
-                    }
-                )
-                return
-
-            # The operation is either insert or update.
-            # Determine the updated value for last_session_date depending on if the patient
-            # has met with the therapist before or not.
-            if patient_last_session_date is None:
-                assert session_date is not None, "Received an invalid session date"
-                patient_last_session_date = session_date
-            elif session_date is not None:
-                patient_last_session_date = max(patient_last_session_date, session_date)
-
-            await aws_db_client.update(
-                user_id=therapist_id,
-                request=request,
-                table_name=ENCRYPTED_PATIENTS_TABLE_NAME,
-                payload={
-                    "last_session_date": patient_last_session_date,
-                    "total_sessions": total_session_count,
-                    "unique_active_years": unique_active_years,
-                },
-                filters={
-                    'id': patient_id
-                }
-            )
-        except Exception as e:
-            eng_alert = EngineeringAlert(
-                description="Updating the patient's \"total session count\" and \"last sesion date\" failed",
-                session_id=session_id,
-                exception=e,
-                environment=environment,
-                therapist_id=therapist_id,
-                patient_id=patient_id
-            )
-            dependency_container.inject_resend_client().send_internal_alert(alert=eng_alert)
-            raise RuntimeError(e) from e
-
-    async def get_patient_active_session_years(
-        self,
-        therapist_id: str,
-        patient_id: str,
-        request: Request,
-    ) -> list[str]:
-        aws_db_client: AwsDbBaseClass = dependency_container.inject_aws_db_client()
-        session_dates = await aws_db_client.select(
-            user_id=therapist_id,
-            request=request,
-            fields=["session_date"],
-            filters={
-                "patient_id": patient_id,
-                "is_soft_deleted": False,
-            },
-            table_name=ENCRYPTED_SESSION_REPORTS_TABLE_NAME
-        )
-
-        unique_active_years: Set[str] = {
-            str(entry["session_date"].year) for entry in session_dates if entry["session_date"]
-        }
-
-        return sorted(unique_active_years)
-
     async def default_streaming_error_message(
         self,
         user_id: str,
@@ -1152,7 +1269,8 @@ class AssistantManager:
                 fields=["*"],
                 filters={
                     "patient_id": patient_id
-                }
+                },
+                read_routing=DbReadRouting.AUTO,
             )
             return {} if len(response) == 0 else response[0]
         except Exception as e:
@@ -1173,7 +1291,8 @@ class AssistantManager:
                 fields=["*"],
                 filters={
                     "patient_id": patient_id
-                }
+                },
+                read_routing=DbReadRouting.AUTO,
             )
             return {} if len(response) == 0 else response[0]
         except Exception as e:
@@ -1194,7 +1313,8 @@ class AssistantManager:
                 fields=["*"],
                 filters={
                     "patient_id": patient_id
-                }
+                },
+                read_routing=DbReadRouting.AUTO,
             )
 
             if len(response) == 0:
@@ -1223,7 +1343,8 @@ class AssistantManager:
                 fields=["*"],
                 filters={
                     "patient_id": patient_id
-                }
+                },
+                read_routing=DbReadRouting.AUTO,
             )
 
             if len(response) == 0:
@@ -1237,36 +1358,207 @@ class AssistantManager:
         except Exception as e:
             raise RuntimeError(e) from e
 
+    async def process_outbox_jobs(
+        self,
+        request: Request,
+    ):
+        """
+        Runs pending outbox jobs, in claimed batches, until none are left (or the drain limit is reached).
+        Jobs are claimed with row locks that other runs skip over, so request nudges and the outbox poller
+        can drain concurrently without running a job twice.
+
+        Arguments:
+        request – the request (or worker context) associated with the jobs.
+        """
+        cls = type(self)
+        aws_db_client: AwsDbBaseClass = dependency_container.inject_aws_db_client()
+        processed_jobs_count = 0
+        while processed_jobs_count < cls.OUTBOX_DRAIN_MAX_JOBS:
+            jobs = await aws_db_client.claim_outbox_jobs(
+                request=request,
+                limit=cls.OUTBOX_CLAIM_BATCH_SIZE
+            )
+            if len(jobs) == 0:
+                return
+
+            # Claimed jobs belong to different patients, so they can safely run concurrently.
+            await asyncio.gather(*[self._run_outbox_job(job=job, request=request) for job in jobs])
+            processed_jobs_count += len(jobs)
+
     # Private
 
-    async def _insert_vectors_and_generate_insights(
+    def _schedule_outbox_drain(
+        self,
+        background_tasks: BackgroundTasks,
+        request: Request,
+    ):
+        # The drain runs in the scheduler's ingestion pool, which bounds how many run at once and
+        # owns them through shutdown. Waiting on it keeps the request's background work in step.
+        background_tasks.add_task(
+            JobScheduler.shared().run,
+            JobPool.INGESTION,
+            self.process_outbox_jobs,
+            request=request
+        )
+
+    async def _run_outbox_job(
+        self,
+        job: OutboxJob,
+        request: Request,
+    ):
+        aws_db_client: AwsDbBaseClass = dependency_container.inject_aws_db_client()
+        environment = os.environ.get('ENVIRONMENT')
+        try:
+            follow_up_jobs = await self._handle_outbox_job(
+                job=job,
+                environment=environment,
+                request=request
+            )
+            await aws_db_client.complete_outbox_job(
+                request=request,
+                job=job,
+                follow_up_jobs=follow_up_jobs
+            )
+        except asyncio.CancelledError as cancellation:
+            # Handing the job back to the outbox gets it retried before its lease expires. A shutdown drain
+            # isn't the job's fault, so it doesn't use up an attempt, unlike running past its deadline.
+            try:
+                if JobScheduler.is_drain_cancellation(cancellation):
+                    await aws_db_client.release_outbox_job(
+                        request=request,
+                        job=job
+                    )
+                else:
+                    await aws_db_client.fail_outbox_job(
+                        request=request,
+                        job=job,
+                        error="The job was cancelled while running"
+                    )
+            except Exception as fail_error:
+                print(f"[AssistantManager] Failed to hand back cancelled outbox job {job.id}: {fail_error}")
+            raise
+        except Exception as e:
+            print(f"[AssistantManager] Outbox job {job.id} ({job.job_type.value}) failed: {e}")
+            try:
+                will_retry = await aws_db_client.fail_outbox_job(
+                    request=request,
+                    job=job,
+                    error=str(e)
+                )
+            except Exception as fail_error:
+                # The job's lease expires eventually, so it still gets retried.
+                print(f"[AssistantManager] Failed to record the failure of outbox job {job.id}: {fail_error}")
+                return
+
+            if not will_retry:
+                eng_alert = EngineeringAlert(
+                    description=f"Outbox job {job.id} ({job.job_type.value}) failed after {job.attempts} attempts",
+                    session_id=job.payload.get('session_id'),
+                    exception=e,
+                    environment=environment,
+                    therapist_id=job.therapist_id,
+                    patient_id=job.patient_id,
+                )
+                dependency_container.inject_resend_client().send_internal_alert(alert=eng_alert)
+
+    async def _handle_outbox_job(
+        self,
+        job: OutboxJob,
+        environment: str,
+        request: Request,
+    ) -> list[OutboxJob]:
+        # Returns the jobs that should follow the handled one.
+        payload = job.payload
+        if job.job_type == OutboxJobType.INSERT_SESSION_VECTORS:
+            await self._insert_vectors(
+                session_notes_id=payload['session_notes_id'],
+                therapist_id=job.therapist_id,
+                patient_id=job.patient_id,
+                session_date=date.fromisoformat(payload['session_date']),
+                session_id=payload.get('session_id'),
+                language_code=payload['language_code'],
+                environment=environment,
+                request=request,
+            )
+        elif job.job_type == OutboxJobType.UPDATE_SESSION_VECTORS:
+            await self._update_vectors(
+                session_notes_id=payload['session_notes_id'],
+                therapist_id=job.therapist_id,
+                patient_id=job.patient_id,
+                session_text_changed=payload['session_text_changed'],
+                old_session_date=date.fromisoformat(payload['old_session_date']),
+                new_session_date=date.fromisoformat(payload['new_session_date']),
+                session_id=payload.get('session_id'),
+                language_code=payload['language_code'],
+                environment=environment,
+                request=request,
+            )
+        elif job.job_type == OutboxJobType.DELETE_SESSION_VECTORS:
+            # The deletion resolves the user's bucket and deletes through blocking calls.
+            await run_in_threadpool(
+                dependency_container.inject_pinecone_client().delete_session_vectors,
+                user_id=job.therapist_id,
+                patient_id=job.patient_id,
+                date=date.fromisoformat(payload['session_date'])
+            )
+        elif job.job_type in [
+            OutboxJobType.INSERT_PREEXISTING_HISTORY_VECTORS,
+            OutboxJobType.UPDATE_PREEXISTING_HISTORY_VECTORS
+        ]:
+            await self._sync_preexisting_history_vectors(
+                therapist_id=job.therapist_id,
+                patient_id=job.patient_id,
+                is_update=(job.job_type == OutboxJobType.UPDATE_PREEXISTING_HISTORY_VECTORS),
+                request=request,
+            )
+            return []
+        elif job.job_type == OutboxJobType.GENERATE_METRICS_AND_INSIGHTS:
+            await self._generate_metrics_and_insights(
+                language_code=payload['language_code'],
+                therapist_id=job.therapist_id,
+                patient_id=job.patient_id,
+                environment=environment,
+                session_id=payload.get('session_id'),
+                request=request,
+            )
+            return []
+        else:
+            raise Exception(f"Unsupported outbox job type \"{job.job_type.value}\"")
+
+        # Session vectors changed, so the patient's insights should be regenerated.
+        return [
+            OutboxJob(
+                job_type=OutboxJobType.GENERATE_METRICS_AND_INSIGHTS,
+                therapist_id=job.therapist_id,
+                patient_id=job.patient_id,
+                payload={
+                    "language_code": payload['language_code'],
+                    "session_id": payload.get('session_id'),
+                },
+            )
+        ]
+
+    async def _insert_vectors(
         self,
         session_notes_id: str,
         therapist_id: str,
         patient_id: str,
-        notes_text: str,
         session_date: date,
         session_id: str | None,
         language_code: str,
         environment: str,
-        background_tasks: BackgroundTasks,
-        auth_manager: AuthManager,
         request: Request,
     ):
-        # Update session notes entry with minisummary if needed
-        if len(notes_text) > 0:
-            await self._update_session_notes_with_mini_summary(
-                session_notes_id=session_notes_id,
-                notes_text=notes_text,
-                therapist_id=therapist_id,
-                language_code=language_code,
-                auth_manager=auth_manager,
-                session_id=session_id,
-                environment=environment,
-                background_tasks=background_tasks,
-                request=request,
-                patient_id=patient_id,
-            )
+        # Jobs read the current notes, rather than carrying them in the outbox.
+        session_report = await self.retrieve_single_session_report(
+            therapist_id=therapist_id,
+            session_report_id=session_notes_id,
+            request=request,
+        )
+        if len(session_report) == 0:
+            # The session was deleted in the meantime, and its own job takes care of the rest.
+            return
+        notes_text = session_report['notes_text'] or ''
 
         vector_ids = await dependency_container.inject_pinecone_client().insert_session_vectors(
             user_id=therapist_id,
@@ -1275,15 +1567,29 @@ class AssistantManager:
             session_report_id=session_notes_id,
             openai_client=dependency_container.inject_openai_client(),
             therapy_session_date=session_date,
-            summarize_chunk=self.chartwise_assistant.summarize_chunk
+            summarize_chunk=self.chartwise_assistant.summarize_chunk,
+            summarize_chunks=self._session_chunks_summarizer(
+                session_notes_id=session_notes_id,
+                notes_text=notes_text,
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                session_id=session_id,
+                language_code=language_code,
+                environment=environment,
+                request=request,
+            )
         )
 
         # Insert vector ids into mapping table for enhancing RAG accuracy.
+        # Mappings left behind by an earlier attempt of the job get replaced.
         aws_db_client: AwsDbBaseClass = dependency_container.inject_aws_db_client()
-        await aws_db_client.batch_insert(
+        await aws_db_client.replace_rows(
             user_id=therapist_id,
             request=request,
             table_name=VECTORS_SESSION_MAPPINGS_TABLE_NAME,
+            filters={
+                "session_report_id": session_notes_id
+            },
             payloads=[
                 {
                     "id": vector_id,
@@ -1296,59 +1602,30 @@ class AssistantManager:
             ]
         )
 
-        # Update patient metrics around last session date, and total session count AFTER
-        # session has already been inserted.
-        await self.update_patient_metrics_after_session_report_operation(
-            patient_id=patient_id,
-            environment=environment,
-            therapist_id=therapist_id,
-            session_id=session_id,
-            operation=SessionCrudOperation.INSERT_COMPLETED,
-            session_date=session_date,
-            request=request,
-        )
-
-        background_tasks.add_task(
-            self._generate_metrics_and_insights,
-            language_code=language_code,
-            therapist_id=therapist_id,
-            patient_id=patient_id,
-            environment=environment,
-            session_id=session_id,
-            request=request,
-        )
-
-    async def _update_vectors_and_generate_insights(
+    async def _update_vectors(
         self,
         session_notes_id: str,
         therapist_id: str,
         patient_id: str,
-        notes_text: str,
+        session_text_changed: bool,
         old_session_date: date,
         new_session_date: date,
         session_id: str | None,
         language_code: str,
         environment: str,
-        background_tasks: BackgroundTasks,
-        auth_manager: AuthManager,
         request: Request,
     ):
-        # We only have to generate a new mini_summary if the session text changed.
-        if len(notes_text) > 0:
-            await self._update_session_notes_with_mini_summary(
-                session_notes_id=session_notes_id,
-                notes_text=notes_text,
-                therapist_id=therapist_id,
-                language_code=language_code,
-                auth_manager=auth_manager,
-                session_id=session_id,
-                environment=environment,
-                background_tasks=background_tasks,
-                request=request,
-                patient_id=patient_id,
-            )
+        session_report = await self.retrieve_single_session_report(
+            therapist_id=therapist_id,
+            session_report_id=session_notes_id,
+            request=request,
+        )
+        if len(session_report) == 0:
+            return
+        notes_text = session_report['notes_text'] or ''
 
-        await dependency_container.inject_pinecone_client().update_session_vectors(
+        # Chunks (and the mini summary derived from them) only have to be summarized again if the session text changed.
+        vector_ids = await dependency_container.inject_pinecone_client().update_session_vectors(
             user_id=therapist_id,
             patient_id=patient_id,
             text=notes_text,
@@ -1356,68 +1633,117 @@ class AssistantManager:
             new_date=new_session_date,
             session_report_id=session_notes_id,
             openai_client=dependency_container.inject_openai_client(),
-            summarize_chunk=self.chartwise_assistant.summarize_chunk
-        )
-
-        # If the session date changed, let's proactively recalculate the patient's last_session_date and total_sessions in case
-        # the new session date overwrote the patient's last_session_date value.
-        await self.update_patient_metrics_after_session_report_operation(
-            patient_id=patient_id,
-            therapist_id=therapist_id,
-            session_id=session_id,
-            environment=environment,
-            operation=SessionCrudOperation.UPDATE_COMPLETED,
-            session_date=new_session_date,
-            request=request,
+            summarize_chunk=self.chartwise_assistant.summarize_chunk,
+            summarize_chunks=None if not session_text_changed else self._session_chunks_summarizer(
+                session_notes_id=session_notes_id,
+                notes_text=notes_text,
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                session_id=session_id,
+                language_code=language_code,
+                environment=environment,
+                request=request,
+            )
         )
 
-        background_tasks.add_task(
-            self._generate_metrics_and_insights,
-            language_code=language_code,
-            therapist_id=therapist_id,
-            patient_id=patient_id,
-            environment=environment,
-            session_id=session_id,
+        # Vector ids change when chunks are edited or re-dated, so we re-sync the session's mappings.
+        aws_db_client: AwsDbBaseClass = dependency_container.inject_aws_db_client()
+        await aws_db_client.replace_rows(
+            user_id=therapist_id,
             request=request,
+            table_name=VECTORS_SESSION_MAPPINGS_TABLE_NAME,
+            filters={
+                "session_report_id": session_notes_id
+            },
+            payloads=[
+                {
+                    "id": vector_id,
+                    "therapist_id": therapist_id,
+                    "patient_id": patient_id,
+                    "session_report_id": session_notes_id,
+                    "session_date": new_session_date,
+                }
+                for vector_id in vector_ids
+            ]
         )
 
-    async def _delete_vectors_and_generate_insights(
+    def _session_chunks_summarizer(
         self,
+        session_notes_id: str,
+        notes_text: str,
         therapist_id: str,
         patient_id: str,
-        session_date: date,
         session_id: str | None,
         language_code: str,
         environment: str,
-        background_tasks: BackgroundTasks,
         request: Request,
-    ):
-        dependency_container.inject_pinecone_client().delete_session_vectors(
-            user_id=therapist_id,
-            patient_id=patient_id,
-            date=session_date
-        )
+    ) -> Callable:
+        """
+        Returns the callable that summarizes a session's chunks during ingestion, and derives the
+        session's mini summary from the chunk summaries rather than from the full notes.
+        """
+        async def summarize_chunks(
+            chunk_texts: list[str],
+            openai_client: OpenAIBaseClass,
+            chunk_summaries: list[str | None] | None = None
+        ) -> list[str]:
+            # Chunks carried over from the previous version of the notes keep their summary.
+            chunk_summaries = list(chunk_summaries or [None] * len(chunk_texts))
+            missing_indexes = [index for index, chunk_summary in enumerate(chunk_summaries) if chunk_summary is None]
+            if len(missing_indexes) > 0:
+                fresh_chunk_summaries = await self.chartwise_assistant.summarize_chunks(
+                    chunk_texts=[chunk_texts[index] for index in missing_indexes],
+                    openai_client=openai_client
+                )
+                for index, chunk_summary in zip(missing_indexes, fresh_chunk_summaries):
+                    chunk_summaries[index] = chunk_summary
 
-        # Update patient metrics around last session date, and total session count AFTER
-        # session has already been deleted.
-        await self.update_patient_metrics_after_session_report_operation(
-            patient_id=patient_id,
+            # The mini summary gets stored before any vector is written, so that a failure leaves
+            # nothing to clean up on retry.
+            if len(notes_text) > 0 and len(chunk_summaries) > 0:
+                await self._update_session_notes_with_mini_summary(
+                    session_notes_id=session_notes_id,
+                    notes_text=notes_text,
+                    therapist_id=therapist_id,
+                    language_code=language_code,
+                    auth_manager=AuthManager(),
+                    session_id=session_id,
+                    environment=environment,
+                    background_tasks=BackgroundTasks(),
+                    request=request,
+                    patient_id=patient_id,
+                    chunk_summaries=chunk_summaries,
+                )
+            return chunk_summaries
+        return summarize_chunks
+
+    async def _sync_preexisting_history_vectors(
+        self,
+        therapist_id: str,
+        patient_id: str,
+        is_update: bool,
+        request: Request,
+    ):
+        patient = await self.retrieve_single_patient(
             therapist_id=therapist_id,
-            session_id=session_id,
-            environment=environment,
-            operation=SessionCrudOperation.DELETE_COMPLETED,
-            session_date=None,
+            patient_id=patient_id,
             request=request,
         )
+        pre_existing_history = patient.get('pre_existing_history') or ''
+        if not is_update and len(pre_existing_history) == 0:
+            return
 
-        background_tasks.add_task(
-            self._generate_metrics_and_insights,
-            language_code=language_code,
-            therapist_id=therapist_id,
+        pinecone_client = dependency_container.inject_pinecone_client()
+        sync_vectors = (
+            pinecone_client.update_preexisting_history_vectors if is_update
+            else pinecone_client.insert_preexisting_history_vectors
+        )
+        await sync_vectors(
+            user_id=therapist_id,
             patient_id=patient_id,
-            environment=environment,
-            session_id=session_id,
-            request=request,
+            text=pre_existing_history,
+            openai_client=dependency_container.inject_openai_client(),
+            summarize_chunk=self.chartwise_assistant.summarize_chunk
         )
 
     async def _generate_metrics_and_insights(
@@ -1440,35 +1766,46 @@ class AssistantManager:
         if environment != "testing":
             await asyncio.sleep(30)
 
-        # Update this patient's recent topics for future fetches.
-        await self.update_patient_recent_topics(
-            language_code=language_code,
-            therapist_id=therapist_id,
-            patient_id=patient_id,
-            environment=environment,
-            session_id=session_id,
-            request=request,
-        )
+        if self.chartwise_assistant.insight_generation_mode == InsightGenerationMode.COMBINED:
+            # Update this patient's recent topics, presession tray, and question suggestions in one go.
+            await self.update_patient_insights_in_one_call(
+                language_code=language_code,
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                environment=environment,
+                session_id=session_id,
+                request=request,
+            )
+        else:
+            # Update this patient's recent topics for future fetches.
+            await self.update_patient_recent_topics(
+                language_code=language_code,
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                environment=environment,
+                session_id=session_id,
+                request=request,
+            )
 
-        # Update this patient's presession tray for future fetches.
-        await self.update_presession_tray(
-            therapist_id=therapist_id,
-            patient_id=patient_id,
-            environment=environment,
-            session_id=session_id,
-            language_code=language_code,
-            request=request,
-        )
+            # Update this patient's presession tray for future fetches.
+            await self.update_presession_tray(
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                environment=environment,
+                session_id=session_id,
+                language_code=language_code,
+                request=request,
+            )
 
-        # Update this patient's question suggestions for future fetches.
-        await self.update_question_suggestions(
-            language_code=language_code,
-            therapist_id=therapist_id,
-            patient_id=patient_id,
-            environment=environment,
-            session_id=session_id,
-            request=request,
-        )
+            # Update this patient's question suggestions for future fetches.
+            await self.update_question_suggestions(
+                language_code=language_code,
+                therapist_id=therapist_id,
+                patient_id=patient_id,
+                environment=environment,
+                session_id=session_id,
+                request=request,
+            )
 
         # Update attendance insights
         await self.generate_attendance_insights(
@@ -1665,6 +2002,148 @@ class AssistantManager:
             dependency_container.inject_resend_client().send_internal_alert(alert=eng_alert)
             raise RuntimeError(e) from e
 
+    async def _insight_output_is_fresh(
+        self,
+        generator: InsightGenerator,
+        table_name: str,
+        therapist_id: str,
+        patient_id: str,
+        input_fingerprint: str,
+        request: Request,
+    ) -> bool:
+        """
+        Returns whether the stored output for a generator was produced from the same inputs,
+        in which case regenerating it would be a wasted LLM call. Records the outcome either way.
+        """
+        aws_db_client: AwsDbBaseClass = dependency_container.inject_aws_db_client()
+        stored_output = await aws_db_client.select(
+            user_id=therapist_id,
+            request=request,
+            fields=["input_fingerprint"],
+            table_name=table_name,
+            filters={
+                "patient_id": patient_id
+            },
+            limit=1
+        )
+        is_fresh = (
+            len(stored_output) > 0
+            and stored_output[0].get("input_fingerprint") == input_fingerprint
+        )
+        self.chartwise_assistant.record_insight_generation(
+            generator=generator,
+            skipped=is_fresh
+        )
+        return is_fresh
+
+    def _insight_prompt_inputs(
+        self,
+        generator: InsightGenerator,
+        language_code: str,
+        patient_data: dict,
+        therapist_data: dict | None = None,
+    ) -> dict:
+        """
+        Returns the prompt inputs that go into a generator's input fingerprint, so that the fingerprint
+        is the same regardless of whether the output gets generated on its own or combined with others.
+        """
+        patient_full_name = " ".join([patient_data['first_name'], patient_data['last_name']])
+        if generator == InsightGenerator.QUESTION_SUGGESTIONS:
+            return {
+                "language_code": language_code,
+                "patient_name": patient_full_name,
+                "patient_gender": patient_data['gender'],
+                "pre_existing_history": patient_data['pre_existing_history'],
+            }
+        if generator == InsightGenerator.PRESESSION_BRIEFING:
+            assert therapist_data is not None, "Missing therapist data for the presession briefing"
+            return {
+                "language_code": therapist_data['language_preference'],
+                "patient_name": patient_data['first_name'],
+                "patient_gender": patient_data['gender'],
+                "therapist_name": therapist_data['first_name'],
+                "therapist_gender": therapist_data['gender'],
+                "session_count": patient_data['total_sessions'],
+                "pre_existing_history": patient_data['pre_existing_history'],
+            }
+        if generator == InsightGenerator.RECENT_TOPICS:
+            return {
+                "language_code": language_code,
+                "patient_name": patient_full_name,
+                "patient_gender": patient_data['gender'],
+            }
+        raise Exception(f"Untracked prompt inputs for generator {generator.value}")
+
+    async def _store_question_suggestions(
+        self,
+        therapist_id: str,
+        patient_id: str,
+        question_suggestions: ListQuestionSuggestionsSchema,
+        input_fingerprint: str,
+        request: Request,
+    ):
+        questions_json = question_suggestions.model_dump_json()
+        await dependency_container.inject_aws_db_client().upsert(
+            user_id=therapist_id,
+            request=request,
+            payload={
+                "patient_id": patient_id,
+                "last_updated": datetime.now(),
+                "therapist_id": therapist_id,
+                "questions": eval(questions_json),
+                "input_fingerprint": input_fingerprint,
+            },
+            table_name=ENCRYPTED_PATIENT_QUESTION_SUGGESTIONS_TABLE_NAME,
+            conflict_columns=["patient_id"],
+        )
+
+    async def _store_presession_briefing(
+        self,
+        therapist_id: str,
+        patient_id: str,
+        briefing: str,
+        input_fingerprint: str,
+        request: Request,
+    ):
+        await dependency_container.inject_aws_db_client().upsert(
+            user_id=therapist_id,
+            request=request,
+            payload={
+                "last_updated": datetime.now(),
+                "patient_id": patient_id,
+                "therapist_id": therapist_id,
+                "briefing": briefing,
+                "input_fingerprint": input_fingerprint,
+            },
+            conflict_columns=["patient_id"],
+            table_name=ENCRYPTED_PATIENT_BRIEFINGS_TABLE_NAME
+        )
+
+    async def _store_recent_topics(
+        self,
+        therapist_id: str,
+        patient_id: str,
+        recent_topics: ListRecentTopicsSchema,
+        topics_insights: str,
+        input_fingerprint: str,
+        request: Request,
+    ):
+        recent_topics_json = recent_topics.model_dump_json()
+        await dependency_container.inject_aws_db_client().upsert(
+            user_id=therapist_id,
+            request=request,
+            payload={
+                "last_updated": datetime.now(),
+                "insights": topics_insights,
+                "patient_id": patient_id,
+                "therapist_id": therapist_id,
+                "topics": eval(recent_topics_json),
+                "input_fingerprint": input_fingerprint,
+            },
+            conflict_columns=["patient_id"],
+            table_name=ENCRYPTED_PATIENT_TOPICS_TABLE_NAME
+        )
+
     async def _update_session_notes_with_mini_summary(
         self,
         session_notes_id: str,
@@ -1677,11 +2156,13 @@ class AssistantManager:
         background_tasks: BackgroundTasks,
         request: Request,
         patient_id: str,
+        chunk_summaries: list[str] | None = None,
     ):
         try:
             mini_summary = await self.chartwise_assistant.create_session_mini_summary(
                 session_notes=notes_text,
                 language_code=language_code,
+                chunk_summaries=chunk_summaries,
             )
 
             await self.update_session(
@@ -1731,6 +2212,7 @@ class AssistantManager:
                     "is_soft_deleted": False,
                 },
                 order_by=("session_date", "desc"),
+                read_routing=DbReadRouting.AUTO,
             )
             return [] if len(session_reports_data) == 0 else session_reports_data
         except Exception as e:
@@ -1764,6 +2246,7 @@ class AssistantManager:
                 },
                 order_by=("session_date", "desc"),
                 table_name=ENCRYPTED_SESSION_REPORTS_TABLE_NAME,
+                read_routing=DbReadRouting.AUTO,
             )
 
             if len(response_data) == 0:
@@ -1833,7 +2316,8 @@ class AssistantManager:
                 },
                 table_name=ENCRYPTED_SESSION_REPORTS_TABLE_NAME,
                 limit=most_recent_n,
-                order_by=("session_date", "desc")
+                order_by=("session_date", "desc"),
+                read_routing=DbReadRouting.AUTO,
             )
             return [] if len(session_reports_data) == 0 else session_reports_data
         except Exception as e:
@@ -2,23 +2,23 @@ import os
 
 from datetime import date
 from fastapi import BackgroundTasks, Request
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from tiktoken import Encoding, get_encoding
 
 from .media_processing_manager import MediaProcessingManager
+from ..data_processing import celery
 from ..data_processing.diarization_cleaner import DiarizationCleaner
 from ..dependencies.api.templates import SessionNotesTemplate
 from ..dependencies.dependency_container import AwsDbBaseClass, AwsS3BaseClass, dependency_container
+from ..internal.db.patient_metrics import PatientMetricsDelta
 from ..internal.schemas import (
     MediaType,
     SessionProcessingStatus,
-    ENCRYPTED_PATIENTS_TABLE_NAME,
     ENCRYPTED_SESSION_REPORTS_TABLE_NAME
 )
 from ..managers.assistant_manager import AssistantManager, SessionNotesSource
 from ..managers.auth_manager import AuthManager
-from ..vectors import data_cleaner
 from ..vectors.chartwise_assistant import PromptCrafter, PromptScenario
+from ..vectors.text_chunker import TextChunker
+from ..vectors.tokenizer import Tokenizer
 
 class AudioProcessingManager(MediaProcessingManager):
 
@@ -55,61 +55,38 @@ class AudioProcessingManager(MediaProcessingManager):
                     "patient_id": patient_id,
                     "source": source,
                     "processing_status": SessionProcessingStatus.PROCESSING.value
-                }
+                },
+                patient_metrics_delta=PatientMetricsDelta.for_inserted_session(session_date)
             )
             assert type(session_report_creation_response) == dict and (0 != len(session_report_creation_response)), "Something went wrong when inserting the session."
             session_report_id = session_report_creation_response['id']
 
-            aws_s3_client: AwsS3BaseClass = dependency_container.inject_aws_s3_client()
-            audio_file_url_dict: dict = aws_s3_client.get_audio_file_read_signed_url(
-                file_path=file_path,
-                bucket_name=os.environ.get("SESSION_AUDIO_FILES_PROCESSING_BUCKET_NAME")
-            )
-            audio_file_url = audio_file_url_dict.get("url")
-            assert audio_file_url is not None, "Received empty audio file URL"
-
-            # Attempt immediate processing.
+            # Hand the recording off to the audio workers.
+            task_arguments = {
+                "session_report_id": session_report_id,
+                "environment": environment,
+                "therapist_id": therapist_id,
+                "language_code": language_code,
+                "session_id": session_id,
+                "template": template.value,
+                "storage_filepath": file_path,
+            }
             if diarize:
-                background_tasks.add_task(
-                    self._diarize_audio_and_save,
-                    session_report_id=session_report_id,
-                    environment=environment,
+                await self._enqueue_media_task(
+                    task=celery.MediaTask.DIARIZE_AUDIO,
+                    job=self.diarize_audio_and_save,
+                    task_arguments=task_arguments,
                     background_tasks=background_tasks,
-                    auth_manager=auth_manager,
-                    assistant_manager=assistant_manager,
-                    therapist_id=therapist_id,
-                    patient_id=patient_id,
-                    language_code=language_code,
-                    session_id=session_id,
-                    template=template,
-                    storage_filepath=file_path,
-                    audio_file_url=audio_file_url,
                     request=request,
                 )
             else:
-                background_tasks.add_task(
-                    self._transcribe_audio_and_save,
-                        session_report_id=session_report_id,
-                        environment=environment,
-                        background_tasks=background_tasks,
-                        auth_manager=auth_manager,
-                        assistant_manager=assistant_manager,
-                        therapist_id=therapist_id,
-                        language_code=language_code,
-                        session_id=session_id,
-                        template=template,
-                        storage_filepath=file_path,
-                        audio_file_url=audio_file_url,
-                        request=request,
-                    )
-
-            background_tasks.add_task(
-                self._update_patient_metrics_after_processing_transcription_session,
-                request=request,
-                patient_id=patient_id,
-                session_date=session_date,
-                therapist_id=therapist_id,
-            )
+                await self._enqueue_media_task(
+                    task=celery.MediaTask.TRANSCRIBE_AUDIO,
+                    job=self.transcribe_audio_and_save,
+                    task_arguments=task_arguments,
+                    background_tasks=background_tasks,
+                    request=request,
+                )
 
             return session_report_id
         except Exception as e:
@@ -129,25 +106,38 @@ class AudioProcessingManager(MediaProcessingManager):
                 )
             raise RuntimeError(e) from e
 
-    # Private
-
-    async def _diarize_audio_and_save(
+    async def diarize_audio_and_save(
         self,
         session_report_id: str,
         environment: str,
-        background_tasks: BackgroundTasks,
-        auth_manager: AuthManager,
-        assistant_manager: AssistantManager,
         therapist_id: str,
-        patient_id: str,
         language_code: str,
         session_id: str | None,
-        template: SessionNotesTemplate,
+        template: str,
         storage_filepath: str,
-        audio_file_url: str,
+        background_tasks: BackgroundTasks,
         request: Request
     ):
+        """
+        Diarizes an uploaded session recording, and saves its diarization and summary to the session report.
+        Runs on the audio workers (or in-process, in eager mode).
+
+        Arguments:
+        session_report_id – the id of the session report being processed.
+        environment – the current environment.
+        therapist_id – the therapist id.
+        language_code – the language code to be used for generating dynamic content.
+        session_id – the current session id.
+        template – the value of the template to be used for the session notes.
+        storage_filepath – the storage filepath where the recording is stored in S3.
+        background_tasks – the object to schedule concurrent tasks.
+        request – the upstream (or worker) Request object.
+        """
+        assistant_manager = AssistantManager()
+        auth_manager = AuthManager()
         try:
+            notes_template = SessionNotesTemplate(template)
+            audio_file_url = await self._audio_file_url(storage_filepath)
             diarization = await dependency_container.inject_deepgram_client().diarize_audio(audio_file_url=audio_file_url)
             update_body = {
                 "id": session_report_id,
@@ -190,8 +180,12 @@ class AudioProcessingManager(MediaProcessingManager):
                 scenario=PromptScenario.DIARIZATION_SUMMARY,
                 language_code=language_code
             )
-            encoding = get_encoding("o200k_base")
-            prompt_tokens = len(encoding.encode(f"{system_prompt}\n{user_prompt}"))
+            tokenizer = Tokenizer.shared()
+            prompt_tokens = tokenizer.count_prompt_tokens(
+                prompt=system_prompt,
+                scenario=PromptScenario.DIARIZATION_SUMMARY,
+                language_code=language_code
+            ) + tokenizer.count_tokens(user_prompt) + 1
 
             openai_client = dependency_container.inject_openai_client()
             max_tokens = openai_client.GPT_4O_MINI_MAX_OUTPUT_TOKENS - prompt_tokens
@@ -199,7 +193,7 @@ class AudioProcessingManager(MediaProcessingManager):
             if max_tokens < 0:
                 # Need to chunk diarization and generate summary of the union of all chunks.
                 session_summary = await self._chunk_diarization_and_summarize(
-                    encoding=encoding,
+                    tokenizer=tokenizer,
                     diarization=diarization,
                     prompt_crafter=prompt_crafter,
                     summarize_chunk_system_prompt=system_prompt,
@@ -212,10 +206,11 @@ class AudioProcessingManager(MediaProcessingManager):
                         {"role": "system", "content": system_prompt},
                         {"role": "user", "content": user_prompt},
                     ],
+                    prompt_scenario=PromptScenario.DIARIZATION_SUMMARY,
                 )
 
             assert type(session_summary) == str, "Unexpected data type for session summary"
-            if template == SessionNotesTemplate.SOAP:
+            if notes_template == SessionNotesTemplate.SOAP:
                 session_summary = await assistant_manager.adapt_session_notes_to_soap(
                     session_notes_text=session_summary,
                 )
@@ -266,24 +261,39 @@ class AudioProcessingManager(MediaProcessingManager):
             )
             raise RuntimeError(e) from e
 
-    async def _transcribe_audio_and_save(
+    async def transcribe_audio_and_save(
         self,
         session_report_id: str,
         environment: str,
-        background_tasks: BackgroundTasks,
-        auth_manager: AuthManager,
-        assistant_manager: AssistantManager,
         therapist_id: str,
         language_code: str,
         session_id: str | None,
-        template: SessionNotesTemplate,
+        template: str,
         storage_filepath: str,
-        audio_file_url: str,
+        background_tasks: BackgroundTasks,
         request: Request
     ):
+        """
+        Transcribes an uploaded notes recording, and saves the transcription to the session report.
+        Runs on the audio workers (or in-process, in eager mode).
+
+        Arguments:
+        session_report_id – the id of the session report being processed.
+        environment – the current environment.
+        therapist_id – the therapist id.
+        language_code – the language code to be used for generating dynamic content.
+        session_id – the current session id.
+        template – the value of the template to be used for the session notes.
+        storage_filepath – the storage filepath where the recording is stored in S3.
+        background_tasks – the object to schedule concurrent tasks.
+        request – the upstream (or worker) Request object.
+        """
+        assistant_manager = AssistantManager()
+        auth_manager = AuthManager()
         try:
+            audio_file_url = await self._audio_file_url(storage_filepath)
             transcription = await dependency_container.inject_deepgram_client().transcribe_audio(audio_file_url=audio_file_url)
-            if template == SessionNotesTemplate.SOAP:
+            if SessionNotesTemplate(template) == SessionNotesTemplate.SOAP:
                 transcription = await assistant_manager.adapt_session_notes_to_soap(
                     session_notes_text=transcription,
                 )
@@ -334,91 +344,48 @@ class AudioProcessingManager(MediaProcessingManager):
             )
             raise RuntimeError(e) from e
 
-    async def _update_patient_metrics_after_processing_transcription_session(
-        self,
-        request: Request,
-        patient_id: str,
-        session_date: date,
-        therapist_id: str
-    ):
-        try:
-            # Fetch last session date
-            aws_db_client: AwsDbBaseClass = dependency_container.inject_aws_db_client()
-            patient_query_data = await aws_db_client.select(
-                user_id=therapist_id,
-                request=request,
-                fields=["*"],
-                filters={
-                    'id': patient_id
-                },
-                table_name=ENCRYPTED_PATIENTS_TABLE_NAME
-            )
-            assert (0 != len(patient_query_data)), "Did not find any data for the patient"
-
-            # Determine the updated value for last_session_date depending on if the patient
-            # has met with the therapist before or not.
-            patient_last_session_date = patient_query_data[0]['last_session_date']
-            if patient_last_session_date is None:
-                patient_last_session_date = session_date
-            else:
-                # Determine most recent date between `patient_last_session_date` and `session_date`.
-                patient_last_session_date = max(patient_last_session_date, session_date)
-
-            # Fetch total sessions count
-            session_reports_query = await aws_db_client.select(
-                user_id=therapist_id,
-                request=request,
-                fields=["id"],
-                filters={
-                    'patient_id': patient_id,
-                    'is_soft_deleted': False,
-                },
-                table_name=ENCRYPTED_SESSION_REPORTS_TABLE_NAME
-            )
-            total_sessions_count = len(session_reports_query)
+    # Private
 
-            await aws_db_client.update(
-                user_id=therapist_id,
-                request=request,
-                table_name=ENCRYPTED_PATIENTS_TABLE_NAME,
-                payload={
-                    "last_session_date": patient_last_session_date,
-                    "total_sessions": total_sessions_count,
-                },
-                filters={
-                    'id': patient_id
-                }
-            )
-        except Exception as e:
-            raise RuntimeError(e) from e
+    async def _audio_file_url(
+        self,
+        storage_filepath: str
+    ) -> str:
+        # Signed when the job runs, since it may have waited in the queue for longer than a URL lives.
+        aws_s3_client: AwsS3BaseClass = dependency_container.inject_aws_s3_client()
+        audio_file_url_dict: dict = await aws_s3_client.get_audio_file_read_signed_url(
+            file_path=storage_filepath,
+            bucket_name=os.environ.get("SESSION_AUDIO_FILES_PROCESSING_BUCKET_NAME")
+        )
+        audio_file_url = audio_file_url_dict.get("url")
+        assert audio_file_url is not None, "Received empty audio file URL"
+        return audio_file_url
 
     async def _chunk_diarization_and_summarize(
         self,
-        encoding: Encoding,
+        tokenizer: Tokenizer,
         diarization: list | None,
         prompt_crafter: PromptCrafter,
         summarize_chunk_system_prompt: str,
         language_code: str,
     ) -> str:
         try:
-            splitter = RecursiveCharacterTextSplitter(
-                separators=["\n\n", "\n", " ", ""],
-                chunk_size=256,
-                chunk_overlap=25,
-                length_function=lambda text: len(encoding.encode(text)),
-            )
-
+            chunker = TextChunker(tokenizer=tokenizer)
             chunk_summaries = []
             flattened_diarization = DiarizationCleaner.flatten_diarization(diarization or [])
-            chunks = splitter.split_text(flattened_diarization)
-            for chunk in chunks:
-                current_chunk_text = data_cleaner.clean_up_text(chunk)
-                user_prompt = prompt_crafter.get_user_message_for_scenario(
+            user_prompts = [
+                prompt_crafter.get_user_message_for_scenario(
                     scenario=PromptScenario.DIARIZATION_SUMMARY,
-                    diarization=current_chunk_text
+                    diarization=chunk
                 )
-
-                prompt_tokens = len(encoding.encode(f"{summarize_chunk_system_prompt}\n{user_prompt}"))
+                for chunk in chunker.split_text(flattened_diarization)
+            ]
+            system_prompt_tokens = tokenizer.count_prompt_tokens(
+                prompt=summarize_chunk_system_prompt,
+                scenario=PromptScenario.DIARIZATION_SUMMARY,
+                language_code=language_code
+            )
+            for user_prompt, user_prompt_tokens in zip(user_prompts, tokenizer.count_tokens_batch(user_prompts)):
+                prompt_tokens = system_prompt_tokens + user_prompt_tokens + 1
 
                 openai_client = dependency_container.inject_openai_client()
                 max_tokens = openai_client.GPT_4O_MINI_MAX_OUTPUT_TOKENS - prompt_tokens
@@ -428,6 +395,7 @@ class AudioProcessingManager(MediaProcessingManager):
                         {"role": "system", "content": summarize_chunk_system_prompt},
                         {"role": "user", "content": user_prompt},
                     ],
+                    prompt_scenario=PromptScenario.DIARIZATION_SUMMARY,
                 )
                 chunk_summaries.append(current_chunk_summary)
 
@@ -441,7 +409,11 @@ class AudioProcessingManager(MediaProcessingManager):
                 scenario=PromptScenario.DIARIZATION_CHUNKS_GRAND_SUMMARY,
                 diarization=grand_summary_raw
             )
-            prompt_tokens = len(encoding.encode(f"{summarize_chunk_system_prompt}\n{user_prompt}"))
+            prompt_tokens = tokenizer.count_prompt_tokens(
+                prompt=grand_summary_system_prompt,
+                scenario=PromptScenario.DIARIZATION_CHUNKS_GRAND_SUMMARY,
+                language_code=language_code
+            ) + tokenizer.count_tokens(grand_summary_user_prompt) + 1
             max_tokens = openai_client.GPT_4O_MINI_MAX_OUTPUT_TOKENS - prompt_tokens
 
             grand_summary = await openai_client.trigger_async_chat_completion(
@@ -450,6 +422,7 @@ class AudioProcessingManager(MediaProcessingManager):
                     {"role": "system", "content": grand_summary_system_prompt},
                     {"role": "user", "content": grand_summary_user_prompt},
                 ],
+                prompt_scenario=PromptScenario.DIARIZATION_CHUNKS_GRAND_SUMMARY,
             )
 
             assert type(grand_summary) == str, "Unexpected data type for grand summary"
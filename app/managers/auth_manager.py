@@ -22,17 +22,24 @@ class AuthManager:
     ACCESS_TOKEN_EXPIRE_MINUTES = 120
 
     def __init__(self):
-        secret_manager = dependency_container.inject_aws_secret_manager_client()
-        secret_id = os.environ.get("SESSION_TOKEN_JWT_SECRET_NAME")
-        assert secret_id is not None, "Nullable JWT Secret, secret name"
-        secret_data = secret_manager.get_secret(
-            secret_id=secret_id,
+        self._secret_id = os.environ.get("SESSION_TOKEN_JWT_SECRET_NAME")
+        assert self._secret_id is not None, "Nullable JWT Secret, secret name"
+
+        # Warm up the (process-wide) secrets cache.
+        assert self.secret_key is not None, "Nullable JWT Secret"
+        self._pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        logging.getLogger('passlib').setLevel(logging.ERROR)
+
+    @property
+    def secret_key(self) -> str | None:
+        # Read through the secrets cache on every use so that rotations are picked up. This runs on the
+        # event loop, so expired values are served while they get refreshed in the background.
+        secret_data = dependency_container.inject_aws_secret_manager_client().get_cached_secret(
+            secret_id=self._secret_id,
             resend_client=dependency_container.inject_resend_client(),
         )
         assert type(secret_data) == dict, "Unexpected data type"
-        self.secret_key = secret_data.get('secret')
-        self._pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        logging.getLogger('passlib').setLevel(logging.ERROR)
+        return secret_data.get('secret')
 
     # Authentication
 
@@ -91,11 +98,16 @@ class AuthManager:
         access_token: str,
     ) -> dict:
         try:
-            payload = jwt.decode(
-                jwt=access_token,
-                key=self.secret_key,
-                algorithms=[type(self).ALGORITHM]
-            )
+            try:
+                payload = jwt.decode(
+                    jwt=access_token,
+                    key=self.secret_key,
+                    algorithms=[type(self).ALGORITHM]
+                )
+            except jwt.InvalidSignatureError:
+                # The secret may have been rotated since we cached it, so have the next read refresh it.
+                dependency_container.inject_aws_secret_manager_client().invalidate_secret(self._secret_id)
+                raise
             exp: float = payload.get("exp")
             user_id: str = payload.get("sub")
 
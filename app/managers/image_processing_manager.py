@@ -12,9 +12,11 @@ from fastapi import (
 from typing import Tuple
 
 from .media_processing_manager import MediaProcessingManager
+from ..data_processing import celery
 from ..dependencies.api.templates import SessionNotesTemplate
 from ..dependencies.dependency_container import AwsDbBaseClass, dependency_container
 from ..internal.alerting.internal_alert import MediaJobProcessingAlert
+from ..internal.db.patient_metrics import PatientMetricsDelta
 from ..internal.schemas import (MediaType,
                                 SessionProcessingStatus,
                                 ENCRYPTED_SESSION_REPORTS_TABLE_NAME)
@@ -54,6 +56,10 @@ class ImageProcessingManager(MediaProcessingManager):
                 image_filename=image_filename,
             )
 
+            parsed_session_date = datetime.strptime(
+                session_date,
+                datetime_handler.DATE_FORMAT
+            ).date()
             aws_db_client: AwsDbBaseClass = dependency_container.inject_aws_db_client()
             insert_result = await aws_db_client.insert(
                 user_id=therapist_id,
@@ -62,15 +68,13 @@ class ImageProcessingManager(MediaProcessingManager):
                 payload={
                     "textraction_job_id": doc_id,
                     "template": template.value,
-                    "session_date": datetime.strptime(
-                        session_date,
-                        datetime_handler.DATE_FORMAT
-                    ).date(),
+                    "session_date": parsed_session_date,
                     "therapist_id": therapist_id,
                     "patient_id": patient_id,
                     "processing_status": SessionProcessingStatus.PROCESSING.value,
                     "source": SessionNotesSource.NOTES_IMAGE.value,
-                }
+                },
+                patient_metrics_delta=PatientMetricsDelta.for_inserted_session(parsed_session_date)
             )
             assert type(insert_result) == dict, "Unexpected data type"
             session_notes_id = insert_result['id']
@@ -82,9 +86,10 @@ class ImageProcessingManager(MediaProcessingManager):
             await file_copiers.clean_up_files(files_to_clean)
             raise RuntimeError from e
 
-    async def process_textraction(
+    async def enqueue_textraction(
         self,
         document_id: str,
+        session_notes_id: str,
         environment: str,
         language_code: str,
         therapist_id: str,
@@ -93,7 +98,77 @@ class ImageProcessingManager(MediaProcessingManager):
         assistant_manager: AssistantManager,
         request: Request,
         session_id: str | None,
+    ):
+        """
+        Hands an uploaded image's textraction job off to the image workers.
+
+        Arguments:
+        document_id – the id of the textraction job.
+        session_notes_id – the id of the session report awaiting the textraction.
+        environment – the current environment.
+        language_code – the language code to be used for generating dynamic content.
+        therapist_id – the therapist id.
+        background_tasks – the object to schedule concurrent tasks.
+        auth_manager – the auth manager to leverage internally.
+        assistant_manager – the assistant manager to leverage internally.
+        request – the upstream Request object.
+        session_id – the current session id.
+        """
+        try:
+            await self._enqueue_media_task(
+                task=celery.MediaTask.PROCESS_TEXTRACTION,
+                job=self.process_textraction,
+                task_arguments={
+                    "document_id": document_id,
+                    "environment": environment,
+                    "language_code": language_code,
+                    "therapist_id": therapist_id,
+                    "session_id": session_id,
+                },
+                background_tasks=background_tasks,
+                request=request,
+            )
+        except Exception as e:
+            await self._update_session_processing_status(
+                assistant_manager=assistant_manager,
+                language_code=language_code,
+                environment=environment,
+                background_tasks=background_tasks,
+                auth_manager=auth_manager,
+                session_id=session_id,
+                therapist_id=therapist_id,
+                session_processing_status=SessionProcessingStatus.FAILED.value,
+                session_notes_id=session_notes_id,
+                media_type=MediaType.IMAGE,
+                request=request,
+            )
+            raise RuntimeError(e) from e
+
+    async def process_textraction(
+        self,
+        document_id: str,
+        environment: str,
+        language_code: str,
+        therapist_id: str,
+        background_tasks: BackgroundTasks,
+        request: Request,
+        session_id: str | None,
     ) -> str:
+        """
+        Retrieves a textraction, and saves it to its session report.
+        Runs on the image workers (or in-process, in eager mode).
+
+        Arguments:
+        document_id – the id of the textraction job.
+        environment – the current environment.
+        language_code – the language code to be used for generating dynamic content.
+        therapist_id – the therapist id.
+        background_tasks – the object to schedule concurrent tasks.
+        request – the upstream (or worker) Request object.
+        session_id – the current session id.
+        """
+        assistant_manager = AssistantManager()
+        auth_manager = AuthManager()
         try:
             session_notes_id = None
 
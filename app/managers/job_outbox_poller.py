@@ -0,0 +1,56 @@
+import asyncio
+
+from fastapi import FastAPI
+
+from .assistant_manager import AssistantManager
+from ..internal.utilities.general_utilities import worker_request
+from ..internal.utilities.job_scheduler import JobPool, JobScheduler
+
+class JobOutboxPoller:
+    """
+    Drains the job outbox periodically, for the jobs that didn't run right after their request
+    (i.e. retries waiting on their backoff, or jobs left behind by a deploy or a crash).
+
+    Arguments:
+    app – the app whose database pool holds the outbox.
+    """
+    POLL_INTERVAL_SECONDS = 10
+
+    def __init__(
+        self,
+        app: FastAPI
+    ):
+        self._app = app
+        self._assistant_manager = AssistantManager()
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._poll())
+
+    async def stop(self):
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    # Private
+
+    async def _poll(self):
+        cls = type(self)
+        while True:
+            try:
+                await JobScheduler.shared().run(
+                    JobPool.INGESTION,
+                    self._assistant_manager.process_outbox_jobs,
+                    request=worker_request(self._app)
+                )
+            except Exception as e:
+                print(f"[JobOutboxPoller] Failed to drain the job outbox: {e}")
+            await asyncio.sleep(cls.POLL_INTERVAL_SECONDS)
+
@@ -1,17 +1,58 @@
-import os
+import asyncio, os
 
 from abc import ABC
 from fastapi import BackgroundTasks, Request
+from typing import Awaitable, Callable
 
 from .assistant_manager import AssistantManager
 from .auth_manager import AuthManager
+from ..data_processing import celery
 from ..dependencies.api.aws_s3_base_class import AwsS3BaseClass
 from ..dependencies.dependency_container import dependency_container
 from ..internal.alerting.internal_alert import MediaJobProcessingAlert
 from ..internal.schemas import MediaType, SessionProcessingStatus
+from ..internal.utilities.job_scheduler import JobPool, JobScheduler
 
 class MediaProcessingManager(ABC):
 
+    async def _enqueue_media_task(
+        self,
+        task: celery.MediaTask,
+        job: Callable[..., Awaitable],
+        task_arguments: dict,
+        background_tasks: BackgroundTasks,
+        request: Request
+    ):
+        """
+        Hands a media processing job off to its worker queue.
+        In eager mode the job runs in-process instead (in the scheduler's media pool), once the response has been sent.
+
+        Arguments:
+        task – the task running the job on workers.
+        job – the manager method running the job, which the task calls with the same arguments.
+        task_arguments – the (JSON-serializable) keyword arguments of the job.
+        background_tasks – the object to schedule concurrent tasks.
+        request – the upstream Request object.
+        """
+        if celery.is_eager():
+            background_tasks.add_task(
+                JobScheduler.shared().run,
+                JobPool.MEDIA,
+                job,
+                background_tasks=background_tasks,
+                request=request,
+                **task_arguments
+            )
+            return
+
+        # Publishing blocks on the broker.
+        task_id = await asyncio.to_thread(
+            celery.enqueue_media_task,
+            task=task,
+            task_arguments=task_arguments
+        )
+        print(f"[MediaProcessingManager] Enqueued {task.value} as {task_id}")
+
     async def _update_session_processing_status(
         self,
         assistant_manager: AssistantManager,
@@ -78,7 +119,7 @@ class MediaProcessingManager(ABC):
             assert bucket_name is not None, "Nullable bucket name"
             assert storage_filepath is not None, "Nullable storage filepath"
 
-            aws_s3_client.delete_file(
+            await aws_s3_client.delete_file(
                 bucket_name,
                 storage_filepath=storage_filepath
             )
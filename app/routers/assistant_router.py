@@ -1429,7 +1429,7 @@ class AssistantRouter:
 
             # Delete all vector data for the patient, since it's not necessary to keep around
             # when we already have our soft-deleted records in Postgres.
-            self._assistant_manager.delete_all_vector_data_for_single_patient(
+            await self._assistant_manager.delete_all_vector_data_for_single_patient(
                 therapist_id=user_id,
                 patient_id=patient_id
             )
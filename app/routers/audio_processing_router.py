@@ -451,7 +451,7 @@ class AudioProcessingRouter:
             )
 
             storage_client: AwsS3BaseClass = dependency_container.inject_aws_s3_client()
-            file_upload_data = storage_client.initiate_multipart_audio_file_upload(
+            file_upload_data = await storage_client.initiate_multipart_audio_file_upload(
                 file_path=file_path,
                 bucket_name=os.environ.get("SESSION_AUDIO_FILES_PROCESSING_BUCKET_NAME")
             )
@@ -550,7 +550,7 @@ class AudioProcessingRouter:
 
         try:
             storage_client: AwsS3BaseClass = dependency_container.inject_aws_s3_client()
-            url = storage_client.retrieve_presigned_url_for_multipart_upload(
+            url = await storage_client.retrieve_presigned_url_for_multipart_upload(
                 file_path=file_path,
                 bucket_name=os.environ.get("SESSION_AUDIO_FILES_PROCESSING_BUCKET_NAME"),
                 upload_id=upload_id,
@@ -654,7 +654,7 @@ class AudioProcessingRouter:
 
         try:
             storage_client: AwsS3BaseClass = dependency_container.inject_aws_s3_client()
-            storage_client.complete_multipart_audio_file_upload(
+            await storage_client.complete_multipart_audio_file_upload(
                 file_path=file_path,
                 upload_id=upload_id,
                 parts=parts,
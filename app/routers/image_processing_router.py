@@ -194,11 +194,21 @@ class ImageProcessingRouter:
                 request=request,
             )
             request.state.session_report_id = session_report_id
-            background_tasks.add_task(
-                self._process_textraction,
-                job_id=job_id,
+            aws_db_client: AwsDbBaseClass = dependency_container.inject_aws_db_client()
+            language_code = await general_utilities.get_user_language_code(
+                user_id=user_id,
+                aws_db_client=aws_db_client,
+                request=request,
+            )
+            await self._image_processing_manager.enqueue_textraction(
+                document_id=job_id,
+                session_notes_id=session_report_id,
+                environment=self._environment,
+                language_code=language_code,
                 therapist_id=user_id,
                 background_tasks=background_tasks,
+                auth_manager=self._auth_manager,
+                assistant_manager=self._assistant_manager,
                 request=request,
                 session_id=session_id,
             )
@@ -223,39 +233,3 @@ class ImageProcessingRouter:
                 status_code=status_code,
                 detail=description
             )
-
-    async def _process_textraction(
-        self,
-        job_id: str,
-        therapist_id: str,
-        background_tasks: BackgroundTasks,
-        request: Request,
-        session_id: str | None,
-    ):
-        """
-        Processes the textraction job in the background after the image has been uploaded.
-
-        Arguments:
-        job_id – the ID of the textraction job.
-        therapist_id – the ID of the therapist who initiated the textraction.
-        session_id – the session ID for tracking.
-        background_tasks – the background tasks manager for scheduling concurrent tasks.
-        aws_db_client – the AWS database client for database operations.
-        """
-        aws_db_client: AwsDbBaseClass = dependency_container.inject_aws_db_client()
-        language_code = await general_utilities.get_user_language_code(
-            user_id=therapist_id,
-            aws_db_client=aws_db_client,
-            request=request,
-        )
-        await self._image_processing_manager.process_textraction(
-            document_id=job_id,
-            session_id=session_id,
-            environment=self._environment,
-            language_code=language_code,
-            therapist_id=therapist_id,
-            background_tasks=background_tasks,
-            auth_manager=self._auth_manager,
-            assistant_manager=self._assistant_manager,
-            request=request,
-        )
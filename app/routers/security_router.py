@@ -26,6 +26,7 @@ from ..internal.schemas import (
     USER_ID_KEY,
 )
 from ..internal.utilities import datetime_handler, general_utilities
+from ..internal.utilities.job_scheduler import JobPool, JobScheduler
 from ..internal.utilities.route_verification import get_user_info
 from ..managers.assistant_manager import AssistantManager
 from ..managers.auth_manager import AuthManager
@@ -323,7 +324,11 @@ class SecurityRouter:
         """
         request.state.session_id = session_id
         self._auth_manager.logout(response)
-        background_tasks.add_task(dependency_container.inject_openai_client().clear_chat_history)
+        background_tasks.add_task(
+            JobScheduler.shared().run,
+            JobPool.MAINTENANCE,
+            dependency_container.inject_openai_client().clear_chat_history
+        )
         return {}
 
     async def _retrieve_therapist_internal(
@@ -721,7 +726,7 @@ class SecurityRouter:
             if len(patient_ids) > 0:
                 # Delete all vector data for the patients, since it's not necessary to keep around
                 # when we already have our soft-deleted records in Postgres.
-                self._assistant_manager.delete_all_vector_data_for_patients(
+                await self._assistant_manager.delete_all_vector_data_for_patients(
                     user_id=user_id,
                     patient_ids=patient_ids
                 )
@@ -1,3 +1,5 @@
+import asyncio
+
 from contextlib import asynccontextmanager
 from fastapi import APIRouter, FastAPI, HTTPException, status, Response
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,17 +10,11 @@ from transformers import AutoModelForSequenceClassification, AutoTokenizer
 from .dependencies.dependency_container import dependency_container
 from .internal.db.connection import connect_pool, disconnect_pool
 from .internal.logging.logging_middleware import TimingMiddleware
+from .internal.utilities.job_scheduler import JobScheduler
+from .managers.job_outbox_poller import JobOutboxPoller
 from .data_processing.electra_model_data import ELECTRA_MODEL_CACHE_DIR, ELECTRA_MODEL_NAME
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    secret_manager = dependency_container.inject_aws_secret_manager_client()
-    resend_client = dependency_container.inject_resend_client()
-    await connect_pool(
-        app=app,
-        secret_manager=secret_manager,
-        resend_client=resend_client,
-    )
+def load_model_and_tokenizer():
     print("Loading model and tokenizer...")
     AutoTokenizer.from_pretrained(
         ELECTRA_MODEL_NAME,
@@ -29,7 +25,32 @@ async def lifespan(app: FastAPI):
         cache_dir=ELECTRA_MODEL_CACHE_DIR
     )
     print("Finished loading model and tokenizer.")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    secret_manager = dependency_container.inject_aws_secret_manager_client()
+    resend_client = dependency_container.inject_resend_client()
+
+    # Startup steps are independent of each other, so we run the blocking ones in threads
+    # and let them overlap with the pool creation.
+    await asyncio.gather(
+        connect_pool(
+            app=app,
+            secret_manager=secret_manager,
+            resend_client=resend_client,
+        ),
+        asyncio.to_thread(dependency_container.inject_chartwise_encryptor),
+        asyncio.to_thread(load_model_and_tokenizer),
+    )
+
+    # Picks up outbox jobs that weren't run by the request that enqueued them.
+    job_outbox_poller = JobOutboxPoller(app=app)
+    job_outbox_poller.start()
     yield
+    await job_outbox_poller.stop()
+
+    # Running jobs get to finish (or hand themselves back to the outbox) before the pool goes away.
+    await JobScheduler.shared().drain()
     await disconnect_pool(app)
     print("Releasing model and tokenizer.")
 
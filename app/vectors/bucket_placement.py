@@ -0,0 +1,196 @@
+import bisect, hashlib, json, os, time
+
+from redis import Redis
+from starlette.concurrency import run_in_threadpool
+
+from ..internal.utilities.ttl_lru_cache import TTLLRUCache
+
+class BucketOverride:
+    """
+    An explicit placement for a user, taking precedence over the hashed one.
+    Reads are always served by a single bucket, while writes may go to several (i.e. during a migration).
+
+    Arguments:
+    read_bucket – the bucket serving the user's reads.
+    write_buckets – the buckets receiving the user's writes. Defaults to the read bucket.
+    """
+
+    def __init__(
+        self,
+        read_bucket: str,
+        write_buckets: list[str] | None = None
+    ):
+        self.read_bucket = read_bucket
+        self.write_buckets = write_buckets or [read_bucket]
+        if self.read_bucket not in self.write_buckets:
+            raise ValueError("The read bucket must receive writes")
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "read_bucket": self.read_bucket,
+            "write_buckets": self.write_buckets,
+        })
+
+    @classmethod
+    def from_json(cls, value: str | bytes) -> "BucketOverride":
+        data = json.loads(value)
+        return cls(
+            read_bucket=data['read_bucket'],
+            write_buckets=data['write_buckets'],
+        )
+
+class BucketPlacement:
+    """
+    Resolves the Pinecone index (bucket) holding a user's vectors.
+
+    Users are placed by hashing their id, unless they have an override (i.e. they were pinned to a
+    bucket, or are being migrated). Two hashing strategies are supported, through the
+    `PINECONE_BUCKET_PLACEMENT` environment variable:
+
+    modulo – the legacy `md5 % bucket count` placement, and the default.
+    consistent_hash – a hash ring, where adding a bucket only moves ~1/N of the users.
+
+    Switching strategies (or bucket counts) moves users, so they must be migrated or pinned beforehand.
+
+    Overrides are stored in Redis, and cached in-process for a short time. The migration tool waits
+    for that cache to expire between phases, so every process observes each phase. Async callers
+    should resolve placements through `placement_async`, so that cache misses don't block the event loop.
+
+    Arguments:
+    redis_client – the client holding overrides. Overrides are disabled when None.
+    strategy – the hashing strategy. Defaults to the `PINECONE_BUCKET_PLACEMENT` environment variable.
+    buckets – the bucket names. Defaults to the legacy buckets (1 through 20).
+    """
+    MODULO_STRATEGY = "modulo"
+    CONSISTENT_HASH_STRATEGY = "consistent_hash"
+    LEGACY_BUCKET_COUNT = 20
+    VIRTUAL_NODES_PER_BUCKET = 100
+    OVERRIDE_KEY_PREFIX = "pinecone_bucket_override:"
+    OVERRIDE_CACHE_TTL_SECONDS = 30
+    OVERRIDE_CACHE_MAX_ENTRIES = 10000
+    REDIS_FAILURE_BACKOFF_SECONDS = 5
+
+    def __init__(
+        self,
+        redis_client: Redis | None = None,
+        strategy: str | None = None,
+        buckets: list[str] | None = None
+    ):
+        cls = type(self)
+        self._redis_client = redis_client
+        self._strategy = strategy or os.environ.get("PINECONE_BUCKET_PLACEMENT", cls.MODULO_STRATEGY)
+        if self._strategy not in [cls.MODULO_STRATEGY, cls.CONSISTENT_HASH_STRATEGY]:
+            raise ValueError(f"Unknown placement strategy: {self._strategy}")
+        self._buckets = buckets or [str(i) for i in range(1, cls.LEGACY_BUCKET_COUNT + 1)]
+
+        ring = sorted(
+            (self._hash(f"{bucket}#{virtual_node}"), bucket)
+            for bucket in self._buckets
+            for virtual_node in range(cls.VIRTUAL_NODES_PER_BUCKET)
+        )
+        self._ring_hashes = [point[0] for point in ring]
+        self._ring_buckets = [point[1] for point in ring]
+
+        # Overrides are wrapped in a tuple, so that "no override" can be cached too.
+        self._overrides_cache = TTLLRUCache(
+            name="pinecone_bucket_overrides",
+            max_entries=cls.OVERRIDE_CACHE_MAX_ENTRIES,
+            ttl_seconds=cls.OVERRIDE_CACHE_TTL_SECONDS,
+        )
+        # Kept past their TTL, to be served while Redis is unavailable.
+        self._last_known_overrides = TTLLRUCache(
+            name="pinecone_bucket_last_known_overrides",
+            max_entries=cls.OVERRIDE_CACHE_MAX_ENTRIES,
+        )
+        # While Redis is failing, lookups skip it until this (monotonic) time, rather than each paying for a timeout.
+        self._redis_retry_at = 0.0
+
+    def placement(self, user_id: str) -> BucketOverride:
+        """
+        Returns the user's effective placement. Callers that both read and write should resolve it
+        once, so that they don't observe two different phases of a migration.
+        """
+        override = self.get_override(user_id)
+        return BucketOverride(read_bucket=self.hashed_bucket(user_id)) if override is None else override
+
+    async def placement_async(self, user_id: str) -> BucketOverride:
+        """
+        Returns the user's effective placement, looking overrides up in the threadpool on cache misses.
+        """
+        cached_override = self._overrides_cache.get(user_id)
+        if self._redis_client is None or cached_override is not None:
+            return self.placement(user_id)
+        return await run_in_threadpool(self.placement, user_id)
+
+    def read_bucket(self, user_id: str) -> str:
+        return self.placement(user_id).read_bucket
+
+    def write_buckets(self, user_id: str) -> list[str]:
+        return self.placement(user_id).write_buckets
+
+    def hashed_bucket(self, user_id: str) -> str:
+        """
+        Returns the bucket assigned to the user by the hashing strategy, regardless of overrides.
+        """
+        user_hash = self._hash(user_id)
+        if self._strategy == type(self).MODULO_STRATEGY:
+            return self._buckets[user_hash % len(self._buckets)]
+
+        ring_position = bisect.bisect(self._ring_hashes, user_hash) % len(self._ring_hashes)
+        return self._ring_buckets[ring_position]
+
+    def get_override(self, user_id: str) -> BucketOverride | None:
+        if self._redis_client is None:
+            return None
+
+        cached_override = self._overrides_cache.get(user_id)
+        if cached_override is not None:
+            return cached_override[0]
+
+        # Falling back to the hashed bucket could split a pinned user's data, so we
+        # keep serving the last override we saw while Redis is unavailable.
+        if time.monotonic() < self._redis_retry_at:
+            return self._last_known_override(user_id)
+
+        try:
+            value = self._redis_client.get(self._override_key(user_id))
+            override = None if value is None else BucketOverride.from_json(value)
+        except Exception as e:
+            self._redis_retry_at = time.monotonic() + type(self).REDIS_FAILURE_BACKOFF_SECONDS
+            print(f"[BucketPlacement] Failed to read override, using the last known placement: {e}")
+            return self._last_known_override(user_id)
+
+        self._overrides_cache.set(user_id, (override,))
+        self._last_known_overrides.set(user_id, (override,))
+        return override
+
+    def set_override(
+        self,
+        user_id: str,
+        override: BucketOverride
+    ):
+        """
+        Atomically replaces the user's override. Other processes observe it within `OVERRIDE_CACHE_TTL_SECONDS`.
+        """
+        if self._redis_client is None:
+            raise RuntimeError("Overrides require Redis")
+        self._redis_client.set(self._override_key(user_id), override.to_json())
+        self._overrides_cache.invalidate(user_id)
+
+    def clear_override(self, user_id: str):
+        if self._redis_client is None:
+            raise RuntimeError("Overrides require Redis")
+        self._redis_client.delete(self._override_key(user_id))
+        self._overrides_cache.invalidate(user_id)
+
+    # Private
+
+    def _last_known_override(self, user_id: str) -> BucketOverride | None:
+        last_known_override = self._last_known_overrides.get(user_id)
+        return None if last_known_override is None else last_known_override[0]
+
+    def _override_key(self, user_id: str) -> str:
+        return "".join([type(self).OVERRIDE_KEY_PREFIX, user_id])
+
+    def _hash(self, value: str) -> int:
+        return int(hashlib.md5(value.encode()).hexdigest(), 16)
@@ -1,10 +1,16 @@
-import asyncio, json, tiktoken, logging
+import asyncio, json, logging, os
 
+from collections import Counter
+from dataclasses import dataclass
+from enum import Enum
 from fastapi import Request
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from typing import AsyncIterable
 
+from .context_assembler import AssembledContext
 from .message_templates import PromptCrafter, PromptScenario
+from .text_chunker import TextChunker
+from .tokenizer import Tokenizer
 from ..dependencies.dependency_container import dependency_container
 from ..dependencies.api.openai_base_class import OpenAIBaseClass
 from ..dependencies.api.aws_db_base_class import AwsDbBaseClass
@@ -14,6 +20,8 @@ from ..dependencies.api.pinecone_session_date_override import (
 )
 from ..internal.schemas import (
     ENCRYPTED_SESSION_REPORTS_TABLE_NAME,
+    CombinedInsightsSchema,
+    ListPackedChunkSummariesSchema,
     ListQuestionSuggestionsSchema,
     ListRecentTopicsSchema,
     TimeTokensExtractionSchema,
@@ -24,11 +32,63 @@ TOPICS_CONTEXT_SESSIONS_CAP = 4
 QUESTION_SUGGESTIONS_CONTEXT_SESSIONS_CAP = 4
 ATTENDANCE_CONTEXT_SESSIONS_CAP = 52
 BRIEFING_CONTEXT_SESSIONS_CAP = 4
+# The chunk tokens packed into a single summarization request. Summaries are shorter than their chunks,
+# so the output stays well within the model's limit.
+PACKED_CHUNK_SUMMARIES_TOKEN_BUDGET = 4096
+# Longer notes get their mini summary derived from their chunk summaries, rather than from the full text.
+MINI_SUMMARY_NOTES_TOKEN_BUDGET = 16000
+
+class InsightGenerator(Enum):
+    # keep sorted A-Z
+    ATTENDANCE_INSIGHTS = "attendance_insights"
+    PRESESSION_BRIEFING = "presession_briefing"
+    QUESTION_SUGGESTIONS = "question_suggestions"
+    RECENT_TOPICS = "recent_topics"
+
+# Bump a generator's version whenever its prompts change, so that stored outputs get regenerated.
+INSIGHT_PROMPT_VERSIONS = {
+    InsightGenerator.ATTENDANCE_INSIGHTS: 1,
+    InsightGenerator.PRESESSION_BRIEFING: 1,
+    InsightGenerator.QUESTION_SUGGESTIONS: 1,
+    InsightGenerator.RECENT_TOPICS: 1,
+}
+
+INSIGHT_CONTEXT_SESSIONS_CAPS = {
+    InsightGenerator.ATTENDANCE_INSIGHTS: ATTENDANCE_CONTEXT_SESSIONS_CAP,
+    InsightGenerator.PRESESSION_BRIEFING: BRIEFING_CONTEXT_SESSIONS_CAP,
+    InsightGenerator.QUESTION_SUGGESTIONS: QUESTION_SUGGESTIONS_CONTEXT_SESSIONS_CAP,
+    InsightGenerator.RECENT_TOPICS: TOPICS_CONTEXT_SESSIONS_CAP,
+}
+
+class InsightGenerationMode(Enum):
+    # Every generator makes its own LLM call(s).
+    SEPARATE = "separate"
+    # The generators reading the most recent sessions share a single structured-output call.
+    COMBINED = "combined"
+
+# The generators that can be combined, in the order their sections are laid out in the combined output.
+COMBINED_INSIGHT_SECTIONS = {
+    InsightGenerator.RECENT_TOPICS: ["recent_topics", "recent_topics_insights"],
+    InsightGenerator.PRESESSION_BRIEFING: ["presession_briefing"],
+    InsightGenerator.QUESTION_SUGGESTIONS: ["question_suggestions"],
+}
+
+@dataclass
+class CombinedInsights:
+    recent_topics: ListRecentTopicsSchema | None = None
+    recent_topics_insights: str | None = None
+    presession_briefing: str | None = None
+    question_suggestions: ListQuestionSuggestionsSchema | None = None
 
 class ChartWiseAssistant:
 
     def __init__(self):
         self.namespace_used_for_streaming = None
+        self.insight_generation_counts: Counter[tuple[str, str]] = Counter()
+        self.combined_insight_retry_counts: Counter[str] = Counter()
+        self.insight_generation_mode = InsightGenerationMode(
+            os.environ.get("INSIGHT_GENERATION_MODE", InsightGenerationMode.SEPARATE.value).lower()
+        )
 
     async def query_store(
         self,
@@ -81,6 +141,7 @@ class ChartWiseAssistant:
                 max_tokens = await self.calculate_max_tokens(
                     system_prompt=reformulate_question_system_prompt,
                     user_prompt=reformulate_question_user_prompt,
+                    prompt_scenario=PromptScenario.REFORMULATE_QUERY,
                 )
 
                 completion = await openai_client.trigger_async_chat_completion(
@@ -89,6 +150,7 @@ class ChartWiseAssistant:
                         {"role": "system", "content": reformulate_question_system_prompt},
                         {"role": "user", "content": reformulate_question_user_prompt},
                     ],
+                    prompt_scenario=PromptScenario.REFORMULATE_QUERY,
                 )
                 assert type(completion) == str, "Unexpected completion type when reformulating query input."
                 return completion
@@ -104,6 +166,7 @@ class ChartWiseAssistant:
                 max_tokens = await self.calculate_max_tokens(
                     system_prompt=extract_time_tokens_system_prompt,
                     user_prompt=extract_time_tokens_user_prompt,
+                    prompt_scenario=PromptScenario.EXTRACT_TIME_TOKENS,
                 )
 
                 completion = await openai_client.trigger_async_chat_completion(
@@ -113,6 +176,7 @@ class ChartWiseAssistant:
                         {"role": "user", "content": extract_time_tokens_user_prompt},
                     ],
                     expected_output_model=TimeTokensExtractionSchema,
+                    prompt_scenario=PromptScenario.EXTRACT_TIME_TOKENS,
                 )
                 assert isinstance(completion, TimeTokensExtractionSchema), "Unexpected completion type when extracting time tokens."
                 return completion
@@ -223,6 +287,9 @@ class ChartWiseAssistant:
             max_tokens = await self.calculate_max_tokens(
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
+                context=context,
+                prompt_scenario=PromptScenario.PRESESSION_BRIEFING,
+                language_code=language_code,
             )
 
             completion = await openai_client.trigger_async_chat_completion(
@@ -231,6 +298,7 @@ class ChartWiseAssistant:
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt},
                 ],
+                prompt_scenario=PromptScenario.PRESESSION_BRIEFING,
             )
             assert type(completion) == str, "Unexpected completion type when creating briefing"
             return completion
@@ -299,6 +367,9 @@ class ChartWiseAssistant:
             max_tokens = await self.calculate_max_tokens(
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
+                context=context,
+                prompt_scenario=PromptScenario.QUESTION_SUGGESTIONS,
+                language_code=language_code,
             )
 
             completion = await openai_client.trigger_async_chat_completion(
@@ -308,6 +379,7 @@ class ChartWiseAssistant:
                     {"role": "user", "content": user_prompt},
                 ],
                 expected_output_model=ListQuestionSuggestionsSchema,
+                prompt_scenario=PromptScenario.QUESTION_SUGGESTIONS,
             )
             assert isinstance(completion, ListQuestionSuggestionsSchema), "Unexpected completion type when creating question suggestions"
             return completion
@@ -381,6 +453,9 @@ class ChartWiseAssistant:
             max_tokens = await self.calculate_max_tokens(
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
+                context=context,
+                prompt_scenario=PromptScenario.TOPICS,
+                language_code=language_code,
             )
             logging.info(f"[fetch_recent_topics] Calculated max_tokens: {max_tokens}")
 
@@ -391,6 +466,7 @@ class ChartWiseAssistant:
                     {"role": "user", "content": user_prompt},
                 ],
                 expected_output_model=ListRecentTopicsSchema,
+                prompt_scenario=PromptScenario.TOPICS,
             )
             assert isinstance(completion, ListRecentTopicsSchema), "Unexpected completion type when creating recent topics"
             return completion
@@ -470,6 +546,9 @@ class ChartWiseAssistant:
             max_tokens = await self.calculate_max_tokens(
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
+                context=context,
+                prompt_scenario=PromptScenario.TOPICS_INSIGHTS,
+                language_code=language_code,
             )
             logging.info(f"[generate_recent_topics_insights] Calculated max_tokens: {max_tokens}")
 
@@ -479,6 +558,7 @@ class ChartWiseAssistant:
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt},
                 ],
+                prompt_scenario=PromptScenario.TOPICS_INSIGHTS,
             )
             assert type(completion) == str, "Unexpected completion type when creating recent topics insights"
             return completion
@@ -486,6 +566,118 @@ class ChartWiseAssistant:
             logging.error(f"[generate_recent_topics_insights] Error occurred: {str(e)}")
             raise RuntimeError(e) from e
 
+    async def generate_combined_insights(
+        self,
+        generators: set[InsightGenerator],
+        user_id: str,
+        patient_id: str,
+        language_code: str,
+        patient_first_name: str,
+        patient_full_name: str,
+        patient_gender: str,
+        request: Request,
+        therapist_name: str | None = None,
+        therapist_gender: str | None = None,
+        session_count: int | None = None,
+    ) -> CombinedInsights:
+        """
+        Generates the incoming generators' outputs with a single structured-output call over the most recent sessions.
+        Every section of the output gets validated on its own, and the sections that fail validation (or all of them,
+        if the call itself fails) get regenerated through their standalone generators.
+
+        Arguments:
+        generators – the generators to be combined. Must be keys of COMBINED_INSIGHT_SECTIONS.
+        user_id – the user id associated with the operation.
+        patient_id – the patient id associated with the operation.
+        language_code – the language code to be used in the response.
+        patient_first_name – the patient's first name, by which the briefing and topics insights refer to the patient.
+        patient_full_name – the patient's full name, by which the topics and question suggestions refer to the patient.
+        patient_gender – the patient gender.
+        request – the upstream request object.
+        therapist_name – the therapist's name. Required for the presession briefing.
+        therapist_gender – the therapist gender.
+        session_count – the count of sessions so far with this patient. Required for the presession briefing.
+        """
+        try:
+            assert len(generators) > 0 and generators <= set(COMBINED_INSIGHT_SECTIONS), "Received generators that can't be combined"
+            if InsightGenerator.PRESESSION_BRIEFING in generators:
+                assert therapist_name is not None and session_count is not None, "Missing therapist data for the presession briefing"
+
+            combined_output = None
+            try:
+                combined_output = await self._fetch_combined_insights(
+                    generators=generators,
+                    user_id=user_id,
+                    patient_id=patient_id,
+                    language_code=language_code,
+                    patient_first_name=patient_first_name,
+                    patient_full_name=patient_full_name,
+                    patient_gender=patient_gender,
+                    therapist_name=therapist_name,
+                    therapist_gender=therapist_gender,
+                    session_count=session_count,
+                    request=request,
+                )
+            except Exception as e:
+                logging.error(f"[generate_combined_insights] Combined call failed, falling back to standalone generators: {str(e)}")
+
+            insights = self._validate_combined_insights(
+                combined_output=combined_output,
+                generators=generators
+            )
+
+            if InsightGenerator.RECENT_TOPICS in generators and insights.recent_topics is None:
+                self._record_combined_section_retry("recent_topics")
+                insights.recent_topics = await self.fetch_recent_topics(
+                    user_id=user_id,
+                    patient_id=patient_id,
+                    language_code=language_code,
+                    patient_name=patient_full_name,
+                    patient_gender=patient_gender,
+                    request=request,
+                )
+
+            # Insights that weren't generated alongside the final topics would be describing different ones.
+            if InsightGenerator.RECENT_TOPICS in generators and insights.recent_topics_insights is None:
+                self._record_combined_section_retry("recent_topics_insights")
+                insights.recent_topics_insights = await self.generate_recent_topics_insights(
+                    recent_topics=insights.recent_topics,
+                    user_id=user_id,
+                    patient_id=patient_id,
+                    language_code=language_code,
+                    patient_name=patient_first_name,
+                    patient_gender=patient_gender,
+                    request=request,
+                )
+
+            if InsightGenerator.PRESESSION_BRIEFING in generators and insights.presession_briefing is None:
+                self._record_combined_section_retry("presession_briefing")
+                insights.presession_briefing = await self.create_briefing(
+                    user_id=user_id,
+                    patient_id=patient_id,
+                    language_code=language_code,
+                    patient_name=patient_first_name,
+                    patient_gender=patient_gender,
+                    therapist_name=therapist_name,
+                    therapist_gender=therapist_gender,
+                    session_count=session_count,
+                    request=request,
+                )
+
+            if InsightGenerator.QUESTION_SUGGESTIONS in generators and insights.question_suggestions is None:
+                self._record_combined_section_retry("question_suggestions")
+                insights.question_suggestions = await self.create_question_suggestions(
+                    user_id=user_id,
+                    patient_id=patient_id,
+                    language_code=language_code,
+                    patient_name=patient_full_name,
+                    patient_gender=patient_gender,
+                    request=request,
+                )
+            return insights
+        except Exception as e:
+            raise RuntimeError(e) from e
+
     async def generate_attendance_insights(
         self,
         therapist_id: str,
@@ -518,6 +710,8 @@ class ChartWiseAssistant:
             max_tokens = await self.calculate_max_tokens(
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
+                prompt_scenario=PromptScenario.ATTENDANCE_INSIGHTS,
+                language_code=language_code,
             )
 
             completion = await dependency_container.inject_openai_client().trigger_async_chat_completion(
@@ -526,6 +720,7 @@ class ChartWiseAssistant:
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt},
                 ],
+                prompt_scenario=PromptScenario.ATTENDANCE_INSIGHTS,
             )
             assert type(completion) == str, "Unexpected completion type when creating attendance insights"
             return completion
@@ -552,6 +747,7 @@ class ChartWiseAssistant:
             max_tokens = await self.calculate_max_tokens(
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
+                prompt_scenario=PromptScenario.SOAP_TEMPLATE,
             )
 
             completion = await dependency_container.inject_openai_client().trigger_async_chat_completion(
@@ -560,6 +756,7 @@ class ChartWiseAssistant:
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt},
                 ],
+                prompt_scenario=PromptScenario.SOAP_TEMPLATE,
             )
             assert type(completion) == str, "Unexpected completion type when creating soap report"
             return completion
@@ -588,6 +785,7 @@ class ChartWiseAssistant:
             max_tokens = await self.calculate_max_tokens(
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
+                prompt_scenario=PromptScenario.CHUNK_SUMMARY,
             )
 
             completion = await openai_client.trigger_async_chat_completion(
@@ -596,30 +794,91 @@ class ChartWiseAssistant:
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt},
                 ],
+                prompt_scenario=PromptScenario.CHUNK_SUMMARY,
             )
             assert type(completion) == str, "Unexpected completion type when summarizing chunk"
             return completion
         except Exception as e:
             raise RuntimeError(e) from e
 
+    async def summarize_chunks(
+        self,
+        chunk_texts: list[str],
+        openai_client: OpenAIBaseClass
+    ) -> list[str]:
+        """
+        Summarizes a set of chunks, packing as many of them as fit in PACKED_CHUNK_SUMMARIES_TOKEN_BUDGET
+        into each request. Chunks whose summary is missing or invalid, or whose request failed,
+        get summarized one by one instead. Returns the summaries in the chunks' order.
+
+        Arguments:
+        chunk_texts – the text associated with each of the incoming chunks.
+        openai_client – the openai client to be leveraged internally.
+        """
+        try:
+            chunk_summaries: list[str | None] = [None] * len(chunk_texts)
+            for chunk_indexes in self._pack_chunks(chunk_texts):
+                if len(chunk_indexes) == 1:
+                    # A lone chunk gets the regular prompt.
+                    continue
+
+                try:
+                    packed_summaries = await self._summarize_chunk_pack(
+                        chunk_texts=chunk_texts,
+                        chunk_indexes=chunk_indexes,
+                        openai_client=openai_client
+                    )
+                except Exception as e:
+                    logging.error(f"[summarize_chunks] Packed summarization failed, falling back to single chunks: {str(e)}")
+                    packed_summaries = {}
+
+                for chunk_index in chunk_indexes:
+                    chunk_summaries[chunk_index] = packed_summaries.get(chunk_index)
+
+            for chunk_index, chunk_summary in enumerate(chunk_summaries):
+                if chunk_summary is None:
+                    chunk_summaries[chunk_index] = await self.summarize_chunk(
+                        chunk_text=chunk_texts[chunk_index],
+                        openai_client=openai_client
+                    )
+            return chunk_summaries
+        except Exception as e:
+            raise RuntimeError(e) from e
+
     async def create_session_mini_summary(
         self,
         session_notes: str,
         language_code: str,
+        chunk_summaries: list[str] | None = None,
     ) -> str:
         """
         Creates a 'mini' summary of the incoming session notes.
+        When the notes' chunk summaries are available, or the notes are longer than MINI_SUMMARY_NOTES_TOKEN_BUDGET,
+        the mini summary gets derived from the chunk summaries instead of the full text.
 
         Arguments:
         session_notes – the text associated with the session notes.
         language_code – the language_code to be used for generating the response.
+        chunk_summaries – the summaries of the notes' chunks, if they were already computed (i.e. during ingestion).
         """
         try:
+            if chunk_summaries is None and Tokenizer.shared().count_tokens(session_notes) > MINI_SUMMARY_NOTES_TOKEN_BUDGET:
+                chunk_summaries = await self.summarize_chunks(
+                    chunk_texts=TextChunker().split_text(session_notes),
+                    openai_client=dependency_container.inject_openai_client()
+                )
+
             prompt_crafter = PromptCrafter()
-            user_prompt = prompt_crafter.get_user_message_for_scenario(
-                scenario=PromptScenario.SESSION_MINI_SUMMARY,
-                session_notes=session_notes
-            )
+            if chunk_summaries is not None and len(chunk_summaries) > 0:
+                user_prompt = prompt_crafter.get_user_message_for_scenario(
+                    scenario=PromptScenario.SESSION_MINI_SUMMARY,
+                    chunk_summaries=chunk_summaries
+                )
+            else:
+                user_prompt = prompt_crafter.get_user_message_for_scenario(
+                    scenario=PromptScenario.SESSION_MINI_SUMMARY,
+                    session_notes=session_notes
+                )
             system_prompt = prompt_crafter.get_system_message_for_scenario(
                 scenario=PromptScenario.SESSION_MINI_SUMMARY,
                 language_code=language_code
@@ -627,6 +886,8 @@ class ChartWiseAssistant:
             max_tokens = await self.calculate_max_tokens(
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
+                prompt_scenario=PromptScenario.SESSION_MINI_SUMMARY,
+                language_code=language_code,
             )
 
             completion = await dependency_container.inject_openai_client().trigger_async_chat_completion(
@@ -635,20 +896,114 @@ class ChartWiseAssistant:
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt},
                 ],
+                prompt_scenario=PromptScenario.SESSION_MINI_SUMMARY,
             )
             assert type(completion) == str, "Unexpected completion type when creating a mini summary"
             return completion
         except Exception as e:
             raise RuntimeError(e) from e
 
+    async def compute_insight_input_fingerprint(
+        self,
+        generator: InsightGenerator,
+        therapist_id: str,
+        patient_id: str,
+        request: Request,
+        **prompt_inputs
+    ) -> str:
+        """
+        Computes a fingerprint of everything a generator's output depends on: the ids and last update
+        timestamps of the sessions it would read, the generator's prompt version, and any other prompt inputs.
+        If the fingerprint matches the one stored next to the generator's output, the output is still fresh.
+
+        Arguments:
+        generator – the insight generator.
+        therapist_id – the therapist id associated with the operation.
+        patient_id – the patient id associated with the operation.
+        request – the upstream request object.
+        prompt_inputs – the set of additional inputs that are fed into the generator's prompts.
+        """
+        try:
+            aws_db_client: AwsDbBaseClass = dependency_container.inject_aws_db_client()
+            sessions_data = await aws_db_client.select(
+                user_id=therapist_id,
+                request=request,
+                fields=["id", "session_date", "last_updated"],
+                filters={
+                    "patient_id": patient_id,
+                    "is_soft_deleted": False,
+                },
+                table_name=ENCRYPTED_SESSION_REPORTS_TABLE_NAME,
+                limit=INSIGHT_CONTEXT_SESSIONS_CAPS[generator],
+                order_by=("session_date", "desc")
+            )
+            fingerprint_input = json.dumps(
+                {
+                    "generator": generator.value,
+                    "prompt_version": INSIGHT_PROMPT_VERSIONS[generator],
+                    "sessions": [
+                        [str(session.get("id")), str(session.get("session_date")), str(session.get("last_updated"))]
+                        for session in sessions_data
+                    ],
+                    "prompt_inputs": prompt_inputs,
+                },
+                sort_keys=True,
+                default=str,
+            )
+
+            # Prompt inputs may contain PHI, so we rely on a keyed digest rather than a plain hash.
+            return dependency_container.inject_chartwise_encryptor().digest(fingerprint_input)
+        except Exception as e:
+            raise RuntimeError(e) from e
+
+    def record_insight_generation(
+        self,
+        generator: InsightGenerator,
+        skipped: bool
+    ):
+        """
+        Records whether a generator's output was regenerated, or skipped because its inputs didn't change.
+
+        Arguments:
+        generator – the insight generator.
+        skipped – whether the generation was skipped.
+        """
+        outcome = "skipped" if skipped else "regenerated"
+        self.insight_generation_counts[(generator.value, outcome)] += 1
+        dependency_container.inject_influx_client().log_cache_access(
+            cache_name="insight_input_fingerprints",
+            hit=skipped,
+            insight_generator=generator.value
+        )
+
     # Private
 
     async def calculate_max_tokens(
         self,
         system_prompt: str,
-        user_prompt: str) -> int:
+        user_prompt: str,
+        context: str | None = None,
+        prompt_scenario: PromptScenario | None = None,
+        language_code: str | None = None) -> int:
         openai_client = dependency_container.inject_openai_client()
-        prompt_tokens = len(tiktoken.get_encoding("o200k_base").encode(f"{system_prompt}\n{user_prompt}"))
+        tokenizer = Tokenizer.shared()
+
+        # System prompts mostly depend on the scenario and language alone, so their counts get memoized.
+        if prompt_scenario is not None:
+            system_prompt_tokens = tokenizer.count_prompt_tokens(
+                prompt=system_prompt,
+                scenario=prompt_scenario,
+                language_code=language_code
+            )
+        else:
+            system_prompt_tokens = tokenizer.count_tokens(system_prompt)
+
+        if isinstance(context, AssembledContext) and context in user_prompt:
+            # The context was counted while it got assembled, so we only encode the rest of the prompt.
+            user_prompt_tokens = tokenizer.count_tokens(user_prompt.replace(context, "", 1)) + context.token_count
+        else:
+            user_prompt_tokens = tokenizer.count_tokens(user_prompt)
+        prompt_tokens = system_prompt_tokens + user_prompt_tokens + 1 # Joined by a line break
 
         # Calculate how much space is left in the context window
         available_context = openai_client.GPT_4O_MINI_CONTEXT_WINDOW - prompt_tokens
@@ -657,6 +1012,181 @@ class ChartWiseAssistant:
         max_tokens = min(available_context, openai_client.GPT_4O_MINI_MAX_OUTPUT_TOKENS)
         return max_tokens
 
+    async def _fetch_combined_insights(
+        self,
+        generators: set[InsightGenerator],
+        user_id: str,
+        patient_id: str,
+        language_code: str,
+        patient_first_name: str,
+        patient_full_name: str,
+        patient_gender: str,
+        therapist_name: str | None,
+        therapist_gender: str | None,
+        session_count: int | None,
+        request: Request
+    ) -> CombinedInsightsSchema:
+        sections = [
+            section
+            for generator, generator_sections in COMBINED_INSIGHT_SECTIONS.items() if generator in generators
+            for section in generator_sections
+        ]
+        query_input = (
+            f"I'm coming up to speed with {patient_full_name}'s most recent sessions. "
+            f"Please help me fill in the following sections of their dashboard: {', '.join(sections)}."
+        )
+
+        session_dates_override = await self._retrieve_n_most_recent_session_dates(
+            request=request,
+            therapist_id=user_id,
+            patient_id=patient_id,
+            n=max(INSIGHT_CONTEXT_SESSIONS_CAPS[generator] for generator in generators)
+        )
+
+        openai_client = dependency_container.inject_openai_client()
+        context = await dependency_container.inject_pinecone_client().get_vector_store_context(
+            query_input=query_input,
+            user_id=user_id,
+            patient_id=patient_id,
+            openai_client=openai_client,
+            aws_db_client=dependency_container.inject_aws_db_client(),
+            request=request,
+            query_top_k=0,
+            rerank_vectors=False,
+            # Recent topics alone don't read the pre-existing history.
+            include_preexisting_history=(generators != {InsightGenerator.RECENT_TOPICS}),
+            session_dates_overrides=session_dates_override
+        )
+
+        prompt_crafter = PromptCrafter()
+        user_prompt = prompt_crafter.get_user_message_for_scenario(
+            scenario=PromptScenario.COMBINED_INSIGHTS,
+            context=context,
+            language_code=language_code,
+            patient_name=patient_full_name,
+            patient_gender=patient_gender,
+            sections=sections
+        )
+        system_prompt = prompt_crafter.get_system_message_for_scenario(
+            scenario=PromptScenario.COMBINED_INSIGHTS,
+            sections=sections,
+            language_code=language_code,
+            therapist_name=therapist_name,
+            therapist_gender=therapist_gender,
+            patient_name=patient_first_name,
+            patient_gender=patient_gender,
+            session_count=session_count
+        )
+        max_tokens = await self.calculate_max_tokens(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            context=context,
+            prompt_scenario=PromptScenario.COMBINED_INSIGHTS,
+            language_code=language_code,
+        )
+
+        completion = await openai_client.trigger_async_chat_completion(
+            max_tokens=max_tokens,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            expected_output_model=CombinedInsightsSchema,
+            prompt_scenario=PromptScenario.COMBINED_INSIGHTS,
+        )
+        assert isinstance(completion, CombinedInsightsSchema), "Unexpected completion type when creating combined insights"
+        return completion
+
+    def _validate_combined_insights(
+        self,
+        combined_output: CombinedInsightsSchema | None,
+        generators: set[InsightGenerator]
+    ) -> CombinedInsights:
+        insights = CombinedInsights()
+        if combined_output is None:
+            return insights
+
+        if InsightGenerator.RECENT_TOPICS in generators and combined_output.recent_topics is not None:
+            try:
+                insights.recent_topics = ListRecentTopicsSchema.model_validate(
+                    {"topics": [topic.model_dump() for topic in combined_output.recent_topics]}
+                )
+            except ValidationError as e:
+                logging.warning(f"[generate_combined_insights] Invalid recent_topics section: {str(e)}")
+
+            if insights.recent_topics is not None and len((combined_output.recent_topics_insights or "").strip()) > 0:
+                insights.recent_topics_insights = combined_output.recent_topics_insights
+
+        if InsightGenerator.PRESESSION_BRIEFING in generators and len((combined_output.presession_briefing or "").strip()) > 0:
+            insights.presession_briefing = combined_output.presession_briefing
+
+        if InsightGenerator.QUESTION_SUGGESTIONS in generators and len(combined_output.question_suggestions or []) > 0:
+            insights.question_suggestions = ListQuestionSuggestionsSchema(questions=combined_output.question_suggestions)
+        return insights
+
+    def _record_combined_section_retry(
+        self,
+        section: str
+    ):
+        logging.info(f"[generate_combined_insights] Regenerating section {section} on its own")
+        self.combined_insight_retry_counts[section] += 1
+
+    def _pack_chunks(
+        self,
+        chunk_texts: list[str]
+    ) -> list[list[int]]:
+        packs: list[list[int]] = []
+        pack_tokens = 0
+        for chunk_index, chunk_tokens in enumerate(Tokenizer.shared().count_tokens_batch(chunk_texts)):
+            if len(packs) == 0 or pack_tokens + chunk_tokens > PACKED_CHUNK_SUMMARIES_TOKEN_BUDGET:
+                packs.append([])
+                pack_tokens = 0
+            packs[-1].append(chunk_index)
+            pack_tokens += chunk_tokens
+        return packs
+
+    async def _summarize_chunk_pack(
+        self,
+        chunk_texts: list[str],
+        chunk_indexes: list[int],
+        openai_client: OpenAIBaseClass
+    ) -> dict[int, str]:
+        prompt_crafter = PromptCrafter()
+        user_prompt = prompt_crafter.get_user_message_for_scenario(
+            PromptScenario.PACKED_CHUNK_SUMMARIES,
+            chunks=[(str(chunk_index), chunk_texts[chunk_index]) for chunk_index in chunk_indexes]
+        )
+        system_prompt = prompt_crafter.get_system_message_for_scenario(scenario=PromptScenario.PACKED_CHUNK_SUMMARIES)
+        max_tokens = await self.calculate_max_tokens(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            prompt_scenario=PromptScenario.PACKED_CHUNK_SUMMARIES,
+        )
+
+        completion = await openai_client.trigger_async_chat_completion(
+            max_tokens=max_tokens,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            expected_output_model=ListPackedChunkSummariesSchema,
+            prompt_scenario=PromptScenario.PACKED_CHUNK_SUMMARIES,
+        )
+        assert isinstance(completion, ListPackedChunkSummariesSchema), "Unexpected completion type when summarizing chunks"
+
+        # Only well-formed summaries of the pack's chunks are kept, the rest get summarized on their own.
+        expected_chunk_ids = {str(chunk_index): chunk_index for chunk_index in chunk_indexes}
+        packed_summaries: dict[int, str] = {}
+        for packed_summary in completion.summaries:
+            chunk_index = expected_chunk_ids.get(packed_summary.chunk_id.strip())
+            if chunk_index is None or chunk_index in packed_summaries or len(packed_summary.summary.strip()) == 0:
+                continue
+            packed_summaries[chunk_index] = packed_summary.summary.strip()
+
+        if len(packed_summaries) < len(chunk_indexes):
+            logging.warning(f"[summarize_chunks] {len(chunk_indexes) - len(packed_summaries)} chunks are missing a valid summary")
+        return packed_summaries
+
     async def _fetch_context_based_on_query_input(
         self,
         query_input: str,
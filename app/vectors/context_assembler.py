@@ -0,0 +1,139 @@
+from .tokenizer import Tokenizer
+
+class AssembledContext(str):
+    """
+    A prompt context that carries its own token count, so that callers don't need to encode it again.
+
+    Arguments:
+    value – the context text.
+    token_count – the number of tokens in the context.
+    """
+
+    def __new__(cls, value: str, token_count: int):
+        context = super().__new__(cls, value)
+        context.token_count = token_count
+        return context
+
+class ContextAssembler:
+    """
+    Builds a prompt context out of sections, within a token budget.
+
+    Sections are added in priority order, and their tokens are counted once, as they're added.
+    A section that doesn't fit gets dropped (or truncated, if requested), while later sections
+    may still fit in the remaining budget.
+
+    Arguments:
+    token_budget – the maximum number of tokens in the context. Unbounded when None.
+    tokenizer – the tokenizer used for counting tokens. Defaults to the shared one.
+    """
+    SEPARATOR = "\n"
+
+    def __init__(
+        self,
+        token_budget: int | None = None,
+        tokenizer: Tokenizer | None = None
+    ):
+        self._token_budget = token_budget
+        self._tokenizer = tokenizer or Tokenizer.shared()
+        self._separator_token_count = self._tokenizer.count_tokens(type(self).SEPARATOR)
+        self._sections: list[str] = []
+        self._token_count = 0
+
+    @property
+    def token_count(self) -> int:
+        return self._token_count
+
+    def add(
+        self,
+        text: str,
+        truncate: bool = False
+    ) -> bool:
+        """
+        Adds a section to the context, and returns whether it was added (fully or truncated).
+
+        Arguments:
+        text – the section to be added.
+        truncate – whether a section that doesn't fit should be truncated, rather than dropped.
+        """
+        if len(text) == 0:
+            return False
+
+        tokens = self._tokenizer.encode(text)
+        available_tokens = self._available_tokens()
+        if available_tokens is not None and len(tokens) > available_tokens:
+            if not truncate or available_tokens == 0:
+                return False
+            tokens = tokens[:available_tokens]
+            text = self._tokenizer.decode(tokens)
+
+        self._append(text, len(tokens))
+        return True
+
+    def add_items(
+        self,
+        items: list[str],
+        prefix: str = "",
+        suffix: str = ""
+    ) -> list[int]:
+        """
+        Adds a section made of several items (i.e. retrieved chunks), sorted by relevance. Items that
+        don't fit are dropped, and the prefix and suffix are only added along with at least one item.
+        Returns the positions of the items that were added.
+
+        Arguments:
+        items – the section's items, most relevant first.
+        prefix – the optional text preceding the items.
+        suffix – the optional text following the items.
+        """
+        cls = type(self)
+        wrapper_token_count = self._tokenizer.count_tokens(prefix) + self._tokenizer.count_tokens(suffix)
+        available_tokens = self._available_tokens()
+        if available_tokens is not None:
+            available_tokens -= wrapper_token_count
+
+        added_positions = []
+        added_items = []
+        section_token_count = wrapper_token_count
+        items_token_counts = self._tokenizer.count_tokens_batch(items)
+        for position, (item, item_token_count) in enumerate(zip(items, items_token_counts)):
+            if len(added_items) > 0:
+                item_token_count += self._separator_token_count
+            if available_tokens is not None and item_token_count > available_tokens:
+                continue
+
+            added_positions.append(position)
+            added_items.append(item)
+            section_token_count += item_token_count
+            if available_tokens is not None:
+                available_tokens -= item_token_count
+
+        if len(added_items) > 0:
+            self._append(
+                "".join([prefix, cls.SEPARATOR.join(added_items), suffix]),
+                section_token_count
+            )
+        return added_positions
+
+    def build(self) -> AssembledContext:
+        return AssembledContext(
+            type(self).SEPARATOR.join(self._sections),
+            self._token_count
+        )
+
+    # Private
+
+    def _available_tokens(self) -> int | None:
+        if self._token_budget is None:
+            return None
+        separator_token_count = self._separator_token_count if len(self._sections) > 0 else 0
+        return max(self._token_budget - self._token_count - separator_token_count, 0)
+
+    def _append(
+        self,
+        text: str,
+        token_count: int
+    ):
+        if len(self._sections) > 0:
+            self._token_count += self._separator_token_count
+        self._sections.append(text)
+        self._token_count += token_count
@@ -1,4 +1,26 @@
-import re 
+import bisect, re
+
+from typing import Callable
+
+# The legacy cleanup applied its rules one after the other, and later rules match text that earlier
+# ones removed characters from (i.e. a hyphen rule spanning a removed bullet). To get the same output,
+# the rules are applied in the same order, but rules that can't affect each other share a pass.
+# Hyphenated line breaks are joined and the remaining line breaks removed first.
+_LINE_BREAK_PATTERN = re.compile(r"(?P<joined>-(?<=\w-)\n(?=\w))|\n")
+_WORD_PATTERN = re.compile(r"\w+")
+_CLEANUP_PASSES = (
+    # Spaced dashes, which can leave runs of dashes behind
+    (re.compile(r"  —"), lambda match: ""),
+    # Runs of ten, nine or five dashes, the longest first
+    (re.compile(r"—{5}(?:—{5}|—{4})?"), lambda match: ""),
+    # Escaped unicode sequences and unwanted characters
+    (re.compile(r"\\u[\dA-Fa-f]{4}|\uf075|\uf0b7"), lambda match: ""),
+    # Improperly spaced hyphenated words, and whitespace other than a single space
+    (
+        re.compile(r"(\w)\s*-\s*(\w)|\s(?=\s)\s+|[^\S ]"),
+        lambda match: " " if match.group(1) is None else f"{match.group(1)}-{match.group(2)}"
+    ),
+)
 
 """
 Removes unwanted characters and patterns in text input.
@@ -8,19 +30,106 @@ Arguments:
 content – text input.
 """
 def clean_up_text(content: str) -> str:
-    # Fix hyphenated words broken by newline
-    content = re.sub(r'(\w+)-\n(\w+)', r'\1\2', content)
-
-    # Remove specific unwanted patterns and characters
-    unwanted_patterns = [
-        "\\n", "  —", "——————————", "—————————", "—————",
-        r'\\u[\dA-Fa-f]{4}', r'\uf075', r'\uf0b7'
-    ]
-    for pattern in unwanted_patterns:
-        content = re.sub(pattern, "", content)
-
-    # Fix improperly spaced hyphenated words and normalize whitespace
-    content = re.sub(r'(\w)\s*-\s*(\w)', r'\1-\2', content)
-    content = re.sub(r'\s+', ' ', content)
-
-    return content
+    cleaned_content, _ = clean_up_text_with_line_breaks(content)
+    return cleaned_content
+
+"""
+Cleans up text input like `clean_up_text`, while keeping track of where its line breaks were.
+Returns the cleaned content, along with the offsets (in the cleaned content) of the removed line breaks,
+mapped to the number of line breaks removed at each offset.
+
+Arguments:
+content – text input.
+"""
+def clean_up_text_with_line_breaks(content: str) -> tuple[str, dict[int, int]]:
+    pieces = []
+    cleaned_length = 0
+    line_breaks: dict[int, int] = {}
+    last_end = 0
+    last_joined_end = -1
+    for match in _LINE_BREAK_PATTERN.finditer(content):
+        piece = content[last_end:match.start()]
+        is_line_break = True
+        if match.group("joined") is not None:
+            # The legacy cleanup joined whole words, so a word that was just joined onto the previous
+            # one doesn't get joined onto the next one too.
+            if last_joined_end != -1 and _WORD_PATTERN.fullmatch(content, last_joined_end, match.start()):
+                piece += "-"
+            else:
+                last_joined_end = match.end()
+                is_line_break = False
+
+        pieces.append(piece)
+        cleaned_length += len(piece)
+        if is_line_break:
+            line_breaks[cleaned_length] = line_breaks.get(cleaned_length, 0) + 1
+        last_end = match.end()
+    pieces.append(content[last_end:])
+    cleaned_content = "".join(pieces)
+
+    for pattern, replace in _CLEANUP_PASSES:
+        cleaned_content, line_breaks = _substitute_with_line_breaks(
+            pattern=pattern,
+            content=cleaned_content,
+            line_breaks=line_breaks,
+            replace=replace
+        )
+    return cleaned_content, line_breaks
+
+# Private
+
+"""
+Replaces every match of the incoming pattern, like `re.sub`, while moving the line break offsets along.
+Line breaks within a match that gets removed or turned into whitespace are moved to where the match was.
+Ones within a match that joins words are dropped, since they would otherwise fall mid-word.
+Returns the content, along with the moved line break offsets.
+
+Arguments:
+pattern – the pattern to be replaced.
+content – text input.
+line_breaks – the offsets (in the content) of the removed line breaks, mapped to their count.
+replace – the function returning the replacement of each match.
+"""
+def _substitute_with_line_breaks(
+    pattern: re.Pattern,
+    content: str,
+    line_breaks: dict[int, int],
+    replace: Callable[[re.Match], str]
+) -> tuple[str, dict[int, int]]:
+    pieces = []
+    # For each match, its span in the content, where it starts in the output, and whether it keeps
+    # the line breaks within it.
+    match_starts, match_ends, replaced_starts, keeps_line_breaks = [], [], [], []
+    # How much shorter the output is than the content, after each match.
+    shifts = []
+    shift = 0
+    last_end = 0
+    for match in pattern.finditer(content):
+        replacement = replace(match)
+        pieces.append(content[last_end:match.start()])
+        pieces.append(replacement)
+        match_starts.append(match.start())
+        match_ends.append(match.end())
+        replaced_starts.append(match.start() - shift)
+        keeps_line_breaks.append(replacement.strip() == "")
+        shift += match.end() - match.start() - len(replacement)
+        shifts.append(shift)
+        last_end = match.end()
+
+    if len(match_starts) == 0:
+        return content, line_breaks
+    pieces.append(content[last_end:])
+
+    moved_line_breaks: dict[int, int] = {}
+    for offset, count in line_breaks.items():
+        i = bisect.bisect_right(match_starts, offset) - 1
+        if i < 0:
+            moved_offset = offset
+        elif offset >= match_ends[i]:
+            moved_offset = offset - shifts[i]
+        elif offset == match_starts[i] or keeps_line_breaks[i]:
+            moved_offset = replaced_starts[i]
+        else:
+            continue
+        moved_line_breaks[moved_offset] = moved_line_breaks.get(moved_offset, 0) + count
+    return "".join(pieces), moved_line_breaks
@@ -0,0 +1,346 @@
+import threading, time
+import numpy as np
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+class _MirroredNamespace:
+    """
+    The in-memory copy of a single namespace, searchable by inner product over normalized vectors.
+    The index gets created with the first vectors, since empty namespaces don't tell us their dimension.
+    """
+
+    def __init__(self):
+        self.index = None
+        self.dimension: int | None = None
+        self.vector_ids: dict[int, str] = {}
+        self.internal_ids: dict[str, int] = {}
+        self.metadata: dict[str, dict] = {}
+        self.next_internal_id = 0
+        self.loaded_at = time.monotonic()
+
+    def upsert(self, vectors: list[dict]):
+        if len(vectors) == 0:
+            return
+        if self.index is None:
+            self.dimension = len(vectors[0]['values'])
+            self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(self.dimension))
+
+        self.remove([vector['id'] for vector in vectors])
+
+        internal_ids = []
+        for vector in vectors:
+            internal_id = self.next_internal_id
+            self.next_internal_id += 1
+            self.vector_ids[internal_id] = vector['id']
+            self.internal_ids[vector['id']] = internal_id
+            self.metadata[vector['id']] = vector['metadata']
+            internal_ids.append(internal_id)
+
+        values = _normalized([vector['values'] for vector in vectors])
+        self.index.add_with_ids(values, np.asarray(internal_ids, dtype="int64"))
+
+    def remove(self, vector_ids: list[str]):
+        internal_ids = [self.internal_ids.pop(vector_id) for vector_id in vector_ids if vector_id in self.internal_ids]
+        if self.index is None or len(internal_ids) == 0:
+            return
+
+        for internal_id in internal_ids:
+            self.metadata.pop(self.vector_ids.pop(internal_id), None)
+        self.index.remove_ids(np.asarray(internal_ids, dtype="int64"))
+
+    def __len__(self) -> int:
+        return 0 if self.index is None else self.index.ntotal
+
+class LocalVectorMirror:
+    """
+    An in-process, LRU-bounded mirror of Pinecone namespaces, used as a low-latency path for vector queries
+    and as a degraded-mode fallback while Pinecone is unavailable.
+
+    Namespaces are loaded lazily (in the background) the first time they're queried, and kept in sync by
+    the writes that go through this process. Writes from other processes aren't observed, so mirrored
+    namespaces are only served as fresh for a short TTL, after which they get reloaded.
+
+    Requires `faiss`, see `is_available`.
+
+    Arguments:
+    max_vectors – the maximum number of vectors kept across all namespaces.
+    ttl_seconds – the number of seconds for which a mirrored namespace is considered fresh.
+    """
+    MAX_VECTORS = 50000 # ~300MB of 1536-d vectors
+    TTL_SECONDS = 300 # 5 minutes
+    MAX_CONCURRENT_LOADS = 2
+    SUPPORTED_FILTER_OPERATORS = ["$eq", "$ne", "$gt", "$gte", "$lt", "$lte", "$in", "$nin"]
+
+    def __init__(
+        self,
+        max_vectors: int | None = None,
+        ttl_seconds: float | None = None
+    ):
+        cls = type(self)
+        self._max_vectors = max_vectors or cls.MAX_VECTORS
+        self._ttl_seconds = cls.TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._namespaces: OrderedDict[str, _MirroredNamespace] = OrderedDict()
+        self._vectors_count = 0
+
+        # Namespaces currently being loaded, mapped to whether the load is still valid
+        # (i.e. no writes for the namespace happened while it was loading).
+        self._loading: dict[str, bool] = {}
+        self._lock = threading.Lock()
+        self._load_executor = ThreadPoolExecutor(
+            max_workers=cls.MAX_CONCURRENT_LOADS,
+            thread_name_prefix="local-vector-mirror"
+        )
+
+    @staticmethod
+    def is_available() -> bool:
+        return faiss is not None
+
+    def query(
+        self,
+        namespace: str,
+        embeddings: list[float],
+        top_k: int,
+        metadata_filter: dict | None = None,
+        allow_stale: bool = False
+    ) -> list[dict] | None:
+        """
+        Returns the `top_k` closest matches (as `{"id", "metadata"}` dicts), or None if the query
+        can't be served locally.
+
+        Arguments:
+        namespace – the namespace to be queried.
+        embeddings – the query embeddings.
+        top_k – the maximum number of matches to be returned.
+        metadata_filter – the optional Pinecone-style metadata filter.
+        allow_stale – whether a namespace that outlived its TTL may be served (i.e. when Pinecone is down).
+        """
+        if metadata_filter is not None and not self._is_supported_filter(metadata_filter):
+            return None
+
+        with self._lock:
+            mirrored_namespace = self._namespaces.get(namespace)
+            if mirrored_namespace is None:
+                return None
+            if not allow_stale and time.monotonic() - mirrored_namespace.loaded_at > self._ttl_seconds:
+                return None
+            self._namespaces.move_to_end(namespace)
+            if len(mirrored_namespace) == 0:
+                return []
+            if len(embeddings) != mirrored_namespace.dimension:
+                return None
+
+            # Filters are applied after the search, so filtered queries rank the whole namespace.
+            search_k = len(mirrored_namespace) if metadata_filter is not None else min(top_k, len(mirrored_namespace))
+            _, internal_ids = mirrored_namespace.index.search(_normalized([embeddings]), search_k)
+
+            matches = []
+            for internal_id in internal_ids[0]:
+                if internal_id < 0:
+                    continue
+                vector_id = mirrored_namespace.vector_ids[int(internal_id)]
+                metadata = mirrored_namespace.metadata[vector_id]
+                if metadata_filter is not None and not self._matches_filter(metadata, metadata_filter):
+                    continue
+                matches.append({"id": vector_id, "metadata": metadata})
+                if len(matches) == top_k:
+                    break
+            return matches
+
+    def contains(self, namespace: str) -> bool:
+        with self._lock:
+            return namespace in self._namespaces
+
+    def schedule_load(
+        self,
+        namespace: str,
+        loader: Callable[[], list[dict]]
+    ) -> Future | None:
+        """
+        Loads (or reloads) a namespace in the background. Returns None if the namespace is already loading.
+
+        Arguments:
+        namespace – the namespace to be loaded.
+        loader – the function returning the namespace's vectors, as `{"id", "values", "metadata"}` dicts.
+        """
+        with self._lock:
+            if namespace in self._loading:
+                return None
+            self._loading[namespace] = True
+        return self._load_executor.submit(self._load, namespace, loader)
+
+    def load(
+        self,
+        namespace: str,
+        vectors: list[dict]
+    ):
+        """
+        Replaces the mirrored copy of a namespace.
+
+        Arguments:
+        namespace – the namespace to be loaded.
+        vectors – the namespace's vectors, as `{"id", "values", "metadata"}` dicts.
+        """
+        with self._lock:
+            self._set_namespace(namespace, vectors)
+
+    def upsert(
+        self,
+        namespace: str,
+        vectors: list[dict]
+    ):
+        """
+        Mirrors a write to a namespace. Namespaces that aren't mirrored are left alone.
+
+        Arguments:
+        namespace – the namespace that was written to.
+        vectors – the written vectors, as `{"id", "values", "metadata"}` dicts.
+        """
+        with self._lock:
+            self._invalidate_pending_load(namespace)
+            mirrored_namespace = self._namespaces.get(namespace)
+            if mirrored_namespace is None:
+                return
+
+            previous_count = len(mirrored_namespace)
+            mirrored_namespace.upsert(vectors)
+            self._vectors_count += len(mirrored_namespace) - previous_count
+            self._evict_if_needed()
+
+    def remove(
+        self,
+        namespace: str,
+        vector_ids: list[str]
+    ):
+        """
+        Mirrors the deletion of a set of vectors.
+
+        Arguments:
+        namespace – the namespace that was written to.
+        vector_ids – the ids of the deleted vectors.
+        """
+        with self._lock:
+            self._invalidate_pending_load(namespace)
+            mirrored_namespace = self._namespaces.get(namespace)
+            if mirrored_namespace is None:
+                return
+
+            previous_count = len(mirrored_namespace)
+            mirrored_namespace.remove(vector_ids)
+            self._vectors_count -= previous_count - len(mirrored_namespace)
+
+    def drop(
+        self,
+        namespace: str
+    ):
+        """
+        Drops a namespace from the mirror (i.e. after it got deleted).
+
+        Arguments:
+        namespace – the namespace to be dropped.
+        """
+        with self._lock:
+            self._invalidate_pending_load(namespace)
+            mirrored_namespace = self._namespaces.pop(namespace, None)
+            if mirrored_namespace is not None:
+                self._vectors_count -= len(mirrored_namespace)
+
+    def __len__(self) -> int:
+        return self._vectors_count
+
+    # Private
+
+    def _load(
+        self,
+        namespace: str,
+        loader: Callable[[], list[dict]]
+    ):
+        try:
+            vectors = loader()
+        except Exception as e:
+            print(f"[LocalVectorMirror] Failed to load namespace: {e}")
+            with self._lock:
+                self._loading.pop(namespace, None)
+            return
+
+        with self._lock:
+            if not self._loading.pop(namespace, False):
+                # The namespace was written to while loading, so the loaded copy may be missing those writes.
+                return
+            self._set_namespace(namespace, vectors)
+
+    def _set_namespace(
+        self,
+        namespace: str,
+        vectors: list[dict]
+    ):
+        previous_namespace = self._namespaces.pop(namespace, None)
+        if previous_namespace is not None:
+            self._vectors_count -= len(previous_namespace)
+
+        if len(vectors) > self._max_vectors:
+            return
+
+        mirrored_namespace = _MirroredNamespace()
+        mirrored_namespace.upsert(vectors)
+
+        self._namespaces[namespace] = mirrored_namespace
+        self._vectors_count += len(mirrored_namespace)
+        self._evict_if_needed()
+
+    def _evict_if_needed(self):
+        while self._vectors_count > self._max_vectors and len(self._namespaces) > 1:
+            _, evicted_namespace = self._namespaces.popitem(last=False)
+            self._vectors_count -= len(evicted_namespace)
+
+    def _invalidate_pending_load(self, namespace: str):
+        if namespace in self._loading:
+            self._loading[namespace] = False
+
+    def _is_supported_filter(self, metadata_filter: dict) -> bool:
+        for condition in metadata_filter.values():
+            if not isinstance(condition, dict):
+                continue
+            if any(operator not in type(self).SUPPORTED_FILTER_OPERATORS for operator in condition):
+                return False
+        return True
+
+    def _matches_filter(
+        self,
+        metadata: dict,
+        metadata_filter: dict
+    ) -> bool:
+        for field, condition in metadata_filter.items():
+            value = metadata.get(field)
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+
+            for operator, operand in condition.items():
+                if operator == "$ne" and value == operand:
+                    return False
+                if operator == "$nin" and value in operand:
+                    return False
+                if operator in ["$ne", "$nin"]:
+                    continue
+
+                if value is None:
+                    return False
+                if ((operator == "$eq" and value != operand)
+                    or (operator == "$gt" and not value > operand)
+                    or (operator == "$gte" and not value >= operand)
+                    or (operator == "$lt" and not value < operand)
+                    or (operator == "$lte" and not value <= operand)
+                    or (operator == "$in" and value not in operand)):
+                    return False
+        return True
+
+def _normalized(values: list) -> np.ndarray:
+    vectors = np.ascontiguousarray(np.asarray(values, dtype="float32"))
+    faiss.normalize_L2(vectors)
+    return vectors
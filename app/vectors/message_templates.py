@@ -12,9 +12,11 @@ class PromptScenario(Enum):
     # keep sorted A-Z
     ATTENDANCE_INSIGHTS = "attendance_insights"
     CHUNK_SUMMARY = "chunk_summary"
+    COMBINED_INSIGHTS = "combined_insights"
     DIARIZATION_SUMMARY = "diarization_summary"
     DIARIZATION_CHUNKS_GRAND_SUMMARY = "diarization_chunks_grand_summary"
     EXTRACT_TIME_TOKENS = "extract_time_tokens"
+    PACKED_CHUNK_SUMMARIES = "packed_chunk_summaries"
     PRESESSION_BRIEFING = "presession_briefing"
     QUERY = "query"
     QUESTION_SUGGESTIONS = "question_suggestions"
@@ -102,15 +104,42 @@ class PromptCrafter:
                 patient_gender=patient_gender,
                 query_input=query_input
             )
+        elif scenario == PromptScenario.COMBINED_INSIGHTS:
+            assert 'language_code' in kwargs, "Missing language_code param for building user message"
+            assert 'context' in kwargs, "Missing context param for building user message"
+            assert 'patient_name' in kwargs, "Missing patient_name param for building user message"
+            assert 'patient_gender' in kwargs, "Missing patient_gender param for building user message"
+            assert 'sections' in kwargs, "Missing sections param for building user message"
+
+            language_code = kwargs['language_code']
+            context = kwargs['context']
+            patient_name = kwargs['patient_name']
+            patient_gender = kwargs['patient_gender']
+            sections = kwargs['sections']
+            return self._create_combined_insights_user_message(
+                language_code=language_code,
+                context=context,
+                patient_name=patient_name,
+                patient_gender=patient_gender,
+                sections=sections
+            )
         elif scenario == PromptScenario.CHUNK_SUMMARY:
             assert 'chunk_text' in kwargs, "Missing chunk_text param for building user message"
             chunk_text = kwargs['chunk_text']
             return self._create_chunk_summary_user_message(chunk_text=chunk_text)
+        elif scenario == PromptScenario.PACKED_CHUNK_SUMMARIES:
+            assert 'chunks' in kwargs, "Missing chunks param for building user message"
+            chunks = kwargs['chunks']
+            return self._create_packed_chunk_summaries_user_message(chunks=chunks)
         elif scenario == PromptScenario.SOAP_TEMPLATE:
             assert 'session_notes' in kwargs, "Missing session_notes param for building user message"
             session_notes = kwargs['session_notes']
             return self._create_soap_template_user_message(session_notes=session_notes)
         elif scenario == PromptScenario.SESSION_MINI_SUMMARY:
+            if 'chunk_summaries' in kwargs:
+                chunk_summaries = kwargs['chunk_summaries']
+                return self._create_session_mini_summary_from_chunks_user_message(chunk_summaries=chunk_summaries)
+
             assert 'session_notes' in kwargs, "Missing session_notes param for building user message"
             session_notes = kwargs['session_notes']
             return self._create_session_mini_summary_user_message(session_notes=session_notes)
@@ -220,8 +249,24 @@ class PromptCrafter:
             assert 'language_code' in kwargs, "Missing language_code param for building system message"
             language_code = kwargs['language_code']
             return self._create_recent_topics_system_message(language_code=language_code)
+        elif scenario == PromptScenario.COMBINED_INSIGHTS:
+            assert 'language_code' in kwargs, "Missing language_code param for building system message"
+            assert 'sections' in kwargs, "Missing sections param for building system message"
+
+            # The briefing's params are only needed when the briefing is one of the sections.
+            return self._create_combined_insights_system_message(
+                sections=kwargs['sections'],
+                language_code=kwargs['language_code'],
+                therapist_name=kwargs.get('therapist_name'),
+                therapist_gender=kwargs.get('therapist_gender'),
+                patient_name=kwargs.get('patient_name'),
+                patient_gender=kwargs.get('patient_gender'),
+                session_count=kwargs.get('session_count')
+            )
         elif scenario == PromptScenario.CHUNK_SUMMARY:
             return self._create_chunk_summary_system_message()
+        elif scenario == PromptScenario.PACKED_CHUNK_SUMMARIES:
+            return self._create_packed_chunk_summaries_system_message()
         elif scenario == PromptScenario.SOAP_TEMPLATE:
             return self._create_soap_template_system_message()
         elif scenario == PromptScenario.SESSION_MINI_SUMMARY:
@@ -513,6 +558,83 @@ class PromptCrafter:
         except Exception as e:
             raise RuntimeError(e) from e
 
+    # Combined Insights
+
+    def _create_combined_insights_system_message(
+        self,
+        sections: list[str],
+        language_code: str,
+        therapist_name: str | None,
+        therapist_gender: str | None,
+        patient_name: str | None,
+        patient_gender: str | None,
+        session_count: int | None
+    ) -> str:
+        try:
+            assert len(sections or []) > 0, "Missing sections param for building system message"
+            assert len(language_code or '') > 0, "Missing language_code param for building system message"
+
+            # Every section reuses the instructions of its standalone prompt, so that both stay in sync.
+            section_instructions = {
+                "recent_topics": lambda: self._create_recent_topics_system_message(language_code=language_code),
+                "recent_topics_insights": lambda: (
+                    self._create_topics_insights_system_message(language_code=language_code)
+                    + "The array of topics to be analyzed is the one you return in `recent_topics`.\n"
+                ),
+                "presession_briefing": lambda: self._create_briefing_system_message(
+                    language_code=language_code,
+                    therapist_name=therapist_name,
+                    therapist_gender=therapist_gender,
+                    patient_name=patient_name,
+                    patient_gender=patient_gender,
+                    session_count=session_count
+                ),
+                "question_suggestions": lambda: self._create_question_suggestions_system_message(language_code=language_code),
+            }
+            assert all(section in section_instructions for section in sections), "Received an unknown section for building system message"
+
+            requested_sections = ", ".join(f"`{section}`" for section in sections)
+            message = (
+                "You are generating several outputs for a mental health practitioner who is reviewing a patient's dashboard on our Practice Management Platform, all of them from the same context. "
+                f"Return a single JSON object with the keys {', '.join(f'`{section}`' for section in section_instructions)}. "
+                f"Fill in only the following sections: {requested_sections}. Every other key must be null.\n\n"
+                "Each section has its own set of instructions below. Where a section's instructions describe a standalone JSON object, "
+                "the section's value is that object's array instead: `recent_topics` takes the array of topic objects, and `question_suggestions` takes the array of questions. "
+                "Base `recent_topics` and `recent_topics_insights` only on the `chunk_summary` values, and never on the `pre_existing_history_summary`."
+            )
+            for section in sections:
+                message += f"\n\n### Instructions for `{section}`\n\n{section_instructions[section]()}"
+            return message
+        except Exception as e:
+            raise RuntimeError(e) from e
+
+    def _create_combined_insights_user_message(
+        self,
+        language_code: str,
+        context: str,
+        patient_name: str,
+        patient_gender: str,
+        sections: list[str]
+    ) -> str:
+        try:
+            assert len(language_code or '') > 0, "Missing language_code param for building user message"
+            assert len(context or '') > 0, "Missing context param for building user message"
+            assert len(patient_name or '') > 0, "Missing patient_name param for building user message"
+            assert len(sections or []) > 0, "Missing sections param for building user message"
+
+            if patient_gender is not None and gender_has_default_pronouns(patient_gender):
+                patient_info = f"\nFor reference, the patient is a {patient_gender}, and their name is {patient_name}."
+            else:
+                patient_info = f"\nFor reference, the patient's name is {patient_name}."
+            return (
+                f"We have provided context information below.\n---------------------\n{context}\n---------------------\n"
+                f"\n{patient_info} "
+                f"It is very important that every section is written using language code {language_code}. "
+                f"Given this information, please fill in the following sections: {', '.join(f'`{section}`' for section in sections)}."
+            )
+        except Exception as e:
+            raise RuntimeError(e) from e
+
     # Session Entry Summary Prompt
 
     def _create_chunk_summary_system_message(self) -> str:
@@ -537,6 +659,31 @@ class PromptCrafter:
         except Exception as e:
             raise RuntimeError(e) from e
 
+    # Packed Chunk Summaries Prompt
+
+    def _create_packed_chunk_summaries_system_message(self) -> str:
+        return (
+            f"{self._create_chunk_summary_system_message()}\n\n"
+            "You will be provided with several chunks at once, each one wrapped in a <chunk> tag with its own `id`. "
+            "Summarize every chunk on its own, as if it were the only chunk provided, and never carry information over from one chunk to another. "
+            "Return only a JSON object with one key: `summaries`. The value should be an array with one object per chunk, each including:\n"
+            "- `chunk_id`: the chunk's `id`, exactly as provided\n"
+            "- `summary`: the chunk's summary\n"
+        )
+
+    def _create_packed_chunk_summaries_user_message(
+        self,
+        chunks: list[tuple[str, str]]
+    ) -> str:
+        try:
+            assert len(chunks or []) > 0, "Missing chunks param for building user message"
+            packed_chunks = "\n\n".join(
+                f"<chunk id=\"{chunk_id}\">\n{chunk_text}\n</chunk>" for chunk_id, chunk_text in chunks
+            )
+            return (f"Summarize each of the following chunks:\n\n{packed_chunks}")
+        except Exception as e:
+            raise RuntimeError(e) from e
+
     # SOAP Template Prompt
 
     def _create_soap_template_system_message(self) -> str:
@@ -592,6 +739,20 @@ class PromptCrafter:
         except Exception as e:
             raise RuntimeError(e) from e
 
+    def _create_session_mini_summary_from_chunks_user_message(
+        self,
+        chunk_summaries: list[str]
+    ) -> str:
+        try:
+            assert len(chunk_summaries or []) > 0, "Missing chunk_summaries param for building user message"
+            outline = "\n".join(f"- {chunk_summary}" for chunk_summary in chunk_summaries)
+            return (
+                "The session notes are outlined below, as summaries of their consecutive sections. "
+                f"Summarize the session notes they outline:\n\n{outline}"
+            )
+        except Exception as e:
+            raise RuntimeError(e) from e
+
     # Reformulate query
 
     def _create_reformulate_query_system_message(self) -> str:
@@ -0,0 +1,128 @@
+import bisect
+
+from . import data_cleaner
+from .tokenizer import Tokenizer
+
+class TextChunker:
+    """
+    Splits text into overlapping windows of tokens, for embedding and summarizing.
+
+    The text gets cleaned up and encoded once, and windows are cut on the token array itself, at the
+    strongest natural boundary available (a paragraph, then a line, then a word), rather than
+    re-encoding candidate pieces until they fit.
+
+    Arguments:
+    chunk_size – the maximum number of tokens in a chunk.
+    chunk_overlap – the maximum number of tokens shared by consecutive chunks.
+    tokenizer – the tokenizer used for encoding. Defaults to the shared one.
+    """
+    CHUNK_SIZE = 256
+    CHUNK_OVERLAP = 25
+
+    # Boundary strengths, from weakest to strongest.
+    NO_BOUNDARY = 0
+    WORD_BOUNDARY = 1
+    LINE_BOUNDARY = 2
+    PARAGRAPH_BOUNDARY = 3
+
+    def __init__(
+        self,
+        chunk_size: int | None = None,
+        chunk_overlap: int | None = None,
+        tokenizer: Tokenizer | None = None
+    ):
+        cls = type(self)
+        self._chunk_size = chunk_size or cls.CHUNK_SIZE
+        self._chunk_overlap = cls.CHUNK_OVERLAP if chunk_overlap is None else chunk_overlap
+        assert self._chunk_overlap < self._chunk_size, "The chunk overlap must be smaller than the chunk size"
+        self._tokenizer = tokenizer or Tokenizer.shared()
+
+    def split_text(self, text: str) -> list[str]:
+        """
+        Cleans up the incoming text, and splits it into chunks.
+        Returns the chunks' text, in order.
+
+        Arguments:
+        text – the text to be split.
+        """
+        cleaned_text, line_breaks = data_cleaner.clean_up_text_with_line_breaks(text)
+        tokens, line_boundaries = self._encode_lines(cleaned_text, line_breaks)
+
+        chunks = []
+        for start, end in self._chunk_spans(tokens, line_boundaries):
+            chunk = self._tokenizer.decode(tokens[start:end]).strip()
+            if len(chunk) > 0:
+                chunks.append(chunk)
+        return chunks
+
+    # Private
+
+    def _encode_lines(
+        self,
+        text: str,
+        line_breaks: dict[int, int]
+    ) -> tuple[list[int], dict[int, int]]:
+        # Lines get encoded one after the other, so that the token index where each of them starts
+        # (and the strength of the boundary there) comes out of their token counts.
+        cls = type(self)
+        line_starts = [0] + sorted(offset for offset in line_breaks if 0 < offset < len(text))
+        line_ends = line_starts[1:] + [len(text)]
+
+        tokens = []
+        line_boundaries = {}
+        for line_start, line_end in zip(line_starts, line_ends):
+            line_tokens = self._tokenizer.encode(text[line_start:line_end])
+            if len(tokens) > 0:
+                is_paragraph = line_breaks.get(line_start, 0) > 1
+                line_boundaries[len(tokens)] = cls.PARAGRAPH_BOUNDARY if is_paragraph else cls.LINE_BOUNDARY
+            tokens.extend(line_tokens)
+        return (tokens, line_boundaries)
+
+    def _chunk_spans(
+        self,
+        tokens: list[int],
+        line_boundaries: dict[int, int]
+    ) -> list[tuple[int, int]]:
+        cls = type(self)
+        boundary_indexes = sorted(line_boundaries)
+        spans = []
+        start = 0
+        while start < len(tokens):
+            window_end = start + self._chunk_size
+            if window_end >= len(tokens):
+                spans.append((start, len(tokens)))
+                break
+
+            # The latest of the strongest boundaries within the window.
+            cut, cut_strength = window_end, cls.NO_BOUNDARY
+            first_position = bisect.bisect_right(boundary_indexes, start)
+            last_position = bisect.bisect_right(boundary_indexes, window_end)
+            for index in reversed(boundary_indexes[first_position:last_position]):
+                if line_boundaries[index] > cut_strength:
+                    cut, cut_strength = index, line_boundaries[index]
+            if cut_strength == cls.NO_BOUNDARY:
+                for index in range(window_end, start, -1):
+                    if self._starts_word(tokens[index]):
+                        cut, cut_strength = index, cls.WORD_BOUNDARY
+                        break
+            spans.append((start, cut))
+
+            # The overlap starts at the earliest boundary, as strong as the cut, within its range.
+            overlap_start = max(cut - self._chunk_overlap, start + 1)
+            if cut_strength == cls.NO_BOUNDARY:
+                start = overlap_start
+                continue
+
+            next_start = cut
+            for index in range(overlap_start, cut):
+                boundary_strength = line_boundaries.get(index, cls.NO_BOUNDARY)
+                if boundary_strength == cls.NO_BOUNDARY and self._starts_word(tokens[index]):
+                    boundary_strength = cls.WORD_BOUNDARY
+                if boundary_strength >= cut_strength:
+                    next_start = index
+                    break
+            start = next_start
+        return spans
+
+    def _starts_word(self, token: int) -> bool:
+        return self._tokenizer.decode_token_bytes(token).startswith(b" ")
@@ -0,0 +1,90 @@
+import threading, tiktoken
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Imported for typing only, the templates module depends on the dependency container.
+    from .message_templates import PromptScenario
+
+class Tokenizer:
+    """
+    The process-wide tokenizer, shared by prompt sizing, context assembly and chunking.
+
+    The encoder gets loaded once per process, and the token counts of system prompts are memoized
+    by scenario and language, since most of them never change across requests.
+
+    Arguments:
+    encoding – the encoding to be used. Defaults to the models' encoding.
+    """
+    ENCODING_NAME = "o200k_base"
+    BATCH_NUM_THREADS = 4
+    _lock = threading.Lock()
+    _shared_instance = None
+
+    def __init__(
+        self,
+        encoding: tiktoken.Encoding | None = None
+    ):
+        self._encoding = encoding or tiktoken.get_encoding(type(self).ENCODING_NAME)
+
+        # Keyed by (scenario, language code), holding the prompt along with its count, so that
+        # prompts that do vary (i.e. with the patient's name) are recounted instead of misreported.
+        self._prompt_token_counts: dict[tuple["PromptScenario", str | None], tuple[str, int]] = {}
+
+    @classmethod
+    def shared(cls) -> "Tokenizer":
+        if cls._shared_instance is None:
+            with cls._lock:
+                if cls._shared_instance is None:
+                    cls._shared_instance = cls()
+        return cls._shared_instance
+
+    @property
+    def encoding(self) -> tiktoken.Encoding:
+        return self._encoding
+
+    def encode(self, text: str) -> list[int]:
+        # Special tokens are plain text in user content, so they're never parsed as such.
+        return self._encoding.encode_ordinary(text)
+
+    def decode(self, tokens: list[int]) -> str:
+        return self._encoding.decode(tokens)
+
+    def decode_token_bytes(self, token: int) -> bytes:
+        return self._encoding.decode_single_token_bytes(token)
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.encode(text))
+
+    def count_tokens_batch(self, texts: list[str]) -> list[int]:
+        """
+        Counts the tokens of several texts at once, encoding them in parallel.
+        """
+        batch_tokens = self._encoding.encode_ordinary_batch(
+            texts,
+            num_threads=type(self).BATCH_NUM_THREADS
+        )
+        return [len(tokens) for tokens in batch_tokens]
+
+    def count_prompt_tokens(
+        self,
+        prompt: str,
+        scenario: "PromptScenario",
+        language_code: str | None = None
+    ) -> int:
+        """
+        Counts the tokens of a system prompt, memoizing the count for its scenario and language.
+
+        Arguments:
+        prompt – the prompt to be counted.
+        scenario – the scenario the prompt was crafted for.
+        language_code – the language code the prompt was crafted with, if any.
+        """
+        key = (scenario, language_code)
+        memoized_count = self._prompt_token_counts.get(key)
+        if memoized_count is not None and memoized_count[0] == prompt:
+            return memoized_count[1]
+
+        token_count = self.count_tokens(prompt)
+        self._prompt_token_counts[key] = (prompt, token_count)
+        return token_count